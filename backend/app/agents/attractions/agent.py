@@ -7,6 +7,8 @@ from datetime import UTC, datetime
 
 from crewai import Agent, Crew
 
+from app.core.telemetry import trace_tools
+
 from ..base import BaseAgent
 from ..config import AgentConfig, get_llm
 from ..interfaces import SourceReference
@@ -90,7 +92,7 @@ class AttractionsAgent(BaseAgent):
         super().__init__(config)
 
         # Initialize LLM with fallback support (Anthropic -> Gemini -> OpenAI)
-        self.llm = get_llm(temperature=0.1)
+        self.llm = get_llm(temperature=0.1, config=self.config)
 
         # Create CrewAI agent
         self.agent = self._create_agent()
@@ -109,11 +111,13 @@ class AttractionsAgent(BaseAgent):
             goal=ATTRACTIONS_AGENT_GOAL,
             backstory=ATTRACTIONS_AGENT_BACKSTORY,
             llm=self.llm,
-            tools=[
-                get_city_coordinates_tool,
-                search_attractions_tool,
-                get_attraction_details_tool,
-            ],
+            tools=trace_tools(
+                [
+                    get_city_coordinates_tool,
+                    search_attractions_tool,
+                    get_attraction_details_tool,
+                ]
+            ),
             verbose=True,
             allow_delegation=False,
         )
@@ -14,8 +14,16 @@ import os
 from typing import Any
 
 import httpx
+import numpy as np
 from crewai.tools import tool
 
+from app.core.config import settings
+from app.core.metrics import async_http_event_hooks
+from app.services.gazetteer import get_gazetteer
+from app.services.places import get_place_tile_cache
+from app.services.places.geohash import haversine_km
+from app.services.places.tile_cache import place_point
+
 logger = logging.getLogger(__name__)
 
 # Constants
@@ -53,6 +61,7 @@ class OpenTripMapClient:
             msg = "OPENTRIPMAP_API_KEY not found in environment variables"
             raise ValueError(msg)
         self.lang = lang
+        self.base_url = settings.OPENTRIPMAP_BASE_URL or self.BASE_URL
 
     async def get_location_coordinates(
         self, name: str, country: str | None = None
@@ -69,14 +78,16 @@ class OpenTripMapClient:
         Returns:
             dict with name, country, lon, lat, timezone, population or None if not found
         """
-        url = f"{self.BASE_URL}/{self.lang}/places/geoname"
+        url = f"{self.base_url}/{self.lang}/places/geoname"
         params = {"name": name, "apikey": self.api_key}
 
         if country:
             params["country"] = country
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(
+                timeout=30.0, event_hooks=async_http_event_hooks("opentripmap")
+            ) as client:
                 response = await client.get(url, params=params)
                 response.raise_for_status()
                 data = response.json()
@@ -129,8 +140,60 @@ class OpenTripMapClient:
 
         Returns:
             List of SimpleFeature objects with xid, name, kinds, point, osm, wikidata, dist
+
+        Results are served from the shared geohash tile cache; only tiles
+        that are not cached yet are fetched from the API.
         """
-        url = f"{self.BASE_URL}/{self.lang}/places/radius"
+        try:
+            places = await get_place_tile_cache().radius_search(
+                lat,
+                lon,
+                radius,
+                fetch=lambda tile_lat, tile_lon, tile_radius, tile_limit: self._fetch_radius(
+                    tile_lon,
+                    tile_lat,
+                    tile_radius,
+                    kinds=kinds,
+                    rate=rate,
+                    limit=tile_limit,
+                    format=format,
+                ),
+                category=f"client:{self.lang}:{kinds or 'all'}:{rate or 'any'}:{format}",
+                limit=limit,
+                # Tools run in short-lived event loops; refresh stale tiles inline
+                background_refresh=False,
+            )
+        except httpx.HTTPStatusError as e:
+            logger.warning("HTTP error in radius search: %s", e.response.status_code)
+            return []
+        except Exception:
+            logger.exception("Error in radius search")
+            return []
+
+        # Distances in cached tiles are relative to the tile center
+        results = []
+        for place in places:
+            point = place_point(place)
+            if point and "dist" in place:
+                distance_km = haversine_km(lat, lon, np.array([point[0]]), np.array([point[1]]))
+                results.append({**place, "dist": round(float(distance_km[0]) * 1000, 1)})
+            else:
+                results.append(place)
+        return results
+
+    async def _fetch_radius(
+        self,
+        lon: float,
+        lat: float,
+        radius: int,
+        *,
+        kinds: str | None,
+        rate: str | None,
+        limit: int,
+        format: str,
+    ) -> list[dict[str, Any]]:
+        """Fetch one radius search page from the API (raises on HTTP errors)."""
+        url = f"{self.base_url}/{self.lang}/places/radius"
         params = {
             "lon": lon,
             "lat": lat,
@@ -145,25 +208,19 @@ class OpenTripMapClient:
         if rate:
             params["rate"] = rate
 
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
-
-                # Handle both json array and geojson FeatureCollection responses
-                if isinstance(data, list):
-                    return data
-                if isinstance(data, dict) and "features" in data:
-                    return data["features"]
-                return []
+        async with httpx.AsyncClient(
+            timeout=30.0, event_hooks=async_http_event_hooks("opentripmap")
+        ) as client:
+            response = await client.get(url, params=params)
+            response.raise_for_status()
+            data = response.json()
 
-        except httpx.HTTPStatusError as e:
-            logger.warning("HTTP error in radius search: %s", e.response.status_code)
-            return []
-        except Exception:
-            logger.exception("Error in radius search")
-            return []
+        # Handle both json array and geojson FeatureCollection responses
+        if isinstance(data, list):
+            return data
+        if isinstance(data, dict) and "features" in data:
+            return data["features"]
+        return []
 
     async def get_place_details(self, xid: str) -> dict[str, Any] | None:
         """
@@ -184,11 +241,13 @@ class OpenTripMapClient:
             - url, otm (web links)
             - info (additional structured data)
         """
-        url = f"{self.BASE_URL}/{self.lang}/places/xid/{xid}"
+        url = f"{self.base_url}/{self.lang}/places/xid/{xid}"
         params = {"apikey": self.api_key}
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(
+                timeout=30.0, event_hooks=async_http_event_hooks("opentripmap")
+            ) as client:
                 response = await client.get(url, params=params)
                 response.raise_for_status()
                 return response.json()
@@ -230,7 +289,7 @@ class OpenTripMapClient:
         if len(name) < MIN_AUTOSUGGEST_CHARS:
             return []
 
-        url = f"{self.BASE_URL}/{self.lang}/places/autosuggest"
+        url = f"{self.base_url}/{self.lang}/places/autosuggest"
         params = {
             "name": name,
             "lon": lon,
@@ -244,7 +303,9 @@ class OpenTripMapClient:
             params["kinds"] = kinds
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(
+                timeout=30.0, event_hooks=async_http_event_hooks("opentripmap")
+            ) as client:
                 response = await client.get(url, params=params)
                 response.raise_for_status()
                 data = response.json()
@@ -278,6 +339,20 @@ def get_city_coordinates_tool(city_name: str, country_code: str | None = None) -
     Returns:
         JSON string with city coordinates and metadata
     """
+    # Major cities resolve locally from the offline gazetteer
+    city = get_gazetteer().city(city_name, country_code)
+    if city:
+        return json.dumps(
+            {
+                "name": city.name,
+                "country": city.country,
+                "lat": city.lat,
+                "lon": city.lng,
+                "timezone": city.timezone,
+            },
+            indent=2,
+        )
+
     # Check if API key is configured
     api_key = os.getenv("OPENTRIPMAP_API_KEY")
     if not api_key:
@@ -8,6 +8,11 @@ LLM Fallback Strategy:
 - Primary: Anthropic (Claude)
 - Fallback 1: Google (Gemini)
 - Fallback 2: OpenAI (GPT-4)
+
+Model Tiering:
+- Each agent type maps to a model tier (fast, standard, large)
+- A tier selects the model per provider plus request timeout and max_tokens
+- Explicit llm_model / max_tokens on an AgentConfig override the tier defaults
 """
 
 import logging
@@ -15,6 +20,9 @@ import os
 
 from pydantic import BaseModel, Field
 
+from app.agents.llm_router import LLM_RUNTIME_FAILOVER_ENABLED, FailoverChatModel
+from app.agents.llm_usage import attach_usage_tracking
+
 logger = logging.getLogger(__name__)
 
 # LLM Provider configuration
@@ -30,7 +38,107 @@ DEFAULT_OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 DEFAULT_LLM_MODEL = DEFAULT_ANTHROPIC_MODEL
 
 
-def _create_anthropic_llm(temperature: float = 0.1):
+class ModelTier(BaseModel):
+    """
+    Model selection and request limits for one tier
+
+    Attributes:
+        name: Tier name (fast, standard, large)
+        anthropic_model: Claude model ID
+        google_model: Gemini model ID
+        openai_model: OpenAI model ID
+        max_tokens: Default maximum tokens in LLM response
+        timeout_seconds: Per-request timeout
+    """
+
+    name: str
+    anthropic_model: str
+    google_model: str
+    openai_model: str
+    max_tokens: int
+    timeout_seconds: float
+
+    def model_for(self, provider: str) -> str:
+        """Get this tier's model ID for a provider."""
+        return {
+            "anthropic": self.anthropic_model,
+            "google": self.google_model,
+            "openai": self.openai_model,
+        }[provider]
+
+
+MODEL_TIERS: dict[str, ModelTier] = {
+    # Structured lookups and formatting of API data
+    "fast": ModelTier(
+        name="fast",
+        anthropic_model=os.getenv("ANTHROPIC_FAST_MODEL", "claude-3-5-haiku-20241022"),
+        google_model=os.getenv("GOOGLE_FAST_MODEL", DEFAULT_GOOGLE_MODEL),
+        openai_model=os.getenv("OPENAI_FAST_MODEL", DEFAULT_OPENAI_MODEL),
+        max_tokens=2000,
+        timeout_seconds=30.0,
+    ),
+    # Research and summarisation from web search results
+    "standard": ModelTier(
+        name="standard",
+        anthropic_model=DEFAULT_ANTHROPIC_MODEL,
+        google_model=DEFAULT_GOOGLE_MODEL,
+        openai_model=DEFAULT_OPENAI_MODEL,
+        max_tokens=4000,
+        timeout_seconds=60.0,
+    ),
+    # Multi-day planning that synthesises every other section
+    "large": ModelTier(
+        name="large",
+        anthropic_model=os.getenv("ANTHROPIC_LARGE_MODEL", DEFAULT_ANTHROPIC_MODEL),
+        google_model=os.getenv("GOOGLE_LARGE_MODEL", DEFAULT_GOOGLE_MODEL),
+        openai_model=os.getenv("OPENAI_LARGE_MODEL", "gpt-4o"),
+        max_tokens=8000,
+        timeout_seconds=120.0,
+    ),
+}
+
+# Agent type to model tier routing
+AGENT_MODEL_TIERS: dict[str, str] = {
+    "visa": "fast",
+    "country": "fast",
+    "weather": "fast",
+    "currency": "fast",
+    "flight": "fast",
+    "culture": "standard",
+    "food": "standard",
+    "attractions": "standard",
+    "itinerary": "large",
+}
+
+# Optional overrides, e.g. AGENT_MODEL_TIER_OVERRIDES="visa=standard,food=fast"
+for _override in os.getenv("AGENT_MODEL_TIER_OVERRIDES", "").split(","):
+    if "=" in _override:
+        _agent, _tier = (part.strip() for part in _override.split("=", 1))
+        if _tier in MODEL_TIERS:
+            AGENT_MODEL_TIERS[_agent] = _tier
+        else:
+            logger.warning("Ignoring unknown model tier '%s' for agent '%s'", _tier, _agent)
+
+
+def get_model_tier(agent_type: str | None) -> ModelTier:
+    """
+    Get the model tier for an agent type.
+
+    Args:
+        agent_type: Agent type identifier (unknown or None -> standard tier)
+
+    Returns:
+        ModelTier for the agent
+    """
+    return MODEL_TIERS[AGENT_MODEL_TIERS.get(agent_type or "", "standard")]
+
+
+def _create_anthropic_llm(
+    temperature: float = 0.1,
+    model: str = DEFAULT_ANTHROPIC_MODEL,
+    max_tokens: int | None = None,
+    timeout: float = 60.0,
+):
     """Create Anthropic (Claude) LLM instance."""
     from langchain_anthropic import ChatAnthropic  # noqa: PLC0415
 
@@ -39,15 +147,22 @@ def _create_anthropic_llm(temperature: float = 0.1):
         msg = "ANTHROPIC_API_KEY not set"
         raise ValueError(msg)
 
+    kwargs = {"max_tokens": max_tokens} if max_tokens else {}
     return ChatAnthropic(
-        model=DEFAULT_ANTHROPIC_MODEL,
+        model=model,
         temperature=temperature,
-        timeout=60.0,
+        timeout=timeout,
         anthropic_api_key=api_key,
+        **kwargs,
     )
 
 
-def _create_google_llm(temperature: float = 0.1):
+def _create_google_llm(
+    temperature: float = 0.1,
+    model: str = DEFAULT_GOOGLE_MODEL,
+    max_tokens: int | None = None,
+    timeout: float = 60.0,
+):
     """Create Google (Gemini) LLM instance."""
     from langchain_google_genai import ChatGoogleGenerativeAI  # noqa: PLC0415
 
@@ -57,13 +172,20 @@ def _create_google_llm(temperature: float = 0.1):
         raise ValueError(msg)
 
     return ChatGoogleGenerativeAI(
-        model=DEFAULT_GOOGLE_MODEL,
+        model=model,
         temperature=temperature,
+        max_output_tokens=max_tokens,
+        timeout=timeout,
         google_api_key=api_key,
     )
 
 
-def _create_openai_llm(temperature: float = 0.1):
+def _create_openai_llm(
+    temperature: float = 0.1,
+    model: str = DEFAULT_OPENAI_MODEL,
+    max_tokens: int | None = None,
+    timeout: float = 60.0,
+):
     """Create OpenAI (GPT) LLM instance."""
     from langchain_openai import ChatOpenAI  # noqa: PLC0415
 
@@ -73,20 +195,32 @@ def _create_openai_llm(temperature: float = 0.1):
         raise ValueError(msg)
 
     return ChatOpenAI(
-        model=DEFAULT_OPENAI_MODEL,
+        model=model,
         temperature=temperature,
+        max_tokens=max_tokens,
+        timeout=timeout,
         api_key=api_key,
     )
 
 
-def get_llm(temperature: float = 0.1):
+def get_llm(temperature: float = 0.1, config: "AgentConfig | None" = None):
     """
     Get LLM instance with automatic fallback support.
 
     Fallback chain: Anthropic -> Gemini -> OpenAI
 
+    With runtime failover enabled (LLM_RUNTIME_FAILOVER, default on) every
+    provider that can be constructed is wrapped in a FailoverChatModel, so
+    errors and timeouts during a call also fail over to the next provider.
+
+    The model, max_tokens and request timeout come from the agent's model tier
+    (see AGENT_MODEL_TIERS). Fields set explicitly on the config win: llm_model
+    replaces the Claude model, max_tokens the tier default, and timeout_seconds
+    caps the request timeout.
+
     Args:
         temperature: LLM temperature (default 0.1 for factual responses)
+        config: Agent configuration used for tier routing (optional)
 
     Returns:
         Configured LLM instance
@@ -94,6 +228,18 @@ def get_llm(temperature: float = 0.1):
     Raises:
         RuntimeError: If all LLM providers fail
     """
+    tier = get_model_tier(config.agent_type if config else None)
+    explicit = config.model_fields_set if config else set()
+    max_tokens = config.max_tokens if "max_tokens" in explicit else tier.max_tokens
+    timeout = tier.timeout_seconds
+    if config and config.timeout_seconds:
+        timeout = min(timeout, float(config.timeout_seconds))
+
+    def model_for(provider: str) -> str:
+        if provider == "anthropic" and "llm_model" in explicit:
+            return config.llm_model
+        return tier.model_for(provider)
+
     # Define provider chain based on primary provider
     if LLM_PROVIDER == "google":
         providers = [
@@ -115,10 +261,16 @@ def get_llm(temperature: float = 0.1):
         ]
 
     errors = []
+    available = []
 
     for name, create_fn in providers:
         try:
-            llm = create_fn(temperature)
+            llm = create_fn(
+                temperature,
+                model=model_for(name),
+                max_tokens=max_tokens,
+                timeout=timeout,
+            )
         except Exception as e:
             error_msg = str(e)
             errors.append((name, error_msg))
@@ -131,8 +283,23 @@ def get_llm(temperature: float = 0.1):
 
             continue
         else:
-            logger.info("LLM initialized successfully with provider: %s", name)
-            return llm
+            logger.info(
+                "LLM initialized successfully with provider: %s (tier=%s, model=%s)",
+                name,
+                tier.name,
+                model_for(name),
+            )
+            llm = attach_usage_tracking(llm, tier=tier.name, provider=name, model=model_for(name))
+            available.append((name, llm))
+
+            # Without runtime failover only the first working provider is used
+            if not (LLM_FALLBACK_ENABLED and LLM_RUNTIME_FAILOVER_ENABLED):
+                break
+
+    if len(available) == 1:
+        return available[0][1]
+    if available:
+        return FailoverChatModel(models=available)
 
     # All providers failed
     error_details = "; ".join([f"{name}: {err}" for name, err in errors])
@@ -168,7 +335,10 @@ class AgentConfig(BaseModel):
 
     llm_model: str = Field(
         default=DEFAULT_LLM_MODEL,
-        description="Claude model ID to use for agent execution",
+        description=(
+            "Claude model ID to use for agent execution. "
+            "If not set explicitly, the agent's model tier decides."
+        ),
     )
 
     temperature: float = Field(
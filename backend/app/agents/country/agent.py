@@ -10,6 +10,8 @@ from datetime import datetime
 
 from crewai import Agent, Crew, Process
 
+from app.core.telemetry import trace_tools
+
 from ..base import BaseAgent
 from ..config import AgentConfig, get_llm
 from ..exceptions import AgentExecutionError
@@ -57,7 +59,7 @@ class CountryAgent(BaseAgent):
         super().__init__(config or AgentConfig(agent_type="country"))
 
         # Initialize LLM with fallback support (Anthropic -> Gemini -> OpenAI)
-        self.llm = get_llm(temperature=0.1)
+        self.llm = get_llm(temperature=0.1, config=self.config)
 
         # Create CrewAI agent
         self.agent = self._create_crewai_agent()
@@ -76,13 +78,15 @@ class CountryAgent(BaseAgent):
             goal=COUNTRY_AGENT_GOAL,
             backstory=COUNTRY_AGENT_BACKSTORY,
             llm=self.llm,
-            tools=[
-                get_country_info,
-                get_emergency_services,
-                get_power_outlet_info,
-                get_travel_safety_rating,
-                get_notable_facts,
-            ],
+            tools=trace_tools(
+                [
+                    get_country_info,
+                    get_emergency_services,
+                    get_power_outlet_info,
+                    get_travel_safety_rating,
+                    get_notable_facts,
+                ]
+            ),
             verbose=True,
             allow_delegation=False,
         )
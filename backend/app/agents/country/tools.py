@@ -7,13 +7,19 @@ safety data, and travel advisories.
 
 from crewai.tools import tool
 
-from app.services.country.rest_countries_client import RestCountriesClient
+from app.services.country import RestCountriesClient, get_country_catalog
+
+# Used only for countries missing from the catalog snapshot
+_countries_client = RestCountriesClient()
 
 
 @tool("Get Country Information")
 def get_country_info(country_name: str) -> dict:
     """
-    Get comprehensive country information from REST Countries API.
+    Get comprehensive country information from REST Countries data.
+
+    Served from the in-memory country catalog; the API is only called for a
+    country the catalog does not know.
 
     Args:
         country_name: Name of the country (e.g., "France", "Japan")
@@ -23,8 +29,9 @@ def get_country_info(country_name: str) -> dict:
         languages, time zones, currencies, and more.
     """
     try:
-        client = RestCountriesClient()
-        country = client.get_country_by_name_sync(country_name)
+        country = get_country_catalog().get(country_name)
+        if country is None:
+            country = _countries_client.get_country_by_name_sync(country_name)
 
         return {
             "success": True,
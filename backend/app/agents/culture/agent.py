@@ -7,6 +7,8 @@ from datetime import datetime
 
 from crewai import Agent, Crew
 
+from app.core.telemetry import trace_tools
+
 from ..base import BaseAgent
 from ..config import AgentConfig, get_llm
 from ..interfaces import SourceReference
@@ -92,7 +94,7 @@ class CultureAgent(BaseAgent):
         super().__init__(config)
 
         # Initialize LLM with fallback support (Anthropic -> Gemini -> OpenAI)
-        self.llm = get_llm(temperature=0.1)
+        self.llm = get_llm(temperature=0.1, config=self.config)
 
         # Create CrewAI agent
         self.agent = self._create_agent()
@@ -111,15 +113,17 @@ class CultureAgent(BaseAgent):
             goal=CULTURE_AGENT_GOAL,
             backstory=CULTURE_AGENT_BACKSTORY,
             llm=self.llm,
-            tools=[
-                search_cultural_info,  # Web search for real-time cultural info
-                get_greeting_customs,
-                get_dress_code_guidelines,
-                get_religious_considerations,
-                get_cultural_taboos,
-                get_etiquette_guidelines,
-                get_essential_phrases,
-            ],
+            tools=trace_tools(
+                [
+                    search_cultural_info,  # Web search for real-time cultural info
+                    get_greeting_customs,
+                    get_dress_code_guidelines,
+                    get_religious_considerations,
+                    get_cultural_taboos,
+                    get_etiquette_guidelines,
+                    get_essential_phrases,
+                ]
+            ),
             verbose=True,
             allow_delegation=False,
         )
@@ -11,6 +11,7 @@ from ..base import BaseAgent
 from ..config import AgentConfig, get_llm
 from ..interfaces import SourceReference
 from app.core.config import settings
+from app.core.telemetry import trace_tools
 from .models import (
     CostEstimate,
     CurrencyAgentInput,
@@ -26,6 +27,7 @@ from .tasks import (
     create_comprehensive_currency_task,
 )
 from .tools import (
+    convert_currency_amounts,
     get_atm_payment_info,
     get_cost_estimates,
     get_currency_info,
@@ -85,7 +87,7 @@ class CurrencyAgent(BaseAgent):
         super().__init__()
 
         # Initialize LLM with fallback support (Anthropic -> Gemini -> OpenAI)
-        self.llm = get_llm(temperature=0.1)
+        self.llm = get_llm(temperature=0.1, config=self.config)
 
         # Initialize CrewAI Agent
         self.agent = self._create_agent()
@@ -102,13 +104,16 @@ class CurrencyAgent(BaseAgent):
             goal=CURRENCY_AGENT_GOAL,
             backstory=CURRENCY_AGENT_BACKSTORY,
             llm=self.llm,
-            tools=[
-                get_exchange_rates,
-                get_currency_info,
-                get_atm_payment_info,
-                get_tipping_customs,
-                get_cost_estimates,
-            ],
+            tools=trace_tools(
+                [
+                    get_exchange_rates,
+                    convert_currency_amounts,
+                    get_currency_info,
+                    get_atm_payment_info,
+                    get_tipping_customs,
+                    get_cost_estimates,
+                ]
+            ),
             verbose=True,
             allow_delegation=False,
         )
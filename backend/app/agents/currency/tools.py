@@ -5,16 +5,15 @@ Tools for currency research, exchange rates, and financial intelligence.
 """
 
 import logging
+from datetime import date
 
 from crewai.tools import tool
 
-from app.services.currency import CurrencyExchangeClient
+from app.services.country import get_country_catalog
+from app.services.currency import get_exchange_rate_matrix
 
 logger = logging.getLogger(__name__)
 
-# Initialize API client
-currency_client = CurrencyExchangeClient()
-
 
 @tool("Get exchange rates")
 def get_exchange_rates(base_currency: str, target_currency: str) -> str:
@@ -29,7 +28,7 @@ def get_exchange_rates(base_currency: str, target_currency: str) -> str:
         JSON string with exchange rate information
     """
     try:
-        rate_data = currency_client.get_exchange_rate(
+        rate_data = get_exchange_rate_matrix().exchange_rate(
             base_currency=base_currency, target_currency=target_currency
         )
 
@@ -51,6 +50,46 @@ def get_exchange_rates(base_currency: str, target_currency: str) -> str:
         return f"Error: {str(e)}"
 
 
+@tool("Convert amounts between currencies")
+def convert_currency_amounts(
+    amounts: list[float], from_currency: str, to_currency: str, on_date: str = ""
+) -> str:
+    """
+    Convert a list of amounts from one currency to another in one call.
+
+    Use this for budgets, price lists and cost breakdowns instead of
+    converting amounts one by one.
+
+    Args:
+        amounts: Amounts in from_currency (e.g., [1200, 3500, 80])
+        from_currency: Source currency code (e.g., "JPY")
+        to_currency: Target currency code (e.g., "USD")
+        on_date: Optional YYYY-MM-DD date for historical rates (default: latest)
+
+    Returns:
+        JSON string with the converted amounts, their total and the rate used
+    """
+    try:
+        rate_date = date.fromisoformat(on_date) if on_date else None
+        snapshot = get_exchange_rate_matrix().snapshot(rate_date)
+        converted = snapshot.convert(amounts, from_currency, to_currency).round(2)
+
+        result = {
+            "from_currency": from_currency.upper(),
+            "to_currency": to_currency.upper(),
+            "exchange_rate": snapshot.rate(from_currency, to_currency),
+            "date": snapshot.date.isoformat(),
+            "amounts": converted.tolist(),
+            "total": round(float(converted.sum()), 2),
+        }
+        logger.info(f"Converted {len(amounts)} amounts {from_currency} -> {to_currency}")
+        return str(result)
+
+    except Exception as e:
+        logger.error(f"Error converting amounts: {e}")
+        return f"Error: {str(e)}"
+
+
 @tool("Get currency information")
 def get_currency_info(country_code: str) -> str:
     """
@@ -62,11 +101,18 @@ def get_currency_info(country_code: str) -> str:
     Returns:
         JSON string with currency details
 
-    Note: This tool provides currency mapping for common countries.
+    Note: Currencies come from the country catalog (REST Countries snapshot),
+    with a static mapping for common countries when the catalog is unavailable.
     For real-time exchange rates, use get_exchange_rates tool.
     """
-    # Currency mapping for common countries
-    # This is a static mapping; for production, consider integrating REST Countries API
+    currencies = get_country_catalog().currencies(country_code)
+    if currencies:
+        code, details = next(iter(currencies.items()))
+        currency = {"code": code, "name": details.get("name"), "symbol": details.get("symbol")}
+        logger.info(f"Currency for {country_code}: {code}")
+        return str(currency)
+
+    # Fallback mapping for common countries
     currency_map = {
         # Major currencies
         "US": {"code": "USD", "name": "United States Dollar", "symbol": "$"},
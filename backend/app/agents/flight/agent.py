@@ -7,6 +7,8 @@ from datetime import datetime
 
 from crewai import Agent, Crew
 
+from app.core.telemetry import trace_tools
+
 from ..base import BaseAgent
 from ..config import AgentConfig, get_llm
 from ..interfaces import AgentResult, SourceReference
@@ -90,7 +92,7 @@ class FlightAgent(BaseAgent):
         super().__init__(config)
 
         # Initialize LLM with fallback support (Anthropic -> Gemini -> OpenAI)
-        self.llm = get_llm(temperature=0.15)
+        self.llm = get_llm(temperature=0.15, config=self.config)
 
         # Create CrewAI agent
         self.agent = self._create_agent()
@@ -108,14 +110,16 @@ class FlightAgent(BaseAgent):
             role=FLIGHT_AGENT_ROLE,
             goal=FLIGHT_AGENT_GOAL,
             backstory=FLIGHT_AGENT_BACKSTORY,
-            tools=[
-                search_flight_routes,
-                get_airport_info,
-                calculate_layover_requirements,
-                estimate_flight_pricing,
-                get_booking_timing_advice,
-                analyze_baggage_policies,
-            ],
+            tools=trace_tools(
+                [
+                    search_flight_routes,
+                    get_airport_info,
+                    calculate_layover_requirements,
+                    estimate_flight_pricing,
+                    get_booking_timing_advice,
+                    analyze_baggage_policies,
+                ]
+            ),
             llm=self.llm,
             verbose=True,
             allow_delegation=False,
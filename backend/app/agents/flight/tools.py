@@ -2,7 +2,8 @@
 Flight Agent - Tools
 
 Tools for flight search, airport information, and booking guidance.
-Integrates with Skyscanner API via RapidAPI when credentials are available,
+Integrates with Skyscanner API via RapidAPI when credentials are available
+(searched through the flexible-date price calendar and its fare cache),
 falls back to AI knowledge base otherwise.
 """
 
@@ -14,11 +15,15 @@ from datetime import datetime
 from crewai.tools import tool
 
 from app.core.config import settings
+from app.services.airports import airport_code, get_airport_database
+from app.services.gazetteer import get_gazetteer
+from app.services.places.geohash import haversine_km
 
 logger = logging.getLogger(__name__)
 
 # Lazy import to avoid circular dependencies
 _flight_client = None
+_flight_search = None
 
 
 def _get_flight_client():
@@ -40,6 +45,18 @@ def _has_api_credentials() -> bool:
     return bool(settings.RAPIDAPI_KEY)
 
 
+def _get_flight_search():
+    """Get the flexible-date search over the flight client (None without credentials)."""
+    global _flight_search
+    if _flight_search is None and _has_api_credentials():
+        client = _get_flight_client()
+        if client:
+            from app.services.flight.price_calendar import FlexibleFlightSearch
+
+            _flight_search = FlexibleFlightSearch(client)
+    return _flight_search
+
+
 @tool("Search Flight Routes")
 def search_flight_routes(
     origin_city: str,
@@ -72,101 +89,65 @@ def search_flight_routes(
         f"({departure_date} to {return_date})"
     )
 
-    client = _get_flight_client()
+    search = _get_flight_search()
+    origin_code = airport_code(origin_city)
+    destination_code = airport_code(destination_city)
 
-    # Try real API search if client is available
-    if client and _has_api_credentials():
+    # Try real API search if available and both ends resolve to airports
+    if search and origin_code and destination_code:
         try:
-            # Parse dates
             dep_date = datetime.strptime(departure_date, "%Y-%m-%d").date()
             ret_date = datetime.strptime(return_date, "%Y-%m-%d").date() if return_date else None
 
-            # Map cabin class to API format
-            cabin_map = {
-                "economy": "ECONOMY",
-                "premium_economy": "PREMIUM_ECONOMY",
-                "business": "BUSINESS",
-                "first": "FIRST",
-            }
-            travel_class = cabin_map.get(cabin_class.lower(), "ECONOMY")
-
-            # Search flights
-            result = client.search_flights(
-                origin=origin_city.upper()[:3],  # Use first 3 chars as IATA code
-                destination=destination_city.upper()[:3],
-                departure_date=dep_date,
-                return_date=ret_date,
-                travel_class=travel_class,
-                max_offers=10,
+            calendar = search.search(
+                origin_code,
+                destination_code,
+                dep_date,
+                ret_date,
+                cabin_class=cabin_class,
             )
+            day = calendar.requested
+            if day is None or not day.available:
+                msg = f"No search results for {departure_date}"
+                raise ValueError(msg)
 
-            # Format response
-            offers_data = []
-            for offer in result.offers[:5]:  # Limit to top 5
-                segments_info = []
-                for seg in offer.outbound_segments:
-                    segments_info.append(
-                        {
-                            "from": seg.departure_airport,
-                            "to": seg.arrival_airport,
-                            "departure": seg.departure_time,
-                            "arrival": seg.arrival_time,
-                            "airline": seg.carrier_name or seg.carrier_code,
-                            "flight": f"{seg.carrier_code}{seg.flight_number}",
-                            "duration": seg.duration,
-                            "stops": seg.stops,
-                        }
-                    )
-
-                return_info = []
-                for seg in offer.return_segments:
-                    return_info.append(
-                        {
-                            "from": seg.departure_airport,
-                            "to": seg.arrival_airport,
-                            "departure": seg.departure_time,
-                            "arrival": seg.arrival_time,
-                            "airline": seg.carrier_name or seg.carrier_code,
-                            "flight": f"{seg.carrier_code}{seg.flight_number}",
-                            "duration": seg.duration,
-                        }
-                    )
-
-                offers_data.append(
+            offers = calendar.requested_offers(5)  # Limit to top 5
+            response = {
+                "source": f"{search.provider}_api",
+                "origin": origin_code,
+                "destination": destination_code,
+                "departure_date": departure_date,
+                "return_date": return_date,
+                "total_offers": len(day.fares),
+                "offers": [
                     {
-                        "price": offer.total_price,
+                        "price": offer.price,
                         "currency": offer.currency,
-                        "cabin_class": offer.cabin_class,
-                        "airline": offer.validating_airline,
-                        "baggage": offer.included_baggage,
-                        "is_direct": len(offer.outbound_segments) == 1,
-                        "outbound": segments_info,
-                        "return": return_info if return_info else None,
-                        "seats_available": offer.number_of_bookable_seats,
+                        "airline": offer.airline,
+                        "baggage": offer.baggage,
+                        "is_direct": offer.stops == 0,
+                        "stops": offer.stops,
+                        "outbound": offer.outbound,
+                        "return": offer.inbound or None,
+                        "seats_available": offer.seats_available,
                         "last_ticketing_date": offer.last_ticketing_date,
+                        "deep_link": offer.deep_link,
                     }
-                )
-
-            response = {
-                "source": "skyscanner_api",
-                "origin": result.origin,
-                "destination": result.destination,
-                "departure_date": result.departure_date,
-                "return_date": result.return_date,
-                "total_offers": result.total_offers,
-                "offers": offers_data,
-                "carriers": result.dictionaries.get("carriers", {}),
+                    for offer in offers
+                ],
             }
 
             return json.dumps(response, indent=2)
 
         except Exception as e:
-            logger.warning(f"Skyscanner API search failed: {e}. Falling back to AI.")
+            logger.warning(f"Flight API search failed: {e}. Falling back to AI.")
 
     # Fallback to AI knowledge base
     search_context = {
         "origin": origin_city,
+        "origin_airport": origin_code,
         "destination": destination_city,
+        "destination_airport": destination_code,
         "departure_date": departure_date,
         "return_date": return_date,
         "cabin_class": cabin_class,
@@ -194,42 +175,71 @@ Context: {json.dumps(search_context)}"""
 @tool("Get Airport Information")
 def get_airport_info(city: str, country: str | None = None) -> str:
     """
-    Get comprehensive airport information for a city.
-
-    Uses AI knowledge base for airport information.
+    Get the airports serving a city from the offline airport database.
 
     Args:
-        city: City name or IATA code (e.g., "Paris", "JFK")
+        city: City name, IATA airport or metro code, or ICAO code
+            (e.g., "Paris", "JFK", "NYC")
         country: Country name for disambiguation (optional, e.g., "France", "USA")
 
     Returns:
-        JSON string with airport information including IATA codes and facilities
+        JSON string with airports (IATA/ICAO codes, names, coordinates, time zone,
+        metro area code and distance to the city center), main airport first
 
     Example:
         >>> get_airport_info("Paris", "France")
     """
     logger.info(f"Getting airport info for: {city}, {country}")
 
-    # Use AI knowledge base for airport information
-    location = f"{city}, {country}" if country else city
-
-    return f"""Provide comprehensive airport information for {location}.
-
-Include:
-1. Main airport(s) with IATA codes and full names
-2. Terminal information
-3. Distance to city center (km/miles)
-4. Transportation options:
-   - Public transit (metro, bus, train)
-   - Taxis and rideshare services
-   - Airport shuttles
-   - Rental cars
-5. Costs and average travel times for each option
-6. Airport facilities (lounges, wifi, restaurants, duty-free)
-7. Special tips for international travelers
-8. Rush hour considerations
+    database = get_airport_database()
+    airports = database.resolve(city, country)
+    if not airports:
+        return json.dumps(
+            {
+                "source": "airport_database",
+                "query": city,
+                "country": country,
+                "error": f"No airports found for {city}",
+            }
+        )
+
+    # Distances from the named city, or the city of a queried airport/metro code
+    main = airports[0]
+    metro = database.metro_of(main)
+    gazetteer = get_gazetteer()
+    center = gazetteer.city(city.partition(",")[0], main.country, fuzzy=False) or gazetteer.city(
+        metro.city if metro else main.city, main.country
+    )
+    distances = (
+        haversine_km(
+            center.lat,
+            center.lng,
+            [a.lat for a in airports],
+            [a.lng for a in airports],
+        )
+        if center
+        else None
+    )
 
-Format as structured JSON."""
+    results = []
+    for i, airport in enumerate(airports):
+        info = airport.to_dict()
+        metro = database.metro_of(airport)
+        info["metro_code"] = metro.code if metro else None
+        if distances is not None:
+            info["distance_to_city_km"] = round(float(distances[i]), 1)
+        results.append(info)
+
+    return json.dumps(
+        {
+            "source": "airport_database",
+            "query": city,
+            "country": country,
+            "main_airport": airports[0].iata,
+            "airports": results,
+        },
+        indent=2,
+    )
 
 
 @tool("Calculate Layover Requirements")
@@ -318,37 +328,30 @@ def estimate_flight_pricing(
     """
     logger.info(f"Estimating prices: {origin} -> {destination} on {departure_date}")
 
-    client = _get_flight_client()
+    search = _get_flight_search()
+    origin_code = airport_code(origin)
+    destination_code = airport_code(destination)
 
-    # Try real API search for actual prices
-    if client and _has_api_credentials():
+    # Try real API search for actual prices on the date and the days around it
+    if search and origin_code and destination_code:
         try:
             dep_date = datetime.strptime(departure_date, "%Y-%m-%d").date()
 
-            cabin_map = {
-                "economy": "ECONOMY",
-                "premium_economy": "PREMIUM_ECONOMY",
-                "business": "BUSINESS",
-                "first": "FIRST",
-            }
-            travel_class = cabin_map.get(cabin_class.lower(), "ECONOMY")
-
-            result = client.search_flights(
-                origin=origin.upper()[:3],
-                destination=destination.upper()[:3],
-                departure_date=dep_date,
-                travel_class=travel_class,
+            calendar = search.search(
+                origin_code,
+                destination_code,
+                dep_date,
+                flex_days=settings.FLIGHT_FLEX_DAYS,
+                cabin_class=cabin_class,
                 non_stop=is_direct,
-                max_offers=20,
             )
+            prices = [o.price for o in calendar.requested_offers()]
 
-            if result.offers:
-                prices = [o.total_price for o in result.offers]
-                currencies = [o.currency for o in result.offers]
-
+            if prices:
+                summary = calendar.to_dict(offers=3)
                 response = {
-                    "source": "skyscanner_api",
-                    "route": f"{origin} → {destination}",
+                    "source": f"{search.provider}_api",
+                    "route": f"{origin_code} → {destination_code}",
                     "departure_date": departure_date,
                     "cabin_class": cabin_class,
                     "direct_flights_only": is_direct,
@@ -356,15 +359,21 @@ def estimate_flight_pricing(
                         "low": min(prices),
                         "average": sum(prices) / len(prices),
                         "high": max(prices),
-                        "currency": currencies[0] if currencies else "USD",
+                        "currency": calendar.currency or "USD",
                         "sample_size": len(prices),
                     },
-                    "note": "Prices are real-time from Skyscanner API",
+                    "flexible_dates": {
+                        "cheapest_date": summary["cheapest_date"],
+                        "cheapest_price": summary["cheapest_price"],
+                        "savings": summary["savings"],
+                        "calendar": summary["calendar"],
+                    },
+                    "note": "Prices are real-time from the flight search API",
                 }
                 return json.dumps(response, indent=2)
 
         except Exception as e:
-            logger.warning(f"Skyscanner pricing search failed: {e}. Falling back to AI.")
+            logger.warning(f"Flight pricing search failed: {e}. Falling back to AI.")
 
     # Parse date to determine season
     try:
@@ -437,13 +446,42 @@ def get_booking_timing_advice(
         days_until = None
         weeks_until = None
 
+    # Real fares on and around the date, when the flight API is available
+    price_curve = None
+    search = _get_flight_search()
+    origin_code = airport_code(origin)
+    destination_code = airport_code(destination)
+    if search and origin_code and destination_code and days_until is not None:
+        try:
+            calendar = search.search(
+                origin_code,
+                destination_code,
+                dep_date.date(),
+                flex_days=settings.FLIGHT_FLEX_DAYS,
+            )
+            if calendar.cheapest_day:
+                price_curve = calendar.to_dict(offers=3)
+                if current_price is None:
+                    current_price = price_curve["requested_price"]
+        except Exception as e:
+            logger.warning(f"Flight price calendar search failed: {e}")
+
+    observed = (
+        f"""
+**Observed Fares (±{settings.FLIGHT_FLEX_DAYS} days, real-time):**
+{json.dumps(price_curve, indent=2)}
+"""
+        if price_curve
+        else ""
+    )
+
     return f"""Provide booking timing strategy for:
 
 **Route:** {origin} → {destination}
 **Departure Date:** {departure_date}
 **Days Until Departure:** {days_until}
 **Current Price:** ${current_price if current_price else 'Unknown'}
-
+{observed}
 **Advise on:**
 1. Optimal booking window for this route
    - Typical best time (weeks before departure)
@@ -7,6 +7,8 @@ from datetime import datetime
 
 from crewai import Agent, Crew
 
+from app.core.telemetry import trace_tools
+
 from ..base import BaseAgent
 from ..config import AgentConfig, get_llm
 from ..interfaces import SourceReference
@@ -93,7 +95,7 @@ class FoodAgent(BaseAgent):
         super().__init__(config)
 
         # Initialize LLM with fallback support (Anthropic -> Gemini -> OpenAI)
-        self.llm = get_llm(temperature=0.1)
+        self.llm = get_llm(temperature=0.1, config=self.config)
 
         # Create CrewAI agent
         self.agent = self._create_agent()
@@ -112,15 +114,17 @@ class FoodAgent(BaseAgent):
             goal=FOOD_AGENT_GOAL,
             backstory=FOOD_AGENT_BACKSTORY,
             llm=self.llm,
-            tools=[
-                search_food_info,  # Web search for real-time food info
-                get_must_try_dishes,
-                get_dietary_availability,
-                get_food_safety_info,
-                get_restaurant_price_ranges,
-                get_dining_etiquette,
-                get_street_food_info,
-            ],
+            tools=trace_tools(
+                [
+                    search_food_info,  # Web search for real-time food info
+                    get_must_try_dishes,
+                    get_dietary_availability,
+                    get_food_safety_info,
+                    get_restaurant_price_ranges,
+                    get_dining_etiquette,
+                    get_street_food_info,
+                ]
+            ),
             verbose=True,
             allow_delegation=False,
         )
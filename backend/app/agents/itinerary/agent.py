@@ -7,6 +7,8 @@ from datetime import datetime
 
 from crewai import Agent, Crew
 
+from app.core.telemetry import trace_tools
+
 from ..base import BaseAgent
 from ..config import AgentConfig, get_llm
 from ..interfaces import SourceReference
@@ -81,7 +83,7 @@ class ItineraryAgent(BaseAgent):
         super().__init__(config)
 
         # Initialize LLM with fallback support (Anthropic -> Gemini -> OpenAI)
-        self.llm = get_llm(temperature=0.2)
+        self.llm = get_llm(temperature=0.2, config=self.config)
 
         # Create CrewAI agent
         self.agent = self._create_agent()
@@ -100,14 +102,16 @@ class ItineraryAgent(BaseAgent):
             goal=ITINERARY_AGENT_GOAL,
             backstory=ITINERARY_AGENT_BACKSTORY,
             llm=self.llm,
-            tools=[
-                calculate_trip_duration,
-                estimate_activity_duration,
-                estimate_transportation_time,
-                optimize_daily_schedule,
-                estimate_daily_budget,
-                generate_meal_suggestions,
-            ],
+            tools=trace_tools(
+                [
+                    calculate_trip_duration,
+                    estimate_activity_duration,
+                    estimate_transportation_time,
+                    optimize_daily_schedule,
+                    estimate_daily_budget,
+                    generate_meal_suggestions,
+                ]
+            ),
             verbose=True,
             allow_delegation=False,
         )
@@ -11,6 +11,8 @@ from datetime import time as datetime_time
 
 from crewai.tools import tool
 
+from app.services.route_optimizer import InvalidActivityError, optimize_route, parse_minutes
+
 
 @tool("Calculate Trip Duration")
 def calculate_trip_duration(departure_date_str: str, return_date_str: str) -> dict:
@@ -163,12 +165,21 @@ def estimate_transportation_time(distance_km: float, mode: str) -> dict:
 
 
 @tool("Optimize Daily Schedule")
-def optimize_daily_schedule(activities: list[dict]) -> dict:
+def optimize_daily_schedule(
+    activities: list[dict], day_start: str = "09:00", transport_mode: str = "taxi"
+) -> dict:
     """
     Optimize daily activity schedule to minimize travel and maximize enjoyment.
 
+    Activities with coordinates (location.lat/lng) are ordered by a route
+    optimizer that minimizes travel distance and respects opening hours
+    (opens_at/closes_at, HH:MM); start and end times are computed for you.
+    Activities without coordinates are grouped by time of day by category.
+
     Args:
-        activities: List of activities with locations and priorities
+        activities: List of activities with locations, durations and priorities
+        day_start: Time the day starts (HH:MM)
+        transport_mode: Mode between activities (walk, metro, bus, taxi, car)
 
     Returns:
         Optimized schedule with suggestions
@@ -179,16 +190,40 @@ def optimize_daily_schedule(activities: list[dict]) -> dict:
             "suggestions": ["No activities to optimize"],
         }
 
-    # Simple heuristic: Group by location proximity
-    # In production, this would use actual geocoding and routing
+    try:
+        route = optimize_route(activities, day_start=day_start, mode=transport_mode)
+    except InvalidActivityError as e:
+        return {
+            "optimized": activities,
+            "suggestions": [f"Could not optimize schedule: {e}"],
+        }
+    routed = route["activities"][: len(activities) - len(route["unrouted"])]
+    unrouted = route["activities"][len(routed) :]
+
     morning_activities = []
     afternoon_activities = []
     evening_activities = []
 
     suggestions = []
 
-    for activity in activities:
-        priority = activity.get("priority", "recommended")
+    for activity in routed:
+        start = parse_minutes(activity.get("start_time") or activity.get("startTime")) or 0
+        if start < 12 * 60:
+            morning_activities.append(activity)
+        elif start < 17 * 60:
+            afternoon_activities.append(activity)
+        else:
+            evening_activities.append(activity)
+
+    if routed:
+        suggestions.append(
+            f"Route ordered to minimize travel: {route['total_distance_km']:.1f} km "
+            f"(was {route['original_distance_km']:.1f} km)"
+        )
+    for name in route["late_activities"]:
+        suggestions.append(f"{name} cannot fit within its opening hours; consider another day")
+
+    for activity in unrouted:
         category = activity.get("category", "")
 
         # Time-of-day recommendations
@@ -205,9 +240,11 @@ def optimize_daily_schedule(activities: list[dict]) -> dict:
             afternoon_activities.append(activity)
 
     return {
+        "optimized": route["activities"],
         "morning": morning_activities,
         "afternoon": afternoon_activities,
         "evening": evening_activities,
+        "total_distance_km": route["total_distance_km"],
         "suggestions": suggestions or ["Activities distributed throughout the day"],
         "total_activities": len(activities),
     }
@@ -0,0 +1,267 @@
+"""
+LLM Failover Router
+
+Call-level failover across LLM providers. get_llm() used to fall back only
+when a provider client could not be constructed; once an agent was running,
+a slow or overloaded provider (429/529, timeouts) failed the agent outright.
+
+FailoverChatModel wraps one chat model per provider and, on every call:
+- Orders providers by health (rolling error rate per provider)
+- Fails over to the next provider on any error or timeout
+- Optionally hedges: if the first provider has not answered after its p95
+  latency, a second request goes to the next provider and the first answer wins
+
+Provider stats are process-wide, so every agent in a worker benefits from what
+the others have already observed.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import ConfigDict
+
+logger = logging.getLogger(__name__)
+
+# Router configuration
+LLM_RUNTIME_FAILOVER_ENABLED = os.getenv("LLM_RUNTIME_FAILOVER", "true").lower() == "true"
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+LLM_HEDGE_MIN_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", "5"))
+
+# Rolling window of calls kept per provider
+STATS_WINDOW = 50
+# Minimum samples before a provider's stats are trusted
+MIN_SAMPLES = 5
+# Providers at or above this error rate are tried last
+UNHEALTHY_ERROR_RATE = 0.5
+# Errors older than this no longer mark a provider unhealthy
+UNHEALTHY_COOLDOWN_SECONDS = 60.0
+
+
+class ProviderStats:
+    """Rolling latency and error statistics for one provider."""
+
+    def __init__(self, window: int = STATS_WINDOW):
+        self._calls: deque[tuple[float, float, bool]] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency_seconds: float, ok: bool) -> None:
+        with self._lock:
+            self._calls.append((time.monotonic(), latency_seconds, ok))
+
+    def error_rate(self) -> float:
+        with self._lock:
+            calls = list(self._calls)
+        if not calls:
+            return 0.0
+        return sum(1 for _, _, ok in calls if not ok) / len(calls)
+
+    def latency_percentile(self, pct: float) -> float | None:
+        """Latency percentile of successful calls in seconds, None if too few samples."""
+        with self._lock:
+            latencies = sorted(latency for _, latency, ok in self._calls if ok)
+        if len(latencies) < MIN_SAMPLES:
+            return None
+        index = min(len(latencies) - 1, int(round(pct / 100 * (len(latencies) - 1))))
+        return latencies[index]
+
+    def is_healthy(self) -> bool:
+        with self._lock:
+            calls = list(self._calls)
+        if len(calls) < MIN_SAMPLES:
+            return True
+        last_error_at = max((ts for ts, _, ok in calls if not ok), default=None)
+        if last_error_at is None or time.monotonic() - last_error_at > UNHEALTHY_COOLDOWN_SECONDS:
+            return True
+        return self.error_rate() < UNHEALTHY_ERROR_RATE
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            count = len(self._calls)
+        p50 = self.latency_percentile(50)
+        p95 = self.latency_percentile(95)
+        return {
+            "calls": count,
+            "error_rate": round(self.error_rate(), 3),
+            "p50_seconds": round(p50, 3) if p50 is not None else None,
+            "p95_seconds": round(p95, 3) if p95 is not None else None,
+            "healthy": self.is_healthy(),
+        }
+
+
+_provider_stats: dict[str, ProviderStats] = {}
+_provider_stats_lock = threading.Lock()
+
+
+def get_provider_stats(provider: str) -> ProviderStats:
+    """Get or create the shared stats for a provider."""
+    with _provider_stats_lock:
+        if provider not in _provider_stats:
+            _provider_stats[provider] = ProviderStats()
+        return _provider_stats[provider]
+
+
+def get_provider_health() -> dict[str, dict[str, Any]]:
+    """Snapshot of rolling stats for every provider seen by this process."""
+    with _provider_stats_lock:
+        providers = list(_provider_stats.items())
+    return {name: stats.snapshot() for name, stats in providers}
+
+
+def reset_provider_stats() -> None:
+    """Forget all provider stats (used by tests)."""
+    with _provider_stats_lock:
+        _provider_stats.clear()
+
+
+# Hedged requests run here; threads of abandoned attempts finish in the background
+_hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="llm-hedge")
+
+
+class _HedgeFailedError(Exception):
+    """All attempts of a hedged call failed."""
+
+    def __init__(self, errors: list[tuple[str, Exception]]):
+        super().__init__("; ".join(f"{name}: {err}" for name, err in errors))
+        self.errors = errors
+
+
+class FailoverChatModel(BaseChatModel):
+    """
+    Chat model that routes each call across providers with failover and hedging.
+
+    Attributes:
+        models: (provider, chat model) pairs in configured preference order
+        hedge: Send a second request when the first is slower than its p95
+        hedge_min_delay: Lower bound for the hedge delay in seconds
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    models: list[tuple[str, Any]]
+    hedge: bool = LLM_HEDGE_ENABLED
+    hedge_min_delay: float = LLM_HEDGE_MIN_DELAY_SECONDS
+
+    @property
+    def _llm_type(self) -> str:
+        return "failover-router"
+
+    @property
+    def provider_order(self) -> list[str]:
+        """Providers in the order the next call will try them."""
+        return [name for name, _ in self._ordered_models()]
+
+    def _ordered_models(self) -> list[tuple[str, Any]]:
+        # Stable sort keeps the configured order within healthy/unhealthy groups
+        return sorted(self.models, key=lambda item: not get_provider_stats(item[0]).is_healthy())
+
+    def _hedge_delay(self, provider: str) -> float | None:
+        p95 = get_provider_stats(provider).latency_percentile(95)
+        if p95 is None:
+            return None
+        return max(self.hedge_min_delay, p95)
+
+    @staticmethod
+    def _call(provider: str, model: Any, messages: list[BaseMessage], **kwargs) -> BaseMessage:
+        stats = get_provider_stats(provider)
+        started = time.monotonic()
+        try:
+            message = model.invoke(messages, **kwargs)
+        except Exception:
+            stats.record(time.monotonic() - started, ok=False)
+            raise
+        stats.record(time.monotonic() - started, ok=True)
+        return message
+
+    def _invoke_with_hedge(
+        self,
+        ordered: list[tuple[str, Any]],
+        messages: list[BaseMessage],
+        **kwargs,
+    ) -> tuple[str, BaseMessage]:
+        """Run the first provider, hedging to the second after its p95 latency."""
+        (primary, primary_model), (secondary, secondary_model) = ordered[0], ordered[1]
+        delay = self._hedge_delay(primary)
+
+        futures: dict[Future, str] = {
+            _hedge_executor.submit(self._call, primary, primary_model, messages, **kwargs): primary
+        }
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            logger.info(
+                "LLM provider '%s' slower than %.1fs, hedging to '%s'", primary, delay, secondary
+            )
+            futures[
+                _hedge_executor.submit(self._call, secondary, secondary_model, messages, **kwargs)
+            ] = secondary
+
+        errors = []
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return futures[future], future.result()
+                except Exception as e:
+                    errors.append((futures[future], e))
+
+        raise _HedgeFailedError(errors)
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if stop is not None:
+            kwargs["stop"] = stop
+
+        ordered = self._ordered_models()
+        errors: list[tuple[str, str]] = []
+
+        if self.hedge and len(ordered) > 1 and self._hedge_delay(ordered[0][0]) is not None:
+            try:
+                provider, message = self._invoke_with_hedge(ordered, messages, **kwargs)
+                return self._to_result(provider, message)
+            except _HedgeFailedError as e:
+                logger.warning("Hedged LLM call failed, failing over: %s", e)
+                errors.extend((name, str(err)) for name, err in e.errors)
+
+        attempted = {name for name, _ in errors}
+        for provider, model in ordered:
+            if provider in attempted:
+                continue
+            try:
+                message = self._call(provider, model, messages, **kwargs)
+            except Exception as e:
+                errors.append((provider, str(e)))
+                logger.warning("LLM provider '%s' call failed, failing over: %s", provider, e)
+                continue
+            return self._to_result(provider, message)
+
+        error_details = "; ".join([f"{name}: {err}" for name, err in errors])
+        msg = f"All LLM providers failed: {error_details}"
+        raise RuntimeError(msg)
+
+    @staticmethod
+    def _to_result(provider: str, message: BaseMessage) -> ChatResult:
+        if not isinstance(message, AIMessage):
+            message = AIMessage(content=message.content)
+        message.response_metadata = {**message.response_metadata, "provider": provider}
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "FailoverChatModel":
+        """Bind tools on every provider model so failover keeps tool calling."""
+        return self.model_copy(
+            update={
+                "models": [(name, model.bind_tools(tools, **kwargs)) for name, model in self.models]
+            }
+        )
@@ -0,0 +1,271 @@
+"""
+LLM Usage Tracking
+
+Records latency and token usage of every LLM call, tagged with the model tier,
+provider and model that served it, and produces a per-tier latency/cost report
+for tuning the agent -> tier routing in app/agents/config.py. Each call is also
+recorded as an LLM span of the current telemetry trace (app/core/telemetry.py).
+
+Usage:
+    tracker = get_usage_tracker()
+    mark = tracker.mark()
+    ...  # run agents
+    report = tracker.report(since=mark)
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from app.core.telemetry import LLM, record_span
+
+logger = logging.getLogger(__name__)
+
+# Approximate list prices in USD per million tokens: (input, output)
+MODEL_PRICES_PER_MTOK: dict[str, tuple[float, float]] = {
+    "claude-opus": (15.0, 75.0),
+    "claude-sonnet": (3.0, 15.0),
+    "claude-3-5-haiku": (0.8, 4.0),
+    "claude-3-haiku": (0.25, 1.25),
+    "gemini-2.0-flash": (0.1, 0.4),
+    "gemini-1.5-pro": (1.25, 5.0),
+    "gpt-4o-mini": (0.15, 0.6),
+    "gpt-4o": (2.5, 10.0),
+}
+
+# Keep the most recent calls only; enough for several full reports
+MAX_RECORDED_CALLS = 5000
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float | None:
+    """
+    Estimate the USD cost of a call.
+
+    Matches the longest known price prefix of the model ID. Returns None for
+    models without a known price.
+    """
+    matches = [prefix for prefix in MODEL_PRICES_PER_MTOK if model.startswith(prefix)]
+    if not matches:
+        return None
+    input_price, output_price = MODEL_PRICES_PER_MTOK[max(matches, key=len)]
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+@dataclass
+class LLMCallRecord:
+    """A single completed LLM call."""
+
+    seq: int
+    tier: str
+    provider: str
+    model: str
+    latency_ms: float
+    input_tokens: int
+    output_tokens: int
+    error: bool = False
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class LLMUsageTracker:
+    """Thread-safe in-memory store of LLM call records."""
+
+    def __init__(self, max_calls: int = MAX_RECORDED_CALLS):
+        self._records: deque[LLMCallRecord] = deque(maxlen=max_calls)
+        self._lock = threading.Lock()
+        self._seq = 0
+
+    def record(
+        self,
+        *,
+        tier: str,
+        provider: str,
+        model: str,
+        latency_ms: float,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        error: bool = False,
+    ) -> None:
+        """Record a completed LLM call."""
+        with self._lock:
+            self._seq += 1
+            self._records.append(
+                LLMCallRecord(
+                    seq=self._seq,
+                    tier=tier,
+                    provider=provider,
+                    model=model,
+                    latency_ms=latency_ms,
+                    input_tokens=input_tokens,
+                    output_tokens=output_tokens,
+                    error=error,
+                )
+            )
+
+    def mark(self) -> int:
+        """Return a marker; pass it to report(since=...) to report later calls only."""
+        with self._lock:
+            return self._seq
+
+    def reset(self) -> None:
+        """Drop all records."""
+        with self._lock:
+            self._records.clear()
+
+    def report(self, since: int = 0) -> dict[str, Any]:
+        """
+        Build a latency/cost report grouped by tier.
+
+        Args:
+            since: Marker from mark(); only calls recorded after it are included
+
+        Returns:
+            Dict with per-tier stats (calls, errors, latency avg/p50/p95 in ms,
+            tokens, estimated cost) and overall totals
+        """
+        with self._lock:
+            records = [r for r in self._records if r.seq > since]
+
+        tiers: dict[str, dict[str, Any]] = {}
+        for tier in sorted({r.tier for r in records}):
+            tier_records = [r for r in records if r.tier == tier]
+            latencies = sorted(r.latency_ms for r in tier_records)
+            costs = [estimate_cost(r.model, r.input_tokens, r.output_tokens) for r in tier_records]
+            tiers[tier] = {
+                "calls": len(tier_records),
+                "errors": sum(1 for r in tier_records if r.error),
+                "models": sorted({f"{r.provider}/{r.model}" for r in tier_records}),
+                "latency_ms": {
+                    "avg": round(sum(latencies) / len(latencies), 1),
+                    "p50": round(_percentile(latencies, 50), 1),
+                    "p95": round(_percentile(latencies, 95), 1),
+                },
+                "input_tokens": sum(r.input_tokens for r in tier_records),
+                "output_tokens": sum(r.output_tokens for r in tier_records),
+                "estimated_cost_usd": round(sum(c for c in costs if c is not None), 6),
+            }
+
+        return {
+            "tiers": tiers,
+            "total_calls": len(records),
+            "total_estimated_cost_usd": round(
+                sum(t["estimated_cost_usd"] for t in tiers.values()), 6
+            ),
+        }
+
+
+class UsageCallbackHandler(BaseCallbackHandler):
+    """LangChain callback that times calls and reads token usage from responses."""
+
+    def __init__(self, tracker: LLMUsageTracker, tier: str, provider: str, model: str):
+        self.tracker = tracker
+        self.tier = tier
+        self.provider = provider
+        self.model = model
+        self._started: dict[UUID, float] = {}
+
+    def _start(self, run_id: UUID) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def _elapsed_ms(self, run_id: UUID) -> float:
+        started = self._started.pop(run_id, None)
+        return (time.perf_counter() - started) * 1000 if started is not None else 0.0
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs) -> None:
+        self._start(run_id)
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs) -> None:
+        self._start(run_id)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs) -> None:
+        input_tokens, output_tokens = _extract_token_usage(response)
+        latency_ms = self._elapsed_ms(run_id)
+        self.tracker.record(
+            tier=self.tier,
+            provider=self.provider,
+            model=self.model,
+            latency_ms=latency_ms,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+        )
+        record_span(
+            self.model,
+            LLM,
+            duration_ms=latency_ms,
+            tier=self.tier,
+            provider=self.provider,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+        )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs) -> None:
+        latency_ms = self._elapsed_ms(run_id)
+        self.tracker.record(
+            tier=self.tier,
+            provider=self.provider,
+            model=self.model,
+            latency_ms=latency_ms,
+            error=True,
+        )
+        record_span(
+            self.model,
+            LLM,
+            duration_ms=latency_ms,
+            error=error,
+            tier=self.tier,
+            provider=self.provider,
+        )
+
+
+def _extract_token_usage(response: LLMResult) -> tuple[int, int]:
+    """Read (input_tokens, output_tokens) from an LLM result, 0 if not reported."""
+    input_tokens = output_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                input_tokens += usage.get("input_tokens", 0)
+                output_tokens += usage.get("output_tokens", 0)
+    if input_tokens or output_tokens:
+        return input_tokens, output_tokens
+
+    # Older integrations only report usage in llm_output
+    usage = (response.llm_output or {}).get("usage") or (response.llm_output or {}).get(
+        "token_usage"
+    )
+    if isinstance(usage, dict):
+        input_tokens = usage.get("input_tokens", usage.get("prompt_tokens", 0)) or 0
+        output_tokens = usage.get("output_tokens", usage.get("completion_tokens", 0)) or 0
+    return input_tokens, output_tokens
+
+
+# Global tracker instance
+_usage_tracker: LLMUsageTracker | None = None
+
+
+def get_usage_tracker() -> LLMUsageTracker:
+    """Get or create the global LLM usage tracker."""
+    global _usage_tracker
+    if _usage_tracker is None:
+        _usage_tracker = LLMUsageTracker()
+    return _usage_tracker
+
+
+def attach_usage_tracking(llm: Any, tier: str, provider: str, model: str) -> Any:
+    """Attach a usage callback to a LangChain chat model and return it."""
+    handler = UsageCallbackHandler(get_usage_tracker(), tier, provider, model)
+    try:
+        llm.callbacks = [*(llm.callbacks or []), handler]
+    except Exception as e:
+        logger.debug("Could not attach LLM usage tracking: %s", e)
+    return llm
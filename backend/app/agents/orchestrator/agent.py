@@ -13,156 +13,14 @@ error handling and result aggregation.
 """
 
 import asyncio
+import hashlib
 import json
 from datetime import date, datetime
 from typing import Any
 
 from pydantic import BaseModel, ValidationError
 
-# Common country name to ISO 3166-1 alpha-2 code mapping
-COUNTRY_NAME_TO_CODE: dict[str, str] = {
-    # Common countries - add more as needed
-    "afghanistan": "AF",
-    "albania": "AL",
-    "algeria": "DZ",
-    "argentina": "AR",
-    "armenia": "AM",
-    "australia": "AU",
-    "austria": "AT",
-    "azerbaijan": "AZ",
-    "bahrain": "BH",
-    "bangladesh": "BD",
-    "belarus": "BY",
-    "belgium": "BE",
-    "bolivia": "BO",
-    "bosnia and herzegovina": "BA",
-    "brazil": "BR",
-    "bulgaria": "BG",
-    "cambodia": "KH",
-    "cameroon": "CM",
-    "canada": "CA",
-    "chile": "CL",
-    "china": "CN",
-    "colombia": "CO",
-    "costa rica": "CR",
-    "croatia": "HR",
-    "cuba": "CU",
-    "cyprus": "CY",
-    "czech republic": "CZ",
-    "czechia": "CZ",
-    "denmark": "DK",
-    "dominican republic": "DO",
-    "ecuador": "EC",
-    "egypt": "EG",
-    "el salvador": "SV",
-    "estonia": "EE",
-    "ethiopia": "ET",
-    "fiji": "FJ",
-    "finland": "FI",
-    "france": "FR",
-    "georgia": "GE",
-    "germany": "DE",
-    "ghana": "GH",
-    "greece": "GR",
-    "guatemala": "GT",
-    "honduras": "HN",
-    "hong kong": "HK",
-    "hungary": "HU",
-    "iceland": "IS",
-    "india": "IN",
-    "indonesia": "ID",
-    "iran": "IR",
-    "iraq": "IQ",
-    "ireland": "IE",
-    "israel": "IL",
-    "italy": "IT",
-    "jamaica": "JM",
-    "japan": "JP",
-    "jordan": "JO",
-    "kazakhstan": "KZ",
-    "kenya": "KE",
-    "kuwait": "KW",
-    "kyrgyzstan": "KG",
-    "laos": "LA",
-    "latvia": "LV",
-    "lebanon": "LB",
-    "libya": "LY",
-    "lithuania": "LT",
-    "luxembourg": "LU",
-    "macau": "MO",
-    "malaysia": "MY",
-    "maldives": "MV",
-    "malta": "MT",
-    "mexico": "MX",
-    "moldova": "MD",
-    "mongolia": "MN",
-    "montenegro": "ME",
-    "morocco": "MA",
-    "myanmar": "MM",
-    "nepal": "NP",
-    "netherlands": "NL",
-    "new zealand": "NZ",
-    "nicaragua": "NI",
-    "nigeria": "NG",
-    "north korea": "KP",
-    "north macedonia": "MK",
-    "norway": "NO",
-    "oman": "OM",
-    "pakistan": "PK",
-    "panama": "PA",
-    "paraguay": "PY",
-    "peru": "PE",
-    "philippines": "PH",
-    "poland": "PL",
-    "portugal": "PT",
-    "qatar": "QA",
-    "romania": "RO",
-    "russia": "RU",
-    "russian federation": "RU",
-    "rwanda": "RW",
-    "saudi arabia": "SA",
-    "senegal": "SN",
-    "serbia": "RS",
-    "singapore": "SG",
-    "slovakia": "SK",
-    "slovenia": "SI",
-    "south africa": "ZA",
-    "south korea": "KR",
-    "korea": "KR",
-    "spain": "ES",
-    "sri lanka": "LK",
-    "sudan": "SD",
-    "sweden": "SE",
-    "switzerland": "CH",
-    "syria": "SY",
-    "taiwan": "TW",
-    "tajikistan": "TJ",
-    "tanzania": "TZ",
-    "thailand": "TH",
-    "tunisia": "TN",
-    "turkey": "TR",
-    "turkmenistan": "TM",
-    "uganda": "UG",
-    "ukraine": "UA",
-    "united arab emirates": "AE",
-    "uae": "AE",
-    "united kingdom": "GB",
-    "uk": "GB",
-    "england": "GB",
-    "scotland": "GB",
-    "wales": "GB",
-    "united states": "US",
-    "usa": "US",
-    "america": "US",
-    "united states of america": "US",
-    "uruguay": "UY",
-    "uzbekistan": "UZ",
-    "venezuela": "VE",
-    "vietnam": "VN",
-    "yemen": "YE",
-    "zambia": "ZM",
-    "zimbabwe": "ZW",
-}
+from app.services.gazetteer import country_code, get_gazetteer
 
 
 def get_country_code(country_name: str) -> str:
@@ -182,21 +40,21 @@ def get_country_code(country_name: str) -> str:
     if len(country_name) == 2 and country_name.isalpha():
         return country_name.upper()
 
-    # Look up in mapping
-    normalized = country_name.lower().strip()
-    if normalized in COUNTRY_NAME_TO_CODE:
-        return COUNTRY_NAME_TO_CODE[normalized]
-
-    # Try partial match
-    for name, code in COUNTRY_NAME_TO_CODE.items():
-        if name in normalized or normalized in name:
-            return code
+    # Look up in the offline gazetteer (names, aliases, ISO3 codes, close matches)
+    code = country_code(country_name)
+    if code:
+        return code
 
     # Last resort: return first 2 chars uppercase (may be wrong but won't crash)
     return country_name[:2].upper() if len(country_name) >= 2 else "XX"
 
 
+from app.agents.config import get_model_tier
+from app.agents.llm_router import get_provider_health
+from app.agents.llm_usage import get_usage_tracker
 from app.core.supabase import supabase
+from app.core.telemetry import AGENT, Trace
+from app.services.change_detector import ChangeDetector
 
 # Import specialist agents as they become available
 try:
@@ -281,11 +139,66 @@ SECTION_TITLES: dict[str, str] = {
 }
 
 
+# Agent execution phases. Agents within a phase are independent of each other;
+# each phase may use results of the phases before it.
+AGENT_PHASES: list[list[str]] = [
+    ["visa", "country", "weather", "currency", "culture"],  # Phase 1: independent
+    ["food", "attractions"],  # Phase 2: depend on culture/country
+    ["itinerary"],  # Phase 3: synthesis of phases 1-2
+    ["flight"],  # Phase 4: requires origin city
+]
+
+# Delay between agents of a phase to avoid rate limits
+# Anthropic free tier: 30,000 input tokens/minute
+AGENT_DELAY_SECONDS = 5
+
+
 def get_section_title(section_type: str) -> str:
     """Get the display title for a section type."""
     return SECTION_TITLES.get(section_type, section_type.replace("_", " ").title())
 
 
+# Trip fields an agent works from that are not part of its orchestrator input
+# model (single-agent recalculation passes them), so they are fingerprinted too
+FINGERPRINT_TRIP_FIELDS: dict[str, tuple[str, ...]] = {
+    "currency": ("budget",),
+    "attractions": ("budget",),
+}
+
+
+def compute_input_fingerprint(
+    agent_name: str, agent_input: Any, extra: dict[str, Any] | None = None
+) -> str:
+    """
+    Compute a stable hash of an agent's normalized input.
+
+    trip_id is excluded so the fingerprint only changes when the data the
+    agent works from changes.
+
+    Args:
+        agent_name: Name of agent
+        agent_input: Agent input object from _create_agent_input
+        extra: Additional trip fields the agent depends on
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    if hasattr(agent_input, "model_dump"):
+        payload = agent_input.model_dump(mode="json", exclude={"trip_id"})
+    else:
+        payload = agent_input
+    document = {"agent": agent_name, "input": payload}
+    if extra:
+        document["extra"] = extra
+    canonical = json.dumps(
+        document,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
 class TripData(BaseModel):
     """Trip data model for orchestrator input"""
 
@@ -301,6 +214,8 @@ class TripData(BaseModel):
     budget_level: str = "mid-range"
     interests: list[str] | None = None
     dietary_restrictions: list[str] | None = None
+    budget: float | None = None
+    currency: str | None = None  # Traveler's home currency (ISO code)
 
     def validate_dates(self) -> None:
         """Validate that dates are present and valid for report generation"""
@@ -364,13 +279,23 @@ class OrchestratorAgent:
             self.available_agents["flight"] = FlightAgent
 
         self.errors: list[dict[str, str]] = []
-
-    async def generate_report(self, trip_data: dict[str, Any]) -> dict[str, Any]:
+        self.input_fingerprints: dict[str, str] = {}
+        self.skipped_agents: list[str] = []
+        self._usage_mark = 0
+        self.trace = Trace("report")
+
+    async def generate_report(
+        self, trip_data: dict[str, Any], force: bool = False
+    ) -> dict[str, Any]:
         """
         Generate complete travel report
 
+        Agents whose input fingerprint matches the one stored on their existing
+        report section are skipped, since they would produce the same section.
+
         Args:
             trip_data: Trip information dictionary
+            force: Re-run every agent even if its input is unchanged
 
         Returns:
             Complete travel report with all sections
@@ -384,6 +309,22 @@ class OrchestratorAgent:
         # Validate dates are present
         validated_data.validate_dates()
 
+        # Only LLM calls made from here on count towards this report's usage
+        self._usage_mark = get_usage_tracker().mark()
+        self.trace = Trace("report", trip_id=validated_data.trip_id)
+
+        # Fingerprint agent inputs and skip agents whose input is unchanged
+        self.input_fingerprints = self.get_input_fingerprints(validated_data)
+        if not force:
+            existing = self._load_existing_fingerprints(validated_data.trip_id)
+            self.skipped_agents = [
+                name
+                for name, fingerprint in self.input_fingerprints.items()
+                if existing.get(name) == fingerprint
+            ]
+            if self.skipped_agents:
+                print(f"[Orchestrator] Skipping unchanged agents: {self.skipped_agents}")
+
         # Update job status to running
         await self._update_job_status(
             validated_data.trip_id, "running", {"message": "Starting report generation"}
@@ -395,7 +336,7 @@ class OrchestratorAgent:
         try:
             # Phase 1: Independent agents (can run in parallel)
             # These agents don't depend on each other and can run simultaneously
-            phase1_agents = ["visa", "country", "weather", "currency", "culture"]
+            phase1_agents = AGENT_PHASES[0]
             print(f"[Orchestrator] Starting Phase 1 with agents: {phase1_agents}")
             phase1_results = await self._run_phase(validated_data, phase1_agents)
             print(
@@ -404,7 +345,7 @@ class OrchestratorAgent:
             sections.update(phase1_results)
 
             # Phase 2: Dependent agents (depend on culture/country)
-            phase2_agents = ["food", "attractions"]
+            phase2_agents = AGENT_PHASES[1]
             print(f"[Orchestrator] Starting Phase 2 with agents: {phase2_agents}")
             phase2_results = await self._run_phase(validated_data, phase2_agents)
             print(
@@ -413,7 +354,7 @@ class OrchestratorAgent:
             sections.update(phase2_results)
 
             # Phase 3: Synthesis agents (itinerary depends on Phase 1-2 results)
-            phase3_agents = ["itinerary"]
+            phase3_agents = AGENT_PHASES[2]
             print(f"[Orchestrator] Starting Phase 3 with agents: {phase3_agents}")
             phase3_results = await self._run_phase(validated_data, phase3_agents)
             print(
@@ -423,7 +364,7 @@ class OrchestratorAgent:
 
             # Phase 4: Flight agent (requires origin city from trip data)
             if validated_data.origin_city:
-                phase4_agents = ["flight"]
+                phase4_agents = AGENT_PHASES[3]
                 print(f"[Orchestrator] Starting Phase 4 with agents: {phase4_agents}")
                 phase4_results = await self._run_phase(validated_data, phase4_agents)
                 print(
@@ -479,13 +420,14 @@ class OrchestratorAgent:
         """
         results = {}
 
-        # Filter to only available agents
-        available_agents_in_phase = [name for name in agent_names if name in self.available_agents]
+        # Filter to only available agents whose input changed
+        available_agents_in_phase = [
+            name
+            for name in agent_names
+            if name in self.available_agents and name not in self.skipped_agents
+        ]
 
         # Run agents sequentially with delay to avoid rate limits
-        # Anthropic free tier: 30,000 input tokens/minute
-        DELAY_BETWEEN_AGENTS = 5  # seconds delay between agents
-
         for agent_name in available_agents_in_phase:
             print(f"[Orchestrator] Running agent: {agent_name}")
             try:
@@ -510,8 +452,8 @@ class OrchestratorAgent:
 
             # Add delay between agents to avoid rate limiting
             if agent_name != available_agents_in_phase[-1]:
-                print(f"[Orchestrator] Waiting {DELAY_BETWEEN_AGENTS}s before next agent...")
-                await asyncio.sleep(DELAY_BETWEEN_AGENTS)
+                print(f"[Orchestrator] Waiting {AGENT_DELAY_SECONDS}s before next agent...")
+                await asyncio.sleep(AGENT_DELAY_SECONDS)
 
         return results
 
@@ -532,12 +474,16 @@ class OrchestratorAgent:
         # Create agent input
         agent_input = self._create_agent_input(trip_data, agent_name)
 
-        # Get agent class and instantiate
-        agent_class = self.available_agents[agent_name]
-        agent_instance = agent_class()
-
-        # Run agent
-        result = await agent_instance.run_async(agent_input)
+        # Instantiate and run agent (its LLM and tool calls are recorded as child spans)
+        with self.trace.span(
+            agent_name,
+            AGENT,
+            trip_id=trip_data.trip_id,
+            model_tier=get_model_tier(agent_name).name,
+        ):
+            agent_class = self.available_agents[agent_name]
+            agent_instance = agent_class()
+            result = await agent_instance.run_async(agent_input)
 
         return result.model_dump() if hasattr(result, "model_dump") else result
 
@@ -606,6 +552,11 @@ class OrchestratorAgent:
         if agent_name == "weather":
             from app.agents.weather.models import WeatherAgentInput
 
+            # Resolve coordinates locally so the agent can query weather by lat/lon
+            city = get_gazetteer().geocode(
+                trip_data.destination_city, trip_data.destination_country
+            )
+
             return WeatherAgentInput(
                 trip_id=trip_data.trip_id,
                 user_nationality=trip_data.user_nationality,
@@ -613,8 +564,8 @@ class OrchestratorAgent:
                 destination_city=trip_data.destination_city,
                 departure_date=trip_data.departure_date,
                 return_date=trip_data.return_date,
-                latitude=None,  # Will be populated by geocoding in future
-                longitude=None,  # Will be populated by geocoding in future
+                latitude=city.lat if city else None,
+                longitude=city.lng if city else None,
             )
 
         # For currency agent
@@ -628,7 +579,7 @@ class OrchestratorAgent:
                 departure_date=trip_data.departure_date,
                 return_date=trip_data.return_date,
                 traveler_nationality=trip_data.user_nationality,
-                base_currency="USD",  # Default to USD, can be extended later
+                base_currency=trip_data.currency or "USD",
             )
 
         # For culture agent
@@ -655,7 +606,7 @@ class OrchestratorAgent:
                 departure_date=trip_data.departure_date,
                 return_date=trip_data.return_date,
                 traveler_nationality=trip_data.user_nationality,
-                dietary_restrictions=None,  # Can be extended to include user preferences
+                dietary_restrictions=trip_data.dietary_restrictions or None,
             )
 
         # For attractions agent
@@ -704,6 +655,59 @@ class OrchestratorAgent:
 
         raise ValueError(f"Unknown agent: {agent_name}")
 
+    def get_input_fingerprints(
+        self, trip_data: TripData, agent_names: list[str] | None = None
+    ) -> dict[str, str]:
+        """
+        Fingerprint the input each agent would receive for this trip
+
+        Args:
+            trip_data: Validated trip data
+            agent_names: Agents to fingerprint (default: all available agents)
+
+        Returns:
+            Mapping of agent name to input fingerprint. Agents whose input
+            cannot be built are omitted (they will always run).
+        """
+        fingerprints = {}
+        for agent_name in agent_names or self.list_available_agents():
+            try:
+                agent_input = self._create_agent_input(trip_data, agent_name)
+            except Exception:
+                continue
+            extra = {
+                field: getattr(trip_data, field)
+                for field in FINGERPRINT_TRIP_FIELDS.get(agent_name, ())
+            }
+            fingerprints[agent_name] = compute_input_fingerprint(agent_name, agent_input, extra)
+        return fingerprints
+
+    def _load_existing_fingerprints(self, trip_id: str) -> dict[str, str]:
+        """
+        Load input fingerprints stored on a trip's existing report sections
+
+        Args:
+            trip_id: Trip ID
+
+        Returns:
+            Mapping of section type to stored fingerprint
+        """
+        try:
+            response = (
+                supabase.table("report_sections")
+                .select("section_type, input_fingerprint")
+                .eq("trip_id", trip_id)
+                .execute()
+            )
+        except Exception:
+            return {}
+
+        return {
+            row["section_type"]: row["input_fingerprint"]
+            for row in (response.data or [])
+            if row.get("input_fingerprint")
+        }
+
     def _serialize_for_json(self, obj: Any) -> Any:
         """
         Recursively serialize an object for JSON compatibility.
@@ -756,6 +760,7 @@ class OrchestratorAgent:
                     "section_type": section_type,
                     "title": get_section_title(section_type),
                     "content": serialized_content,
+                    "input_fingerprint": self.input_fingerprints.get(section_type),
                     "generated_at": datetime.utcnow().isoformat(),
                 },
                 on_conflict="trip_id,section_type",
@@ -791,6 +796,7 @@ class OrchestratorAgent:
                         "section_type": section_type,
                         "title": get_section_title(section_type),
                         "content": serialized_content,
+                        "input_fingerprint": self.input_fingerprints.get(section_type),
                         "generated_at": datetime.utcnow().isoformat(),
                     },
                     on_conflict="trip_id,section_type",
@@ -875,6 +881,11 @@ class OrchestratorAgent:
                 "agent_count": len(sections),
                 "error_count": len(errors),
                 "orchestrator_version": "1.0.0",
+                "skipped_agents": list(self.skipped_agents),
+                "estimated_time_saved": ChangeDetector().estimate_recalc_time(self.skipped_agents),
+                "llm_usage": get_usage_tracker().report(since=self._usage_mark),
+                "llm_provider_health": get_provider_health(),
+                "telemetry": self.trace.summary(),
             },
         }
 
@@ -12,7 +12,7 @@ Architecture:
 """
 
 import json
-from datetime import datetime
+from datetime import UTC, datetime
 
 from crewai import Agent, Crew, Process
 
@@ -21,6 +21,8 @@ from app.agents.config import AgentConfig, get_llm
 from app.agents.exceptions import AgentExecutionError
 from app.agents.interfaces import SourceReference
 from app.core.config import settings
+from app.core.telemetry import trace_tools
+from app.services.visa.matrix import VisaMatrixEntry, get_visa_matrix
 
 from .models import (
     ApplicationProcess,
@@ -96,7 +98,7 @@ class VisaAgent(BaseAgent):
         )
 
         # Initialize LLM with fallback support (Anthropic -> Gemini -> OpenAI)
-        self.llm = get_llm(temperature=0.1)
+        self.llm = get_llm(temperature=0.1, config=self.config)
 
         # Initialize CrewAI Agent
         self.crew_agent = Agent(
@@ -104,13 +106,15 @@ class VisaAgent(BaseAgent):
             goal=VISA_AGENT_GOAL,
             backstory=VISA_AGENT_BACKSTORY,
             llm=self.llm,
-            tools=[
-                check_visa_requirements,
-                get_embassy_info,
-                generate_document_checklist,
-                estimate_processing_time,
-                check_travel_advisories,
-            ],
+            tools=trace_tools(
+                [
+                    check_visa_requirements,
+                    get_embassy_info,
+                    generate_document_checklist,
+                    estimate_processing_time,
+                    check_travel_advisories,
+                ]
+            ),
             verbose=True,  # Enable verbose logging for debugging
             allow_delegation=False,  # Single agent, no delegation needed
         )
@@ -134,9 +138,21 @@ class VisaAgent(BaseAgent):
         if len(input_data.destination_country) > 3 or not input_data.destination_country.isupper():
             raise ValueError(f"Invalid destination country code: {input_data.destination_country}")
 
+        # Stored visa requirement for this pair (O(1); the tool checks live on a miss)
+        try:
+            matrix_entry = get_visa_matrix().get(
+                input_data.user_nationality, input_data.destination_country
+            )
+        except Exception:
+            matrix_entry = None
+
         try:
             # Create CrewAI task
-            task = create_single_step_task(self.crew_agent, input_data)
+            task = create_single_step_task(
+                self.crew_agent,
+                input_data,
+                known_requirement=matrix_entry.to_dict() if matrix_entry else None,
+            )
 
             # Create and execute Crew
             crew = Crew(
@@ -151,6 +167,8 @@ class VisaAgent(BaseAgent):
 
             # Parse and validate result
             output = self._parse_crew_result(crew_result, input_data)
+            if matrix_entry:
+                self._apply_matrix_freshness(output, matrix_entry)
 
             return output
 
@@ -164,6 +182,17 @@ class VisaAgent(BaseAgent):
                 original_error=e,
             )
 
+    def _apply_matrix_freshness(self, output: VisaAgentOutput, entry: VisaMatrixEntry) -> None:
+        """Report when the visa requirement was actually checked, warning if stale."""
+        # Naive UTC, like the other last_verified values (see recalculate_confidence)
+        checked_at = datetime.fromtimestamp(entry.checked_at, tz=UTC)
+        output.last_verified = checked_at.replace(tzinfo=None)
+        if entry.stale:
+            output.warnings.append(
+                f"Visa requirement data was last checked {int(entry.age_seconds // 86400)} "
+                "days ago. Verify with official sources before travel."
+            )
+
     def _parse_crew_result(self, crew_result, input_data: VisaAgentInput) -> VisaAgentOutput:
         """
         Parse CrewAI result into VisaAgentOutput
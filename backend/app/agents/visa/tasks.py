@@ -5,6 +5,8 @@ Defines the tasks that the Visa Agent executes using CrewAI.
 Tasks are structured workflows that use the agent's tools to gather and analyze visa information.
 """
 
+import json
+
 from crewai import Task
 
 from .prompts import (
@@ -91,7 +93,7 @@ def create_visa_verification_task(agent, research_result) -> Task:
     )
 
 
-def create_single_step_task(agent, input_data) -> Task:
+def create_single_step_task(agent, input_data, known_requirement: dict | None = None) -> Task:
     """
     Create a simplified single-step task (for MVP or testing)
 
@@ -101,10 +103,23 @@ def create_single_step_task(agent, input_data) -> Task:
     Args:
         agent: The CrewAI Agent instance
         input_data: VisaAgentInput with trip details
+        known_requirement: Stored visa matrix entry for the trip's passport
+            and destination, if any (saves the agent a tool call)
 
     Returns:
         Task: CrewAI Task for single-step visa analysis
     """
+    known = ""
+    if known_requirement:
+        freshness = (
+            "STALE - verify with official sources" if known_requirement.get("stale") else "current"
+        )
+        known = f"""
+    Known requirement (visa matrix, checked {known_requirement.get("checked_at")}, {freshness}):
+    {json.dumps(known_requirement)}
+    Use this instead of calling check_visa_requirements for this passport and destination.
+"""
+
     description = f"""
     Analyze visa requirements for this trip:
 
@@ -113,7 +128,7 @@ def create_single_step_task(agent, input_data) -> Task:
     Purpose: {input_data.trip_purpose}
     Duration: {input_data.duration_days} days
     Departure: {input_data.departure_date}
-
+{known}
     Steps:
     1. Check visa requirements using check_visa_requirements tool
     2. Determine if visa is required
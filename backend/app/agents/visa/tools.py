@@ -7,11 +7,7 @@ Each tool is decorated with @tool for CrewAI integration.
 
 from crewai.tools import tool
 
-from app.core.config import settings
-from app.services.visa.travel_buddy_client import TravelBuddyClient
-
-# Initialize Travel Buddy AI client
-_visa_client = TravelBuddyClient(api_key=settings.RAPIDAPI_KEY)
+from app.services.visa.matrix import get_visa_matrix
 
 
 @tool("Visa Requirements Checker")
@@ -19,7 +15,8 @@ def check_visa_requirements(passport_country: str, destination_country: str) ->
     """
     Check visa requirements for a specific passport and destination country.
 
-    This tool queries the Travel Buddy AI API for official visa requirements.
+    Reads the locally stored visa matrix (refreshed from the Travel Buddy AI
+    API in the background); pairs not stored yet are checked live.
     Use this as the primary source for visa information.
 
     Args:
@@ -36,17 +33,17 @@ def check_visa_requirements(passport_country: str, destination_country: str) ->
             - embassy_url: str or None
             - currency: str (destination currency code)
             - timezone: str
+            - checked_at: str (ISO time the requirement was last checked)
+            - age_days: float
+            - stale: bool (data is older than the refresh window; verify officially)
 
     Example:
         >>> result = check_visa_requirements("US", "FR")
         >>> print(result["visa_required"])  # False (Schengen visa-free)
     """
     try:
-        result = _visa_client.check_visa(
-            passport=passport_country.upper(),
-            destination=destination_country.upper(),
-        )
-        return result.to_dict()
+        entry = get_visa_matrix().lookup(passport_country.upper(), destination_country.upper())
+        return entry.to_dict()
     except Exception as e:
         return {
             "error": str(e),
@@ -75,12 +72,11 @@ def get_embassy_info(destination_country: str) -> dict:
     try:
         # We can enhance this later with a dedicated embassy API
         # For now, we'll return the embassy URL from visa check
-        result = _visa_client.check_visa(
-            passport="US",  # Dummy passport to get destination info
-            destination=destination_country.upper(),
+        entry = get_visa_matrix().lookup(
+            "US", destination_country.upper()  # Dummy passport to get destination info
         )
         return {
-            "embassy_url": result.embassy_url,
+            "embassy_url": entry.result.embassy_url,
             "destination_country": destination_country.upper(),
         }
     except Exception as e:
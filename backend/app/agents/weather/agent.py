@@ -7,6 +7,8 @@ from datetime import datetime
 
 from crewai import Agent, Crew
 
+from app.core.telemetry import trace_tools
+
 from ..base import BaseAgent
 from ..config import AgentConfig, get_llm
 from ..interfaces import AgentResult
@@ -61,7 +63,7 @@ class WeatherAgent(BaseAgent):
         super().__init__(config or AgentConfig(agent_type="weather"))
 
         # Initialize LLM with fallback support (Anthropic -> Gemini -> OpenAI)
-        self.llm = get_llm(temperature=0.1)
+        self.llm = get_llm(temperature=0.1, config=self.config)
 
         self.crew_agent = self._create_agent()
 
@@ -76,12 +78,14 @@ class WeatherAgent(BaseAgent):
             role=WEATHER_AGENT_ROLE,
             goal=WEATHER_AGENT_GOAL,
             backstory=WEATHER_AGENT_BACKSTORY,
-            tools=[
-                get_weather_forecast,
-                get_weather_by_coordinates,
-                get_climate_information,
-                calculate_packing_needs,
-            ],
+            tools=trace_tools(
+                [
+                    get_weather_forecast,
+                    get_weather_by_coordinates,
+                    get_climate_information,
+                    calculate_packing_needs,
+                ]
+            ),
             llm=self.llm,
             verbose=True,
             allow_delegation=False,
@@ -124,6 +128,8 @@ class WeatherAgent(BaseAgent):
                 departure_date=input_data.departure_date.isoformat(),
                 return_date=input_data.return_date.isoformat(),
                 duration_days=duration,
+                latitude=input_data.latitude,
+                longitude=input_data.longitude,
             )
 
             # Execute CrewAI workflow
@@ -179,6 +179,9 @@ def create_comprehensive_weather_task(
     departure_date: str,
     return_date: str,
     duration_days: int,
+    *,
+    latitude: float | None = None,
+    longitude: float | None = None,
 ) -> Task:
     """
     Create comprehensive task combining all weather analysis aspects.
@@ -193,15 +196,24 @@ def create_comprehensive_weather_task(
         departure_date: Departure date (YYYY-MM-DD)
         return_date: Return date (YYYY-MM-DD)
         duration_days: Trip duration in days
+        latitude: Destination latitude, if already known
+        longitude: Destination longitude, if already known
 
     Returns:
         CrewAI Task for comprehensive weather analysis
     """
+    coordinates = ""
+    if latitude is not None and longitude is not None:
+        coordinates = (
+            f"- Coordinates: {latitude}, {longitude} "
+            "(use these with the Get Weather by Coordinates tool)\n"
+        )
+
     description = f"""Provide comprehensive weather intelligence for the trip.
 
 **Trip Details:**
 - Destination: {destination_city}, {destination_country}
-- Travel Dates: {departure_date} to {return_date}
+{coordinates}- Travel Dates: {departure_date} to {return_date}
 - Duration: {duration_days} days
 
 **Your Complete Analysis Must Include:**
@@ -8,6 +8,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from app.core.auth import verify_jwt_token
 from app.core.errors import log_and_raise_http_error
 from app.core.supabase import supabase
+from app.services.gazetteer import country_code
 
 logger = logging.getLogger(__name__)
 from app.models.trips import (
@@ -25,35 +26,9 @@ from app.models.trips import (
 router = APIRouter(prefix="/history", tags=["history"])
 
 
-# Country code mapping for world map visualization
-COUNTRY_CODE_MAP = {
-    "United States": "US",
-    "United Kingdom": "GB",
-    "France": "FR",
-    "Germany": "DE",
-    "Japan": "JP",
-    "China": "CN",
-    "Australia": "AU",
-    "Canada": "CA",
-    "Italy": "IT",
-    "Spain": "ES",
-    "Brazil": "BR",
-    "India": "IN",
-    "Mexico": "MX",
-    "Netherlands": "NL",
-    "Switzerland": "CH",
-    "Thailand": "TH",
-    "Singapore": "SG",
-    "South Korea": "KR",
-    "Portugal": "PT",
-    "Greece": "GR",
-    # Add more as needed
-}
-
-
 def get_country_code(country_name: str) -> str:
-    """Get ISO 3166-1 alpha-2 code for a country name."""
-    return COUNTRY_CODE_MAP.get(country_name, country_name[:2].upper())
+    """Get ISO 3166-1 alpha-2 code for a country name (for world map visualization)."""
+    return country_code(country_name) or country_name[:2].upper()
 
 
 @router.get("", response_model=TravelHistoryResponse)
@@ -145,6 +120,114 @@ async def get_travel_history(
         )
 
 
+def _aggregate_travel_stats(trips: list[dict], now: datetime) -> TravelStatsResponse:
+    """Travel statistics for a user's completed trips (travel streak counted back from now)."""
+    # Calculate statistics
+    countries: dict[str, dict] = {}
+    cities_set: set = set()
+    total_days = 0
+
+    for trip in trips:
+        destinations = trip.get("destinations", [])
+        trip_details = trip.get("trip_details", {})
+
+        # Calculate trip duration
+        start_date_str = trip_details.get("departureDate")
+        end_date_str = trip_details.get("returnDate")
+        if start_date_str and end_date_str:
+            try:
+                start_date = datetime.fromisoformat(start_date_str.replace("Z", "+00:00"))
+                end_date = datetime.fromisoformat(end_date_str.replace("Z", "+00:00"))
+                trip_duration = (end_date - start_date).days
+                total_days += max(trip_duration, 1)
+            except (ValueError, TypeError):
+                pass
+
+        # Track countries and cities
+        for dest in destinations:
+            country = dest.get("country", "Unknown")
+            city = dest.get("city", "")
+
+            if city:
+                cities_set.add(f"{city}, {country}")
+
+            if country not in countries:
+                countries[country] = {
+                    "visit_count": 0,
+                    "cities": set(),
+                    "last_visited": None,
+                }
+
+            countries[country]["visit_count"] += 1
+            if city:
+                countries[country]["cities"].add(city)
+
+            if end_date_str:
+                if (
+                    countries[country]["last_visited"] is None
+                    or end_date_str > countries[country]["last_visited"]
+                ):
+                    countries[country]["last_visited"] = end_date_str
+
+    # Find most visited and favorite
+    most_visited_country = (
+        max(countries.keys(), key=lambda c: countries[c]["visit_count"]) if countries else None
+    )
+    favorite_destination = most_visited_country  # Could be enhanced with user ratings
+
+    # Calculate travel streak (consecutive months with travel)
+    travel_streak = 0
+    if trips:
+        # Collect all trip months
+        trip_months: set[tuple[int, int]] = set()
+        for trip in trips:
+            trip_details = trip.get("trip_details", {})
+            start_date_str = trip_details.get("departureDate")
+            if start_date_str:
+                try:
+                    start_date = datetime.fromisoformat(start_date_str.replace("Z", "+00:00"))
+                    trip_months.add((start_date.year, start_date.month))
+                except (ValueError, TypeError):
+                    pass
+
+        # Count consecutive months from current month going back
+        if trip_months:
+            current_year, current_month = now.year, now.month
+
+            while (current_year, current_month) in trip_months:
+                travel_streak += 1
+                # Go to previous month
+                current_month -= 1
+                if current_month == 0:
+                    current_month = 12
+                    current_year -= 1
+
+    # Build country visit list for world map
+    country_visits = [
+        CountryVisit(
+            country_code=get_country_code(country),
+            country_name=country,
+            visit_count=data["visit_count"],
+            last_visited=data["last_visited"],
+            cities=list(data["cities"]),
+        )
+        for country, data in countries.items()
+    ]
+
+    return TravelStatsResponse(
+        stats=TravelStats(
+            total_trips=len(trips),
+            countries_visited=len(countries),
+            cities_visited=len(cities_set),
+            total_days_traveled=total_days,
+            favorite_destination=favorite_destination,
+            most_visited_country=most_visited_country,
+            travel_streak=travel_streak,
+        ),
+        countries=country_visits,
+    )
+
+
 @router.get("/stats", response_model=TravelStatsResponse)
 async def get_travel_stats(token_payload: dict = Depends(verify_jwt_token)):
     """
@@ -183,111 +266,7 @@ async def get_travel_stats(token_payload: dict = Depends(verify_jwt_token)):
                 countries=[],
             )
 
-        # Calculate statistics
-        countries: dict[str, dict] = {}
-        cities_set: set = set()
-        total_days = 0
-
-        for trip in trips:
-            destinations = trip.get("destinations", [])
-            trip_details = trip.get("trip_details", {})
-
-            # Calculate trip duration
-            start_date_str = trip_details.get("departureDate")
-            end_date_str = trip_details.get("returnDate")
-            if start_date_str and end_date_str:
-                try:
-                    start_date = datetime.fromisoformat(start_date_str.replace("Z", "+00:00"))
-                    end_date = datetime.fromisoformat(end_date_str.replace("Z", "+00:00"))
-                    trip_duration = (end_date - start_date).days
-                    total_days += max(trip_duration, 1)
-                except (ValueError, TypeError):
-                    pass
-
-            # Track countries and cities
-            for dest in destinations:
-                country = dest.get("country", "Unknown")
-                city = dest.get("city", "")
-
-                if city:
-                    cities_set.add(f"{city}, {country}")
-
-                if country not in countries:
-                    countries[country] = {
-                        "visit_count": 0,
-                        "cities": set(),
-                        "last_visited": None,
-                    }
-
-                countries[country]["visit_count"] += 1
-                if city:
-                    countries[country]["cities"].add(city)
-
-                if end_date_str:
-                    if (
-                        countries[country]["last_visited"] is None
-                        or end_date_str > countries[country]["last_visited"]
-                    ):
-                        countries[country]["last_visited"] = end_date_str
-
-        # Find most visited and favorite
-        most_visited_country = (
-            max(countries.keys(), key=lambda c: countries[c]["visit_count"]) if countries else None
-        )
-        favorite_destination = most_visited_country  # Could be enhanced with user ratings
-
-        # Calculate travel streak (consecutive months with travel)
-        travel_streak = 0
-        if trips:
-            # Collect all trip months
-            trip_months: set[tuple[int, int]] = set()
-            for trip in trips:
-                trip_details = trip.get("trip_details", {})
-                start_date_str = trip_details.get("departureDate")
-                if start_date_str:
-                    try:
-                        start_date = datetime.fromisoformat(start_date_str.replace("Z", "+00:00"))
-                        trip_months.add((start_date.year, start_date.month))
-                    except (ValueError, TypeError):
-                        pass
-
-            # Count consecutive months from current month going back
-            if trip_months:
-                now = datetime.utcnow()
-                current_year, current_month = now.year, now.month
-
-                while (current_year, current_month) in trip_months:
-                    travel_streak += 1
-                    # Go to previous month
-                    current_month -= 1
-                    if current_month == 0:
-                        current_month = 12
-                        current_year -= 1
-
-        # Build country visit list for world map
-        country_visits = [
-            CountryVisit(
-                country_code=get_country_code(country),
-                country_name=country,
-                visit_count=data["visit_count"],
-                last_visited=data["last_visited"],
-                cities=list(data["cities"]),
-            )
-            for country, data in countries.items()
-        ]
-
-        return TravelStatsResponse(
-            stats=TravelStats(
-                total_trips=len(trips),
-                countries_visited=len(countries),
-                cities_visited=len(cities_set),
-                total_days_traveled=total_days,
-                favorite_destination=favorite_destination,
-                most_visited_country=most_visited_country,
-                travel_streak=travel_streak,
-            ),
-            countries=country_visits,
-        )
+        return _aggregate_travel_stats(trips, datetime.utcnow())
 
     except Exception as e:
         log_and_raise_http_error(
@@ -12,10 +12,18 @@ from typing import Optional
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import ValidationError
 
 from app.core.auth import verify_jwt_token
 from app.core.errors import log_and_raise_http_error
 from app.core.supabase import supabase
+from app.services.itinerary_index import (
+    IndexedItinerary,
+    ItineraryItemNotFound,
+    activity_costs,
+)
+from app.services.json_patch import JsonPatchError, JsonPatchTestFailed, apply_patch
+from app.services.route_optimizer import InvalidActivityError, optimize_route
 
 logger = logging.getLogger(__name__)
 from app.models.itinerary import (
@@ -27,10 +35,14 @@ from app.models.itinerary import (
     DayPlanCreate,
     DayPlanResponse,
     DayPlanUpdate,
+    DayRouteSummary,
     Itinerary,
+    ItineraryPatchRequest,
     ItineraryResponse,
     ItineraryUpdate,
     Location,
+    OptimizeRouteRequest,
+    OptimizeRouteResponse,
     PlaceSearchRequest,
     PlaceSearchResponse,
     PlaceSearchResult,
@@ -52,47 +64,73 @@ def get_trip_itinerary(trip_data: dict) -> Optional[dict]:
     return trip_details.get("itinerary")
 
 
-def update_trip_itinerary(trip_id: str, user_id: str, itinerary: dict) -> dict:
-    """Update the itinerary in trip_details JSONB field."""
-    # Get current trip_details
-    response = (
-        supabase.table("trips")
-        .select("trip_details")
-        .eq("id", trip_id)
-        .eq("user_id", user_id)
-        .single()
-        .execute()
-    )
-
-    if not response.data:
+def get_itinerary_version(itinerary: Optional[dict]) -> int:
+    """Get the optimistic-concurrency version of a stored itinerary."""
+    return int((itinerary or {}).get("version", 0) or 0)
+
+
+def save_trip_itinerary(
+    trip_id: str, user_id: str, itinerary: dict, expected_version: Optional[int] = None
+) -> int:
+    """
+    Write the itinerary into trip_details with a single jsonb_set (RPC).
+
+    Only the itinerary key is sent and written; the rest of trip_details is
+    left untouched server-side. Every write bumps the itinerary version.
+
+    Args:
+        trip_id: Trip ID
+        user_id: Owner user ID
+        itinerary: Itinerary document to store
+        expected_version: If given, only write when the stored version matches
+
+    Returns:
+        New itinerary version
+
+    Raises:
+        HTTPException: 404 if the trip does not exist, 409 on a version conflict
+    """
+    response = supabase.rpc(
+        "save_trip_itinerary",
+        {
+            "p_trip_id": trip_id,
+            "p_user_id": user_id,
+            "p_itinerary": itinerary,
+            "p_expected_version": expected_version,
+        },
+    ).execute()
+
+    row = response.data[0] if response.data else None
+    if not row or not row.get("found"):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
 
-    # Update trip_details with new itinerary
-    trip_details = response.data.get("trip_details", {}) or {}
-    trip_details["itinerary"] = itinerary
+    if not row.get("applied"):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=(
+                f"Itinerary was modified concurrently (expected version {expected_version}, "
+                f"current version {row.get('version')}). Reload and retry."
+            ),
+        )
 
-    # Save back to database
-    update_response = (
-        supabase.table("trips")
-        .update({"trip_details": trip_details})
-        .eq("id", trip_id)
-        .eq("user_id", user_id)
-        .execute()
-    )
+    return row.get("version")
 
-    return update_response.data[0] if update_response.data else {}
 
+def update_trip_itinerary(trip_id: str, user_id: str, itinerary: dict) -> dict:
+    """Update the itinerary in trip_details JSONB field."""
+    version = save_trip_itinerary(trip_id, user_id, itinerary)
+    return {**itinerary, "version": version}
 
-def calculate_day_cost(day: dict) -> float:
-    """Calculate total cost for a day."""
-    activities = day.get("activities", [])
-    return sum(a.get("cost_estimate", 0) or 0 for a in activities)
+
+def calculate_day_cost(day: dict, currency: str = "USD") -> float:
+    """Calculate total cost for a day in the given currency."""
+    return float(activity_costs(day.get("activities", []), currency).sum())
 
 
 def calculate_itinerary_cost(itinerary: dict) -> float:
-    """Calculate total cost for entire itinerary."""
-    days = itinerary.get("days", [])
-    return sum(calculate_day_cost(day) for day in days)
+    """Calculate total cost for entire itinerary in its currency."""
+    activities = [a for day in itinerary.get("days", []) for a in day.get("activities", [])]
+    return float(activity_costs(activities, itinerary.get("currency")).sum())
 
 
 # ============================================================================
@@ -167,6 +205,7 @@ async def get_itinerary(trip_id: str, token_payload: dict = Depends(verify_jwt_t
                     if existing_itinerary.get("last_modified")
                     else datetime.utcnow()
                 ),
+                version=get_itinerary_version(existing_itinerary),
             )
         else:
             # Return empty itinerary
@@ -272,6 +311,111 @@ async def update_itinerary(
         )
 
 
+# ============================================================================
+# Patch Itinerary
+# ============================================================================
+
+
+@router.patch(
+    "/{trip_id}/itinerary",
+    response_model=ItineraryResponse,
+    summary="Patch itinerary",
+    description="Apply a batch of JSON Patch (RFC 6902) operations to the itinerary",
+)
+async def patch_itinerary(
+    trip_id: str,
+    patch_data: ItineraryPatchRequest,
+    token_payload: dict = Depends(verify_jwt_token),
+):
+    """
+    Apply JSON Patch operations to the itinerary in one atomic write.
+
+    Paths are relative to the itinerary document, e.g.
+    ``{"op": "move", "from": "/days/0/activities/2", "path": "/days/1/activities/0"}``.
+    The request carries the version the client last read; if the itinerary has
+    changed since, nothing is written and 409 is returned.
+    """
+    user_id = token_payload["user_id"]
+
+    try:
+        trip_response = (
+            supabase.table("trips")
+            .select("id, user_id, trip_details")
+            .eq("id", trip_id)
+            .eq("user_id", user_id)
+            .single()
+            .execute()
+        )
+
+        if not trip_response.data:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
+
+        existing_itinerary = get_trip_itinerary(trip_response.data) or {
+            "days": [],
+            "currency": "USD",
+        }
+        current_version = get_itinerary_version(existing_itinerary)
+        if patch_data.version != current_version:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=(
+                    f"Itinerary version mismatch (expected {patch_data.version}, "
+                    f"current {current_version}). Reload and retry."
+                ),
+            )
+
+        operations = [
+            operation.model_dump(by_alias=True, exclude_unset=True)
+            for operation in patch_data.operations
+        ]
+        try:
+            patched = apply_patch(existing_itinerary, operations)
+        except JsonPatchTestFailed as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e)) from e
+        except JsonPatchError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+            ) from e
+
+        # Recalculate costs and validate the patched document before writing it
+        try:
+            patched = IndexedItinerary(patched).to_dict()
+            days = [DayPlan(**day) for day in patched["days"]]
+        except (KeyError, TypeError, AttributeError, ValidationError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Patched itinerary is invalid: {e}",
+            ) from e
+
+        patched["currency"] = patched.get("currency") or "USD"
+        patched["last_modified"] = datetime.utcnow().isoformat()
+
+        new_version = save_trip_itinerary(trip_id, user_id, patched, current_version)
+
+        itinerary = Itinerary(
+            trip_id=trip_id,
+            days=days,
+            total_cost=patched["total_cost"],
+            currency=patched["currency"],
+            last_modified=datetime.fromisoformat(patched["last_modified"]),
+            version=new_version,
+        )
+
+        return ItineraryResponse(
+            trip_id=trip_id,
+            itinerary=itinerary,
+            has_ai_generated=False,
+            last_synced_at=None,
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_and_raise_http_error(
+            "patch itinerary", e, "Failed to patch itinerary. Please try again."
+        )
+
+
 # ============================================================================
 # Day Management
 # ============================================================================
@@ -309,7 +453,7 @@ async def add_day(
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
 
         trip_data = trip_response.data
-        existing_itinerary = get_trip_itinerary(trip_data) or {"days": [], "currency": "USD"}
+        itinerary = IndexedItinerary(get_trip_itinerary(trip_data))
 
         # Create new day with generated ID
         day_id = str(uuid4())
@@ -326,16 +470,12 @@ async def add_day(
             "total_cost": 0,
         }
 
-        # Calculate cost
-        new_day["total_cost"] = calculate_day_cost(new_day)
-
-        # Add to itinerary
-        existing_itinerary["days"].append(new_day)
-        existing_itinerary["last_modified"] = datetime.utcnow().isoformat()
-        existing_itinerary["total_cost"] = calculate_itinerary_cost(existing_itinerary)
+        # Add to itinerary (costs are updated incrementally)
+        itinerary.add_day(new_day)
+        itinerary.data["last_modified"] = datetime.utcnow().isoformat()
 
         # Save
-        update_trip_itinerary(trip_id, user_id, existing_itinerary)
+        update_trip_itinerary(trip_id, user_id, itinerary.to_dict())
 
         return DayPlanResponse(
             success=True,
@@ -384,32 +524,21 @@ async def update_day(
         if not existing_itinerary:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
 
+        itinerary = IndexedItinerary(existing_itinerary)
+
         # Find and update day
-        day_found = False
-        for day in existing_itinerary["days"]:
-            if day["id"] == day_id:
-                day_found = True
-                if day_data.date is not None:
-                    day["date"] = day_data.date
-                if day_data.day_number is not None:
-                    day["day_number"] = day_data.day_number
-                if day_data.title is not None:
-                    day["title"] = day_data.title
-                if day_data.notes is not None:
-                    day["notes"] = day_data.notes
-                break
-
-        if not day_found:
+        try:
+            updated_day = itinerary.update_day(
+                day_id, day_data.model_dump(exclude_none=True, by_alias=False)
+            )
+        except ItineraryItemNotFound:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Day not found")
 
         # Update timestamp
-        existing_itinerary["last_modified"] = datetime.utcnow().isoformat()
+        itinerary.data["last_modified"] = datetime.utcnow().isoformat()
 
         # Save
-        update_trip_itinerary(trip_id, user_id, existing_itinerary)
-
-        # Get updated day
-        updated_day = next(d for d in existing_itinerary["days"] if d["id"] == day_id)
+        update_trip_itinerary(trip_id, user_id, itinerary.to_dict())
 
         return DayPlanResponse(
             success=True,
@@ -457,19 +586,19 @@ async def remove_day(
         if not existing_itinerary:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
 
-        # Find and remove day
-        original_length = len(existing_itinerary["days"])
-        existing_itinerary["days"] = [d for d in existing_itinerary["days"] if d["id"] != day_id]
+        itinerary = IndexedItinerary(existing_itinerary)
 
-        if len(existing_itinerary["days"]) == original_length:
+        # Find and remove day
+        try:
+            itinerary.remove_day(day_id)
+        except ItineraryItemNotFound:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Day not found")
 
-        # Recalculate costs and update timestamp
-        existing_itinerary["total_cost"] = calculate_itinerary_cost(existing_itinerary)
-        existing_itinerary["last_modified"] = datetime.utcnow().isoformat()
+        # Update timestamp
+        itinerary.data["last_modified"] = datetime.utcnow().isoformat()
 
         # Save
-        update_trip_itinerary(trip_id, user_id, existing_itinerary)
+        update_trip_itinerary(trip_id, user_id, itinerary.to_dict())
 
         return
 
@@ -520,10 +649,7 @@ async def add_activity(
         if not existing_itinerary:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
 
-        # Find day
-        day = next((d for d in existing_itinerary["days"] if d["id"] == day_id), None)
-        if not day:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Day not found")
+        itinerary = IndexedItinerary(existing_itinerary)
 
         # Create new activity
         activity_id = str(uuid4())
@@ -532,18 +658,15 @@ async def add_activity(
             **activity_data.model_dump(mode="json"),
         }
 
-        # Add to day
-        if "activities" not in day:
-            day["activities"] = []
-        day["activities"].append(new_activity)
-
-        # Recalculate costs
-        day["total_cost"] = calculate_day_cost(day)
-        existing_itinerary["total_cost"] = calculate_itinerary_cost(existing_itinerary)
-        existing_itinerary["last_modified"] = datetime.utcnow().isoformat()
+        # Add to day (costs are updated incrementally)
+        try:
+            itinerary.add_activity(day_id, new_activity)
+        except ItineraryItemNotFound:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Day not found")
+        itinerary.data["last_modified"] = datetime.utcnow().isoformat()
 
         # Save
-        update_trip_itinerary(trip_id, user_id, existing_itinerary)
+        update_trip_itinerary(trip_id, user_id, itinerary.to_dict())
 
         return ActivityResponse(
             success=True,
@@ -592,33 +715,21 @@ async def update_activity(
         if not existing_itinerary:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
 
-        # Find and update activity across all days
-        activity_found = False
-        updated_activity = None
-
-        for day in existing_itinerary["days"]:
-            for activity in day.get("activities", []):
-                if activity["id"] == activity_id:
-                    activity_found = True
-                    # Update fields
-                    update_dict = activity_data.model_dump(exclude_none=True, mode="json")
-                    for key, value in update_dict.items():
-                        activity[key] = value
-                    updated_activity = activity
-                    break
-            if activity_found:
-                day["total_cost"] = calculate_day_cost(day)
-                break
-
-        if not activity_found:
+        itinerary = IndexedItinerary(existing_itinerary)
+
+        # Find and update activity (costs are updated incrementally)
+        try:
+            updated_activity = itinerary.update_activity(
+                activity_id, activity_data.model_dump(exclude_none=True, mode="json")
+            )
+        except ItineraryItemNotFound:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Activity not found")
 
-        # Recalculate total cost and update timestamp
-        existing_itinerary["total_cost"] = calculate_itinerary_cost(existing_itinerary)
-        existing_itinerary["last_modified"] = datetime.utcnow().isoformat()
+        # Update timestamp
+        itinerary.data["last_modified"] = datetime.utcnow().isoformat()
 
         # Save
-        update_trip_itinerary(trip_id, user_id, existing_itinerary)
+        update_trip_itinerary(trip_id, user_id, itinerary.to_dict())
 
         return ActivityResponse(
             success=True,
@@ -668,26 +779,19 @@ async def remove_activity(
         if not existing_itinerary:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
 
-        # Find and remove activity across all days
-        activity_found = False
-
-        for day in existing_itinerary["days"]:
-            original_length = len(day.get("activities", []))
-            day["activities"] = [a for a in day.get("activities", []) if a["id"] != activity_id]
-            if len(day["activities"]) < original_length:
-                activity_found = True
-                day["total_cost"] = calculate_day_cost(day)
-                break
+        itinerary = IndexedItinerary(existing_itinerary)
 
-        if not activity_found:
+        # Find and remove activity
+        try:
+            itinerary.remove_activity(activity_id)
+        except ItineraryItemNotFound:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Activity not found")
 
-        # Recalculate total cost and update timestamp
-        existing_itinerary["total_cost"] = calculate_itinerary_cost(existing_itinerary)
-        existing_itinerary["last_modified"] = datetime.utcnow().isoformat()
+        # Update timestamp
+        itinerary.data["last_modified"] = datetime.utcnow().isoformat()
 
         # Save
-        update_trip_itinerary(trip_id, user_id, existing_itinerary)
+        update_trip_itinerary(trip_id, user_id, itinerary.to_dict())
 
         return
 
@@ -742,64 +846,39 @@ async def reorder_activities(
         if not existing_itinerary:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
 
-        days_by_id = {d["id"]: d for d in existing_itinerary["days"]}
+        itinerary = IndexedItinerary(existing_itinerary)
 
         for operation in reorder_data.operations:
-            activity_id = operation.activity_id
-            target_day_id = operation.target_day_id
-            target_position = operation.position
-
-            # Find the activity and its current day
-            source_day = None
-            activity = None
-
-            for day in existing_itinerary["days"]:
-                for i, a in enumerate(day.get("activities", [])):
-                    if a["id"] == activity_id:
-                        source_day = day
-                        activity = a
-                        day["activities"].pop(i)
-                        break
-                if activity:
-                    break
-
-            if not activity:
+            try:
+                itinerary.get_activity(operation.activity_id)
+            except ItineraryItemNotFound:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Activity {activity_id} not found",
+                    detail=f"Activity {operation.activity_id} not found",
                 )
 
-            # Find target day
-            if target_day_id not in days_by_id:
+            try:
+                itinerary.get_day(operation.target_day_id)
+            except ItineraryItemNotFound:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Target day {target_day_id} not found",
+                    detail=f"Target day {operation.target_day_id} not found",
                 )
 
-            target_day = days_by_id[target_day_id]
-
-            # Insert at target position
-            if "activities" not in target_day:
-                target_day["activities"] = []
-
-            target_position = min(target_position, len(target_day["activities"]))
-            target_day["activities"].insert(target_position, activity)
-
-            # Recalculate costs for affected days
-            if source_day:
-                source_day["total_cost"] = calculate_day_cost(source_day)
-            target_day["total_cost"] = calculate_day_cost(target_day)
+            # Costs of the source and target days are updated incrementally
+            itinerary.move_activity(
+                operation.activity_id, operation.target_day_id, operation.position
+            )
 
-        # Update timestamp and total cost
-        existing_itinerary["total_cost"] = calculate_itinerary_cost(existing_itinerary)
-        existing_itinerary["last_modified"] = datetime.utcnow().isoformat()
+        # Update timestamp
+        itinerary.data["last_modified"] = datetime.utcnow().isoformat()
 
         # Save
-        update_trip_itinerary(trip_id, user_id, existing_itinerary)
+        update_trip_itinerary(trip_id, user_id, itinerary.to_dict())
 
         return ReorderResponse(
             success=True,
-            updated_days=[DayPlan(**d) for d in existing_itinerary["days"]],
+            updated_days=[DayPlan(**d) for d in itinerary.days],
             message=f"Successfully reordered {len(reorder_data.operations)} activities",
         )
 
@@ -811,6 +890,105 @@ async def reorder_activities(
         )
 
 
+# ============================================================================
+# Optimize Routes
+# ============================================================================
+
+
+@router.post(
+    "/{trip_id}/itinerary/optimize",
+    response_model=OptimizeRouteResponse,
+    summary="Optimize daily routes",
+    description="Reorder each day's activities to minimize travel within opening hours",
+)
+async def optimize_itinerary_routes(
+    trip_id: str,
+    optimize_data: OptimizeRouteRequest,
+    token_payload: dict = Depends(verify_jwt_token),
+):
+    """
+    Reorder activities within each day by travel distance and opening hours.
+
+    Activities stay on their day; start/end times and travel to the next
+    activity are recomputed from the new order.
+    """
+    user_id = token_payload["user_id"]
+
+    try:
+        # Get current itinerary
+        trip_response = (
+            supabase.table("trips")
+            .select("id, user_id, trip_details")
+            .eq("id", trip_id)
+            .eq("user_id", user_id)
+            .single()
+            .execute()
+        )
+
+        if not trip_response.data:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
+
+        existing_itinerary = get_trip_itinerary(trip_response.data)
+        if not existing_itinerary:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Itinerary not found")
+
+        itinerary = IndexedItinerary(existing_itinerary)
+
+        day_ids = optimize_data.day_ids or [day["id"] for day in itinerary.days]
+        for day_id in day_ids:
+            try:
+                itinerary.get_day(day_id)
+            except ItineraryItemNotFound:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail=f"Day {day_id} not found"
+                )
+
+        updated_days = []
+        routes = []
+        for day_id in day_ids:
+            try:
+                result = optimize_route(
+                    itinerary.get_day(day_id)["activities"],
+                    day_start=optimize_data.day_start,
+                    mode=optimize_data.transport_mode,
+                )
+            except InvalidActivityError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"Day {day_id}: {e}",
+                ) from e
+            updated_days.append(itinerary.replace_activities(day_id, result["activities"]))
+            routes.append(
+                DayRouteSummary(
+                    day_id=day_id,
+                    total_distance_km=result["total_distance_km"],
+                    original_distance_km=result["original_distance_km"],
+                    late_activities=result["late_activities"],
+                    unrouted_activities=result["unrouted"],
+                )
+            )
+
+        itinerary.data["last_modified"] = datetime.utcnow().isoformat()
+
+        # Save
+        update_trip_itinerary(trip_id, user_id, itinerary.to_dict())
+
+        saved_km = sum(r.original_distance_km - r.total_distance_km for r in routes)
+        return OptimizeRouteResponse(
+            success=True,
+            updated_days=[DayPlan(**d) for d in updated_days],
+            routes=routes,
+            message=f"Optimized {len(routes)} days, saving {saved_km:.1f} km of travel",
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_and_raise_http_error(
+            "optimize itinerary routes", e, "Failed to optimize itinerary. Please try again."
+        )
+
+
 # ============================================================================
 # Sync from AI-Generated Itinerary
 # ============================================================================
@@ -869,6 +1047,7 @@ async def sync_from_ai_itinerary(
         generated_at = ai_report_response.data[0]["generated_at"]
 
         # Transform AI content to editable format
+        currency = ai_content.get("currency", "USD")
         days = []
         daily_plans = ai_content.get("daily_plans", [])
 
@@ -905,7 +1084,7 @@ async def sync_from_ai_itinerary(
                 "title": ai_day.get("title", f"Day {i + 1}"),
                 "notes": ai_day.get("notes"),
                 "activities": activities,
-                "total_cost": sum(a.get("cost_estimate", 0) or 0 for a in activities),
+                "total_cost": calculate_day_cost({"activities": activities}, currency),
             }
             days.append(day)
 
@@ -913,7 +1092,7 @@ async def sync_from_ai_itinerary(
         itinerary_dict = {
             "days": days,
             "total_cost": sum(d.get("total_cost", 0) for d in days),
-            "currency": ai_content.get("currency", "USD"),
+            "currency": currency,
             "last_modified": datetime.utcnow().isoformat(),
         }
 
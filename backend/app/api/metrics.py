@@ -0,0 +1,51 @@
+"""Prometheus metrics endpoint"""
+
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import Response
+
+from app.core import metrics
+from app.core.config import settings
+
+router = APIRouter(tags=["metrics"])
+
+
+def metrics_authorized(authorization: Optional[str]) -> bool:
+    """Whether the request may scrape metrics (open when METRICS_TOKEN is unset)."""
+    if not settings.METRICS_TOKEN:
+        return True
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    return hmac.compare_digest(token.strip().encode(), settings.METRICS_TOKEN.encode())
+
+
+@router.get(
+    "/metrics",
+    include_in_schema=False,
+    summary="Prometheus Metrics",
+    description="API metrics in the Prometheus text format",
+)
+def prometheus_metrics(authorization: Optional[str] = Header(None)) -> Response:
+    """
+    Metrics for scraping by Prometheus.
+
+    When METRICS_TOKEN is set, scrapers must send it as
+    `Authorization: Bearer <METRICS_TOKEN>` (Prometheus `authorization`
+    scrape config).
+
+    Returns:
+        Response: Request latency, in-flight requests, rate-limit rejections,
+        external API latency, cache lookups, queue depth and agent durations
+    """
+    if not settings.METRICS_ENABLED or not metrics.METRICS_AVAILABLE:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics are disabled")
+    if not metrics_authorized(authorization):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE_LATEST)
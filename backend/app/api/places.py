@@ -8,14 +8,27 @@ Uses OpenTripMap API (free tier) for place data.
 import asyncio
 import logging
 import os
+from functools import partial
 from typing import Optional
 
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from app.core.auth import verify_jwt_token
+from app.core.config import settings
 from app.core.errors import log_and_raise_http_error
+from app.core.metrics import async_http_event_hooks
 from app.models.itinerary import PlaceSearchResponse, PlaceSearchResult
+from app.services.gazetteer import get_gazetteer, normalize
+from app.services.places import (
+    geohash,
+    get_autocomplete_index,
+    get_geocode_cache,
+    get_place_details_cache,
+    get_place_tile_cache,
+    get_suggest_cache,
+    nearby,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +36,13 @@ router = APIRouter(prefix="/places", tags=["places"])
 
 # OpenTripMap API configuration
 OPENTRIPMAP_API_KEY = os.getenv("OPENTRIPMAP_API_KEY", "")
-OPENTRIPMAP_BASE_URL = "https://api.opentripmap.com/0.1/en/places"
+OPENTRIPMAP_BASE_URL = "https://api.opentripmap.com/0.1"
+
+
+def opentripmap_url(endpoint: str) -> str:
+    """URL of an OpenTripMap places endpoint (honours OPENTRIPMAP_BASE_URL)."""
+    return f"{settings.OPENTRIPMAP_BASE_URL or OPENTRIPMAP_BASE_URL}/en/places/{endpoint}"
+
 
 # Category mapping for OpenTripMap
 CATEGORY_MAP = {
@@ -42,18 +61,33 @@ CATEGORY_MAP = {
 }
 
 
+class OpenTripMapUnavailable(Exception):
+    """Raised when an OpenTripMap request fails."""
+
+
 async def geocode_location(location: str) -> tuple[float, float]:
     """
     Geocode a location string to coordinates.
-    Uses OpenTripMap's geoname API.
+    Resolved from the offline gazetteer when possible; otherwise uses
+    OpenTripMap's geoname API, with results cached by normalized name.
     """
+    city = get_gazetteer().geocode(location)
+    if city:
+        return (city.lat, city.lng)
+
     if not OPENTRIPMAP_API_KEY:
         # Fallback to a default location (Tokyo) if no API key
         return (35.6762, 139.6503)
 
-    async with httpx.AsyncClient() as client:
+    cache = get_geocode_cache()
+    cache_key = " ".join(location.lower().split())
+    cached = cache.get(cache_key)
+    if cached:
+        return (cached[0], cached[1])
+
+    async with httpx.AsyncClient(event_hooks=async_http_event_hooks("opentripmap")) as client:
         response = await client.get(
-            f"{OPENTRIPMAP_BASE_URL}/geoname",
+            opentripmap_url("geoname"),
             params={
                 "name": location,
                 "apikey": OPENTRIPMAP_API_KEY,
@@ -68,7 +102,61 @@ async def geocode_location(location: str) -> tuple[float, float]:
             )
 
         data = response.json()
-        return (data.get("lat", 0), data.get("lon", 0))
+        coordinates = (data.get("lat", 0), data.get("lon", 0))
+        if data.get("lat") is not None and data.get("lon") is not None:
+            cache.set(cache_key, list(coordinates))
+        return coordinates
+
+
+async def fetch_opentripmap_radius(
+    kinds: str, lat: float, lng: float, radius_meters: int, limit: int
+) -> list[dict]:
+    """Fetch one radius search page from OpenTripMap (used to fill cache tiles)."""
+    async with httpx.AsyncClient(event_hooks=async_http_event_hooks("opentripmap")) as client:
+        response = await client.get(
+            opentripmap_url("radius"),
+            params={
+                "radius": radius_meters,
+                "lon": lng,
+                "lat": lat,
+                "kinds": kinds,
+                "rate": "3h",  # At least 3 stars (heritage) rating
+                "limit": limit,
+                "apikey": OPENTRIPMAP_API_KEY,
+            },
+            timeout=15.0,
+        )
+
+    if response.status_code != 200:
+        msg = f"OpenTripMap radius search failed with status {response.status_code}"
+        raise OpenTripMapUnavailable(msg)
+    return response.json().get("features", [])
+
+
+async def fetch_opentripmap_autosuggest(
+    name: str, lat: float, lng: float, limit: int
+) -> list[dict]:
+    """Look up place names starting with name around a point (autocomplete misses)."""
+    async with httpx.AsyncClient(event_hooks=async_http_event_hooks("opentripmap")) as client:
+        response = await client.get(
+            opentripmap_url("autosuggest"),
+            params={
+                "name": name,
+                "lat": lat,
+                "lon": lng,
+                "radius": 50000,
+                "limit": limit,
+                "format": "json",
+                "apikey": OPENTRIPMAP_API_KEY,
+            },
+            timeout=5.0,
+        )
+
+    if response.status_code != 200:
+        msg = f"OpenTripMap autosuggest failed with status {response.status_code}"
+        raise OpenTripMapUnavailable(msg)
+    data = response.json()
+    return data if isinstance(data, list) else data.get("features", [])
 
 
 async def search_opentripmap(
@@ -80,67 +168,78 @@ async def search_opentripmap(
 ) -> list[dict]:
     """
     Search for places using OpenTripMap API.
+
+    Radius results come from the geohash tile cache (answered locally when
+    the covering tiles are cached) and place details from the xid cache, so
+    repeated searches around popular cities make no remote calls.
     """
     if not OPENTRIPMAP_API_KEY:
         # Return sample data if no API key configured
         return get_sample_places()
 
-    async with httpx.AsyncClient() as client:
-        # First, get place IDs within radius
-        response = await client.get(
-            f"{OPENTRIPMAP_BASE_URL}/radius",
-            params={
-                "radius": radius_meters,
-                "lon": lng,
-                "lat": lat,
-                "kinds": kinds,
-                "rate": "3h",  # At least 3 stars (heritage) rating
-                "limit": limit,
-                "apikey": OPENTRIPMAP_API_KEY,
-            },
-            timeout=15.0,
+    try:
+        places = await get_place_tile_cache().radius_search(
+            lat,
+            lng,
+            radius_meters,
+            fetch=partial(fetch_opentripmap_radius, kinds),
+            category=f"{kinds}:3h",
+            limit=limit,
         )
+    except (OpenTripMapUnavailable, httpx.HTTPError) as e:
+        logger.warning(f"Place search fell back to sample data: {e}")
+        return get_sample_places()
 
-        if response.status_code != 200:
-            return get_sample_places()
+    # Collect all place IDs to fetch
+    xids = [
+        place["properties"].get("xid")
+        for place in places[:limit]
+        if place.get("properties", {}).get("xid")
+    ]
 
-        places = response.json().get("features", [])
+    details_cache = get_place_details_cache()
+    details = await details_cache.get_many_async(xids)
+    to_fetch = [xid for xid, detail in details.items() if detail is None]
 
-        # Get details for each place in parallel (with semaphore for rate limiting)
-        async def fetch_place_details(xid: str) -> dict | None:
-            """Fetch details for a single place."""
-            try:
-                detail_response = await client.get(
-                    f"{OPENTRIPMAP_BASE_URL}/xid/{xid}",
-                    params={"apikey": OPENTRIPMAP_API_KEY},
-                    timeout=5.0,
-                )
-                if detail_response.status_code == 200:
-                    return detail_response.json()
-            except Exception:
-                pass
-            return None
+    if to_fetch:
+        async with httpx.AsyncClient(event_hooks=async_http_event_hooks("opentripmap")) as client:
 
-        # Collect all place IDs to fetch
-        xids = [
-            place["properties"].get("xid")
-            for place in places[:limit]
-            if place["properties"].get("xid")
-        ]
+            async def fetch_place_details(xid: str) -> dict | None:
+                """Fetch details for a single place."""
+                try:
+                    detail_response = await client.get(
+                        opentripmap_url(f"xid/{xid}"),
+                        params={"apikey": OPENTRIPMAP_API_KEY},
+                        timeout=5.0,
+                    )
+                    if detail_response.status_code == 200:
+                        return detail_response.json()
+                except Exception:
+                    pass
+                return None
+
+            # Fetch missing details in parallel (max 5 concurrent requests for rate limiting)
+            semaphore = asyncio.Semaphore(5)
 
-        # Fetch all details in parallel (max 5 concurrent requests for rate limiting)
-        semaphore = asyncio.Semaphore(5)
+            async def fetch_with_semaphore(xid: str) -> dict | None:
+                async with semaphore:
+                    result = await fetch_place_details(xid)
+                    await asyncio.sleep(0.05)  # Small delay for rate limiting
+                    return result
 
-        async def fetch_with_semaphore(xid: str) -> dict | None:
-            async with semaphore:
-                result = await fetch_place_details(xid)
-                await asyncio.sleep(0.05)  # Small delay for rate limiting
-                return result
+            results = await asyncio.gather(*[fetch_with_semaphore(xid) for xid in to_fetch])
 
-        results = await asyncio.gather(*[fetch_with_semaphore(xid) for xid in xids])
-        detailed_places = [r for r in results if r is not None]
+        fetched = {
+            xid: result for xid, result in zip(to_fetch, results, strict=True) if result is not None
+        }
+        await details_cache.set_many_async(fetched)
+        details.update(fetched)
 
-        return detailed_places
+    found = [details[xid] for xid in xids if details.get(xid) is not None]
+    # Remember the places for autocomplete (the index loads from and writes to Redis)
+    index = await asyncio.to_thread(get_autocomplete_index)
+    await index.add_places_async(found, CATEGORY_MAP)
+    return found
 
 
 def get_sample_places() -> list[dict]:
@@ -400,52 +499,51 @@ async def autocomplete_places(
     """
     Get autocomplete suggestions for place names.
 
-    Returns simple name suggestions for quick selection.
+    Suggestions come from the in-memory autocomplete index (gazetteer
+    destinations plus places seen in earlier results), ranked by popularity
+    and distance to the location context. OpenTripMap autosuggest is only
+    called when the index cannot fill the request with suggestions near the
+    location context, once per query and area.
     """
     try:
-        # If no API key, return sample suggestions
-        if not OPENTRIPMAP_API_KEY:
+        # Building the index on first use reads Redis
+        index = await asyncio.to_thread(get_autocomplete_index)
+        near = None
+        if location:
+            city = get_gazetteer().geocode(location)
+            near = (city.lat, city.lng) if city else None
+
+        suggestions = index.suggest(query, limit, near)
+        # Far-away matches do not answer a query with a location context
+        relevant = suggestions if near is None else nearby(suggestions, near)
+        if len(relevant) < limit and OPENTRIPMAP_API_KEY and len(query.strip()) >= 3:
+            if near is None and location:
+                near = await geocode_location(location)
+            center = near or (35.6762, 139.6503)
+
+            cache = get_suggest_cache()
+            cache_key = f"{normalize(query)}:{geohash.encode(center[0], center[1], 3)}"
+            if await asyncio.to_thread(cache.get, cache_key) is None:
+                try:
+                    places = await fetch_opentripmap_autosuggest(query, *center, limit=limit * 2)
+                except (OpenTripMapUnavailable, httpx.HTTPError) as e:
+                    logger.warning(f"Autosuggest lookup failed: {e}")
+                else:
+                    await index.add_places_async(places, CATEGORY_MAP)
+                    await asyncio.to_thread(cache.set, cache_key, len(places))
+                    suggestions = index.suggest(query, limit, center)
+
+        if not suggestions and not OPENTRIPMAP_API_KEY:
+            # Sample suggestions for development without an API key
             return [
                 {"name": f"{query} Museum", "type": "museum"},
                 {"name": f"{query} Restaurant", "type": "restaurant"},
                 {"name": f"{query} Park", "type": "park"},
             ][:limit]
 
-        # Get center for search
-        if location:
-            center_lat, center_lng = await geocode_location(location)
-        else:
-            center_lat, center_lng = 35.6762, 139.6503
-
-        # Search with a reasonable radius
-        raw_places = await search_opentripmap(
-            lat=center_lat,
-            lng=center_lng,
-            radius_meters=50000,  # 50km radius for autocomplete
-            kinds="interesting_places",
-            limit=limit * 2,
-        )
-
-        # Filter and format suggestions
-        suggestions = []
-        for place in raw_places:
-            name = place.get("name", "")
-            if name and query.lower() in name.lower():
-                kinds = place.get("kinds", "").split(",")
-                category = "attraction"
-                for kind in kinds:
-                    for our_cat, otm_cat in CATEGORY_MAP.items():
-                        if otm_cat in kind:
-                            category = our_cat
-                            break
+        return [suggestion.to_response() for suggestion in suggestions]
 
-                suggestions.append({"name": name, "type": category})
-
-                if len(suggestions) >= limit:
-                    break
-
-        return suggestions
-
-    except Exception as e:
+    except Exception:
         # Return empty list on error (graceful degradation)
+        logger.exception("Autocomplete failed")
         return []
@@ -1,13 +1,18 @@
 """Trips API endpoints"""
 
 import logging
-from datetime import date, datetime
+import math
+from datetime import date, datetime, timedelta
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 
 from app.core.auth import verify_jwt_token
+from app.core.config import settings
 from app.core.errors import log_and_raise_http_error
+from app.core.generation_lease import get_generation_lease
+from app.core.metrics import queue_depth
+from app.core.profiling import PROFILE_TASK_HEADER, profiling_authorized
 from app.core.supabase import supabase
 
 logger = logging.getLogger(__name__)
@@ -60,10 +65,63 @@ from app.models.trips import (
     VersionCompareResponse,
 )
 from app.services.change_detector import ChangeDetector
+from app.services.duration_estimator import get_duration_estimator, parse_timestamp
+from app.services.trip_versions import compare_versions, load_trip_versions, save_trip_version
 
 router = APIRouter(prefix="/trips", tags=["trips"])
 
 
+def _trip_list_item(trip: dict, today: date) -> dict:
+    """Trip summary (TripListItem format) for a trips row, with its display status."""
+    # Extract destination from first destination in array
+    destination_name = "Unknown"
+    if trip.get("destinations") and len(trip["destinations"]) > 0:
+        first_dest = trip["destinations"][0]
+        city, country = first_dest.get("city", ""), first_dest.get("country", "")
+        destination_name = f"{city}, {country}".strip(", ")
+
+    # Extract dates from trip_details
+    trip_details = trip.get("trip_details", {})
+    start_date = trip_details.get("departureDate", "")
+    end_date = trip_details.get("returnDate", "")
+
+    # Determine display status
+    if trip["status"] == "completed":
+        display_status = "completed"
+    elif trip["status"] in ["draft", "pending", "processing"]:
+        # Check if trip is in future or past
+        if start_date:
+            try:
+                departure = datetime.fromisoformat(start_date.replace("Z", "+00:00"))
+                if departure.date() > today:
+                    display_status = "upcoming"
+                elif end_date:
+                    return_date = datetime.fromisoformat(end_date.replace("Z", "+00:00"))
+                    if return_date.date() >= today:
+                        display_status = "in-progress"
+                    else:
+                        display_status = "completed"
+                else:
+                    display_status = "in-progress"
+            except (ValueError, AttributeError):
+                display_status = "upcoming"
+        else:
+            display_status = "upcoming"
+    else:
+        display_status = "completed"
+
+    return {
+        "id": trip["id"],
+        "destination": destination_name,
+        "startDate": start_date,
+        "endDate": end_date,
+        "status": display_status,
+        "createdAt": trip["created_at"],
+        "deletionDate": trip.get("auto_delete_at", ""),
+        "coverImageUrl": trip.get("cover_image_url"),
+    }
+
+
 @router.get("")
 async def list_trips(
     status_filter: str | None = Query(None, description="Filter by trip status"),
@@ -106,58 +164,8 @@ async def list_trips(
             return {"items": [], "nextCursor": None}
 
         # Transform to TripListItem format
-        items = []
-        for trip in response.data:
-            # Extract destination from first destination in array
-            destination_name = "Unknown"
-            if trip.get("destinations") and len(trip["destinations"]) > 0:
-                first_dest = trip["destinations"][0]
-                destination_name = (
-                    f"{first_dest.get('city', '')}, {first_dest.get('country', '')}".strip(", ")
-                )
-
-            # Extract dates from trip_details
-            trip_details = trip.get("trip_details", {})
-            start_date = trip_details.get("departureDate", "")
-            end_date = trip_details.get("returnDate", "")
-
-            # Determine display status
-            if trip["status"] == "completed":
-                display_status = "completed"
-            elif trip["status"] in ["draft", "pending", "processing"]:
-                # Check if trip is in future or past
-                if start_date:
-                    try:
-                        departure = datetime.fromisoformat(start_date.replace("Z", "+00:00"))
-                        if departure.date() > date.today():
-                            display_status = "upcoming"
-                        elif end_date:
-                            return_date = datetime.fromisoformat(end_date.replace("Z", "+00:00"))
-                            if return_date.date() >= date.today():
-                                display_status = "in-progress"
-                            else:
-                                display_status = "completed"
-                        else:
-                            display_status = "in-progress"
-                    except (ValueError, AttributeError):
-                        display_status = "upcoming"
-                else:
-                    display_status = "upcoming"
-            else:
-                display_status = "completed"
-
-            items.append(
-                {
-                    "id": trip["id"],
-                    "destination": destination_name,
-                    "startDate": start_date,
-                    "endDate": end_date,
-                    "status": display_status,
-                    "createdAt": trip["created_at"],
-                    "deletionDate": trip.get("auto_delete_at", ""),
-                    "coverImageUrl": trip.get("cover_image_url"),
-                }
-            )
+        today = date.today()
+        items = [_trip_list_item(trip, today) for trip in response.data]
 
         # Determine if there are more results (simple pagination)
         next_cursor = None
@@ -597,25 +605,76 @@ async def delete_trip(trip_id: str, token_payload: dict = Depends(verify_jwt_tok
         log_and_raise_http_error("delete trip", e, "Failed to delete trip. Please try again.")
 
 
+# Report agents in run order: visa, country, weather, currency, culture, food,
+# attractions, itinerary, then flight (Phase 4) for trips with an origin city
+REPORT_AGENT_ORDER = [
+    "visa",
+    "country",
+    "weather",
+    "currency",
+    "culture",
+    "food",
+    "attractions",
+    "itinerary",
+    "flight",
+]
+
+
+def _report_agents(traveler_details: dict | None) -> list[str]:
+    """Agents a report run will execute for a trip, in run order."""
+    traveler = traveler_details or {}
+    if traveler.get("origin_city") or traveler.get("originCity"):
+        return list(REPORT_AGENT_ORDER)
+    return [agent for agent in REPORT_AGENT_ORDER if agent != "flight"]
+
+
+def _estimated_queue_wait() -> float | None:
+    """Seconds until a newly queued report run starts (None if the queue cannot be read)."""
+    queued = queue_depth(settings.GENERATION_QUEUE)
+    if queued is None:
+        return None
+    # Runs ahead are counted without the flight agent, which only some trips run
+    report_seconds = get_duration_estimator().report_seconds(_report_agents(None))
+    return math.ceil(queued / settings.GENERATION_WORKER_SLOTS) * report_seconds
+
+
 @router.post("/{trip_id}/generate", status_code=status.HTTP_202_ACCEPTED)
-async def generate_trip_report(trip_id: str, token_payload: dict = Depends(verify_jwt_token)):
+async def generate_trip_report(
+    trip_id: str,
+    force: bool = Query(False, description="Re-run agents even if their inputs are unchanged"),
+    profile_token: str | None = Header(None, alias=PROFILE_TASK_HEADER, include_in_schema=False),
+    token_payload: dict = Depends(verify_jwt_token),
+):
     """
     Start AI report generation for a trip
 
     Path Parameters:
     - trip_id: UUID of the trip
 
+    Query Parameters:
+    - force: Re-run every agent. By default, agents whose input fingerprint
+      matches their existing report section are skipped.
+
     Returns:
-    - status: "queued"
-    - task_id: Celery task ID for tracking
+    - status: "queued", or "in_progress" if a generation is already running
+    - task_id: Celery task ID for tracking (the in-flight task if already running)
     - message: Human-readable message
 
     Notes:
     - Trip status must be 'draft' or 'pending'
     - Trip status will be updated to 'processing'
     - Report generation is handled asynchronously by Celery workers
+    - Only one generation runs per trip (per-trip lease); duplicate requests
+      get the in-flight task ID instead of starting a second run
+    - With GENERATION_MAX_QUEUE_WAIT_SECONDS set, returns 503 (with Retry-After)
+      while the estimated wait for a worker is longer than that
+    - With X-Profile-Task set to the profiling token, the run is profiled and
+      its flame graph data stored on the orchestrator's agent_jobs row
     """
     user_id = token_payload["user_id"]
+    lease = get_generation_lease()
+    task_id = str(uuid4())
+    lease_acquired = False
 
     try:
         # Verify trip exists and belongs to user
@@ -633,11 +692,25 @@ async def generate_trip_report(trip_id: str, token_payload: dict = Depends(verif
 
         existing_trip = existing_response.data
 
+        # Single-flight: only one generation per trip at a time
+        lease_acquired, holder_task_id = lease.acquire(trip_id, task_id)
+        if not lease_acquired:
+            return {
+                "status": "in_progress",
+                "task_id": holder_task_id,
+                "message": "Report generation already in progress for this trip.",
+            }
+
         # Check if trip status allows report generation
         if existing_trip["status"] == TripStatus.PROCESSING.value:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Report generation already in progress for this trip",
+            if not lease.is_available():
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Report generation already in progress for this trip",
+                )
+            # We got the lease, so no task is running: the previous run died
+            logger.warning(
+                f"Trip {trip_id} stuck in processing with no active lease. Allowing regeneration."
             )
 
         if existing_trip["status"] == TripStatus.COMPLETED.value:
@@ -663,6 +736,16 @@ async def generate_trip_report(trip_id: str, token_payload: dict = Depends(verif
             # Allow retry for failed trips
             pass
 
+        # Admission: refuse when the queue ahead would take too long to clear
+        if settings.GENERATION_MAX_QUEUE_WAIT_SECONDS:
+            queue_wait = _estimated_queue_wait()
+            if queue_wait is not None and queue_wait > settings.GENERATION_MAX_QUEUE_WAIT_SECONDS:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Report generation is busy. Please try again shortly.",
+                    headers={"Retry-After": str(round(queue_wait))},
+                )
+
         # Update trip status to 'processing'
         update_response = (
             supabase.table("trips")
@@ -672,10 +755,15 @@ async def generate_trip_report(trip_id: str, token_payload: dict = Depends(verif
             .execute()
         )
 
-        # Queue Celery task for report generation
+        # Queue Celery task for report generation (task ID matches the lease holder)
         from app.tasks.agent_jobs import execute_orchestrator
 
-        task = execute_orchestrator.delay(trip_id)
+        task = execute_orchestrator.apply_async(
+            args=[trip_id],
+            kwargs={"force": force},
+            task_id=task_id,
+            headers={"profile": True} if profiling_authorized(profile_token) else None,
+        )
 
         return {
             "status": "queued",
@@ -684,8 +772,13 @@ async def generate_trip_report(trip_id: str, token_payload: dict = Depends(verif
         }
 
     except HTTPException:
+        if lease_acquired:
+            lease.release(trip_id, task_id)
         raise
     except Exception as e:
+        if lease_acquired:
+            lease.release(trip_id, task_id)
+
         # Rollback status update on failure
         try:
             supabase.table("trips").update({"status": TripStatus.FAILED.value}).eq(
@@ -716,6 +809,11 @@ async def get_generation_status(trip_id: str, token_payload: dict = Depends(veri
     - error: Error message (if failed)
     - started_at: When report generation started
     - completed_at: When report generation completed (if done)
+    - eta_seconds: Estimated seconds until the report is complete (if processing)
+    - estimated_completion_at: When the report is expected to be complete
+
+    Progress and ETA are weighted by each agent's learned duration
+    (app/services/duration_estimator.py), not by the number of agents.
     """
     user_id = token_payload["user_id"]
 
@@ -723,7 +821,7 @@ async def get_generation_status(trip_id: str, token_payload: dict = Depends(veri
         # Get trip status
         trip_response = (
             supabase.table("trips")
-            .select("status, created_at, updated_at")
+            .select("status, created_at, updated_at, traveler_details")
             .eq("id", trip_id)
             .eq("user_id", user_id)
             .single()
@@ -754,35 +852,21 @@ async def get_generation_status(trip_id: str, token_payload: dict = Depends(veri
         # This gives us accurate progress since sections are saved incrementally
         sections_response = (
             supabase.table("report_sections")
-            .select("section_type")
+            .select("section_type, generated_at")
             .eq("trip_id", trip_id)
             .execute()
         )
 
-        completed_sections = [s["section_type"] for s in (sections_response.data or [])]
+        sections = sections_response.data or []
+        completed_sections = [s["section_type"] for s in sections]
 
-        # Total agents that will be run (Phase 1 + Phase 2 + Phase 3 + Phase 4)
-        # Phase 1: visa, country, weather, currency, culture
-        # Phase 2: food, attractions
-        # Phase 3: itinerary
-        # Phase 4: flight (conditional, but count it for progress)
-        total_agents = 9
         agents_completed = completed_sections
         agents_failed = []
 
         # Determine current agent based on what's completed
-        # Agents run in order: visa, country, weather, currency, culture, food, attractions, itinerary, flight
-        agent_order = [
-            "visa",
-            "country",
-            "weather",
-            "currency",
-            "culture",
-            "food",
-            "attractions",
-            "itinerary",
-            "flight",
-        ]
+        agent_order = _report_agents(trip.get("traveler_details"))
+        if "flight" in completed_sections and "flight" not in agent_order:
+            agent_order.append("flight")
         current_agent = None
 
         if trip["status"] == "processing":
@@ -792,9 +876,27 @@ async def get_generation_status(trip_id: str, token_payload: dict = Depends(veri
                     current_agent = agent_name
                     break
 
-        # Calculate progress
-        completed_count = len(agents_completed)
-        progress = int((completed_count / total_agents) * 100) if total_agents > 0 else 0
+        # Progress weighted by expected agent durations of the agents that will run
+        estimator = get_duration_estimator()
+        expected = {agent: estimator.expected_seconds(agent) for agent in agent_order}
+        done = sum(expected[agent] for agent in agent_order if agent in completed_sections)
+        progress = int(done / sum(expected.values()) * 100)
+
+        # ETA: the running agent started when the last section was saved (or the run started)
+        eta_seconds = None
+        estimated_completion_at = None
+        if current_agent:
+            now = datetime.utcnow()
+            marks = [parse_timestamp(s.get("generated_at")) for s in sections]
+            marks.append(parse_timestamp(started_at))
+            current_started = max((mark for mark in marks if mark), default=now)
+            remaining = [agent for agent in agent_order if agent not in completed_sections]
+            eta_seconds = round(
+                estimator.remaining_seconds(
+                    remaining, elapsed=(now - current_started).total_seconds()
+                )
+            )
+            estimated_completion_at = (now + timedelta(seconds=eta_seconds)).isoformat()
 
         return {
             "status": trip["status"],
@@ -805,6 +907,8 @@ async def get_generation_status(trip_id: str, token_payload: dict = Depends(veri
             "error": first_error,
             "started_at": started_at,
             "completed_at": (trip["updated_at"] if trip["status"] == "completed" else None),
+            "eta_seconds": eta_seconds,
+            "estimated_completion_at": estimated_completion_at,
         }
 
     except HTTPException:
@@ -2215,6 +2319,7 @@ async def preview_changes(
 @router.post("/{trip_id}/recalculate", response_model=RecalculationResponse)
 async def recalculate_trip(
     trip_id: str,
+    response: Response,
     recalc_request: RecalculationRequest | None = None,
     token_payload: dict = Depends(verify_jwt_token),
 ):
@@ -2238,8 +2343,14 @@ async def recalculate_trip(
     - affected_agents: List of agents being recalculated
     - estimated_time: Estimated time in seconds
     - message: Status message
+
+    If a generation or recalculation is already running for the trip, responds
+    with 202 and the in-flight task ID instead of queueing a second task.
     """
     user_id = token_payload["user_id"]
+    lease = get_generation_lease()
+    task_id = str(uuid4())
+    lease_acquired = False
 
     try:
         # Verify trip exists and belongs to user
@@ -2255,17 +2366,29 @@ async def recalculate_trip(
 
         existing_trip = existing_response.data[0]
 
+        # Determine which agents to recalculate
+        request_data = recalc_request or RecalculationRequest()
+        agents_to_recalc = request_data.agents
+
+        # Single-flight: point duplicate requests at the in-flight task
+        lease_acquired, holder_task_id = lease.acquire(trip_id, task_id)
+        if not lease_acquired:
+            response.status_code = status.HTTP_202_ACCEPTED
+            return RecalculationResponse(
+                task_id=holder_task_id or "",
+                status=RecalculationStatusEnum.IN_PROGRESS,
+                affected_agents=agents_to_recalc or [],
+                estimated_time=0,
+                message="Recalculation already in progress for this trip",
+            )
+
         # Check if trip is in a recalculable state
-        if existing_trip.get("status") == "processing":
+        if existing_trip.get("status") == "processing" and not lease.is_available():
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Trip is currently being processed. Please wait for completion.",
             )
 
-        # Determine which agents to recalculate
-        request_data = recalc_request or RecalculationRequest()
-        agents_to_recalc = request_data.agents
-
         if not agents_to_recalc:
             # If no agents specified, get all agents that have reports
             reports_response = (
@@ -2298,13 +2421,15 @@ async def recalculate_trip(
         try:
             from app.tasks.agent_jobs import execute_selective_recalc
 
-            task = execute_selective_recalc.delay(trip_id, agents_to_recalc)
+            task = execute_selective_recalc.apply_async(
+                args=[trip_id, agents_to_recalc],
+                kwargs={"force": request_data.force},
+                task_id=task_id,
+            )
             task_id = task.id
         except Exception as celery_error:
             # If Celery is not available, return a mock response
-            import uuid
-
-            task_id = str(uuid.uuid4())
+            lease.release(trip_id, task_id)
 
         # Update trip status to processing
         supabase.table("trips").update(
@@ -2322,8 +2447,12 @@ async def recalculate_trip(
         )
 
     except HTTPException:
+        if lease_acquired:
+            lease.release(trip_id, task_id)
         raise
     except Exception as e:
+        if lease_acquired:
+            lease.release(trip_id, task_id)
         log_and_raise_http_error(
             "trigger recalculation", e, "Failed to trigger recalculation. Please try again."
         )
@@ -2562,6 +2691,30 @@ async def cancel_recalculation(
         log_and_raise_http_error("cancel recalculation", e, "Failed to cancel recalculation.")
 
 
+def _queue_recalc_under_lease(trip_id: str, agents: list[str]) -> tuple[str, bool]:
+    """
+    Queue a selective recalculation while holding the trip's generation lease.
+
+    Returns:
+        (task_id, queued): the new task, or the in-flight task's ID with
+        queued=False if a generation or recalculation already holds the lease
+    """
+    from app.tasks.agent_jobs import execute_selective_recalc
+
+    lease = get_generation_lease()
+    task_id = str(uuid4())
+    lease_acquired, holder_task_id = lease.acquire(trip_id, task_id)
+    if not lease_acquired:
+        return holder_task_id or "", False
+
+    try:
+        task = execute_selective_recalc.apply_async(args=[trip_id, agents], task_id=task_id)
+    except Exception:
+        lease.release(trip_id, task_id)
+        raise
+    return task.id, True
+
+
 @router.put("/{trip_id}/with-recalc", response_model=TripUpdateWithRecalcResponse)
 async def update_trip_with_recalc(
     trip_id: str,
@@ -2656,15 +2809,13 @@ async def update_trip_with_recalc(
         # Create version history entry before updating
         version_number = existing_trip.get("version", 0) + 1
         try:
-            supabase.table("trip_versions").insert(
-                {
-                    "trip_id": trip_id,
-                    "version_number": version_number - 1,  # Store the old version
-                    "trip_data": old_trip,
-                    "change_summary": f"Update before version {version_number}",
-                    "fields_changed": list(change_result.changes.keys()),
-                }
-            ).execute()
+            save_trip_version(
+                trip_id,
+                version_number - 1,  # Store the old version
+                old_trip,
+                f"Update before version {version_number}",
+                list(change_result.changes.keys()),
+            )
         except Exception:
             # Version history table might not exist yet - that's OK
             pass
@@ -2699,25 +2850,33 @@ async def update_trip_with_recalc(
 
             if has_reports:
                 try:
-                    from app.tasks.agent_jobs import execute_selective_recalc
-
-                    task = execute_selective_recalc.delay(trip_id, change_result.affected_agents)
-                    task_id = task.id
-
-                    # Update trip status
-                    supabase.table("trips").update(
-                        {
-                            "status": TripStatus.PROCESSING.value,
-                        }
-                    ).eq("id", trip_id).execute()
-
-                    recalculation = RecalculationResponse(
-                        task_id=task_id,
-                        status=RecalculationStatusEnum.QUEUED,
-                        affected_agents=change_result.affected_agents,
-                        estimated_time=change_result.estimated_recalc_time,
-                        message=f"Recalculation queued for {len(change_result.affected_agents)} agent(s)",
+                    task_id, queued = _queue_recalc_under_lease(
+                        trip_id, change_result.affected_agents
                     )
+
+                    if queued:
+                        # Update trip status
+                        supabase.table("trips").update(
+                            {
+                                "status": TripStatus.PROCESSING.value,
+                            }
+                        ).eq("id", trip_id).execute()
+
+                        recalculation = RecalculationResponse(
+                            task_id=task_id,
+                            status=RecalculationStatusEnum.QUEUED,
+                            affected_agents=change_result.affected_agents,
+                            estimated_time=change_result.estimated_recalc_time,
+                            message=f"Recalculation queued for {len(change_result.affected_agents)} agent(s)",
+                        )
+                    else:
+                        recalculation = RecalculationResponse(
+                            task_id=task_id,
+                            status=RecalculationStatusEnum.IN_PROGRESS,
+                            affected_agents=change_result.affected_agents,
+                            estimated_time=0,
+                            message="Recalculation already in progress for this trip",
+                        )
                 except Exception:
                     # Celery not available
                     pass
@@ -2792,10 +2951,10 @@ async def list_trip_versions(
 
         current_version = trip_response.data[0].get("version", 1)
 
-        # Fetch version history
+        # Fetch version history (summaries only, not the stored data)
         versions_response = (
             supabase.table("trip_versions")
-            .select("*")
+            .select("version_number, created_at, change_summary, fields_changed")
             .eq("trip_id", trip_id)
             .order("version_number", desc=True)
             .execute()
@@ -2866,66 +3025,18 @@ async def compare_trip_versions(
         # Ensure version_a < version_b for consistent comparison
         v_min, v_max = min(version_a, version_b), max(version_a, version_b)
 
-        # Fetch both versions
-        versions_response = (
-            supabase.table("trip_versions")
-            .select("*")
-            .eq("trip_id", trip_id)
-            .in_("version_number", [v_min, v_max])
-            .execute()
-        )
-
-        if not versions_response.data or len(versions_response.data) < 2:
+        # Diff the stored versions (from deltas when they share a keyframe)
+        diff = compare_versions(trip_id, v_min, v_max)
+        if diff is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"One or both versions not found. Available versions may not include {version_a} and {version_b}.",
             )
 
-        # Map versions by number
-        version_map = {v["version_number"]: v for v in versions_response.data}
-
-        if v_min not in version_map or v_max not in version_map:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Version {v_min if v_min not in version_map else v_max} not found",
-            )
-
-        data_a = version_map[v_min].get("trip_data", {})
-        data_b = version_map[v_max].get("trip_data", {})
-
-        # Compare the two versions
-        changes = []
-        all_keys = set(data_a.keys()) | set(data_b.keys())
-
-        def compare_values(key: str, val_a, val_b, prefix: str = ""):
-            """Recursively compare values and generate FieldChange objects."""
-            field_name = f"{prefix}{key}" if prefix else key
-
-            if val_a == val_b:
-                return []
-
-            # If both are dicts, compare nested
-            if isinstance(val_a, dict) and isinstance(val_b, dict):
-                nested_changes = []
-                nested_keys = set(val_a.keys()) | set(val_b.keys())
-                for nested_key in nested_keys:
-                    nested_changes.extend(
-                        compare_values(
-                            nested_key,
-                            val_a.get(nested_key),
-                            val_b.get(nested_key),
-                            f"{field_name}.",
-                        )
-                    )
-                return nested_changes
-
-            # Different values
-            return [FieldChange(field=field_name, old_value=val_a, new_value=val_b)]
-
-        for key in all_keys:
-            val_a = data_a.get(key)
-            val_b = data_b.get(key)
-            changes.extend(compare_values(key, val_a, val_b))
+        changes = [
+            FieldChange(field=field, old_value=old_value, new_value=new_value)
+            for field, old_value, new_value in diff
+        ]
 
         # Generate summary
         change_count = len(changes)
@@ -2995,39 +3106,29 @@ async def restore_trip_version(
         current_trip = trip_response.data[0]
         current_version = current_trip.get("version", 1)
 
-        # Fetch the version to restore
-        version_response = (
-            supabase.table("trip_versions")
-            .select("*")
-            .eq("trip_id", trip_id)
-            .eq("version_number", version_number)
-            .execute()
-        )
+        # Fetch (and rebuild) the version to restore
+        restored = load_trip_versions(trip_id, [version_number])
 
-        if not version_response.data or len(version_response.data) == 0:
+        if version_number not in restored:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Version {version_number} not found for trip {trip_id}",
             )
 
-        version_data = version_response.data[0]
-        trip_data = version_data.get("trip_data", {})
+        trip_data = restored[version_number]
 
         # Save current state as a new version entry
-        supabase.table("trip_versions").insert(
+        save_trip_version(
+            trip_id,
+            current_version,
             {
-                "trip_id": trip_id,
-                "version_number": current_version,
-                "trip_data": {
-                    "traveler_details": current_trip.get("traveler_details"),
-                    "destinations": current_trip.get("destinations", []),
-                    "trip_details": current_trip.get("trip_details"),
-                    "preferences": current_trip.get("preferences"),
-                },
-                "change_summary": f"State before restoring to version {version_number}",
-                "fields_changed": [],
-            }
-        ).execute()
+                "traveler_details": current_trip.get("traveler_details"),
+                "destinations": current_trip.get("destinations", []),
+                "trip_details": current_trip.get("trip_details"),
+                "preferences": current_trip.get("preferences"),
+            },
+            f"State before restoring to version {version_number}",
+        )
 
         # Restore the old version data
         new_version = current_version + 1
@@ -3041,7 +3142,8 @@ async def restore_trip_version(
 
         supabase.table("trips").update(update_fields).eq("id", trip_id).execute()
 
-        # Trigger full recalculation since we're restoring an old version
+        # Trigger recalculation since we're restoring an old version
+        # (agents whose input fingerprint still matches their section are skipped)
         recalculation = None
         if current_trip.get("status") in ["completed", "failed"]:
             all_agents = [
@@ -3055,24 +3157,31 @@ async def restore_trip_version(
                 "itinerary",
             ]
             try:
-                from app.tasks.agent_jobs import execute_selective_recalc
+                task_id, queued = _queue_recalc_under_lease(trip_id, all_agents)
 
-                task = execute_selective_recalc.delay(trip_id, all_agents)
-
-                supabase.table("trips").update(
-                    {
-                        "status": TripStatus.PROCESSING.value,
-                    }
-                ).eq("id", trip_id).execute()
+                if queued:
+                    supabase.table("trips").update(
+                        {
+                            "status": TripStatus.PROCESSING.value,
+                        }
+                    ).eq("id", trip_id).execute()
 
-                detector = ChangeDetector()
-                recalculation = RecalculationResponse(
-                    task_id=task.id,
-                    status=RecalculationStatusEnum.QUEUED,
-                    affected_agents=all_agents,
-                    estimated_time=detector.estimate_recalc_time(all_agents),
-                    message="Full recalculation triggered after version restore",
-                )
+                    detector = ChangeDetector()
+                    recalculation = RecalculationResponse(
+                        task_id=task_id,
+                        status=RecalculationStatusEnum.QUEUED,
+                        affected_agents=all_agents,
+                        estimated_time=detector.estimate_recalc_time(all_agents),
+                        message="Full recalculation triggered after version restore",
+                    )
+                else:
+                    recalculation = RecalculationResponse(
+                        task_id=task_id,
+                        status=RecalculationStatusEnum.IN_PROGRESS,
+                        affected_agents=all_agents,
+                        estimated_time=0,
+                        message="Recalculation already in progress for this trip",
+                    )
             except Exception:
                 pass
 
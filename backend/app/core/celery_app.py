@@ -10,15 +10,25 @@ Architecture:
 - JSON serialization for task arguments and results
 - Auto-discovery of tasks from app.tasks module
 - Idempotent tasks to prevent duplicate database entries
+- Prometheus exporter in each worker (task durations, agent runs, external
+  API calls), see app/core/metrics.py
+- On-demand profiling of single runs sent with headers={"profile": True},
+  stored on their agent_jobs row, see app/core/profiling.py
 """
 
+import inspect
 import logging
+import os
+import time
 from typing import Any
 
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import task_postrun, task_prerun, worker_process_shutdown, worker_ready
 
+from app.core import metrics
 from app.core.config import settings
+from app.core.profiling import SamplingProfiler
 
 logger = logging.getLogger(__name__)
 
@@ -81,9 +91,127 @@ celery_app.conf.update(
             "task": "app.tasks.cleanup.process_deletion_queue",
             "schedule": crontab(hour=3, minute=0),  # Run at 3 AM daily
         },
+        "refresh-visa-matrix": {
+            "task": "app.tasks.visa_matrix.refresh_visa_matrix",
+            "schedule": crontab(minute=15),  # Hourly, within the per-run request budget
+        },
+        "refresh-exchange-rates": {
+            "task": "app.tasks.exchange_rates.refresh_exchange_rates",
+            "schedule": crontab(hour=0, minute=30),  # Daily, after rates are published
+        },
+        "refresh-country-catalog": {
+            "task": "app.tasks.country_catalog.refresh_country_catalog",
+            "schedule": crontab(hour=4, minute=30, day_of_week=1),  # Weekly, Monday 4:30 AM
+        },
+        "refresh-agent-durations": {
+            "task": "app.tasks.agent_durations.refresh_agent_durations",
+            "schedule": crontab(minute="*/15"),  # Recent runs feed the ETAs within 15 minutes
+        },
     },
 )
 
+# ==============================================
+# Worker Metrics
+# ==============================================
+
+# task_id -> perf_counter at start (per pool process)
+_task_started: dict[str, float] = {}
+
+
+@task_prerun.connect
+def _record_task_start(task_id: str | None = None, task: Any = None, **kwargs: Any) -> None:
+    _task_started[task_id] = time.perf_counter()
+    metrics.track_task_in_progress(task.name, 1)
+
+
+@task_postrun.connect
+def _record_task_end(
+    task_id: str | None = None, task: Any = None, state: str | None = None, **kwargs: Any
+) -> None:
+    started = _task_started.pop(task_id, None)
+    metrics.track_task_in_progress(task.name, -1)
+    if started is not None:
+        metrics.observe_task(task.name, state or "UNKNOWN", time.perf_counter() - started)
+
+
+@worker_ready.connect
+def _start_metrics_exporter(**kwargs: Any) -> None:
+    if settings.METRICS_ENABLED and settings.METRICS_WORKER_PORT:
+        metrics.start_worker_exporter(settings.METRICS_WORKER_PORT)
+
+
+@worker_process_shutdown.connect
+def _forget_pool_process(pid: int | None = None, **kwargs: Any) -> None:
+    metrics.mark_process_dead(pid or os.getpid())
+
+
+# ==============================================
+# On-demand Task Profiling
+# ==============================================
+
+# task_id -> profiler for runs sent with headers={"profile": True}
+_task_profilers: dict[str, SamplingProfiler] = {}
+
+
+def _profile_requested(request: Any) -> bool:
+    headers = request.get("headers") or {}
+    return bool(request.get("profile") or headers.get("profile"))
+
+
+def _agent_job_filters(
+    task: Any, task_id: str, args: tuple | None, kwargs: dict | None
+) -> dict[str, str]:
+    """Columns identifying the agent_jobs row of a task run."""
+    try:
+        params = inspect.signature(task.run).bind_partial(*(args or ()), **(kwargs or {}))
+    except TypeError:
+        params = None
+    arguments = params.arguments if params else {}
+    if arguments.get("job_id"):
+        return {"id": arguments["job_id"]}
+    if arguments.get("trip_id") and arguments.get("agent_type"):
+        return {"trip_id": arguments["trip_id"], "agent_type": arguments["agent_type"]}
+    return {"celery_task_id": task_id}
+
+
+def _start_task_profile(task_id: str | None = None, task: Any = None, **kwargs: Any) -> None:
+    if _profile_requested(task.request):
+        _task_profilers[task_id] = SamplingProfiler().start()
+
+
+def _store_task_profile(
+    task_id: str | None = None,
+    task: Any = None,
+    args: tuple | None = None,
+    kwargs: dict | None = None,
+    **extra: Any,
+) -> None:
+    profiler = _task_profilers.pop(task_id, None)
+    if profiler is None:
+        return
+    profile = profiler.stop().summary()
+    filters = _agent_job_filters(task, task_id, args, kwargs)
+    logger.info(
+        f"Profiled task {task.name}",
+        extra={"task_id": task_id, "samples": profile["samples"], "job": filters},
+    )
+    try:
+        from app.core.supabase import supabase
+
+        query = supabase.table("agent_jobs").update({"profile": profile})
+        for column, value in filters.items():
+            query = query.eq(column, value)
+        query.execute()
+    except Exception as e:
+        logger.warning(f"Could not store profile for task {task_id}: {e}")
+
+
+# Only connected when profiling is enabled, so other runs pay nothing
+if settings.PROFILING_TOKEN:
+    task_prerun.connect(_start_task_profile)
+    task_postrun.connect(_store_task_profile)
+
+
 # ==============================================
 # Task Base Class
 # ==============================================
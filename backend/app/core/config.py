@@ -28,6 +28,57 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
 
+    # Report generation lease (single-flight per trip)
+    GENERATION_LEASE_TTL_SECONDS: int = 120  # While a worker heartbeats the lease
+    GENERATION_LEASE_QUEUED_TTL_SECONDS: int = 900  # While the task waits in the queue
+    GENERATION_LEASE_HEARTBEAT_SECONDS: int = 30
+
+    # Place search caches (OpenTripMap tiles and details)
+    PLACES_TILE_TTL_SECONDS: int = 7 * 24 * 3600  # Tiles are dropped after this
+    PLACES_TILE_REFRESH_SECONDS: int = 24 * 3600  # Older tiles are served and refreshed
+    PLACES_DETAILS_TTL_SECONDS: int = 30 * 24 * 3600
+
+    # Visa requirement matrix (passport x destination, refreshed by Celery beat)
+    VISA_MATRIX_TTL_SECONDS: int = 180 * 24 * 3600  # Entries are dropped after this
+    VISA_MATRIX_REFRESH_SECONDS: int = 14 * 24 * 3600  # Older entries are re-checked
+    VISA_MATRIX_STALE_SECONDS: int = 45 * 24 * 3600  # Older entries are flagged stale
+    VISA_MATRIX_REFRESH_BUDGET: int = 200  # Travel Buddy requests per refresh run
+    VISA_MATRIX_REQUEST_INTERVAL_SECONDS: float = 1.0  # Pause between refresh requests
+    VISA_MATRIX_PASSPORTS: str = "US,GB,CA,AU,DE,FR,IN,CN,JP"  # Seeded for every destination
+
+    # Country catalog (REST Countries snapshot, refreshed by Celery beat)
+    COUNTRY_CATALOG_RELOAD_SECONDS: int = 6 * 3600  # Workers re-read the shared snapshot
+    COUNTRY_CATALOG_RETRY_SECONDS: int = 300  # Wait after a failed cold-start fetch
+
+    # Exchange rates (daily snapshot against one base, refreshed by Celery beat)
+    FX_BASE_CURRENCY: str = "USD"
+    FX_REFRESH_SECONDS: int = 12 * 3600  # Older latest snapshots are re-fetched
+    FX_SNAPSHOT_TTL_SECONDS: int = 400 * 24 * 3600  # Dated snapshots are kept this long
+    FX_RETRY_SECONDS: int = 300  # Wait after a failed fetch
+
+    # Shared OAuth tokens (e.g. Amadeus), refreshed by one process at a time
+    OAUTH_TOKEN_LOCK_SECONDS: int = 10  # Waiters refresh themselves after this
+
+    # Flight search (flexible-date fan-out and fare cache)
+    FLIGHT_SEARCH_CACHE_TTL_SECONDS: int = 30 * 60  # Fares are re-searched after this
+    FLIGHT_FLEX_DAYS: int = 3  # Dates searched either side of the requested one
+    FLIGHT_SEARCH_CONCURRENCY: int = 4  # Date searches in flight at once
+
+    # Selective recalculation
+    RECALC_MAX_CONCURRENT_AGENTS: int = 3  # Agents run in parallel within a phase
+
+    # Agent duration estimates (learned from agent_jobs, refreshed by Celery beat)
+    ETA_EWMA_ALPHA: float = 0.2  # Weight of the newest run in the running mean
+    ETA_MIN_SAMPLES: int = 3  # Runs needed before learned durations replace the defaults
+    ETA_RELOAD_SECONDS: int = 300  # API processes re-read the shared estimates
+    ETA_HISTORY_DAYS: int = 30  # How far back the first refresh reads
+    ETA_REFRESH_BATCH: int = 500  # agent_jobs rows read per query
+
+    # Report generation admission (0 = always queue)
+    GENERATION_MAX_QUEUE_WAIT_SECONDS: int = 0  # Reject with 503 above this estimated wait
+    GENERATION_WORKER_SLOTS: int = 2  # Report runs the workers process at once
+    GENERATION_QUEUE: str = "celery"  # Broker queue report generation tasks are sent to
+
     # Security (default for testing only)
     SECRET_KEY: str = "test-secret-key-change-in-production"
     SESSION_LIFETIME_HOURS: int = 24
@@ -44,6 +95,17 @@ class Settings(BaseSettings):
     SENTRY_PROFILES_SAMPLE_RATE: float = 0.1
     SENTRY_ENABLED: bool = True
 
+    # Prometheus metrics (API at /metrics, Celery workers on their own port)
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: str = ""  # Bearer token required to scrape /metrics; empty = open
+    METRICS_WORKER_PORT: int = 9808  # 0 disables the worker exporter
+    METRICS_QUEUES: str = "celery"  # Comma-separated broker queues for queue depth
+
+    # On-demand profiling (app/core/profiling.py); empty token = disabled
+    PROFILING_TOKEN: str = ""  # Shared secret sent in X-Profile / X-Profile-Task
+    PROFILING_INTERVAL_MS: float = 5.0  # Sampling interval
+    PROFILING_MAX_SECONDS: float = 900.0  # Sampling stops after this
+
     # Feature Flags
     FEATURE_DASHBOARD_HOME: bool = True
     FEATURE_RECOMMENDATIONS: bool = True
@@ -72,11 +134,35 @@ class Settings(BaseSettings):
     # Web Search & Scraping
     FIRECRAWL_API_KEY: str = ""  # Firecrawl for web search (Culture, Food agents)
 
+    # External API base URLs (empty = the real API). Point these at the fake
+    # services server (python -m benchmarks.fake_services) for load and soak tests
+    VISUAL_CROSSING_BASE_URL: str = ""
+    WEATHERAPI_BASE_URL: str = ""
+    REST_COUNTRIES_BASE_URL: str = ""
+    EXCHANGE_API_BASE_URL: str = ""  # May contain {version} (latest or a date)
+    TRAVEL_BUDDY_BASE_URL: str = ""
+    AMADEUS_BASE_URL: str = ""  # Overrides the test/production API choice
+    SKYSCANNER_BASE_URL: str = ""
+    FIRECRAWL_BASE_URL: str = ""
+    OPENTRIPMAP_BASE_URL: str = ""
+
     @property
     def cors_origins_list(self) -> list[str]:
         """Parse CORS origins from comma-separated string"""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
 
+    @property
+    def metrics_queues_list(self) -> list[str]:
+        """Parse Celery queues reported by the queue depth metric"""
+        return [queue.strip() for queue in self.METRICS_QUEUES.split(",") if queue.strip()]
+
+    @property
+    def visa_matrix_passports_list(self) -> list[str]:
+        """Parse seeded visa matrix passports from comma-separated string"""
+        return [
+            code.strip().upper() for code in self.VISA_MATRIX_PASSPORTS.split(",") if code.strip()
+        ]
+
     class Config:
         env_file = "../.env"
         case_sensitive = True
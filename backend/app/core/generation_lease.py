@@ -0,0 +1,255 @@
+"""
+Per-trip generation lease
+
+Prevents two report generations (full orchestrator or selective recalculation)
+from running for the same trip at the same time.
+
+Architecture:
+- One Redis key per trip holding the Celery task ID that owns the lease
+- API acquires the lease with a long "queued" TTL before dispatching the task
+- The running task claims the lease, then heartbeats it with a short TTL
+- Leases of dead workers expire on their own; leases whose Celery task has
+  already finished are reclaimed on the next acquire
+- If Redis is unavailable the lease is a no-op and callers fall back to the
+  trip status checks
+"""
+
+import logging
+import threading
+from typing import Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+LEASE_KEY_PREFIX = "tip:generation-lease:"
+
+# Set the key to our token if it is free or already ours
+_CLAIM_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if (not current) or current == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# Extend the TTL only while we still own the key
+_EXTEND_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Delete the key only while we still own it
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Celery states after which a task will never touch the lease again
+_FINISHED_TASK_STATES = {"SUCCESS", "FAILURE", "REVOKED"}
+
+
+class LeaseHeartbeat:
+    """
+    Background thread that keeps a lease alive while a task is running.
+
+    Call stop() when the task finishes; it stops the thread and releases
+    the lease.
+    """
+
+    def __init__(self, lease: "GenerationLease", trip_id: str, task_id: str):
+        self.lease = lease
+        self.trip_id = trip_id
+        self.task_id = task_id
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"lease-heartbeat-{trip_id}",
+            daemon=True,
+        )
+
+    def start(self) -> "LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.lease.heartbeat_seconds):
+            if not self.lease.extend(self.trip_id, self.task_id):
+                logger.warning(
+                    f"Lost generation lease for trip {self.trip_id}",
+                    extra={"trip_id": self.trip_id, "task_id": self.task_id},
+                )
+                return
+
+    def stop(self) -> None:
+        """Stop heartbeating and release the lease."""
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self.lease.release(self.trip_id, self.task_id)
+
+
+class GenerationLease:
+    """
+    Distributed per-trip lease backed by Redis.
+
+    The lease value is the Celery task ID of the owner, so a caller that loses
+    the race can point clients at the in-flight task.
+    """
+
+    def __init__(
+        self,
+        client: Optional[redis.Redis] = None,
+        ttl_seconds: int | None = None,
+        queued_ttl_seconds: int | None = None,
+        heartbeat_seconds: int | None = None,
+    ):
+        self._client = client
+        self.ttl_seconds = ttl_seconds or settings.GENERATION_LEASE_TTL_SECONDS
+        self.queued_ttl_seconds = queued_ttl_seconds or settings.GENERATION_LEASE_QUEUED_TTL_SECONDS
+        self.heartbeat_seconds = heartbeat_seconds or settings.GENERATION_LEASE_HEARTBEAT_SECONDS
+
+    @property
+    def client(self) -> Optional[redis.Redis]:
+        return self._client if self._client is not None else get_redis_client()
+
+    def is_available(self) -> bool:
+        """Whether the lease is actually enforced (Redis reachable)."""
+        return self.client is not None
+
+    @staticmethod
+    def _key(trip_id: str) -> str:
+        return f"{LEASE_KEY_PREFIX}{trip_id}"
+
+    def holder(self, trip_id: str) -> str | None:
+        """Return the task ID currently holding the lease, if any."""
+        client = self.client
+        if client is None:
+            return None
+        try:
+            return client.get(self._key(trip_id))
+        except redis.RedisError as e:
+            logger.warning(f"Failed to read generation lease for trip {trip_id}: {e}")
+            return None
+
+    def acquire(self, trip_id: str, task_id: str) -> tuple[bool, str | None]:
+        """
+        Acquire the lease for a task that is about to be queued.
+
+        Uses the queued TTL so the lease survives while the task waits for a
+        worker. A lease held by a task that has already finished is reclaimed.
+
+        Returns:
+            (acquired, holder_task_id). When Redis is unavailable this returns
+            (True, None) and the lease is not enforced.
+        """
+        client = self.client
+        if client is None:
+            return True, None
+
+        key = self._key(trip_id)
+        ttl_ms = self.queued_ttl_seconds * 1000
+        try:
+            # Retry covers the owner releasing between our SET and GET
+            for _ in range(3):
+                if client.set(key, task_id, nx=True, px=ttl_ms):
+                    return True, task_id
+
+                current = client.get(key)
+                if current is None:
+                    continue
+                if not self._is_task_finished(current):
+                    return False, current
+
+                logger.warning(
+                    f"Reclaiming stale generation lease for trip {trip_id}",
+                    extra={"trip_id": trip_id, "stale_task_id": current},
+                )
+                client.eval(_RELEASE_SCRIPT, 1, key, current)
+
+            return False, client.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to acquire generation lease for trip {trip_id}: {e}")
+            return True, None
+
+    def claim(self, trip_id: str, task_id: str) -> str | None:
+        """
+        Claim the lease from inside the running task.
+
+        Succeeds if the lease is free or was acquired for this task by the API.
+
+        Returns:
+            None if the task may proceed, otherwise the task ID of the owner.
+        """
+        client = self.client
+        if client is None:
+            return None
+
+        key = self._key(trip_id)
+        try:
+            if client.eval(_CLAIM_SCRIPT, 1, key, task_id, self.ttl_seconds * 1000):
+                return None
+            return client.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to claim generation lease for trip {trip_id}: {e}")
+            return None
+
+    def extend(self, trip_id: str, task_id: str) -> bool:
+        """Extend the lease TTL. Returns False if the lease is no longer ours."""
+        client = self.client
+        if client is None:
+            return True
+        try:
+            return bool(
+                client.eval(_EXTEND_SCRIPT, 1, self._key(trip_id), task_id, self.ttl_seconds * 1000)
+            )
+        except redis.RedisError as e:
+            # Keep heartbeating; the TTL gives us slack for transient errors
+            logger.warning(f"Failed to extend generation lease for trip {trip_id}: {e}")
+            return True
+
+    def release(self, trip_id: str, task_id: str) -> None:
+        """Release the lease if it is still owned by task_id."""
+        client = self.client
+        if client is None:
+            return
+        try:
+            client.eval(_RELEASE_SCRIPT, 1, self._key(trip_id), task_id)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to release generation lease for trip {trip_id}: {e}")
+
+    def start_heartbeat(self, trip_id: str, task_id: str) -> LeaseHeartbeat:
+        """Start a background heartbeat for a claimed lease."""
+        return LeaseHeartbeat(self, trip_id, task_id).start()
+
+    @staticmethod
+    def _is_task_finished(task_id: str) -> bool:
+        """Check the Celery result backend for a terminal task state."""
+        try:
+            from celery.result import AsyncResult
+
+            from app.core.celery_app import celery_app
+
+            return AsyncResult(task_id, app=celery_app).state in _FINISHED_TASK_STATES
+        except Exception:
+            return False
+
+
+# Global lease instance
+_generation_lease: GenerationLease | None = None
+
+
+def get_generation_lease() -> GenerationLease:
+    """Get or create the global generation lease."""
+    global _generation_lease
+    if _generation_lease is None:
+        _generation_lease = GenerationLease()
+    return _generation_lease
@@ -16,6 +16,8 @@ from uuid import uuid4
 
 from fastapi import FastAPI, Request
 
+from app.core.metrics import observe_request, track_in_flight
+
 # Try to import structlog for advanced structured logging
 try:
     import structlog
@@ -214,9 +216,26 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
 
 
+def _route_template(request: Request) -> str:
+    """Matched route path (e.g. /api/trips/{trip_id}), keeping metric labels bounded."""
+    route = request.scope.get("route")
+    template = getattr(route, "path", None)
+    if not template:
+        return "unmatched"
+    # Depending on the FastAPI version, routes of an included router may not carry
+    # the include prefix; take the prefix segments from the request path
+    extra = request.url.path.count("/") - template.count("/")
+    if extra > 0:
+        template = "/".join(request.url.path.split("/")[: extra + 1]) + template
+    return template
+
+
 class RequestLogger:
     """
     Middleware for logging HTTP requests and responses.
+
+    Also records request latency by route template and in-flight requests
+    for the Prometheus metrics (app/core/metrics.py).
     """
 
     def __init__(self, app: FastAPI):
@@ -245,11 +264,13 @@ class RequestLogger:
         )
 
         # Process request
+        track_in_flight(1)
         try:
             response = await call_next(request)
         except Exception as e:
             # Log error
             duration_ms = (time.time() - start_time) * 1000
+            observe_request(request.method, _route_template(request), 500, duration_ms / 1000)
             self.logger.error(
                 "Request failed",
                 extra={
@@ -262,9 +283,14 @@ class RequestLogger:
                 },
             )
             raise
+        finally:
+            track_in_flight(-1)
 
         # Calculate duration
         duration_ms = (time.time() - start_time) * 1000
+        observe_request(
+            request.method, _route_template(request), response.status_code, duration_ms / 1000
+        )
 
         # Log request completion
         log_level = logging.INFO if response.status_code < 400 else logging.WARNING
@@ -0,0 +1,327 @@
+"""
+Prometheus Metrics
+
+Request, dependency, cache, queue and agent metrics for autoscaling and for
+measuring performance changes. The API serves them at /metrics (behind
+METRICS_TOKEN when set); Celery workers serve them from their own exporter on
+METRICS_WORKER_PORT.
+
+Metrics:
+- tip_http_request_duration_seconds{method,route,status}: API latency by
+  route template (e.g. /api/trips/{trip_id})
+- tip_http_requests_in_flight: API requests being handled
+- tip_rate_limit_rejections_total: requests rejected with 429
+- tip_external_api_duration_seconds{client,outcome}: outbound HTTP calls,
+  recorded by httpx event hooks (http_event_hooks/async_http_event_hooks)
+- tip_cache_requests_total{cache,result}: hits and misses per cache
+  (hit ratio = hit / (hit + miss))
+- tip_celery_queue_depth{queue}: messages waiting in each broker queue,
+  read from Redis at scrape time (API only)
+- tip_agent_duration_seconds{agent,status}: agent runs (from telemetry spans)
+- tip_celery_task_duration_seconds{task,state}, tip_celery_tasks_in_progress{task}
+
+Multiple processes (uvicorn workers, the Celery prefork pool) need
+PROMETHEUS_MULTIPROC_DIR set to a shared, empty directory; each exporter then
+aggregates the metrics of all processes. Without prometheus-client installed
+every function here is a no-op.
+"""
+
+import logging
+import os
+import time
+from typing import Any, Optional
+
+import httpx
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+METRICS_AVAILABLE = False
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        REGISTRY,
+        CollectorRegistry,
+        Counter,
+        Gauge,
+        Histogram,
+        generate_latest,
+        multiprocess,
+        start_http_server,
+    )
+    from prometheus_client.core import GaugeMetricFamily
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    logger.info("prometheus-client not installed. Metrics disabled.")
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Agents and report generation take minutes, not milliseconds
+AGENT_BUCKETS = (1, 2.5, 5, 10, 20, 30, 45, 60, 90, 120, 180, 300, 600, 1200)
+TASK_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800)
+
+if METRICS_AVAILABLE:
+    HTTP_REQUEST_DURATION = Histogram(
+        "tip_http_request_duration_seconds",
+        "API request latency by route template",
+        ["method", "route", "status"],
+    )
+    HTTP_REQUESTS_IN_FLIGHT = Gauge(
+        "tip_http_requests_in_flight",
+        "API requests currently being handled",
+        multiprocess_mode="livesum",
+    )
+    RATE_LIMIT_REJECTIONS = Counter(
+        "tip_rate_limit_rejections_total",
+        "Requests rejected by the rate limiter",
+    )
+    EXTERNAL_API_DURATION = Histogram(
+        "tip_external_api_duration_seconds",
+        "Outbound HTTP call latency by client",
+        ["client", "outcome"],
+    )
+    CACHE_REQUESTS = Counter(
+        "tip_cache_requests_total",
+        "Cache lookups by result (hit or miss)",
+        ["cache", "result"],
+    )
+    AGENT_DURATION = Histogram(
+        "tip_agent_duration_seconds",
+        "Agent run duration",
+        ["agent", "status"],
+        buckets=AGENT_BUCKETS,
+    )
+    CELERY_TASK_DURATION = Histogram(
+        "tip_celery_task_duration_seconds",
+        "Celery task duration by final state",
+        ["task", "state"],
+        buckets=TASK_BUCKETS,
+    )
+    CELERY_TASKS_IN_PROGRESS = Gauge(
+        "tip_celery_tasks_in_progress",
+        "Celery tasks currently executing",
+        ["task"],
+        multiprocess_mode="livesum",
+    )
+
+
+def _multiprocess() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+# ----------------------------------------------------------------------
+# Recording
+# ----------------------------------------------------------------------
+
+
+def observe_request(method: str, route: str, status_code: int, duration_seconds: float) -> None:
+    if METRICS_AVAILABLE:
+        HTTP_REQUEST_DURATION.labels(method, route, str(status_code)).observe(duration_seconds)
+
+
+def track_in_flight(delta: int) -> None:
+    if METRICS_AVAILABLE:
+        HTTP_REQUESTS_IN_FLIGHT.inc(delta)
+
+
+def count_rate_limit_rejection() -> None:
+    if METRICS_AVAILABLE:
+        RATE_LIMIT_REJECTIONS.inc()
+
+
+def observe_external_call(client: str, outcome: str, duration_seconds: float) -> None:
+    if METRICS_AVAILABLE:
+        EXTERNAL_API_DURATION.labels(client, outcome).observe(duration_seconds)
+
+
+def count_cache_lookup(cache: str, hit: bool) -> None:
+    if METRICS_AVAILABLE:
+        CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def observe_agent(agent: str, ok: bool, duration_seconds: float) -> None:
+    if METRICS_AVAILABLE:
+        AGENT_DURATION.labels(agent, "ok" if ok else "error").observe(duration_seconds)
+
+
+def observe_task(task: str, state: str, duration_seconds: float) -> None:
+    if METRICS_AVAILABLE:
+        CELERY_TASK_DURATION.labels(task, state).observe(duration_seconds)
+
+
+def track_task_in_progress(task: str, delta: int) -> None:
+    if METRICS_AVAILABLE:
+        CELERY_TASKS_IN_PROGRESS.labels(task).inc(delta)
+
+
+# ----------------------------------------------------------------------
+# Outbound HTTP
+# ----------------------------------------------------------------------
+
+_STARTED = "tip_metrics_started"
+
+
+def _outcome(response: httpx.Response) -> str:
+    return f"{response.status_code // 100}xx"
+
+
+def http_event_hooks(client: str) -> dict[str, list[Any]]:
+    """
+    httpx.Client event hooks recording each call's latency under client.
+
+    Usage:
+        httpx.Client(timeout=30.0, event_hooks=http_event_hooks("amadeus"))
+    """
+
+    def on_request(request: httpx.Request) -> None:
+        request.extensions[_STARTED] = time.perf_counter()
+
+    def on_response(response: httpx.Response) -> None:
+        started = response.request.extensions.get(_STARTED)
+        if started is not None:
+            observe_external_call(client, _outcome(response), time.perf_counter() - started)
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+def async_http_event_hooks(client: str) -> dict[str, list[Any]]:
+    """httpx.AsyncClient event hooks (see http_event_hooks)."""
+
+    async def on_request(request: httpx.Request) -> None:
+        request.extensions[_STARTED] = time.perf_counter()
+
+    async def on_response(response: httpx.Response) -> None:
+        started = response.request.extensions.get(_STARTED)
+        if started is not None:
+            observe_external_call(client, _outcome(response), time.perf_counter() - started)
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+# ----------------------------------------------------------------------
+# Queue depth
+# ----------------------------------------------------------------------
+
+
+class QueueDepthCollector:
+    """Reads the length of each Celery queue from the Redis broker at scrape time."""
+
+    def __init__(self, queues: list[str], redis_client: Optional[redis.Redis] = None):
+        self.queues = queues
+        self._client = redis_client
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(
+                settings.CELERY_BROKER_URL, socket_connect_timeout=1, socket_timeout=1
+            )
+        return self._client
+
+    def depths(self, queues: Optional[list[str]] = None) -> dict[str, int]:
+        """Messages waiting in each queue, default self.queues (raises redis.RedisError)."""
+        queues = self.queues if queues is None else queues
+        with self.client.pipeline(transaction=False) as pipe:
+            for queue in queues:
+                pipe.llen(queue)
+            depths = pipe.execute()
+        return dict(zip(queues, depths, strict=True))
+
+    def collect(self):
+        family = GaugeMetricFamily(
+            "tip_celery_queue_depth", "Messages waiting in a Celery queue", labels=["queue"]
+        )
+        try:
+            depths = self.depths()
+        except redis.RedisError as e:
+            logger.debug(f"Queue depth read failed: {e}")
+            return
+        for queue, depth in depths.items():
+            family.add_metric([queue], depth)
+        yield family
+
+
+_queue_collector: Optional[QueueDepthCollector] = None
+_queue_registry: Optional["CollectorRegistry"] = None
+
+
+def _get_queue_collector() -> QueueDepthCollector:
+    global _queue_collector
+    if _queue_collector is None:
+        _queue_collector = QueueDepthCollector(settings.metrics_queues_list)
+    return _queue_collector
+
+
+def _get_queue_registry() -> "CollectorRegistry":
+    global _queue_registry
+    if _queue_registry is None:
+        _queue_registry = CollectorRegistry()
+        _queue_registry.register(_get_queue_collector())
+    return _queue_registry
+
+
+def queue_depth(queue: str) -> Optional[int]:
+    """Messages waiting in one broker queue, or None if the broker cannot be read."""
+    try:
+        return _get_queue_collector().depths([queue])[queue]
+    except redis.RedisError as e:
+        logger.debug(f"Queue depth read failed: {e}")
+        return None
+
+
+# ----------------------------------------------------------------------
+# Exposition
+# ----------------------------------------------------------------------
+
+
+def _process_registry() -> "CollectorRegistry":
+    """This process's metrics, or every process's in multiprocess mode."""
+    if not _multiprocess():
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render(include_queues: bool = True) -> bytes:
+    """Metrics in the Prometheus text format (empty without prometheus-client)."""
+    if not METRICS_AVAILABLE:
+        return b""
+    output = generate_latest(_process_registry())
+    if include_queues:
+        output += generate_latest(_get_queue_registry())
+    return output
+
+
+_worker_exporter_started = False
+
+
+def start_worker_exporter(port: int) -> bool:
+    """
+    Serve worker metrics over HTTP on port (once per process).
+
+    Call from the Celery main process; with the prefork pool set
+    PROMETHEUS_MULTIPROC_DIR so the pool processes' metrics are included.
+
+    Returns:
+        True if the exporter was started
+    """
+    global _worker_exporter_started
+    if not METRICS_AVAILABLE or _worker_exporter_started:
+        return False
+    try:
+        start_http_server(port, registry=_process_registry())
+    except OSError as e:
+        logger.warning(f"Could not start worker metrics exporter on port {port}: {e}")
+        return False
+    _worker_exporter_started = True
+    logger.info("Worker metrics exporter started", extra={"port": port})
+    return True
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop a finished pool process's live gauges (multiprocess mode)."""
+    if METRICS_AVAILABLE and _multiprocess():
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,235 @@
+"""
+Shared OAuth access tokens
+
+Client-credentials tokens (e.g. Amadeus) cached once per process and shared
+across processes through Redis, so new client instances and other workers
+reuse a token instead of re-authenticating.
+
+Architecture:
+- Tokens are kept in process memory and in Redis with a TTL of the token's
+  expires_in minus EXPIRY_MARGIN_SECONDS
+- When no valid token is cached, one process refreshes it: the refresher
+  holds a Redis lock (SET NX with OAUTH_TOKEN_LOCK_SECONDS TTL) while other
+  processes poll for the new token; within a process, threads refresh one at
+  a time
+- If the refresher dies or fails, the lock expires and a waiter refreshes
+- If Redis is unavailable, tokens are only shared within the process
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+TOKEN_KEY_PREFIX = "tip:oauth-token:"
+LOCK_KEY_PREFIX = "tip:oauth-token-lock:"
+
+# Tokens are treated as expired this long before the provider expires them
+EXPIRY_MARGIN_SECONDS = 60
+POLL_INTERVAL_SECONDS = 0.1
+
+# Delete a key only while it still holds our value (the lock owner, or the
+# token being invalidated)
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Fetches a new token: returns (access_token, expires_in_seconds)
+TokenFetcher = Callable[[], tuple[str, int]]
+AsyncTokenFetcher = Callable[[], Awaitable[tuple[str, int]]]
+
+
+class SharedTokenCache:
+    """Process-wide OAuth tokens backed by Redis, with single-flight refresh."""
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None, lock_seconds: int | None = None):
+        self._client = redis_client
+        self.lock_seconds = (
+            lock_seconds if lock_seconds is not None else settings.OAUTH_TOKEN_LOCK_SECONDS
+        )
+        # name -> (token, expires_at)
+        self._tokens: dict[str, tuple[str, float]] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    @property
+    def client(self) -> Optional[redis.Redis]:
+        return self._client if self._client is not None else get_redis_client()
+
+    # ------------------------------------------------------------------
+    # Cached tokens
+    # ------------------------------------------------------------------
+
+    def get(self, name: str) -> Optional[tuple[str, float]]:
+        """Cached (token, expires_at) from this process or Redis, or None."""
+        cached = self._tokens.get(name)
+        if cached and time.time() < cached[1]:
+            return cached
+
+        client = self.client
+        if client is None:
+            return None
+        try:
+            with client.pipeline(transaction=False) as pipe:
+                token, ttl_ms = (
+                    pipe.get(TOKEN_KEY_PREFIX + name).pttl(TOKEN_KEY_PREFIX + name).execute()
+                )
+        except redis.RedisError as e:
+            logger.debug(f"Token read failed for {name}: {e}")
+            return None
+        if not token or ttl_ms <= 0:
+            return None
+        cached = (token, time.time() + ttl_ms / 1000)
+        self._tokens[name] = cached
+        return cached
+
+    def put(self, name: str, token: str, expires_in: int) -> tuple[str, float]:
+        """Cache a new token; returns (token, expires_at)."""
+        ttl = max(expires_in - EXPIRY_MARGIN_SECONDS, 1)
+        cached = (token, time.time() + ttl)
+        self._tokens[name] = cached
+        client = self.client
+        if client is not None:
+            try:
+                client.set(TOKEN_KEY_PREFIX + name, token, ex=ttl)
+            except redis.RedisError as e:
+                logger.debug(f"Token write failed for {name}: {e}")
+        return cached
+
+    def invalidate(self, name: str, token: str) -> None:
+        """
+        Drop a token the provider rejected.
+
+        Only removed if it is still the cached token, so a fresh token stored
+        by another instance or process in the meantime is kept.
+        """
+        cached = self._tokens.get(name)
+        if cached and cached[0] == token:
+            self._tokens.pop(name, None)
+        client = self.client
+        if client is not None:
+            try:
+                client.eval(_RELEASE_SCRIPT, 1, TOKEN_KEY_PREFIX + name, token)
+            except redis.RedisError as e:
+                logger.debug(f"Token delete failed for {name}: {e}")
+
+    # ------------------------------------------------------------------
+    # Refresh lock
+    # ------------------------------------------------------------------
+
+    def _lock(self, name: str) -> tuple[bool, Optional[str]]:
+        """Try the refresh lock: (acquired, owner). Without Redis every caller proceeds."""
+        client = self.client
+        if client is None:
+            return True, None
+        owner = uuid.uuid4().hex
+        try:
+            acquired = client.set(
+                LOCK_KEY_PREFIX + name, owner, nx=True, ex=max(self.lock_seconds, 1)
+            )
+        except redis.RedisError as e:
+            logger.debug(f"Token lock failed for {name}: {e}")
+            return True, None
+        return bool(acquired), owner if acquired else None
+
+    def _unlock(self, name: str, owner: Optional[str]) -> None:
+        client = self.client
+        if owner is None or client is None:
+            return
+        try:
+            client.eval(_RELEASE_SCRIPT, 1, LOCK_KEY_PREFIX + name, owner)
+        except redis.RedisError as e:
+            logger.debug(f"Token unlock failed for {name}: {e}")
+
+    def _local_lock(self, name: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(name, threading.Lock())
+
+    # ------------------------------------------------------------------
+    # Single-flight refresh
+    # ------------------------------------------------------------------
+
+    def get_or_refresh(self, name: str, fetch: TokenFetcher) -> tuple[str, float]:
+        """
+        Cached token, or a new one from fetch() if none is valid.
+
+        While another process refreshes, waits (up to the lock TTL) for its
+        token instead of fetching a second one.
+
+        Returns:
+            (token, expires_at)
+
+        Raises:
+            Whatever fetch() raises
+        """
+        cached = self.get(name)
+        if cached:
+            return cached
+
+        with self._local_lock(name):
+            deadline = time.time() + self.lock_seconds
+            while True:
+                cached = self.get(name)
+                if cached:
+                    return cached
+                acquired, owner = self._lock(name)
+                if acquired or time.time() >= deadline:
+                    break
+                time.sleep(POLL_INTERVAL_SECONDS)
+
+            try:
+                # The previous holder may have stored a token just before releasing
+                cached = self.get(name)
+                if cached:
+                    return cached
+                return self.put(name, *fetch())
+            finally:
+                self._unlock(name, owner)
+
+    async def get_or_refresh_async(self, name: str, fetch: AsyncTokenFetcher) -> tuple[str, float]:
+        """Async get_or_refresh (waits with asyncio.sleep instead of blocking)."""
+        cached = self.get(name)
+        if cached:
+            return cached
+
+        deadline = time.time() + self.lock_seconds
+        while True:
+            cached = self.get(name)
+            if cached:
+                return cached
+            acquired, owner = self._lock(name)
+            if acquired or time.time() >= deadline:
+                break
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+        try:
+            cached = self.get(name)
+            if cached:
+                return cached
+            return self.put(name, *(await fetch()))
+        finally:
+            self._unlock(name, owner)
+
+
+_token_cache: Optional[SharedTokenCache] = None
+
+
+def get_token_cache() -> SharedTokenCache:
+    """Get the process-wide token cache."""
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = SharedTokenCache()
+    return _token_cache
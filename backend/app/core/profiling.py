@@ -0,0 +1,262 @@
+"""
+On-demand Profiling
+
+A stdlib sampling profiler for looking at one slow request or task in
+production, without a profiler running all the time.
+
+- API: send `X-Profile: <PROFILING_TOKEN>` and the response is replaced by a
+  flame graph of that request (SVG, or folded stacks with
+  `X-Profile-Format: folded`). The handler's status code is returned in
+  X-Profiled-Status. The token is only accepted as a header: query strings
+  end up in request logs.
+- Celery: `task.apply_async(..., headers={"profile": True})` profiles one run
+  and stores the folded stacks on its agent_jobs row (`profile` column).
+  POST /api/trips/{trip_id}/generate does this when called with
+  `X-Profile-Task: <PROFILING_TOKEN>`.
+
+Profiling is off unless PROFILING_TOKEN is set: the middleware and the
+worker signal handlers are not even registered. The sampler records every
+thread in the process (each stack is rooted at its thread name), so idle
+pool threads show up as separate towers and concurrent work is included.
+"""
+
+import hmac
+import html
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Mapping
+from typing import Any
+
+from fastapi import FastAPI, Request, Response
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_FORMAT_HEADER = "X-Profile-Format"
+PROFILE_TASK_HEADER = "X-Profile-Task"
+
+_SAMPLER_THREAD_NAME = "tip-profiler"
+
+
+def profiling_authorized(token: str | None) -> bool:
+    """Whether token is the configured profiling token (profiling disabled if unset)."""
+    if not settings.PROFILING_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode(), settings.PROFILING_TOKEN.encode())
+
+
+# ==============================================
+# Sampler
+# ==============================================
+
+
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    path = code.co_filename.replace(os.sep, "/").rsplit("/", 2)
+    return f"{code.co_name} ({'/'.join(path[-2:])}:{code.co_firstlineno})"
+
+
+def _fold(frame: Any, thread_name: str) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    return ";".join(reversed(labels))
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of all threads from a background thread.
+
+    Usage:
+        with SamplingProfiler() as profiler:
+            do_work()
+        profiler.folded()  # "thread;outer (pkg/mod.py:1);inner (pkg/mod.py:9) 42" lines
+    """
+
+    def __init__(self, *, interval_ms: float | None = None, max_seconds: float | None = None):
+        self.interval = (interval_ms or settings.PROFILING_INTERVAL_MS) / 1000
+        self.max_seconds = max_seconds or settings.PROFILING_MAX_SECONDS
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started = 0.0
+
+    def start(self) -> "SamplingProfiler":
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name=_SAMPLER_THREAD_NAME, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.duration = time.perf_counter() - self._started
+        return self
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        deadline = self._started + self.max_seconds
+        while not self._stop.wait(self.interval):
+            if time.perf_counter() > deadline:
+                logger.warning(
+                    f"Profiling stopped after {self.max_seconds}s (PROFILING_MAX_SECONDS)"
+                )
+                return
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                name = names.get(ident, f"thread-{ident}")
+                if name != _SAMPLER_THREAD_NAME:
+                    self.stacks[_fold(frame, name)] += 1
+            self.samples += 1
+
+    def folded(self) -> str:
+        """Folded stacks (flamegraph.pl, speedscope, inferno), heaviest first."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def summary(self) -> dict[str, Any]:
+        """What is stored for a profiled task."""
+        return {
+            "format": "folded",
+            "interval_ms": round(self.interval * 1000, 2),
+            "samples": self.samples,
+            "duration_seconds": round(self.duration, 3),
+            "folded": self.folded(),
+        }
+
+
+# ==============================================
+# Flame Graph
+# ==============================================
+
+_FRAME_HEIGHT = 16
+_MIN_WIDTH = 0.5  # Narrower frames are left out
+
+
+def _color(label: str) -> str:
+    shade = sum(label.encode()) % 100
+    return f"rgb({205 + shade % 50},{80 + shade},{40 + shade // 3})"
+
+
+def render_flamegraph(stacks: Mapping[str, int], *, title: str = "", width: int = 1200) -> str:
+    """Render folded stack counts as a self-contained SVG flame graph."""
+    root: dict[str, Any] = {"count": 0, "children": {}}
+    for stack, count in stacks.items():
+        root["count"] += count
+        node = root
+        for label in stack.split(";"):
+            node = node["children"].setdefault(label, {"count": 0, "children": {}})
+            node["count"] += count
+
+    total = root["count"] or 1
+    scale = width / total
+    frames: list[tuple[int, float, float, str, int]] = []
+
+    def layout(node: dict[str, Any], depth: int, x: float) -> None:
+        for label, child in sorted(node["children"].items()):
+            child_width = child["count"] * scale
+            if child_width >= _MIN_WIDTH:
+                frames.append((depth, x, child_width, label, child["count"]))
+                layout(child, depth + 1, x)
+            x += child_width
+
+    layout(root, 0, 0.0)
+    depth = max((frame[0] for frame in frames), default=0) + 1
+    height = (depth + 2) * _FRAME_HEIGHT
+
+    parts = [
+        (
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            'font-family="monospace" font-size="11">'
+        ),
+        f'<text x="4" y="12">{html.escape(title)} ({root["count"]} samples)</text>',
+    ]
+    for frame_depth, x, frame_width, label, count in frames:
+        y = height - (frame_depth + 1) * _FRAME_HEIGHT
+        text = html.escape(label)
+        share = 100 * count / total
+        parts.append(
+            f"<g><title>{text} ({count} samples, {share:.1f}%)</title>"
+            f'<rect x="{x:.1f}" y="{y}" width="{frame_width:.1f}" height="{_FRAME_HEIGHT - 1}" '
+            f'fill="{_color(label)}"/>'
+        )
+        chars = int(frame_width // 7)
+        if chars >= 3:
+            visible = label if len(label) <= chars else label[: chars - 2] + ".."
+            parts.append(f'<text x="{x + 2:.1f}" y="{y + 11}">{html.escape(visible)}</text>')
+        parts.append("</g>")
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+# ==============================================
+# Request Profiling
+# ==============================================
+
+
+class RequestProfiler:
+    """
+    Middleware that profiles requests carrying the profiling token.
+
+    The response body is drained inside the profile (so streaming responses
+    are included) and replaced by the flame graph.
+    """
+
+    def __init__(self, app: FastAPI):
+        self.app = app
+
+    async def __call__(self, request: Request, call_next):
+        token = request.headers.get(PROFILE_HEADER)
+        if token is None:
+            return await call_next(request)
+        if not profiling_authorized(token):
+            logger.warning(
+                "Ignoring profiling request with an invalid token",
+                extra={"path": str(request.url.path)},
+            )
+            return await call_next(request)
+
+        with SamplingProfiler() as profiler:
+            response = await call_next(request)
+            async for _ in response.body_iterator:
+                pass
+
+        headers = {
+            "X-Profiled-Status": str(response.status_code),
+            "X-Profile-Samples": str(profiler.samples),
+            "Cache-Control": "no-store",
+        }
+        logger.info(
+            f"Profiled {request.method} {request.url.path}",
+            extra={"samples": profiler.samples, "duration_seconds": round(profiler.duration, 3)},
+        )
+        if request.headers.get(PROFILE_FORMAT_HEADER, "").lower() == "folded":
+            return Response(profiler.folded(), media_type="text/plain", headers=headers)
+        title = f"{request.method} {request.url.path} in {profiler.duration * 1000:.0f} ms"
+        return Response(
+            render_flamegraph(profiler.stacks, title=title),
+            media_type="image/svg+xml",
+            headers=headers,
+        )
+
+
+def register_profiling_middleware(app: FastAPI) -> None:
+    """Add the request profiler, only when a profiling token is configured."""
+    if settings.PROFILING_TOKEN:
+        app.middleware("http")(RequestProfiler(app))
@@ -0,0 +1,62 @@
+"""Redis client for backend coordination (leases, shared caches)"""
+
+import logging
+import time
+from typing import Optional
+
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Cached client instance
+_redis_client: Optional[redis.Redis] = None
+
+# Avoid paying the connect timeout on every call while Redis is down
+_RETRY_AFTER_SECONDS = 30
+_last_failure_at: Optional[float] = None
+
+
+def get_redis_client() -> Optional[redis.Redis]:
+    """
+    Get a shared Redis client for REDIS_URL.
+
+    The client is created lazily and cached per process. Returns None if Redis
+    is not configured or not reachable, so callers can degrade gracefully
+    (e.g. in CI/testing without a Redis server).
+    """
+    global _redis_client, _last_failure_at
+
+    # Return cached client if available
+    if _redis_client is not None:
+        return _redis_client
+
+    if not settings.REDIS_URL:
+        return None
+
+    if _last_failure_at is not None and time.monotonic() - _last_failure_at < _RETRY_AFTER_SECONDS:
+        return None
+
+    try:
+        client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=2,
+            socket_timeout=2,
+        )
+        client.ping()
+    except redis.RedisError as e:
+        logger.warning(f"Redis unavailable at {settings.REDIS_URL}: {e}")
+        _last_failure_at = time.monotonic()
+        return None
+
+    _redis_client = client
+    return _redis_client
+
+
+def set_redis_client(client: Optional[redis.Redis]) -> None:
+    """Override the cached Redis client (used by tests to inject fakeredis)."""
+    global _redis_client, _last_failure_at
+    _redis_client = client
+    _last_failure_at = None
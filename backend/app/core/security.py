@@ -22,6 +22,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.core.config import settings
 from app.core.errors import ErrorCode, RateLimitError
+from app.core.metrics import count_rate_limit_rejection
 
 logger = logging.getLogger(__name__)
 
@@ -177,6 +178,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         is_limited, headers = rate_limiter.is_rate_limited(request)
 
         if is_limited:
+            count_rate_limit_rejection()
             logger.warning(
                 "Rate limit exceeded",
                 extra={
@@ -269,6 +271,9 @@ def validate_production_security() -> list[str]:
         if "localhost" in settings.CELERY_BROKER_URL or "127.0.0.1" in settings.CELERY_BROKER_URL:
             issues.append("WARNING: CELERY_BROKER_URL contains localhost in production")
 
+        if settings.METRICS_ENABLED and not settings.METRICS_TOKEN:
+            issues.append("WARNING: METRICS_TOKEN not set - /metrics is public")
+
         # Check Sentry configuration
         if not settings.SENTRY_DSN:
             issues.append("INFO: SENTRY_DSN not configured - errors won't be tracked")
@@ -0,0 +1,406 @@
+"""
+Execution Telemetry
+
+Structured spans for report generation: one per agent run, LLM request and
+tool invocation, so a slow report shows where its time went.
+
+Architecture:
+- A Trace collects the finished spans of one job (e.g. one orchestrator run)
+  and summarizes them per agent; the summary is stored in
+  agent_jobs.result_data["metadata"]["telemetry"]
+- Spans nest through context variables: a tool or LLM span started while an
+  agent span is current becomes its child, including in the worker thread the
+  agent runs in (asyncio.to_thread copies the context)
+- Agent durations also feed the tip_agent_duration_seconds histogram
+  (app/core/metrics.py)
+- Every span is also exported to Sentry tracing (when sentry-sdk is installed
+  and initialized) and to OpenTelemetry (when opentelemetry-api is installed;
+  a no-op unless an SDK is configured)
+
+Usage:
+    trace = Trace("report", trip_id=trip_id)
+    with trace.span("visa", "agent"):
+        ...  # LLM and tool spans are recorded automatically
+    summary = trace.summary()
+"""
+
+import functools
+import logging
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any, Optional
+
+from app.core.metrics import observe_agent
+
+logger = logging.getLogger(__name__)
+
+SENTRY_AVAILABLE = False
+try:
+    import sentry_sdk
+
+    SENTRY_AVAILABLE = True
+except ImportError:
+    pass
+
+OTEL_AVAILABLE = False
+try:
+    from opentelemetry import trace as otel_trace
+
+    OTEL_AVAILABLE = True
+except ImportError:
+    pass
+
+# Span kinds
+AGENT = "agent"
+LLM = "llm"
+TOOL = "tool"
+
+# Spans kept per trace; later spans are still counted in the per-agent totals
+MAX_SPANS_PER_TRACE = 500
+MAX_ERROR_LENGTH = 200
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("tip_trace", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("tip_span", default=None)
+
+
+@dataclass
+class Span:
+    """One timed operation."""
+
+    name: str
+    kind: str
+    parent_id: Optional[str] = None
+    agent: Optional[str] = None  # enclosing agent span's name (own name for agent spans)
+    attributes: dict[str, Any] = field(default_factory=dict)
+    span_id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    start: float = field(default_factory=time.time)
+    duration_ms: Optional[float] = None
+    error: Optional[str] = None
+    _exported: list[Any] = field(default_factory=list, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def set(self, **attributes: Any) -> None:
+        """Add attributes (e.g. token counts known only at the end)."""
+        self.attributes.update(attributes)
+
+    def fail(self, error: BaseException | str) -> None:
+        """Mark the span as failed."""
+        self.error = str(error)[:MAX_ERROR_LENGTH] or type(error).__name__
+
+    def to_dict(self, trace_start: float) -> dict[str, Any]:
+        return {
+            "id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "offset_ms": round((self.start - trace_start) * 1000, 1),
+            "duration_ms": self.duration_ms,
+            "status": "ok" if self.ok else "error",
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+def _empty_totals() -> dict[str, Any]:
+    return {
+        "llm_calls": 0,
+        "llm_ms": 0.0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "tool_calls": 0,
+        "tool_ms": 0.0,
+        "errors": 0,
+    }
+
+
+class Trace:
+    """Thread-safe collection of the finished spans of one job."""
+
+    def __init__(self, name: str, **attributes: Any):
+        self.name = name
+        self.attributes = attributes
+        self.trace_id = uuid.uuid4().hex
+        self.start = time.time()
+        self._spans: list[Span] = []
+        self._totals: dict[str, dict[str, Any]] = {}
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        """Record a finished span."""
+        with self._lock:
+            totals = self._totals.setdefault(span.agent or "unattributed", _empty_totals())
+            if span.kind == AGENT:
+                totals["duration_ms"] = round(
+                    totals.get("duration_ms", 0.0) + (span.duration_ms or 0), 1
+                )
+                totals["status"] = "ok" if span.ok else "error"
+                if "model_tier" in span.attributes:
+                    totals["model_tier"] = span.attributes["model_tier"]
+            elif span.kind == LLM:
+                totals["llm_calls"] += 1
+                totals["llm_ms"] = round(totals["llm_ms"] + (span.duration_ms or 0), 1)
+                totals["input_tokens"] += span.attributes.get("input_tokens", 0)
+                totals["output_tokens"] += span.attributes.get("output_tokens", 0)
+            elif span.kind == TOOL:
+                totals["tool_calls"] += 1
+                totals["tool_ms"] = round(totals["tool_ms"] + (span.duration_ms or 0), 1)
+            if span.kind != AGENT and not span.ok:
+                totals["errors"] += 1
+
+            if len(self._spans) < MAX_SPANS_PER_TRACE:
+                self._spans.append(span)
+            else:
+                self._dropped += 1
+
+    @contextmanager
+    def span(self, name: str, kind: str, **attributes: Any) -> Iterator[Span]:
+        """Time a block as a span of this trace (see span())."""
+        trace_token = _current_trace.set(self)
+        try:
+            with span(name, kind, **attributes) as current:
+                yield current
+        finally:
+            _current_trace.reset(trace_token)
+
+    def summary(self) -> dict[str, Any]:
+        """
+        JSON-serializable summary for agent_jobs.result_data.
+
+        Returns:
+            Dict with per-agent totals (duration, LLM calls/latency/tokens, tool
+            calls/latency, errors), overall totals and the recorded spans in
+            start order
+        """
+        with self._lock:
+            spans = sorted(self._spans, key=lambda s: s.start)
+            agents = {name: dict(totals) for name, totals in self._totals.items()}
+            dropped = self._dropped
+
+        totals = _empty_totals()
+        for agent_totals in agents.values():
+            for key in totals:
+                totals[key] += agent_totals[key]
+        totals["llm_ms"] = round(totals["llm_ms"], 1)
+        totals["tool_ms"] = round(totals["tool_ms"], 1)
+
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "attributes": self.attributes,
+            "started_at": datetime.fromtimestamp(self.start, UTC).isoformat(),
+            "duration_ms": round((time.time() - self.start) * 1000, 1),
+            "agents": agents,
+            "totals": totals,
+            "spans": [s.to_dict(self.start) for s in spans],
+            "dropped_spans": dropped,
+        }
+
+
+def current_trace() -> Optional[Trace]:
+    """The trace spans are currently recorded into, if any."""
+    return _current_trace.get()
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+# ----------------------------------------------------------------------
+# Export
+# ----------------------------------------------------------------------
+
+
+def _export_attributes(span: Span) -> dict[str, Any]:
+    """Attributes as OpenTelemetry/Sentry-compatible primitive values."""
+    exported = {"tip.span_kind": span.kind}
+    for key, value in span.attributes.items():
+        if isinstance(value, str | bool | int | float):
+            exported[key] = value
+        elif value is not None:
+            exported[key] = str(value)
+    return exported
+
+
+def _start_export(span: Span, start_time: Optional[float] = None) -> None:
+    """Open the exported Sentry/OpenTelemetry spans (backdated to start_time if given)."""
+    if SENTRY_AVAILABLE:
+        try:
+            kwargs = {}
+            if start_time is not None:
+                kwargs["start_timestamp"] = datetime.fromtimestamp(start_time, UTC)
+            try:
+                sentry_span = sentry_sdk.start_span(op=f"tip.{span.kind}", name=span.name, **kwargs)
+            except TypeError:
+                # sentry-sdk 1.x names spans by description
+                sentry_span = sentry_sdk.start_span(
+                    op=f"tip.{span.kind}", description=span.name, **kwargs
+                )
+            if start_time is None:
+                sentry_span.__enter__()
+            span._exported.append(("sentry", sentry_span))
+        except Exception as e:
+            logger.debug(f"Sentry span export failed: {e}")
+    if OTEL_AVAILABLE:
+        try:
+            tracer = otel_trace.get_tracer("tip.agents")
+            if start_time is None:
+                otel_span = tracer.start_as_current_span(span.name)
+                span._exported.append(("otel-current", otel_span, otel_span.__enter__()))
+            else:
+                otel_span = tracer.start_span(span.name, start_time=int(start_time * 1e9))
+                span._exported.append(("otel", otel_span, otel_span))
+        except Exception as e:
+            logger.debug(f"OpenTelemetry span export failed: {e}")
+
+
+def _finish_export(span: Span, end_time: Optional[float] = None) -> None:
+    attributes = _export_attributes(span)
+    for exported in reversed(span._exported):
+        try:
+            if exported[0] == "sentry":
+                sentry_span = exported[1]
+                for key, value in attributes.items():
+                    sentry_span.set_data(key, value)
+                sentry_span.set_status("ok" if span.ok else "internal_error")
+                if end_time is None:
+                    sentry_span.__exit__(None, None, None)
+                else:
+                    sentry_span.finish(end_timestamp=datetime.fromtimestamp(end_time, UTC))
+            else:
+                manager, otel_span = exported[1], exported[2]
+                otel_span.set_attributes(attributes)
+                if not span.ok:
+                    otel_span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR, span.error))
+                if exported[0] == "otel-current":
+                    manager.__exit__(None, None, None)
+                else:
+                    otel_span.end(end_time=int(end_time * 1e9) if end_time else None)
+        except Exception as e:
+            logger.debug(f"Span export failed: {e}")
+    span._exported.clear()
+
+
+# ----------------------------------------------------------------------
+# Recording spans
+# ----------------------------------------------------------------------
+
+
+def _child_span(name: str, kind: str, attributes: dict[str, Any]) -> Span:
+    parent = _current_span.get()
+    return Span(
+        name,
+        kind,
+        parent_id=parent.span_id if parent else None,
+        agent=name if kind == AGENT else parent.agent if parent else None,
+        attributes=attributes,
+    )
+
+
+@contextmanager
+def span(name: str, kind: str, **attributes: Any) -> Iterator[Span]:
+    """
+    Time a block as a span, nested under the current span.
+
+    The span is recorded into the current trace (if any) and exported. An
+    exception raised in the block marks the span failed and is re-raised.
+
+    Args:
+        name: Span name (agent type, tool name, model)
+        kind: AGENT, LLM or TOOL
+        **attributes: Span attributes; more can be added with Span.set()
+    """
+    current = _child_span(name, kind, attributes)
+    _start_export(current)
+    span_token = _current_span.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.fail(e)
+        raise
+    finally:
+        current.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        _current_span.reset(span_token)
+        _finish_export(current)
+        if kind == AGENT:
+            observe_agent(name, current.ok, current.duration_ms / 1000)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(current)
+
+
+def record_span(
+    name: str,
+    kind: str,
+    *,
+    duration_ms: float,
+    error: BaseException | str | None = None,
+    **attributes: Any,
+) -> Span:
+    """
+    Record a span that has just finished (e.g. from an LLM callback).
+
+    The span ends now, started duration_ms ago and is nested under the current
+    span.
+    """
+    end = time.time()
+    recorded = _child_span(name, kind, attributes)
+    recorded.start = end - duration_ms / 1000
+    recorded.duration_ms = round(duration_ms, 1)
+    if error is not None:
+        recorded.fail(error)
+    _start_export(recorded, start_time=recorded.start)
+    _finish_export(recorded, end_time=end)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(recorded)
+    return recorded
+
+
+def traced(name: str, kind: str = TOOL) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator recording each call of a function as a span."""
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name, kind) as current:
+                result = func(*args, **kwargs)
+                if isinstance(result, str):
+                    current.set(output_chars=len(result))
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+def trace_tools(tools: list[Any]) -> list[Any]:
+    """
+    Copies of CrewAI tools that record each invocation as a tool span.
+
+    Tools without a wrapped function (func) are returned unchanged.
+    """
+    wrapped = []
+    for tool in tools:
+        func = getattr(tool, "func", None)
+        if func is None or getattr(func, "__tip_traced__", False):
+            wrapped.append(tool)
+            continue
+        traced_func = traced(getattr(tool, "name", None) or func.__name__)(func)
+        traced_func.__tip_traced__ = True
+        try:
+            wrapped.append(tool.model_copy(update={"func": traced_func}))
+        except Exception as e:
+            logger.debug(f"Could not trace tool {getattr(tool, 'name', tool)}: {e}")
+            wrapped.append(tool)
+    return wrapped
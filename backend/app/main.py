@@ -12,6 +12,7 @@ from app.api import (
     healthcheck,
     history,
     itinerary,
+    metrics,
     places,
     profile,
     recommendations,
@@ -24,6 +25,7 @@ from app.core.api_validation import startup_api_check
 from app.core.config import settings
 from app.core.exception_handlers import register_exception_handlers
 from app.core.logging_config import RequestLogger, configure_logging
+from app.core.profiling import register_profiling_middleware
 from app.core.security import check_security_on_startup, register_security_middleware
 from app.core.sentry import configure_sentry
 
@@ -83,6 +85,9 @@ register_security_middleware(app)
 # Add request logging middleware
 app.middleware("http")(RequestLogger(app))
 
+# On-demand request profiling (only registered when PROFILING_TOKEN is set)
+register_profiling_middleware(app)
+
 # Include routers
 app.include_router(healthcheck.router, prefix="/api")
 app.include_router(trips.router, prefix="/api")
@@ -96,6 +101,9 @@ app.include_router(history.router, prefix="/api")
 app.include_router(settings_router.router, prefix="/api")
 app.include_router(feedback.router, prefix="/api")
 
+# Prometheus scrape endpoint (unprefixed, as scrapers expect)
+app.include_router(metrics.router)
+
 
 # Root endpoint
 @app.get("/", include_in_schema=False)
@@ -7,7 +7,7 @@ distinct from the AI-generated itinerary reports.
 
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Any, Literal, Optional
 from uuid import uuid4
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -106,6 +106,12 @@ class ActivityBase(BaseModel):
     transport_duration_minutes: Optional[int] = Field(
         None, ge=0, description="Travel time to next activity", alias="transportDurationMinutes"
     )
+    opens_at: Optional[str] = Field(
+        None, description="Opening time in HH:MM format", alias="opensAt"
+    )
+    closes_at: Optional[str] = Field(
+        None, description="Closing time in HH:MM format", alias="closesAt"
+    )
 
 
 class Activity(ActivityBase):
@@ -141,6 +147,8 @@ class ActivityUpdate(BaseModel):
     accessibility_notes: Optional[str] = Field(None, alias="accessibilityNotes")
     transport_to_next: Optional[str] = Field(None, alias="transportToNext")
     transport_duration_minutes: Optional[int] = Field(None, ge=0, alias="transportDurationMinutes")
+    opens_at: Optional[str] = Field(None, alias="opensAt")
+    closes_at: Optional[str] = Field(None, alias="closesAt")
 
 
 # ============================================================================
@@ -211,6 +219,7 @@ class Itinerary(ItineraryBase):
     last_modified: datetime = Field(
         default_factory=datetime.utcnow, description="Last modification time", alias="lastModified"
     )
+    version: int = Field(default=0, ge=0, description="Version for optimistic concurrency")
 
     def calculate_total_cost(self) -> float:
         """Calculate total cost from all days."""
@@ -249,6 +258,77 @@ class ReorderRequest(BaseModel):
     operations: list[ReorderItem] = Field(..., description="List of reorder operations")
 
 
+# ============================================================================
+# Route Optimization Models
+# ============================================================================
+
+
+class OptimizeRouteRequest(BaseModel):
+    """Request to reorder activities by travel distance and opening hours."""
+
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    day_ids: Optional[list[str]] = Field(
+        None, description="Days to optimize (all days if omitted)", alias="dayIds"
+    )
+    day_start: str = Field(
+        default="09:00",
+        pattern=r"^([01]\d|2[0-3]):[0-5]\d$",
+        description="Time each day starts (HH:MM)",
+        alias="dayStart",
+    )
+    transport_mode: Literal["walk", "bike", "metro", "bus", "taxi", "car"] = Field(
+        default="taxi", description="Mode used for travel-time estimates", alias="transportMode"
+    )
+
+
+class DayRouteSummary(BaseModel):
+    """Route optimization result for one day."""
+
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    day_id: str = Field(..., alias="dayId")
+    total_distance_km: float = Field(..., alias="totalDistanceKm")
+    original_distance_km: float = Field(..., alias="originalDistanceKm")
+    late_activities: list[str] = Field(
+        default_factory=list,
+        description="Activities that still end after closing time",
+        alias="lateActivities",
+    )
+    unrouted_activities: list[str] = Field(
+        default_factory=list,
+        description="Activities without coordinates (left at the end of the day)",
+        alias="unroutedActivities",
+    )
+
+
+# ============================================================================
+# JSON Patch Models
+# ============================================================================
+
+
+class JsonPatchOperation(BaseModel):
+    """Single RFC 6902 operation; paths are relative to the itinerary."""
+
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    op: Literal["add", "remove", "replace", "move", "copy", "test"]
+    path: str = Field(..., description="JSON Pointer, e.g. /days/0/activities/1")
+    value: Any = None
+    from_: Optional[str] = Field(None, alias="from", description="Source pointer for move/copy")
+
+
+class ItineraryPatchRequest(BaseModel):
+    """Batch of JSON Patch operations applied atomically to the itinerary."""
+
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    version: int = Field(..., ge=0, description="Itinerary version the operations are based on")
+    operations: list[JsonPatchOperation] = Field(
+        ..., min_length=1, max_length=500, description="Operations, applied in order"
+    )
+
+
 # ============================================================================
 # Place Search Models
 # ============================================================================
@@ -340,6 +420,17 @@ class ActivityResponse(BaseModel):
     message: Optional[str] = None
 
 
+class OptimizeRouteResponse(BaseModel):
+    """API response for route optimization."""
+
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    success: bool
+    updated_days: list[DayPlan] = Field(..., alias="updatedDays")
+    routes: list[DayRouteSummary]
+    message: Optional[str] = None
+
+
 class ReorderResponse(BaseModel):
     """API response for reorder operations."""
 
@@ -0,0 +1,17 @@
+"""Offline airport database for IATA code resolution."""
+
+from .airports import (
+    Airport,
+    AirportDatabase,
+    MetroArea,
+    airport_code,
+    get_airport_database,
+)
+
+__all__ = [
+    "Airport",
+    "AirportDatabase",
+    "MetroArea",
+    "airport_code",
+    "get_airport_database",
+]
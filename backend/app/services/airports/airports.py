@@ -0,0 +1,284 @@
+"""
+Offline Airport Database
+
+Local lookup of airports (IATA/ICAO codes, name, city, country, coordinates,
+time zone) and IATA metropolitan areas from the bundled data file built by
+app.services.airports.build.
+
+resolve() turns a free-form location into airports, best first:
+- an IATA airport, IATA metro area ("NYC", "LON") or ICAO code
+- a popular region or island served by a city's airport ("Bali" -> DPS),
+  from REGION_AIRPORTS
+- a metro area by city name ("New York" -> JFK, EWR, LGA)
+- airports whose city is that name, international airports first
+- airports near the gazetteer coordinates of the city
+- airports whose name contains it ("Heathrow"), then a close city name
+"""
+
+import difflib
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+from app.services.gazetteer import get_gazetteer, normalize
+from app.services.places.geohash import haversine_km
+
+DATA_PATH = Path(__file__).parent / "data" / "airports.json"
+
+FUZZY_CUTOFF = 0.85
+# Shorter queries would match too many airport names
+MIN_NAME_QUERY = 5
+# Airports this far from a city are not offered for it
+NEARBY_KM = 100.0
+# International airports rank as if this much closer
+INTERNATIONAL_DISTANCE_FACTOR = 0.5
+
+# Destinations that are regions or islands rather than cities -> airports
+# serving them, main first. Checked before city names, so "Bali" is not the
+# town in Cameroon and "Tuscany" is not left to fuzzy matching.
+REGION_AIRPORTS: dict[str, tuple[str, ...]] = {
+    "algarve": ("FAO",),
+    "amalfi coast": ("NAP",),
+    "bali": ("DPS",),
+    "big island": ("KOA",),
+    "cote dazur": ("NCE",),
+    "dolomites": ("VCE",),
+    "french riviera": ("NCE",),
+    "hawaii": ("HNL", "OGG", "KOA", "LIH"),
+    "kauai": ("LIH",),
+    "lake como": ("MXP",),
+    "lapland": ("RVN",),
+    "maui": ("OGG",),
+    "napa valley": ("SFO",),
+    "oahu": ("HNL",),
+    "patagonia": ("FTE",),
+    "provence": ("MRS",),
+    "sardinia": ("CAG", "OLB"),
+    "sicily": ("PMO", "CTA"),
+    "swiss alps": ("ZRH", "GVA"),
+    "tuscany": ("FLR", "PSA"),
+}
+
+
+@dataclass(frozen=True)
+class Airport:
+    iata: str
+    icao: str
+    name: str
+    city: str
+    country: str  # ISO2 code
+    lat: float
+    lng: float
+    timezone: str
+
+    @property
+    def international(self) -> bool:
+        name = self.name.lower()
+        return "international" in name or "intl" in name
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class MetroArea:
+    code: str
+    city: str
+    country: str  # ISO2 code
+    airports: tuple[str, ...]
+
+
+class AirportDatabase:
+    """Indexed airports and metro areas."""
+
+    def __init__(self, document: dict[str, Any]):
+        timezones = document["timezones"]
+        columns = document["airports"]
+        self.airports = [
+            Airport(iata, icao, name, city, country, lat, lng, timezones[tz])
+            for iata, icao, name, city, country, lat, lng, tz in zip(
+                columns["iata"],
+                columns["icao"],
+                columns["name"],
+                columns["city"],
+                columns["country"],
+                columns["lat"],
+                columns["lng"],
+                columns["tz"],
+                strict=True,
+            )
+        ]
+        self.metros = {
+            code: MetroArea(code, metro["city"], metro["country"], tuple(metro["airports"]))
+            for code, metro in document["metros"].items()
+        }
+
+        self._by_iata = {a.iata: a for a in self.airports}
+        self._by_icao = {a.icao: a for a in self.airports if a.icao}
+        self._metro_of = {iata: m.code for m in self.metros.values() for iata in m.airports}
+        self._metro_names: dict[str, list[MetroArea]] = {}
+        for metro in self.metros.values():
+            self._metro_names.setdefault(normalize(metro.city), []).append(metro)
+
+        # Normalized city -> airports; "Arnavutkoy, Istanbul" and "Stockholm / Nykoping"
+        # are indexed under each part. International airports first.
+        self._by_city: dict[str, list[Airport]] = {}
+        for airport in sorted(self.airports, key=lambda a: not a.international):
+            names = {airport.city}
+            names.update(airport.city.replace("/", ",").split(","))
+            for name in {normalize(n) for n in names} - {""}:
+                self._by_city.setdefault(name, []).append(airport)
+
+        self._lats = np.array([a.lat for a in self.airports])
+        self._lngs = np.array([a.lng for a in self.airports])
+        self._international = np.array([a.international for a in self.airports])
+
+    @classmethod
+    def load(cls, path: Path = DATA_PATH) -> "AirportDatabase":
+        return cls(json.loads(path.read_text(encoding="utf-8")))
+
+    # ------------------------------------------------------------------
+    # Codes
+    # ------------------------------------------------------------------
+
+    def airport(self, code: str) -> Optional[Airport]:
+        """Airport by IATA or ICAO code."""
+        code = code.strip().upper()
+        return self._by_iata.get(code) or self._by_icao.get(code)
+
+    def metro(self, code: str) -> Optional[MetroArea]:
+        """Metro area by IATA city code ("NYC", "LON")."""
+        return self.metros.get(code.strip().upper())
+
+    def metro_of(self, airport: Airport) -> Optional[MetroArea]:
+        """Metro area an airport belongs to."""
+        code = self._metro_of.get(airport.iata)
+        return self.metros[code] if code else None
+
+    # ------------------------------------------------------------------
+    # Resolution
+    # ------------------------------------------------------------------
+
+    def resolve(
+        self, location: str, country: Optional[str] = None, limit: int = 5
+    ) -> list[Airport]:
+        """
+        Airports serving a location, best first.
+
+        Args:
+            location: Airport/metro code or city, e.g. "JFK", "NYC", "New York",
+                "Paris, France", "Kyoto"
+            country: Optional country (code or name) to disambiguate
+            limit: Maximum airports
+
+        Returns:
+            Airports, main airport first (empty if nothing matches)
+        """
+        if not location or not location.strip():
+            return []
+        code = location.strip().upper()
+        if len(code) == 3 and code in self.metros:
+            return self._metro_airports(self.metros[code])[:limit]
+        if len(code) in (3, 4) and code.isalnum():
+            airport = self.airport(code)
+            if airport:
+                return [airport]
+
+        parts = [p.strip() for p in location.split(",") if p.strip()]
+        if len(parts) > 1 and country is None and get_gazetteer().country(parts[-1], fuzzy=False):
+            country = parts[-1]
+            parts = parts[:-1]
+        iso2 = None
+        if country:
+            resolved = get_gazetteer().country(country)
+            iso2 = resolved.iso2 if resolved else None
+
+        # A qualifier that is not a country ("Paris, Texas") is not dropped:
+        # without a match for the whole name the location is unknown
+        return self._resolve_city(", ".join(parts), iso2)[:limit]
+
+    def _resolve_city(self, name: str, iso2: Optional[str]) -> list[Airport]:
+        key = normalize(name)
+        if not key:
+            return []
+        regional = [
+            self._by_iata[code]
+            for code in REGION_AIRPORTS.get(key, ())
+            if iso2 is None or self._by_iata[code].country == iso2
+        ]
+        if regional:
+            return regional
+        # Without a country, prefer the gazetteer's country for the name, so
+        # "Dublin" is not Dublin, Georgia (DBN)
+        home = iso2
+        if home is None:
+            known = get_gazetteer().city(name, fuzzy=False)
+            home = known.country if known else None
+
+        for metro in self._metro_names.get(key, []):
+            if home is None or metro.country == home:
+                return self._metro_airports(metro)
+
+        airports = [a for a in self._by_city.get(key, []) if home is None or a.country == home]
+        if airports:
+            # Without a country, keep to the country of the best match ("Portland")
+            return [a for a in airports if a.country == airports[0].country]
+
+        city = get_gazetteer().city(name, iso2)
+        if city:
+            return self.nearest(city.lat, city.lng)
+
+        # Airport names ("Heathrow", "Schiphol")
+        if len(key) >= MIN_NAME_QUERY:
+            airports = [
+                a
+                for a in self.airports
+                if key in normalize(a.name) and (iso2 is None or a.country == iso2)
+            ]
+            if airports:
+                return airports
+
+        match = difflib.get_close_matches(key, self._by_city, n=1, cutoff=FUZZY_CUTOFF)
+        if match:
+            return [a for a in self._by_city[match[0]] if iso2 is None or a.country == iso2]
+        return []
+
+    def _metro_airports(self, metro: MetroArea) -> list[Airport]:
+        return [self._by_iata[code] for code in metro.airports]
+
+    def nearest(
+        self, lat: float, lng: float, limit: int = 5, max_km: float = NEARBY_KM
+    ) -> list[Airport]:
+        """Airports within max_km, international airports preferred, then by distance."""
+        distances = haversine_km(lat, lng, self._lats, self._lngs)
+        nearby = np.flatnonzero(distances <= max_km)
+        if not len(nearby):
+            return []
+        scores = distances[nearby] * np.where(
+            self._international[nearby], INTERNATIONAL_DISTANCE_FACTOR, 1.0
+        )
+        return [self.airports[i] for i in nearby[np.argsort(scores, kind="stable")][:limit]]
+
+    def iata_code(self, location: str, country: Optional[str] = None) -> Optional[str]:
+        """IATA code of the main airport serving a location (None if unknown)."""
+        airports = self.resolve(location, country, limit=1)
+        return airports[0].iata if airports else None
+
+
+_airport_database: Optional[AirportDatabase] = None
+
+
+def get_airport_database() -> AirportDatabase:
+    """Get the shared airport database (loaded on first use)."""
+    global _airport_database
+    if _airport_database is None:
+        _airport_database = AirportDatabase.load()
+    return _airport_database
+
+
+def airport_code(location: str, country: Optional[str] = None) -> Optional[str]:
+    """IATA code of the main airport for a city or code (None if unknown)."""
+    return get_airport_database().iata_code(location, country)
@@ -0,0 +1,130 @@
+"""
+Build the bundled airport data file.
+
+Sources:
+- The airportsdata package (MIT licensed, from OurAirports and other open
+  data): every airport with an IATA code, with ICAO code, name, city,
+  country, coordinates and time zone
+- METRO_AREAS below: IATA metropolitan-area codes grouping the airports that
+  serve one city, main airport first
+
+Usage (from backend/, needs `pip install airportsdata`):
+    python -m app.services.airports.build
+
+Writes app/services/airports/data/airports.json. The output is committed;
+the build only needs to run again when the dataset or the table below change.
+"""
+
+import csv
+import json
+from importlib import resources
+from pathlib import Path
+
+OUTPUT_PATH = Path(__file__).parent / "data" / "airports.json"
+
+# Not airports a traveler can fly into from another city
+EXCLUDED_NAME_PARTS = ("heliport", "seaplane base")
+
+# code: (city, iso2, airports in order of passenger traffic)
+METRO_AREAS: dict[str, tuple[str, str, list[str]]] = {
+    "BER": ("Berlin", "DE", ["BER"]),
+    "BFS": ("Belfast", "GB", ["BFS", "BHD"]),
+    "BJS": ("Beijing", "CN", ["PEK", "PKX"]),
+    "BKK": ("Bangkok", "TH", ["BKK", "DMK"]),
+    "BRU": ("Brussels", "BE", ["BRU", "CRL"]),
+    "BUE": ("Buenos Aires", "AR", ["EZE", "AEP"]),
+    "CHI": ("Chicago", "US", ["ORD", "MDW"]),
+    "DFW": ("Dallas", "US", ["DFW", "DAL"]),
+    "DXB": ("Dubai", "AE", ["DXB", "DWC"]),
+    "GLA": ("Glasgow", "GB", ["GLA", "PIK"]),
+    "HOU": ("Houston", "US", ["IAH", "HOU"]),
+    "IEV": ("Kyiv", "UA", ["KBP", "IEV"]),
+    "IST": ("Istanbul", "TR", ["IST", "SAW"]),
+    "JKT": ("Jakarta", "ID", ["CGK", "HLP"]),
+    "JNB": ("Johannesburg", "ZA", ["JNB", "HLA"]),
+    "KUL": ("Kuala Lumpur", "MY", ["KUL", "SZB"]),
+    "LAX": ("Los Angeles", "US", ["LAX", "BUR", "LGB", "SNA", "ONT"]),
+    "LON": ("London", "GB", ["LHR", "LGW", "STN", "LTN", "LCY", "SEN"]),
+    "MEL": ("Melbourne", "AU", ["MEL", "AVV"]),
+    "MEX": ("Mexico City", "MX", ["MEX", "NLU"]),
+    "MIA": ("Miami", "US", ["MIA", "FLL"]),
+    "MIL": ("Milan", "IT", ["MXP", "LIN", "BGY"]),
+    "MOW": ("Moscow", "RU", ["SVO", "DME", "VKO"]),
+    "NGO": ("Nagoya", "JP", ["NGO", "NKM"]),
+    "NYC": ("New York", "US", ["JFK", "EWR", "LGA"]),
+    "ORL": ("Orlando", "US", ["MCO", "SFB"]),
+    "OSA": ("Osaka", "JP", ["KIX", "ITM", "UKB"]),
+    "OSL": ("Oslo", "NO", ["OSL", "TRF"]),
+    "PAR": ("Paris", "FR", ["CDG", "ORY", "BVA"]),
+    "REK": ("Reykjavik", "IS", ["KEF", "RKV"]),
+    "RIO": ("Rio de Janeiro", "BR", ["GIG", "SDU"]),
+    "ROM": ("Rome", "IT", ["FCO", "CIA"]),
+    "SAO": ("Sao Paulo", "BR", ["GRU", "CGH", "VCP"]),
+    "SEL": ("Seoul", "KR", ["ICN", "GMP"]),
+    "SFO": ("San Francisco", "US", ["SFO", "OAK", "SJC"]),
+    "SHA": ("Shanghai", "CN", ["PVG", "SHA"]),
+    "SPK": ("Sapporo", "JP", ["CTS", "OKD"]),
+    "STO": ("Stockholm", "SE", ["ARN", "BMA", "NYO"]),
+    "THR": ("Tehran", "IR", ["IKA", "THR"]),
+    "TPE": ("Taipei", "TW", ["TPE", "TSA"]),
+    "TYO": ("Tokyo", "JP", ["HND", "NRT"]),
+    "VCE": ("Venice", "IT", ["VCE", "TSF"]),
+    "YVR": ("Vancouver", "CA", ["YVR", "CXH"]),
+    "WAS": ("Washington", "US", ["IAD", "DCA", "BWI"]),
+    "YMQ": ("Montreal", "CA", ["YUL", "YMX"]),
+    "YTO": ("Toronto", "CA", ["YYZ", "YTZ"]),
+}
+
+
+def _airports() -> list[dict[str, str]]:
+    source = resources.files("airportsdata").joinpath("airports.csv").read_text(encoding="utf-8")
+    return [
+        row
+        for row in csv.DictReader(source.splitlines())
+        if row["iata"] and not any(part in row["name"].lower() for part in EXCLUDED_NAME_PARTS)
+    ]
+
+
+def build() -> dict:
+    airports = sorted(_airports(), key=lambda row: row["iata"])
+    known = {row["iata"] for row in airports}
+    for code, (_, _, members) in METRO_AREAS.items():
+        missing = [member for member in members if member not in known]
+        if missing:
+            msg = f"Metro area {code} lists unknown airports: {missing}"
+            raise ValueError(msg)
+
+    # Time zones are repeated by thousands of airports; store each once
+    timezones = sorted({row["tz"] for row in airports})
+    tz_index = {tz: i for i, tz in enumerate(timezones)}
+    return {
+        "timezones": timezones,
+        "airports": {
+            "iata": [row["iata"] for row in airports],
+            "icao": [row["icao"] for row in airports],
+            "name": [row["name"] for row in airports],
+            "city": [row["city"] for row in airports],
+            "country": [row["country"] for row in airports],
+            "lat": [round(float(row["lat"]), 4) for row in airports],
+            "lng": [round(float(row["lon"]), 4) for row in airports],
+            "tz": [tz_index[row["tz"]] for row in airports],
+        },
+        "metros": {
+            code: {"city": city, "country": country, "airports": members}
+            for code, (city, country, members) in sorted(METRO_AREAS.items())
+        },
+    }
+
+
+def main() -> None:
+    document = build()
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_PATH.write_text(json.dumps(document, ensure_ascii=False, separators=(",", ":")) + "\n")
+    print(
+        f"Wrote {len(document['airports']['iata'])} airports and "
+        f"{len(document['metros'])} metro areas to {OUTPUT_PATH}"
+    )
+
+
+if __name__ == "__main__":
+    main()
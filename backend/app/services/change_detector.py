@@ -16,6 +16,7 @@ from app.models.trips import (
     TripDetails,
     TripPreferences,
 )
+from app.services.duration_estimator import get_duration_estimator
 
 
 class ChangeResult(BaseModel):
@@ -64,19 +65,6 @@ class ChangeDetector:
         "flight": ["origin_city", "destination", "departure_date", "return_date"],
     }
 
-    # Average time per agent in seconds
-    AGENT_TIMES: dict[str, int] = {
-        "visa": 15,
-        "weather": 10,
-        "currency": 10,
-        "culture": 15,
-        "food": 15,
-        "attractions": 20,
-        "itinerary": 25,
-        "country": 10,
-        "flight": 15,
-    }
-
     def detect_changes(
         self,
         old_trip: dict[str, Any],
@@ -369,9 +357,6 @@ class ChangeDetector:
             agents: List of agent names to recalculate
 
         Returns:
-            Estimated time in seconds
+            Estimated time in seconds (sum of the agents' learned mean durations)
         """
-        total = 0
-        for agent in agents:
-            total += self.AGENT_TIMES.get(agent, 15)  # Default 15s if unknown
-        return total
+        return round(get_duration_estimator().estimate(agents))
@@ -4,6 +4,7 @@ Country Information Services
 Provides clients for accessing country data from external APIs.
 """
 
+from .catalog import CountryCatalog, get_country_catalog
 from .rest_countries_client import CountryInfo, RestCountriesClient
 
-__all__ = ["RestCountriesClient", "CountryInfo"]
+__all__ = ["RestCountriesClient", "CountryInfo", "CountryCatalog", "get_country_catalog"]
@@ -0,0 +1,183 @@
+"""
+Country Catalog
+
+All REST Countries records held in memory, so country, currency and code
+lookups never call the API on the hot path:
+
+- The whole dataset (~250 countries) is fetched in one bulk pass and stored
+  as a compact JSON snapshot in Redis, shared by every worker
+- Each process loads the snapshot once and indexes it by ISO2/ISO3 code,
+  common and official name and alternative spellings; names the index does
+  not know (aliases, typos) are resolved through the gazetteer
+- The Celery beat job (app.tasks.country_catalog) re-fetches the snapshot
+  weekly; workers re-read it every COUNTRY_CATALOG_RELOAD_SECONDS
+- Without a snapshot the first lookup fetches the dataset itself; a failed
+  fetch is not retried for COUNTRY_CATALOG_RETRY_SECONDS
+"""
+
+import json
+import logging
+import time
+from typing import Any, Optional
+
+import httpx
+import redis
+
+from app.core.config import settings
+from app.core.redis_client import get_redis_client
+from app.services.gazetteer import get_gazetteer, normalize
+
+from .rest_countries_client import CountryInfo, RestCountriesClient
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = "tip:countries:snapshot"
+
+
+class CountryCatalog:
+    """In-memory index over a REST Countries snapshot."""
+
+    def __init__(
+        self,
+        client: Optional[RestCountriesClient] = None,
+        redis_client: Optional[redis.Redis] = None,
+    ):
+        self.client = client or RestCountriesClient()
+        self._redis = redis_client
+        self.countries: list[CountryInfo] = []
+        self.fetched_at: Optional[float] = None
+        self._by_code: dict[str, CountryInfo] = {}
+        self._by_name: dict[str, CountryInfo] = {}
+        self._loaded_at = 0.0
+        self._retry_at = 0.0
+
+    @property
+    def redis(self) -> Optional[redis.Redis]:
+        return self._redis if self._redis is not None else get_redis_client()
+
+    def __len__(self) -> int:
+        return len(self.countries)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _index(self, countries: list[CountryInfo], fetched_at: float) -> None:
+        by_code: dict[str, CountryInfo] = {}
+        by_name: dict[str, CountryInfo] = {}
+        for country in countries:
+            by_code[country.cca2] = country
+            by_code[country.cca3] = country
+            by_name.setdefault(normalize(country.name_common), country)
+            by_name.setdefault(normalize(country.name_official), country)
+        # Alternative spellings only fill names no country claims directly
+        for country in countries:
+            for name in country.alt_spellings:
+                by_name.setdefault(normalize(name), country)
+
+        self.countries = countries
+        self.fetched_at = fetched_at
+        self._by_code = by_code
+        self._by_name = by_name
+
+    def load(self) -> bool:
+        """Load the shared snapshot from Redis. Returns False if there is none."""
+        self._loaded_at = time.time()
+        client = self.redis
+        if client is None:
+            return False
+        try:
+            raw = client.get(SNAPSHOT_KEY)
+        except redis.RedisError as e:
+            logger.debug(f"Country snapshot load failed: {e}")
+            return False
+        if not raw:
+            return False
+
+        snapshot = json.loads(raw)
+        self._index([CountryInfo(**data) for data in snapshot["countries"]], snapshot["fetched_at"])
+        return True
+
+    def refresh(self) -> int:
+        """
+        Fetch all countries, store the snapshot and re-index.
+
+        Returns:
+            Number of countries fetched
+
+        Raises:
+            httpx.HTTPError: If the bulk fetch fails
+            ValueError: If the response is invalid
+        """
+        countries = self.client.get_all_countries_sync()
+        fetched_at = time.time()
+        self._index(countries, fetched_at)
+        self._loaded_at = fetched_at
+
+        client = self.redis
+        if client is not None:
+            snapshot = {
+                "fetched_at": fetched_at,
+                "countries": [c.model_dump(exclude_defaults=True) for c in countries],
+            }
+            try:
+                client.set(SNAPSHOT_KEY, json.dumps(snapshot, separators=(",", ":")))
+            except redis.RedisError as e:
+                logger.warning(f"Country snapshot store failed: {e}")
+        return len(countries)
+
+    def _ensure_loaded(self) -> None:
+        now = time.time()
+        if self.countries and now - self._loaded_at < settings.COUNTRY_CATALOG_RELOAD_SECONDS:
+            return
+        if self.load() or self.countries or now < self._retry_at:
+            return
+        try:
+            self.refresh()
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"Country catalog fetch failed: {e}")
+            self._retry_at = now + settings.COUNTRY_CATALOG_RETRY_SECONDS
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get(self, query: str) -> Optional[CountryInfo]:
+        """
+        Resolve a country by ISO2/ISO3 code, name, alternative spelling or alias.
+
+        Args:
+            query: e.g. "FR", "FRA", "France", "French Republic", "england"
+
+        Returns:
+            CountryInfo, or None if nothing matches (or no snapshot is available)
+        """
+        if not query or not query.strip():
+            return None
+        self._ensure_loaded()
+
+        code = query.strip().upper()
+        if len(code) in (2, 3) and code in self._by_code:
+            return self._by_code[code]
+        country = self._by_name.get(normalize(query))
+        if country is not None:
+            return country
+
+        resolved = get_gazetteer().country(query)
+        return self._by_code.get(resolved.iso2) if resolved else None
+
+    def currencies(self, query: str) -> dict[str, dict[str, Any]]:
+        """Currencies of a country (code: {name, symbol}), empty if unknown."""
+        country = self.get(query)
+        return dict(country.currencies) if country else {}
+
+
+_country_catalog: Optional[CountryCatalog] = None
+
+
+def get_country_catalog() -> CountryCatalog:
+    """Get the shared country catalog."""
+    global _country_catalog
+    if _country_catalog is None:
+        _country_catalog = CountryCatalog()
+    return _country_catalog
@@ -9,6 +9,9 @@ API Documentation: https://restcountries.com/
 import httpx
 from pydantic import BaseModel, Field
 
+from app.core.config import settings
+from app.core.metrics import async_http_event_hooks, http_event_hooks
+
 
 class CountryInfo(BaseModel):
     """Country information from REST Countries API."""
@@ -34,6 +37,9 @@ class CountryInfo(BaseModel):
     car_side: str = Field(..., description="Driving side: 'left' or 'right'")
     flags_svg: str | None = Field(None, description="SVG flag URL")
     flags_png: str | None = Field(None, description="PNG flag URL")
+    alt_spellings: list[str] = Field(
+        default_factory=list, description="Alternative names and spellings"
+    )
 
 
 class RestCountriesClient:
@@ -41,6 +47,12 @@ class RestCountriesClient:
 
     BASE_URL = "https://restcountries.com/v3.1"
 
+    # /all accepts at most 10 fields per request; cca3 joins the groups
+    ALL_FIELD_GROUPS = (
+        "name,cca2,cca3,altSpellings,capital,region,subregion,population,area,latlng",
+        "cca3,languages,timezones,borders,currencies,idd,car,flags",
+    )
+
     def __init__(self, timeout: float = 10.0):
         """
         Initialize REST Countries client.
@@ -49,11 +61,24 @@ class RestCountriesClient:
             timeout: HTTP request timeout in seconds
         """
         self.timeout = timeout
-        self._client = httpx.AsyncClient(timeout=timeout)
+        self.base_url = settings.REST_COUNTRIES_BASE_URL or self.BASE_URL
+        self._client = httpx.AsyncClient(
+            timeout=timeout, event_hooks=async_http_event_hooks("rest_countries")
+        )
+        self._sync_client: httpx.Client | None = None
+
+    def _http_client(self) -> httpx.Client:
+        if self._sync_client is None:
+            self._sync_client = httpx.Client(
+                timeout=self.timeout, event_hooks=http_event_hooks("rest_countries")
+            )
+        return self._sync_client
 
     async def close(self):
-        """Close the HTTP client."""
+        """Close the HTTP clients."""
         await self._client.aclose()
+        if self._sync_client is not None:
+            self._sync_client.close()
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -93,6 +118,7 @@ class RestCountriesClient:
             car_side=data.get("car", {}).get("side", "right"),
             flags_svg=data.get("flags", {}).get("svg"),
             flags_png=data.get("flags", {}).get("png"),
+            alt_spellings=data.get("altSpellings", []),
         )
 
     async def get_country_by_name(self, name: str) -> CountryInfo:
@@ -112,7 +138,7 @@ class RestCountriesClient:
         if not name or not name.strip():
             raise ValueError("Country name cannot be empty")
 
-        url = f"{self.BASE_URL}/name/{name.strip()}"
+        url = f"{self.base_url}/name/{name.strip()}"
 
         try:
             response = await self._client.get(url)
@@ -154,7 +180,7 @@ class RestCountriesClient:
         if len(code) not in [2, 3]:
             raise ValueError(f"Invalid country code: {code}")
 
-        url = f"{self.BASE_URL}/alpha/{code}"
+        url = f"{self.base_url}/alpha/{code}"
 
         try:
             response = await self._client.get(url)
@@ -184,19 +210,18 @@ class RestCountriesClient:
         if not name or not name.strip():
             raise ValueError("Country name cannot be empty")
 
-        url = f"{self.BASE_URL}/name/{name.strip()}"
+        url = f"{self.base_url}/name/{name.strip()}"
 
         try:
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.get(url)
-                response.raise_for_status()
-                data = response.json()
+            response = self._http_client().get(url)
+            response.raise_for_status()
+            data = response.json()
 
-                if not data or not isinstance(data, list):
-                    raise ValueError(f"Invalid API response for country: {name}")
+            if not data or not isinstance(data, list):
+                raise ValueError(f"Invalid API response for country: {name}")
 
-                country_data = data[0]
-                return self._parse_country_response(country_data)
+            country_data = data[0]
+            return self._parse_country_response(country_data)
 
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
@@ -221,20 +246,45 @@ class RestCountriesClient:
         if len(code) not in [2, 3]:
             raise ValueError(f"Invalid country code: {code}")
 
-        url = f"{self.BASE_URL}/alpha/{code}"
+        url = f"{self.base_url}/alpha/{code}"
 
         try:
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.get(url)
-                response.raise_for_status()
-                data = response.json()
+            response = self._http_client().get(url)
+            response.raise_for_status()
+            data = response.json()
 
-                if not data or not isinstance(data, dict):
-                    raise ValueError(f"Invalid API response for code: {code}")
+            if not data or not isinstance(data, dict):
+                raise ValueError(f"Invalid API response for code: {code}")
 
-                return self._parse_country_response(data)
+            return self._parse_country_response(data)
 
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 raise ValueError(f"Country not found with code: {code}")
             raise
+
+    def get_all_countries_sync(self) -> list[CountryInfo]:
+        """
+        Get every country in one pass (one request per field group).
+
+        Returns:
+            CountryInfo objects for all ~250 countries
+
+        Raises:
+            httpx.HTTPStatusError: If API request fails
+            ValueError: If the response is invalid
+        """
+        merged: dict[str, dict] = {}
+        for fields in self.ALL_FIELD_GROUPS:
+            response = self._http_client().get(f"{self.base_url}/all", params={"fields": fields})
+            response.raise_for_status()
+            data = response.json()
+
+            if not data or not isinstance(data, list):
+                raise ValueError("Invalid API response for all countries")
+
+            for country_data in data:
+                if country_data.get("cca3"):
+                    merged.setdefault(country_data["cca3"], {}).update(country_data)
+
+        return [self._parse_country_response(data) for data in merged.values()]
@@ -1,5 +1,12 @@
 """Currency services package."""
 
 from .exchange_api_client import CurrencyExchangeClient, ExchangeRateData
+from .rate_matrix import ExchangeRateMatrix, RateSnapshot, get_exchange_rate_matrix
 
-__all__ = ["CurrencyExchangeClient", "ExchangeRateData"]
+__all__ = [
+    "CurrencyExchangeClient",
+    "ExchangeRateData",
+    "ExchangeRateMatrix",
+    "RateSnapshot",
+    "get_exchange_rate_matrix",
+]
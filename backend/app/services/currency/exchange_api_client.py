@@ -17,6 +17,9 @@ from datetime import date, datetime
 import httpx
 from pydantic import BaseModel, Field
 
+from app.core.config import settings
+from app.core.metrics import async_http_event_hooks, http_event_hooks
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,11 +52,20 @@ class CurrencyExchangeClient:
             timeout: HTTP request timeout in seconds
         """
         self.timeout = timeout
+        self.base_url = settings.EXCHANGE_API_BASE_URL or self.BASE_URL
         self._currencies_cache: dict[str, str] | None = None
+        self._http: httpx.Client | None = None
+
+    def _http_client(self) -> httpx.Client:
+        if self._http is None:
+            self._http = httpx.Client(
+                timeout=self.timeout, event_hooks=http_event_hooks("exchangerate_api")
+            )
+        return self._http
 
     def _get_url(self, version: str = "latest") -> str:
         """Get base URL with version."""
-        return self.BASE_URL.format(version=version)
+        return self.base_url.format(version=version)
 
     def get_all_currencies(self) -> dict[str, str]:
         """
@@ -72,7 +84,9 @@ class CurrencyExchangeClient:
         url = f"{self._get_url()}/currencies.json"
 
         try:
-            with httpx.Client(timeout=self.timeout) as client:
+            with httpx.Client(
+                timeout=self.timeout, event_hooks=http_event_hooks("exchangerate_api")
+            ) as client:
                 response = client.get(url)
                 response.raise_for_status()
                 currencies = response.json()
@@ -108,36 +122,61 @@ class CurrencyExchangeClient:
             httpx.HTTPError: If API request fails
             ValueError: If base currency is invalid
         """
-        base_currency = base_currency.lower().strip()
+        _, rates = self.get_rate_table(base_currency, date_str=date_str)
 
-        # Determine version (date or latest)
-        version = date_str if date_str else "latest"
-        url = f"{self._get_url(version)}/currencies/{base_currency}.json"
+        # Filter to target currencies if specified
+        if target_currencies:
+            target_currencies_lower = [c.lower() for c in target_currencies]
+            rates = {k: v for k, v in rates.items() if k.lower() in target_currencies_lower}
 
-        try:
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.get(url)
-                response.raise_for_status()
-                data = response.json()
+        return rates
 
-                # Extract rates
-                if base_currency not in data:
-                    raise ValueError(f"Invalid base currency: {base_currency}")
+    def get_rate_table(
+        self, base_currency: str, date_str: str | None = None
+    ) -> tuple[date, dict[str, float]]:
+        """
+        Get all exchange rates for a base currency with the date they apply to.
 
-                rates = data[base_currency]
+        Args:
+            base_currency: Base currency code (e.g., "usd")
+            date_str: Date in YYYY-MM-DD format. If None, uses latest.
 
-                # Filter to target currencies if specified
-                if target_currencies:
-                    target_currencies_lower = [c.lower() for c in target_currencies]
-                    rates = {k: v for k, v in rates.items() if k.lower() in target_currencies_lower}
+        Returns:
+            (rate date, {currency code: rate}) with lowercase codes
 
-                logger.info(f"Fetched {len(rates)} exchange rates for {base_currency}")
-                return rates
+        Raises:
+            httpx.HTTPError: If API request fails
+            ValueError: If base currency is invalid
+        """
+        base_currency = base_currency.lower().strip()
+
+        # Determine version (date or latest)
+        version = date_str if date_str else "latest"
+        url = f"{self._get_url(version)}/currencies/{base_currency}.json"
 
+        try:
+            response = self._http_client().get(url)
+            response.raise_for_status()
+            data = response.json()
         except httpx.HTTPError as e:
             logger.error(f"Failed to fetch exchange rates for {base_currency}: {e}")
             raise
 
+        # Extract rates
+        if base_currency not in data:
+            raise ValueError(f"Invalid base currency: {base_currency}")
+
+        rates = data[base_currency]
+        if data.get("date"):
+            rate_date = date.fromisoformat(data["date"])
+        elif date_str:
+            rate_date = date.fromisoformat(date_str)
+        else:
+            rate_date = date.today()
+
+        logger.info(f"Fetched {len(rates)} exchange rates for {base_currency}")
+        return rate_date, rates
+
     def get_exchange_rate(
         self, base_currency: str, target_currency: str, date_str: str | None = None
     ) -> ExchangeRateData:
@@ -202,7 +241,9 @@ class CurrencyExchangeClient:
         url = f"{self._get_url(version)}/currencies/{base_currency}.json"
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with httpx.AsyncClient(
+                timeout=self.timeout, event_hooks=async_http_event_hooks("exchangerate_api")
+            ) as client:
                 response = await client.get(url)
                 response.raise_for_status()
                 data = response.json()
@@ -0,0 +1,260 @@
+"""
+Exchange Rate Matrix
+
+Daily snapshots of every exchange rate against one base currency
+(settings.FX_BASE_CURRENCY), held as a NumPy array indexed by currency code,
+so conversions never call the exchange API per pair:
+
+- Any pair is a cross rate through the base: rate(A -> B) = rates[B] / rates[A]
+- A batch of amounts (with per-amount source or target currencies) converts
+  in one vectorized expression
+- Snapshots are stored in a JsonCache (in-process LRU backed by Redis) under
+  their rate date, so date-specific conversions use that day's rates; the
+  latest snapshot is re-fetched every FX_REFRESH_SECONDS and by the daily
+  Celery beat job (app.tasks.exchange_rates)
+"""
+
+import logging
+import time
+from collections.abc import Sequence
+from datetime import date
+from typing import Any, Optional
+
+import httpx
+import numpy as np
+import redis
+
+from app.core.config import settings
+from app.services.places import JsonCache
+
+from .exchange_api_client import CurrencyExchangeClient, ExchangeRateData
+
+logger = logging.getLogger(__name__)
+
+LATEST = "latest"
+
+Codes = str | Sequence[str]
+
+
+class RateSnapshot:
+    """All rates against one base currency on one date."""
+
+    def __init__(self, rate_date: date, base: str, rates: dict[str, float]):
+        self.date = rate_date
+        self.base = base.upper()
+        valid = {
+            code.upper(): float(rate)
+            for code, rate in rates.items()
+            if isinstance(rate, (int, float)) and rate > 0
+        }
+        valid[self.base] = 1.0
+        self.codes = sorted(valid)
+        self._index = {code: i for i, code in enumerate(self.codes)}
+        # Units of each currency per 1 base currency
+        self.rates = np.array([valid[code] for code in self.codes])
+
+    def __contains__(self, code: str) -> bool:
+        return code.upper() in self._index
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def indices(self, codes: Codes) -> int | np.ndarray:
+        """Array positions of currency codes (raises ValueError for unknown codes)."""
+        try:
+            if isinstance(codes, str):
+                return self._index[codes.upper()]
+            return np.array([self._index[code.upper()] for code in codes], dtype=np.intp)
+        except KeyError as e:
+            msg = f"Unknown currency: {e.args[0]}"
+            raise ValueError(msg) from e
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        """Units of to_currency per 1 from_currency."""
+        return float(
+            self.rates[self.indices(to_currency)] / self.rates[self.indices(from_currency)]
+        )
+
+    def convert(self, amounts: Any, from_currency: Codes, to_currency: Codes) -> np.ndarray:
+        """
+        Convert amounts between currencies.
+
+        Args:
+            amounts: Scalar or array of amounts
+            from_currency: Source currency, or one per amount
+            to_currency: Target currency, or one per amount
+
+        Returns:
+            Converted amounts (same shape as the broadcast inputs)
+
+        Raises:
+            ValueError: If a currency code is unknown
+        """
+        factors = self.rates[self.indices(to_currency)] / self.rates[self.indices(from_currency)]
+        return np.asarray(amounts, dtype=float) * factors
+
+    def cross_rates(self, codes: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Matrix of rates between codes (all codes by default); [i, j] converts i -> j."""
+        rates = self.rates if codes is None else self.rates[self.indices(codes)]
+        return rates[np.newaxis, :] / rates[:, np.newaxis]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "date": self.date.isoformat(),
+            "base": self.base,
+            "codes": self.codes,
+            "rates": self.rates.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RateSnapshot":
+        return cls(
+            date.fromisoformat(data["date"]),
+            data["base"],
+            dict(zip(data["codes"], data["rates"], strict=True)),
+        )
+
+
+class ExchangeRateMatrix:
+    """Latest and dated rate snapshots with vectorized conversion."""
+
+    def __init__(
+        self,
+        client: Optional[CurrencyExchangeClient] = None,
+        redis_client: Optional[redis.Redis] = None,
+        base_currency: Optional[str] = None,
+    ):
+        self.client = client or CurrencyExchangeClient()
+        self.base = (base_currency or settings.FX_BASE_CURRENCY).upper()
+        self.store = JsonCache(
+            "fx:rates",
+            settings.FX_SNAPSHOT_TTL_SECONDS,
+            max_entries=64,
+            redis_client=redis_client,
+        )
+        # Parsed snapshots by store key, with the time they were fetched
+        self._snapshots: dict[str, tuple[float, RateSnapshot]] = {}
+        self._retry_at = 0.0
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def _load(self, key: str) -> Optional[tuple[float, RateSnapshot]]:
+        if key in self._snapshots:
+            return self._snapshots[key]
+        entry = self.store.get_entry(key)
+        if entry is None:
+            return None
+        loaded = (entry[0], RateSnapshot.from_dict(entry[1]))
+        if len(self._snapshots) >= self.store.max_entries:
+            self._snapshots.pop(next(iter(self._snapshots)))
+        self._snapshots[key] = loaded
+        return loaded
+
+    def _put(self, key: str, snapshot: RateSnapshot, fetched_at: float) -> None:
+        self.store.set(key, snapshot.to_dict(), fetched_at)
+        self._snapshots[key] = (fetched_at, snapshot)
+
+    def _fetch(self, rate_date: Optional[date] = None) -> RateSnapshot:
+        if time.time() < self._retry_at:
+            msg = "Exchange rates unavailable (retrying later)"
+            raise ValueError(msg)
+        try:
+            fetched_date, rates = self.client.get_rate_table(
+                self.base, date_str=rate_date.isoformat() if rate_date else None
+            )
+        except (httpx.HTTPError, ValueError):
+            self._retry_at = time.time() + settings.FX_RETRY_SECONDS
+            raise
+        return RateSnapshot(fetched_date, self.base, rates)
+
+    def refresh(self) -> RateSnapshot:
+        """Fetch the latest rates and store them as latest and under their date."""
+        snapshot = self._fetch()
+        fetched_at = time.time()
+        self._put(LATEST, snapshot, fetched_at)
+        self._put(snapshot.date.isoformat(), snapshot, fetched_at)
+        return snapshot
+
+    def latest(self) -> RateSnapshot:
+        """
+        Latest snapshot, re-fetched when older than FX_REFRESH_SECONDS.
+
+        An older snapshot keeps serving if the fetch fails.
+
+        Raises:
+            httpx.HTTPError, ValueError: If no snapshot is stored and the fetch fails
+        """
+        stored = self._snapshots.get(LATEST)
+        if stored is None or time.time() - stored[0] > settings.FX_REFRESH_SECONDS:
+            # Another worker may have refreshed the shared copy
+            self._snapshots.pop(LATEST, None)
+            self.store.forget(LATEST)
+            stored = self._load(LATEST) or stored
+        if stored is not None and time.time() - stored[0] <= settings.FX_REFRESH_SECONDS:
+            return stored[1]
+
+        try:
+            return self.refresh()
+        except (httpx.HTTPError, ValueError) as e:
+            if stored is None:
+                raise
+            logger.warning(f"Exchange rate refresh failed, using rates from {stored[1].date}: {e}")
+            self._snapshots[LATEST] = stored
+            return stored[1]
+
+    def on(self, rate_date: date) -> RateSnapshot:
+        """Snapshot for a date (today or later uses the latest rates)."""
+        if rate_date >= date.today():
+            return self.latest()
+        stored = self._load(rate_date.isoformat())
+        if stored is not None:
+            return stored[1]
+        snapshot = self._fetch(rate_date)
+        self._put(rate_date.isoformat(), snapshot, time.time())
+        return snapshot
+
+    def snapshot(self, on: Optional[date] = None) -> RateSnapshot:
+        return self.latest() if on is None else self.on(on)
+
+    # ------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------
+
+    def rate(self, from_currency: str, to_currency: str, on: Optional[date] = None) -> float:
+        """Units of to_currency per 1 from_currency (latest, or on a date)."""
+        return self.snapshot(on).rate(from_currency, to_currency)
+
+    def convert(
+        self,
+        amounts: Any,
+        from_currency: Codes,
+        to_currency: Codes,
+        on: Optional[date] = None,
+    ) -> np.ndarray:
+        """Convert a scalar or batch of amounts (see RateSnapshot.convert)."""
+        return self.snapshot(on).convert(amounts, from_currency, to_currency)
+
+    def exchange_rate(
+        self, base_currency: str, target_currency: str, on: Optional[date] = None
+    ) -> ExchangeRateData:
+        """Rate between two currencies as ExchangeRateData."""
+        snapshot = self.snapshot(on)
+        return ExchangeRateData(
+            base_currency=base_currency.upper(),
+            target_currency=target_currency.upper(),
+            rate=snapshot.rate(base_currency, target_currency),
+            rate_date=snapshot.date,
+        )
+
+
+_exchange_rate_matrix: Optional[ExchangeRateMatrix] = None
+
+
+def get_exchange_rate_matrix() -> ExchangeRateMatrix:
+    """Get the shared exchange rate matrix."""
+    global _exchange_rate_matrix
+    if _exchange_rate_matrix is None:
+        _exchange_rate_matrix = ExchangeRateMatrix()
+    return _exchange_rate_matrix
@@ -0,0 +1,323 @@
+"""
+Agent Duration Estimator
+
+How long agents take, learned from past runs instead of fixed guesses, for
+recalculation time estimates, the generation status ETA and queue admission:
+
+- Observations come from completed agent_jobs rows: per-agent rows (single
+  agent retries, dispatched agent jobs) use completed_at - started_at, and
+  orchestrator rows contribute the per-agent durations of their telemetry
+  (result_data.metadata.telemetry.agents, see app/core/telemetry.py). The
+  rest of an orchestrator run (rate-limit pauses, saving sections) is learned
+  as a per-agent gap
+- Durations are kept per (agent, model tier) as an EWMA of the duration plus
+  a window of recent durations for quantiles (e.g. p90 for pessimistic ETAs).
+  Agents whose section is reused because their input fingerprint matched
+  (cache hits) do not run and are estimated at zero
+- Until a key has ETA_MIN_SAMPLES runs, the agent's default below is used
+- The Celery beat job (app.tasks.agent_durations) folds new rows into a JSON
+  snapshot in Redis; API processes re-read it every ETA_RELOAD_SECONDS
+"""
+
+import json
+import logging
+import math
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any, Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = "tip:eta:durations"
+
+# Seconds per agent before any runs are observed
+DEFAULT_AGENT_SECONDS: dict[str, float] = {
+    "visa": 15,
+    "weather": 10,
+    "currency": 10,
+    "culture": 15,
+    "food": 15,
+    "attractions": 20,
+    "itinerary": 25,
+    "country": 10,
+    "flight": 15,
+}
+DEFAULT_SECONDS = 15.0  # Unknown agents
+DEFAULT_GAP_SECONDS = 5.0  # Orchestrator pause between agents (AGENT_DELAY_SECONDS)
+
+GAP = "_gap"
+RECENT_WINDOW = 50  # Recent durations kept per key for quantiles
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a Supabase timestamp as naive UTC (None if missing or invalid)."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    # Rows mix offset-aware and naive (utcnow) timestamps
+    return parsed.astimezone(UTC).replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+@dataclass
+class DurationStats:
+    """Running duration statistics of one (agent, model tier)."""
+
+    count: int = 0
+    mean: float = 0.0
+    recent: list[float] = field(default_factory=list)
+
+    def add(self, seconds: float, alpha: float) -> None:
+        self.mean = seconds if self.count == 0 else self.mean + alpha * (seconds - self.mean)
+        self.count += 1
+        self.recent.append(round(seconds, 2))
+        del self.recent[:-RECENT_WINDOW]
+
+    def quantile(self, q: float) -> float:
+        """Quantile of the recent durations (linear interpolation)."""
+        ordered = sorted(self.recent)
+        position = q * (len(ordered) - 1)
+        low = math.floor(position)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+class AgentDurationEstimator:
+    """Per-agent duration estimates learned from agent_jobs."""
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None):
+        self._redis = redis_client
+        # "agent:tier" -> stats
+        self.stats: dict[str, DurationStats] = {}
+        # Model tier each agent currently runs on (AGENT_MODEL_TIERS of the workers)
+        self.tiers: dict[str, str] = {}
+        self.cursor: Optional[str] = None  # completed_at of the last folded row
+        self._loaded_at = 0.0
+
+    @property
+    def redis(self) -> Optional[redis.Redis]:
+        return self._redis if self._redis is not None else get_redis_client()
+
+    # ------------------------------------------------------------------
+    # Learning
+    # ------------------------------------------------------------------
+
+    def observe(self, agent: str, seconds: float, tier: Optional[str] = None) -> None:
+        """Record one successful run of an agent (or a gap, agent=GAP)."""
+        if seconds < 0:
+            return
+        tier = tier or self.tiers.get(agent, "default")
+        key = f"{agent}:{tier}"
+        self.stats.setdefault(key, DurationStats()).add(seconds, settings.ETA_EWMA_ALPHA)
+
+    def observe_job(self, row: dict[str, Any]) -> int:
+        """
+        Record the durations in a completed agent_jobs row.
+
+        Args:
+            row: agent_type, started_at, completed_at and (orchestrator rows)
+                agents, the per-agent telemetry totals
+
+        Returns:
+            Number of agent runs recorded
+        """
+        started = parse_timestamp(row.get("started_at"))
+        completed = parse_timestamp(row.get("completed_at"))
+        elapsed = (completed - started).total_seconds() if started and completed else None
+
+        if row.get("agent_type") != "orchestrator":
+            if elapsed is None:
+                return 0
+            self.observe(row["agent_type"], elapsed)
+            return 1
+
+        runs = {
+            name: totals
+            for name, totals in (row.get("agents") or {}).items()
+            if totals.get("status") == "ok" and totals.get("duration_ms") is not None
+        }
+        for name, totals in runs.items():
+            self.observe(name, totals["duration_ms"] / 1000, totals.get("model_tier"))
+        if runs and elapsed is not None:
+            agent_seconds = sum(totals["duration_ms"] for totals in runs.values()) / 1000
+            self.observe(GAP, max(elapsed - agent_seconds, 0) / len(runs))
+        return len(runs)
+
+    # ------------------------------------------------------------------
+    # Estimates
+    # ------------------------------------------------------------------
+
+    def _learned(self, agent: str) -> Optional[DurationStats]:
+        """Stats for the agent's current tier, else its best-observed tier."""
+        stats = self.stats.get(f"{agent}:{self.tiers.get(agent, 'default')}")
+        if stats is None:
+            prefix = f"{agent}:"
+            candidates = [s for key, s in self.stats.items() if key.startswith(prefix)]
+            stats = max(candidates, key=lambda s: s.count, default=None)
+        if stats is None or stats.count < settings.ETA_MIN_SAMPLES:
+            return None
+        return stats
+
+    def expected_seconds(
+        self, agent: str, *, cache_hit: bool = False, quantile: Optional[float] = None
+    ) -> float:
+        """
+        Expected duration of one agent run.
+
+        Args:
+            agent: Agent type
+            cache_hit: Whether the agent's section will be reused (no run)
+            quantile: Quantile of recent runs (e.g. 0.9), or None for the mean
+        """
+        if cache_hit:
+            return 0.0
+        self._ensure_loaded()
+        stats = self._learned(agent)
+        if stats is None:
+            return DEFAULT_AGENT_SECONDS.get(agent, DEFAULT_SECONDS)
+        return stats.mean if quantile is None else stats.quantile(quantile)
+
+    def gap_seconds(self) -> float:
+        """Orchestrator time between agents (pauses, saving sections)."""
+        self._ensure_loaded()
+        stats = self._learned(GAP)
+        return DEFAULT_GAP_SECONDS if stats is None else stats.mean
+
+    def estimate(
+        self,
+        agents: Iterable[str],
+        *,
+        cache_hits: Iterable[str] = (),
+        quantile: Optional[float] = None,
+    ) -> float:
+        """Total run time of agents (their durations only)."""
+        hits = set(cache_hits)
+        return sum(
+            self.expected_seconds(agent, cache_hit=agent in hits, quantile=quantile)
+            for agent in agents
+        )
+
+    def remaining_seconds(
+        self, agents: list[str], *, elapsed: float = 0.0, quantile: Optional[float] = None
+    ) -> float:
+        """
+        Time left for agents run one after another by the orchestrator.
+
+        Args:
+            agents: Agents still to finish, in run order; the first is running
+            elapsed: Seconds the first agent has been running
+            quantile: See expected_seconds
+        """
+        if not agents:
+            return 0.0
+        durations = [self.expected_seconds(agent, quantile=quantile) for agent in agents]
+        current = max(durations[0] - elapsed, 0.0)
+        return current + sum(durations[1:]) + self.gap_seconds() * (len(agents) - 1)
+
+    def report_seconds(self, agents: list[str], *, quantile: Optional[float] = None) -> float:
+        """Duration of a whole report run over agents."""
+        return self.remaining_seconds(agents, quantile=quantile)
+
+    # ------------------------------------------------------------------
+    # Snapshot
+    # ------------------------------------------------------------------
+
+    def _snapshot(self) -> dict[str, Any]:
+        return {
+            "cursor": self.cursor,
+            "tiers": self.tiers,
+            "stats": {key: asdict(stats) for key, stats in self.stats.items()},
+        }
+
+    def load(self) -> bool:
+        """Load the shared estimates from Redis. Returns False if there are none."""
+        self._loaded_at = time.time()
+        client = self.redis
+        if client is None:
+            return False
+        try:
+            raw = client.get(SNAPSHOT_KEY)
+        except redis.RedisError as e:
+            logger.debug(f"Duration estimates load failed: {e}")
+            return False
+        if not raw:
+            return False
+
+        snapshot = json.loads(raw)
+        self.cursor = snapshot.get("cursor")
+        self.tiers = snapshot.get("tiers", {})
+        self.stats = {key: DurationStats(**data) for key, data in snapshot["stats"].items()}
+        return True
+
+    def _ensure_loaded(self) -> None:
+        if time.time() - self._loaded_at >= settings.ETA_RELOAD_SECONDS:
+            self.load()
+
+    def refresh(self, supabase: Any, tiers: Optional[dict[str, str]] = None) -> int:
+        """
+        Fold agent_jobs rows completed since the last refresh into the estimates.
+
+        Args:
+            supabase: Supabase client to read agent_jobs with
+            tiers: Current agent to model tier routing (rows without a
+                recorded tier are attributed to it)
+
+        Returns:
+            Number of agent runs recorded
+        """
+        self.load()
+        if tiers is not None:
+            self.tiers = dict(tiers)
+        if self.cursor is None:
+            self.cursor = (
+                datetime.utcnow() - timedelta(days=settings.ETA_HISTORY_DAYS)
+            ).isoformat()
+
+        recorded = 0
+        while True:
+            rows = (
+                supabase.table("agent_jobs")
+                .select(
+                    "agent_type, started_at, completed_at, "
+                    "agents:result_data->metadata->telemetry->agents"
+                )
+                .eq("status", "completed")
+                .gt("completed_at", self.cursor)
+                .order("completed_at")
+                .limit(settings.ETA_REFRESH_BATCH)
+                .execute()
+            ).data or []
+            for row in rows:
+                recorded += self.observe_job(row)
+                self.cursor = row["completed_at"]
+            if len(rows) < settings.ETA_REFRESH_BATCH:
+                break
+
+        client = self.redis
+        if client is not None:
+            try:
+                client.set(SNAPSHOT_KEY, json.dumps(self._snapshot(), separators=(",", ":")))
+            except redis.RedisError as e:
+                logger.warning(f"Duration estimates store failed: {e}")
+        self._loaded_at = time.time()
+        return recorded
+
+
+_duration_estimator: Optional[AgentDurationEstimator] = None
+
+
+def get_duration_estimator() -> AgentDurationEstimator:
+    """Get the shared agent duration estimator."""
+    global _duration_estimator
+    if _duration_estimator is None:
+        _duration_estimator = AgentDurationEstimator()
+    return _duration_estimator
@@ -6,5 +6,14 @@ flight options, prices, and booking information.
 """
 
 from .amadeus_client import AmadeusFlightClient, FlightOffer, FlightSearchResult
+from .price_calendar import CalendarDay, Fare, FlexibleFlightSearch, PriceCalendar
 
-__all__ = ["AmadeusFlightClient", "FlightOffer", "FlightSearchResult"]
+__all__ = [
+    "AmadeusFlightClient",
+    "CalendarDay",
+    "Fare",
+    "FlexibleFlightSearch",
+    "FlightOffer",
+    "FlightSearchResult",
+    "PriceCalendar",
+]
@@ -12,8 +12,11 @@ Features:
 - Flight price confirmation
 - Airport information lookup
 - Sync and async operations
+- OAuth tokens shared across instances and processes (app.core.oauth_tokens)
 """
 
+import hashlib
+import time
 from dataclasses import asdict, dataclass
 from datetime import date
 from typing import Literal
@@ -21,6 +24,8 @@ from typing import Literal
 import httpx
 
 from app.core.config import settings
+from app.core.metrics import async_http_event_hooks, http_event_hooks
+from app.core.oauth_tokens import SharedTokenCache, get_token_cache
 
 
 @dataclass
@@ -175,6 +180,8 @@ class AmadeusFlightClient:
         api_key: str | None = None,
         api_secret: str | None = None,
         test_mode: bool = True,
+        *,
+        token_cache: SharedTokenCache | None = None,
     ):
         """
         Initialize Amadeus client.
@@ -183,18 +190,35 @@ class AmadeusFlightClient:
             api_key: Amadeus API Key (defaults to settings.AMADEUS_API_KEY)
             api_secret: Amadeus API Secret (defaults to settings.AMADEUS_API_SECRET)
             test_mode: Use test environment (default True for safety)
+            token_cache: Shared OAuth token cache (defaults to the process-wide cache)
         """
         self.api_key = api_key or settings.AMADEUS_API_KEY
         self.api_secret = api_secret or settings.AMADEUS_API_SECRET
 
-        # Use test or production environment
-        if test_mode:
+        # Use test or production environment (or the configured base URL)
+        if settings.AMADEUS_BASE_URL:
+            self.base_url = settings.AMADEUS_BASE_URL
+        elif test_mode:
             self.base_url = "https://test.api.amadeus.com"
         else:
             self.base_url = "https://api.amadeus.com"
 
+        self.token_cache = token_cache or get_token_cache()
         self._access_token: str | None = None
         self._token_expires_at: float = 0
+        self._sync_client: httpx.Client | None = None
+
+    def _http_client(self) -> httpx.Client:
+        """Persistent HTTP client for synchronous requests (reuses connections)."""
+        if self._sync_client is None:
+            self._sync_client = httpx.Client(timeout=60.0, event_hooks=http_event_hooks("amadeus"))
+        return self._sync_client
+
+    def close(self) -> None:
+        """Close the synchronous HTTP client."""
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
 
     def _validate_iata_code(self, code: str, code_type: str) -> None:
         """
@@ -210,85 +234,166 @@ class AmadeusFlightClient:
         if not code or len(code) != 3 or not code.isalpha():
             raise ValueError(f"Invalid {code_type} code: {code}. Must be 3-letter IATA code")
 
+    @property
+    def _token_name(self) -> str:
+        """Shared token cache key for these credentials (the key itself is not stored)."""
+        key_hash = hashlib.sha256(f"{self.base_url}:{self.api_key}".encode()).hexdigest()
+        return f"amadeus:{key_hash[:16]}"
+
+    def _token_request(self) -> tuple[str, dict[str, str], dict[str, str]]:
+        """URL, form data and headers of the OAuth2 token request."""
+        return (
+            f"{self.base_url}/v1/security/oauth2/token",
+            {
+                "grant_type": "client_credentials",
+                "client_id": self.api_key,
+                "client_secret": self.api_secret,
+            },
+            {"Content-Type": "application/x-www-form-urlencoded"},
+        )
+
     def _get_access_token(self) -> str:
         """
         Get OAuth2 access token (with caching).
 
+        Tokens are shared with other instances and processes through the
+        token cache; only one process requests a new token at expiry.
+
         Returns:
             Valid access token
 
         Raises:
             httpx.HTTPError: If authentication fails
         """
-        import time
-
         # Return cached token if still valid
         if self._access_token and time.time() < self._token_expires_at:
             return self._access_token
 
-        # Request new token
-        url = f"{self.base_url}/v1/security/oauth2/token"
-        data = {
-            "grant_type": "client_credentials",
-            "client_id": self.api_key,
-            "client_secret": self.api_secret,
-        }
-
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(
-                url,
-                data=data,
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-            )
+        def fetch() -> tuple[str, int]:
+            url, data, headers = self._token_request()
+            response = self._http_client().post(url, data=data, headers=headers, timeout=30.0)
             response.raise_for_status()
             result = response.json()
+            return result["access_token"], result.get("expires_in", 1800)
 
-        self._access_token = result["access_token"]
-        # Token expires in X seconds, set expiry with 60s buffer
-        expires_in = result.get("expires_in", 1800)
-        self._token_expires_at = time.time() + expires_in - 60
-
+        self._access_token, self._token_expires_at = self.token_cache.get_or_refresh(
+            self._token_name, fetch
+        )
         return self._access_token
 
-    async def _get_access_token_async(self) -> str:
+    async def _get_access_token_async(self, http_client: httpx.AsyncClient | None = None) -> str:
         """
         Get OAuth2 access token asynchronously (with caching).
 
+        Args:
+            http_client: Async client to send the token request with (optional)
+
         Returns:
             Valid access token
 
         Raises:
             httpx.HTTPError: If authentication fails
         """
-        import time
-
         # Return cached token if still valid
         if self._access_token and time.time() < self._token_expires_at:
             return self._access_token
 
-        # Request new token
-        url = f"{self.base_url}/v1/security/oauth2/token"
-        data = {
-            "grant_type": "client_credentials",
-            "client_id": self.api_key,
-            "client_secret": self.api_secret,
-        }
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                url,
-                data=data,
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-            )
+        async def fetch() -> tuple[str, int]:
+            url, data, headers = self._token_request()
+            if http_client is None:
+                async with httpx.AsyncClient(
+                    timeout=30.0, event_hooks=async_http_event_hooks("amadeus")
+                ) as client:
+                    response = await client.post(url, data=data, headers=headers)
+            else:
+                response = await http_client.post(url, data=data, headers=headers, timeout=30.0)
             response.raise_for_status()
             result = response.json()
+            return result["access_token"], result.get("expires_in", 1800)
 
-        self._access_token = result["access_token"]
-        expires_in = result.get("expires_in", 1800)
-        self._token_expires_at = time.time() + expires_in - 60
-
+        self._access_token, self._token_expires_at = await self.token_cache.get_or_refresh_async(
+            self._token_name, fetch
+        )
         return self._access_token
 
+    async def authenticate_async(self, http_client: httpx.AsyncClient | None = None) -> None:
+        """
+        Make sure a valid access token is cached.
+
+        Call before fanning out concurrent searches so they share one token
+        instead of each requesting their own.
+
+        Raises:
+            httpx.HTTPError: If authentication fails
+        """
+        await self._get_access_token_async(http_client)
+
+    def _invalidate_token(self, token: str) -> None:
+        """Drop a token the API rejected, here and in the shared token cache."""
+        if self._access_token == token:
+            self._access_token = None
+            self._token_expires_at = 0
+        self.token_cache.invalidate(self._token_name, token)
+
+    @staticmethod
+    def _auth_headers(token: str) -> dict[str, str]:
+        return {
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/json",
+        }
+
+    def _api_get(self, url: str, params: dict, timeout: float | None = None) -> httpx.Response:
+        """
+        Authorized GET request.
+
+        A 401 means the token was revoked before its expiry (e.g. rotated
+        credentials): it is invalidated for all instances and the request is
+        retried once with a new token.
+
+        Raises:
+            httpx.HTTPError: If the request fails
+        """
+        options = {} if timeout is None else {"timeout": timeout}
+
+        def send(token: str) -> httpx.Response:
+            headers = self._auth_headers(token)
+            return self._http_client().get(url, params=params, headers=headers, **options)
+
+        token = self._get_access_token()
+        response = send(token)
+        if response.status_code == httpx.codes.UNAUTHORIZED:
+            self._invalidate_token(token)
+            response = send(self._get_access_token())
+        response.raise_for_status()
+        return response
+
+    async def _api_get_async(
+        self,
+        url: str,
+        params: dict,
+        *,
+        http_client: httpx.AsyncClient | None = None,
+        timeout: float = 60.0,
+    ) -> httpx.Response:
+        """Authorized GET request (async), see _api_get."""
+        if http_client is None:
+            async with httpx.AsyncClient(
+                timeout=timeout, event_hooks=async_http_event_hooks("amadeus")
+            ) as client:
+                return await self._api_get_async(url, params, http_client=client)
+
+        async def send(token: str) -> httpx.Response:
+            headers = self._auth_headers(token)
+            return await http_client.get(url, params=params, headers=headers)
+
+        token = await self._get_access_token_async(http_client)
+        response = await send(token)
+        if response.status_code == httpx.codes.UNAUTHORIZED:
+            self._invalidate_token(token)
+            response = await send(await self._get_access_token_async(http_client))
+        response.raise_for_status()
+        return response
+
     def search_flights(
         self,
         origin: str,
@@ -333,9 +438,6 @@ class AmadeusFlightClient:
         if adults < 1:
             raise ValueError("At least 1 adult passenger required")
 
-        # Get access token
-        token = self._get_access_token()
-
         # Build request
         url = f"{self.base_url}/v2/shopping/flight-offers"
         params = {
@@ -356,22 +458,15 @@ class AmadeusFlightClient:
         if infants > 0:
             params["infants"] = infants
 
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/json",
-        }
-
-        with httpx.Client(timeout=60.0) as client:
-            response = client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            return self._parse_search_response(
-                response.json(),
-                origin.upper(),
-                destination.upper(),
-                departure_date.isoformat(),
-                return_date.isoformat() if return_date else None,
-                adults,
-            )
+        response = self._api_get(url, params)
+        return self._parse_search_response(
+            response.json(),
+            origin.upper(),
+            destination.upper(),
+            departure_date.isoformat(),
+            return_date.isoformat() if return_date else None,
+            adults,
+        )
 
     async def search_flights_async(
         self,
@@ -386,6 +481,8 @@ class AmadeusFlightClient:
         non_stop: bool = False,
         max_offers: int = 10,
         currency: str = "USD",
+        *,
+        http_client: httpx.AsyncClient | None = None,
     ) -> FlightSearchResult:
         """
         Search for flight offers (asynchronous).
@@ -402,6 +499,7 @@ class AmadeusFlightClient:
             non_stop: Only non-stop flights
             max_offers: Maximum number of offers to return
             currency: Price currency code
+            http_client: Shared async client for concurrent searches (optional)
 
         Returns:
             FlightSearchResult with available offers
@@ -417,9 +515,6 @@ class AmadeusFlightClient:
         if adults < 1:
             raise ValueError("At least 1 adult passenger required")
 
-        # Get access token
-        token = await self._get_access_token_async()
-
         # Build request
         url = f"{self.base_url}/v2/shopping/flight-offers"
         params = {
@@ -440,22 +535,15 @@ class AmadeusFlightClient:
         if infants > 0:
             params["infants"] = infants
 
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/json",
-        }
-
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            return self._parse_search_response(
-                response.json(),
-                origin.upper(),
-                destination.upper(),
-                departure_date.isoformat(),
-                return_date.isoformat() if return_date else None,
-                adults,
-            )
+        response = await self._api_get_async(url, params, http_client=http_client)
+        return self._parse_search_response(
+            response.json(),
+            origin.upper(),
+            destination.upper(),
+            departure_date.isoformat(),
+            return_date.isoformat() if return_date else None,
+            adults,
+        )
 
     def _parse_search_response(
         self,
@@ -595,37 +683,29 @@ class AmadeusFlightClient:
         """
         self._validate_iata_code(iata_code, "airport")
 
-        token = self._get_access_token()
         url = f"{self.base_url}/v1/reference-data/locations"
         params = {
             "subType": "AIRPORT",
             "keyword": iata_code.upper(),
         }
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/json",
-        }
 
-        with httpx.Client(timeout=30.0) as client:
-            response = client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-
-            # Find exact match
-            for location in data.get("data", []):
-                if location.get("iataCode", "").upper() == iata_code.upper():
-                    return {
-                        "iata_code": location.get("iataCode"),
-                        "name": location.get("name"),
-                        "city": location.get("address", {}).get("cityName"),
-                        "country": location.get("address", {}).get("countryName"),
-                        "country_code": location.get("address", {}).get("countryCode"),
-                        "timezone": location.get("timeZoneOffset"),
-                        "latitude": location.get("geoCode", {}).get("latitude"),
-                        "longitude": location.get("geoCode", {}).get("longitude"),
-                    }
-
-            return {"error": f"Airport not found: {iata_code}"}
+        data = self._api_get(url, params, timeout=30.0).json()
+
+        # Find exact match
+        for location in data.get("data", []):
+            if location.get("iataCode", "").upper() == iata_code.upper():
+                return {
+                    "iata_code": location.get("iataCode"),
+                    "name": location.get("name"),
+                    "city": location.get("address", {}).get("cityName"),
+                    "country": location.get("address", {}).get("countryName"),
+                    "country_code": location.get("address", {}).get("countryCode"),
+                    "timezone": location.get("timeZoneOffset"),
+                    "latitude": location.get("geoCode", {}).get("latitude"),
+                    "longitude": location.get("geoCode", {}).get("longitude"),
+                }
+
+        return {"error": f"Airport not found: {iata_code}"}
 
     async def get_airport_info_async(self, iata_code: str) -> dict:
         """
@@ -639,33 +719,26 @@ class AmadeusFlightClient:
         """
         self._validate_iata_code(iata_code, "airport")
 
-        token = await self._get_access_token_async()
         url = f"{self.base_url}/v1/reference-data/locations"
         params = {
             "subType": "AIRPORT",
             "keyword": iata_code.upper(),
         }
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/json",
-        }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-
-            for location in data.get("data", []):
-                if location.get("iataCode", "").upper() == iata_code.upper():
-                    return {
-                        "iata_code": location.get("iataCode"),
-                        "name": location.get("name"),
-                        "city": location.get("address", {}).get("cityName"),
-                        "country": location.get("address", {}).get("countryName"),
-                        "country_code": location.get("address", {}).get("countryCode"),
-                        "timezone": location.get("timeZoneOffset"),
-                        "latitude": location.get("geoCode", {}).get("latitude"),
-                        "longitude": location.get("geoCode", {}).get("longitude"),
-                    }
-
-            return {"error": f"Airport not found: {iata_code}"}
+        response = await self._api_get_async(url, params, timeout=30.0)
+        data = response.json()
+
+        for location in data.get("data", []):
+            if location.get("iataCode", "").upper() == iata_code.upper():
+                return {
+                    "iata_code": location.get("iataCode"),
+                    "name": location.get("name"),
+                    "city": location.get("address", {}).get("cityName"),
+                    "country": location.get("address", {}).get("countryName"),
+                    "country_code": location.get("address", {}).get("countryCode"),
+                    "timezone": location.get("timeZoneOffset"),
+                    "latitude": location.get("geoCode", {}).get("latitude"),
+                    "longitude": location.get("geoCode", {}).get("longitude"),
+                }
+
+        return {"error": f"Airport not found: {iata_code}"}
@@ -0,0 +1,370 @@
+"""
+Flexible-Date Flight Search
+
+Searches a route on the requested date and up to FLIGHT_FLEX_DAYS either side
+concurrently (one shared async HTTP client, at most FLIGHT_SEARCH_CONCURRENCY
+searches in flight) and merges the offers into a price calendar:
+
+- Round trips keep their length: each departure date is searched with the
+  return date shifted by the same number of days
+- Each date's fares are cached per (provider, route, dates, cabin, passengers)
+  in a JsonCache for FLIGHT_SEARCH_CACHE_TTL_SECONDS, so repeated and
+  overlapping searches (route search, pricing, booking advice) reuse them
+- A failed date search is marked unavailable in the calendar (and not cached)
+  instead of failing the whole search
+"""
+
+import asyncio
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from typing import Any, Optional
+
+import httpx
+import redis
+
+from app.core.config import settings
+from app.core.metrics import async_http_event_hooks
+from app.services.places import JsonCache
+
+from .amadeus_client import AmadeusFlightClient
+from .skyscanner_client import SkyscannerClient
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = {AmadeusFlightClient: "amadeus", SkyscannerClient: "skyscanner"}
+
+
+def _segment(segment: Any) -> dict[str, Any]:
+    return {
+        "from": segment.departure_airport,
+        "to": segment.arrival_airport,
+        "departure": segment.departure_time,
+        "arrival": segment.arrival_time,
+        "airline": segment.carrier_name or segment.carrier_code,
+        "flight": f"{segment.carrier_code}{segment.flight_number}",
+        "duration": segment.duration,
+        "stops": segment.stops,
+    }
+
+
+@dataclass
+class Fare:
+    """One offer, in the same shape for every provider."""
+
+    departure_date: str
+    return_date: Optional[str]
+    price: float
+    currency: str
+    airline: Optional[str]
+    stops: int
+    outbound: list[dict[str, Any]] = field(default_factory=list)
+    inbound: list[dict[str, Any]] = field(default_factory=list)
+    baggage: Optional[str] = None
+    seats_available: Optional[int] = None
+    last_ticketing_date: Optional[str] = None
+    deep_link: Optional[str] = None
+
+    @classmethod
+    def from_offer(cls, offer: Any, departure_date: date, return_date: Optional[date]) -> "Fare":
+        """Fare from an Amadeus or Skyscanner FlightOffer."""
+        outbound = offer.outbound_segments
+        return cls(
+            departure_date=departure_date.isoformat(),
+            return_date=return_date.isoformat() if return_date else None,
+            price=float(offer.total_price),
+            currency=offer.currency,
+            airline=offer.validating_airline,
+            stops=max(len(outbound) - 1, 0) + sum(s.stops for s in outbound),
+            outbound=[_segment(s) for s in outbound],
+            inbound=[_segment(s) for s in offer.return_segments],
+            baggage=offer.included_baggage,
+            seats_available=offer.number_of_bookable_seats,
+            last_ticketing_date=offer.last_ticketing_date,
+            deep_link=getattr(offer, "deep_link", None),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _rank(fares: list[Fare]) -> list[Fare]:
+    return sorted(fares, key=lambda f: (f.price, f.stops))
+
+
+@dataclass
+class CalendarDay:
+    """Fares for one departure date."""
+
+    departure_date: date
+    return_date: Optional[date]
+    fares: list[Fare]
+    available: bool = True  # False when the search for this date failed
+
+    @property
+    def lowest(self) -> Optional[float]:
+        return min((f.price for f in self.fares), default=None)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "date": self.departure_date.isoformat(),
+            "return_date": self.return_date.isoformat() if self.return_date else None,
+            "lowest_price": self.lowest,
+            "offers": len(self.fares),
+            "available": self.available,
+        }
+
+
+@dataclass
+class PriceCalendar:
+    """Fares for a route across a window of departure dates."""
+
+    origin: str
+    destination: str
+    requested_date: date
+    cabin_class: str
+    adults: int
+    days: list[CalendarDay]
+
+    @property
+    def requested(self) -> Optional[CalendarDay]:
+        """The requested date (None if it was not searched, e.g. in the past)."""
+        return next((d for d in self.days if d.departure_date == self.requested_date), None)
+
+    @property
+    def cheapest_day(self) -> Optional[CalendarDay]:
+        priced = [d for d in self.days if d.fares]
+        return min(priced, key=lambda d: d.lowest) if priced else None
+
+    @property
+    def currency(self) -> Optional[str]:
+        return next((f.currency for d in self.days for f in d.fares), None)
+
+    def offers(self, limit: Optional[int] = None) -> list[Fare]:
+        """Fares from every date, cheapest first (fewer stops break ties)."""
+        return _rank([f for d in self.days for f in d.fares])[:limit]
+
+    def requested_offers(self, limit: Optional[int] = None) -> list[Fare]:
+        """Fares on the requested date, cheapest first."""
+        requested = self.requested
+        return _rank(requested.fares)[:limit] if requested else []
+
+    def to_dict(self, offers: int = 5) -> dict[str, Any]:
+        requested = self.requested
+        cheapest = self.cheapest_day
+        requested_price = requested.lowest if requested else None
+        return {
+            "origin": self.origin,
+            "destination": self.destination,
+            "requested_date": self.requested_date.isoformat(),
+            "cabin_class": self.cabin_class,
+            "adults": self.adults,
+            "currency": self.currency,
+            "requested_price": requested_price,
+            "cheapest_date": cheapest.departure_date.isoformat() if cheapest else None,
+            "cheapest_price": cheapest.lowest if cheapest else None,
+            "savings": (
+                round(requested_price - cheapest.lowest, 2)
+                if cheapest and requested_price is not None
+                else None
+            ),
+            "calendar": [d.to_dict() for d in self.days],
+            "best_offers": [f.to_dict() for f in self.offers(offers)],
+        }
+
+
+class FlexibleFlightSearch:
+    """Concurrent multi-date flight search over one provider, with a fare cache."""
+
+    def __init__(
+        self,
+        client: AmadeusFlightClient | SkyscannerClient,
+        redis_client: Optional[redis.Redis] = None,
+    ):
+        self.client = client
+        self.provider = next(
+            (name for cls, name in PROVIDERS.items() if isinstance(client, cls)),
+            type(client).__name__.lower(),
+        )
+        self.cache = JsonCache(
+            "flights:fares",
+            settings.FLIGHT_SEARCH_CACHE_TTL_SECONDS,
+            max_entries=2000,
+            redis_client=redis_client,
+        )
+
+    def cache_key(
+        self,
+        origin: str,
+        destination: str,
+        departure_date: date,
+        return_date: Optional[date],
+        *,
+        cabin_class: str,
+        adults: int,
+        non_stop: bool,
+    ) -> str:
+        return ":".join(
+            [
+                self.provider,
+                origin,
+                destination,
+                departure_date.isoformat(),
+                return_date.isoformat() if return_date else "oneway",
+                cabin_class,
+                str(adults),
+                "direct" if non_stop else "any",
+            ]
+        )
+
+    async def _search_date(
+        self,
+        http_client: httpx.AsyncClient,
+        origin: str,
+        destination: str,
+        departure_date: date,
+        return_date: Optional[date],
+        *,
+        cabin_class: str,
+        adults: int,
+        non_stop: bool,
+        max_offers: int,
+    ) -> list[Fare]:
+        if isinstance(self.client, AmadeusFlightClient):
+            result = await self.client.search_flights_async(
+                origin,
+                destination,
+                departure_date,
+                return_date,
+                adults=adults,
+                travel_class=cabin_class.upper(),
+                non_stop=non_stop,
+                max_offers=max_offers,
+                http_client=http_client,
+            )
+        else:
+            result = await self.client.search_flights_async(
+                origin,
+                destination,
+                departure_date,
+                return_date,
+                adults=adults,
+                cabin_class=cabin_class,
+                non_stop=non_stop,
+                max_offers=max_offers,
+                http_client=http_client,
+            )
+        return [Fare.from_offer(o, departure_date, return_date) for o in result.offers]
+
+    async def search_async(
+        self,
+        origin: str,
+        destination: str,
+        departure_date: date,
+        return_date: Optional[date] = None,
+        *,
+        flex_days: int = 0,
+        adults: int = 1,
+        cabin_class: str = "economy",
+        non_stop: bool = False,
+        max_offers: int = 20,
+    ) -> PriceCalendar:
+        """
+        Search a route on departure_date and flex_days either side.
+
+        Args:
+            origin: Origin IATA code
+            destination: Destination IATA code
+            departure_date: Requested departure date
+            return_date: Requested return date (None for one-way)
+            flex_days: Days searched before and after the requested date
+            adults: Number of adult passengers
+            cabin_class: economy, premium_economy, business or first
+            non_stop: Only non-stop flights
+            max_offers: Maximum offers per date
+
+        Returns:
+            PriceCalendar over the searched dates (past dates are skipped)
+
+        Raises:
+            httpx.HTTPError: If provider authentication fails
+        """
+        origin, destination = origin.upper(), destination.upper()
+        cabin_class = cabin_class.lower()
+        stay = return_date - departure_date if return_date else None
+        today = date.today()
+        dates = [
+            (day, day + stay if stay is not None else None)
+            for day in (
+                departure_date + timedelta(days=n) for n in range(-flex_days, flex_days + 1)
+            )
+            if day >= today
+        ]
+
+        def key(day: date, back: Optional[date]) -> str:
+            return self.cache_key(
+                origin,
+                destination,
+                day,
+                back,
+                cabin_class=cabin_class,
+                adults=adults,
+                non_stop=non_stop,
+            )
+
+        days: dict[date, CalendarDay] = {}
+        missing = []
+        for day, back in dates:
+            cached = self.cache.get(key(day, back))
+            if cached is None:
+                missing.append((day, back))
+            else:
+                days[day] = CalendarDay(day, back, [Fare(**f) for f in cached])
+
+        if missing:
+            semaphore = asyncio.Semaphore(settings.FLIGHT_SEARCH_CONCURRENCY)
+
+            async with httpx.AsyncClient(
+                timeout=60.0, event_hooks=async_http_event_hooks(self.provider)
+            ) as http_client:
+                if isinstance(self.client, AmadeusFlightClient):
+                    # One token for all the date searches
+                    await self.client.authenticate_async(http_client)
+
+                async def search_one(day: date, back: Optional[date]) -> CalendarDay:
+                    async with semaphore:
+                        try:
+                            fares = await self._search_date(
+                                http_client,
+                                origin,
+                                destination,
+                                day,
+                                back,
+                                cabin_class=cabin_class,
+                                adults=adults,
+                                non_stop=non_stop,
+                                max_offers=max_offers,
+                            )
+                        except (httpx.HTTPError, ValueError) as e:
+                            logger.warning(
+                                f"Flight search {origin}-{destination} on {day} failed: {e}"
+                            )
+                            return CalendarDay(day, back, [], available=False)
+                    self.cache.set(key(day, back), [f.to_dict() for f in fares])
+                    return CalendarDay(day, back, fares)
+
+                for searched in await asyncio.gather(*(search_one(d, b) for d, b in missing)):
+                    days[searched.departure_date] = searched
+
+        return PriceCalendar(
+            origin=origin,
+            destination=destination,
+            requested_date=departure_date,
+            cabin_class=cabin_class,
+            adults=adults,
+            days=[days[day] for day, _ in dates],
+        )
+
+    def search(self, *args: Any, **kwargs: Any) -> PriceCalendar:
+        """Synchronous search_async (for agent tools and Celery tasks)."""
+        return asyncio.run(self.search_async(*args, **kwargs))
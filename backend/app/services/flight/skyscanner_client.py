@@ -12,6 +12,7 @@ from typing import Any
 import httpx
 
 from app.core.config import settings
+from app.core.metrics import async_http_event_hooks, http_event_hooks
 
 logger = logging.getLogger(__name__)
 
@@ -78,7 +79,8 @@ class SkyscannerClient:
             api_key: RapidAPI key (defaults to settings.RAPIDAPI_KEY)
         """
         self.api_key = api_key or settings.RAPIDAPI_KEY
-        self._client = httpx.Client(timeout=30.0)
+        self.base_url = settings.SKYSCANNER_BASE_URL or RAPIDAPI_BASE_URL
+        self._client = httpx.Client(timeout=30.0, event_hooks=http_event_hooks("skyscanner"))
 
     def _headers(self) -> dict[str, str]:
         """Get request headers."""
@@ -87,6 +89,62 @@ class SkyscannerClient:
             "X-RapidAPI-Host": RAPIDAPI_HOST,
         }
 
+    def _search_params(
+        self,
+        origin: str,
+        destination: str,
+        departure_date: date,
+        return_date: date | None,
+        *,
+        adults: int,
+        cabin_class: str,
+    ) -> dict[str, str]:
+        """Build search query parameters."""
+        params = {
+            "adults": str(adults),
+            "origin": origin.upper(),
+            "destination": destination.upper(),
+            "departureDate": departure_date.isoformat(),
+            "currency": "USD",
+            "locale": "en-US",
+            "market": "US",
+        }
+
+        if return_date:
+            params["returnDate"] = return_date.isoformat()
+
+        if cabin_class != "economy":
+            cabin_map = {
+                "premium_economy": "premium_economy",
+                "business": "business",
+                "first": "first",
+            }
+            params["cabinClass"] = cabin_map.get(cabin_class, "economy")
+
+        return params
+
+    def _search_result(
+        self,
+        origin: str,
+        destination: str,
+        departure_date: date,
+        return_date: date | None,
+        *,
+        offers: list[FlightOffer] | None = None,
+        dictionaries: dict[str, Any] | None = None,
+    ) -> FlightSearchResult:
+        """Build a search result (empty when no offers are given)."""
+        offers = offers or []
+        return FlightSearchResult(
+            origin=origin,
+            destination=destination,
+            departure_date=str(departure_date),
+            return_date=str(return_date) if return_date else None,
+            total_offers=len(offers),
+            offers=offers,
+            dictionaries=dictionaries or {},
+        )
+
     def search_flights(
         self,
         origin: str,
@@ -116,83 +174,112 @@ class SkyscannerClient:
         """
         if not self.api_key:
             logger.warning("RapidAPI key not configured")
-            return FlightSearchResult(
-                origin=origin,
-                destination=destination,
-                departure_date=str(departure_date),
-                return_date=str(return_date) if return_date else None,
-                total_offers=0,
-                offers=[],
-                dictionaries={},
-            )
+            return self._search_result(origin, destination, departure_date, return_date)
 
         try:
-            # Build search parameters
-            params = {
-                "adults": str(adults),
-                "origin": origin.upper(),
-                "destination": destination.upper(),
-                "departureDate": departure_date.isoformat(),
-                "currency": "USD",
-                "locale": "en-US",
-                "market": "US",
-            }
-
-            if return_date:
-                params["returnDate"] = return_date.isoformat()
-
-            if cabin_class != "economy":
-                cabin_map = {
-                    "premium_economy": "premium_economy",
-                    "business": "business",
-                    "first": "first",
-                }
-                params["cabinClass"] = cabin_map.get(cabin_class, "economy")
+            params = self._search_params(
+                origin,
+                destination,
+                departure_date,
+                return_date,
+                adults=adults,
+                cabin_class=cabin_class,
+            )
 
             logger.info(f"Searching Skyscanner: {origin} -> {destination} on {departure_date}")
 
             response = self._client.get(
-                RAPIDAPI_BASE_URL,
+                self.base_url,
                 headers=self._headers(),
                 params=params,
             )
 
             if response.status_code != 200:
                 logger.error(f"Skyscanner API error: {response.status_code} - {response.text}")
-                return FlightSearchResult(
-                    origin=origin,
-                    destination=destination,
-                    departure_date=str(departure_date),
-                    return_date=str(return_date) if return_date else None,
-                    total_offers=0,
-                    offers=[],
-                    dictionaries={},
-                )
+                return self._search_result(origin, destination, departure_date, return_date)
 
             data = response.json()
-            offers = self._parse_offers(data, cabin_class, max_offers)
-
-            return FlightSearchResult(
-                origin=origin,
-                destination=destination,
-                departure_date=str(departure_date),
-                return_date=str(return_date) if return_date else None,
-                total_offers=len(offers),
-                offers=offers,
+            return self._search_result(
+                origin,
+                destination,
+                departure_date,
+                return_date,
+                offers=self._parse_offers(data, cabin_class, max_offers),
                 dictionaries=data.get("context", {}),
             )
 
         except Exception as e:
             logger.error(f"Skyscanner search error: {e}")
-            return FlightSearchResult(
-                origin=origin,
-                destination=destination,
-                departure_date=str(departure_date),
-                return_date=str(return_date) if return_date else None,
-                total_offers=0,
-                offers=[],
-                dictionaries={},
-            )
+            return self._search_result(origin, destination, departure_date, return_date)
+
+    async def search_flights_async(
+        self,
+        origin: str,
+        destination: str,
+        departure_date: date,
+        return_date: date | None = None,
+        *,
+        adults: int = 1,
+        cabin_class: str = "economy",
+        non_stop: bool = False,
+        max_offers: int = 10,
+        http_client: httpx.AsyncClient | None = None,
+    ) -> FlightSearchResult:
+        """
+        Search for flights using Skyscanner API (asynchronous).
+
+        Unlike search_flights, request errors are raised so callers fanning out
+        several searches can tell a failed search from a route without offers.
+
+        Args:
+            origin: Origin airport IATA code (e.g., "JFK")
+            destination: Destination airport IATA code (e.g., "LHR")
+            departure_date: Departure date
+            return_date: Return date (None for one-way)
+            adults: Number of adult passengers
+            cabin_class: Cabin class (economy, premium_economy, business, first)
+            non_stop: Only show non-stop flights
+            max_offers: Maximum number of offers to return
+            http_client: Shared async client for concurrent searches (optional)
+
+        Returns:
+            FlightSearchResult with offers
+
+        Raises:
+            httpx.HTTPError: If the API request fails
+        """
+        if not self.api_key:
+            logger.warning("RapidAPI key not configured")
+            return self._search_result(origin, destination, departure_date, return_date)
+
+        params = self._search_params(
+            origin,
+            destination,
+            departure_date,
+            return_date,
+            adults=adults,
+            cabin_class=cabin_class,
+        )
+        logger.info(f"Searching Skyscanner: {origin} -> {destination} on {departure_date}")
+
+        if http_client is None:
+            async with httpx.AsyncClient(
+                timeout=30.0, event_hooks=async_http_event_hooks("skyscanner")
+            ) as client:
+                response = await client.get(self.base_url, headers=self._headers(), params=params)
+        else:
+            response = await http_client.get(self.base_url, headers=self._headers(), params=params)
+        response.raise_for_status()
+
+        data = response.json()
+        return self._search_result(
+            origin,
+            destination,
+            departure_date,
+            return_date,
+            offers=self._parse_offers(data, cabin_class, max_offers),
+            dictionaries=data.get("context", {}),
+        )
 
     def _parse_offers(self, data: dict, cabin_class: str, max_offers: int) -> list[FlightOffer]:
         """Parse Skyscanner API response into FlightOffer objects."""
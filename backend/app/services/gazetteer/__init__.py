@@ -0,0 +1,12 @@
+"""Offline gazetteer for country-code resolution and city geocoding."""
+
+from .gazetteer import City, Country, Gazetteer, country_code, get_gazetteer, normalize
+
+__all__ = [
+    "City",
+    "Country",
+    "Gazetteer",
+    "country_code",
+    "get_gazetteer",
+    "normalize",
+]
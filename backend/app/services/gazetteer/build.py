@@ -0,0 +1,569 @@
+"""
+Build the bundled gazetteer data file.
+
+Sources:
+- COUNTRIES below: ISO 3166-1 alpha-2/alpha-3 codes, names and aliases
+- The IANA tz database zone.tab (from the tzdata package): one city per time
+  zone with coordinates, e.g. "JP +353916+1394441 Asia/Tokyo"
+- MAJOR_CITIES below: travel destinations that are not zone cities
+
+Usage (from backend/, needs `pip install tzdata`):
+    python -m app.services.gazetteer.build
+
+Writes app/services/gazetteer/data/gazetteer.json. The output is committed;
+the build only needs to run again when the tables below change.
+"""
+
+import json
+import re
+from importlib import resources
+from pathlib import Path
+
+OUTPUT_PATH = Path(__file__).parent / "data" / "gazetteer.json"
+
+# iso2: (iso3, name, aliases)
+COUNTRIES: dict[str, tuple[str, str, list[str]]] = {
+    "AD": ("AND", "Andorra", []),
+    "AE": ("ARE", "United Arab Emirates", ["UAE", "Emirates"]),
+    "AF": ("AFG", "Afghanistan", []),
+    "AG": ("ATG", "Antigua and Barbuda", ["Antigua"]),
+    "AI": ("AIA", "Anguilla", []),
+    "AL": ("ALB", "Albania", []),
+    "AM": ("ARM", "Armenia", []),
+    "AO": ("AGO", "Angola", []),
+    "AQ": ("ATA", "Antarctica", []),
+    "AR": ("ARG", "Argentina", []),
+    "AS": ("ASM", "American Samoa", []),
+    "AT": ("AUT", "Austria", []),
+    "AU": ("AUS", "Australia", []),
+    "AW": ("ABW", "Aruba", []),
+    "AX": ("ALA", "Aland Islands", []),
+    "AZ": ("AZE", "Azerbaijan", []),
+    "BA": ("BIH", "Bosnia and Herzegovina", ["Bosnia", "Bosnia & Herzegovina"]),
+    "BB": ("BRB", "Barbados", []),
+    "BD": ("BGD", "Bangladesh", []),
+    "BE": ("BEL", "Belgium", []),
+    "BF": ("BFA", "Burkina Faso", []),
+    "BG": ("BGR", "Bulgaria", []),
+    "BH": ("BHR", "Bahrain", []),
+    "BI": ("BDI", "Burundi", []),
+    "BJ": ("BEN", "Benin", []),
+    "BL": ("BLM", "Saint Barthelemy", ["St Barts", "St Barthelemy"]),
+    "BM": ("BMU", "Bermuda", []),
+    "BN": ("BRN", "Brunei", ["Brunei Darussalam"]),
+    "BO": ("BOL", "Bolivia", ["Plurinational State of Bolivia"]),
+    "BQ": ("BES", "Caribbean Netherlands", ["Bonaire"]),
+    "BR": ("BRA", "Brazil", ["Brasil"]),
+    "BS": ("BHS", "Bahamas", ["The Bahamas"]),
+    "BT": ("BTN", "Bhutan", []),
+    "BV": ("BVT", "Bouvet Island", []),
+    "BW": ("BWA", "Botswana", []),
+    "BY": ("BLR", "Belarus", []),
+    "BZ": ("BLZ", "Belize", []),
+    "CA": ("CAN", "Canada", []),
+    "CC": ("CCK", "Cocos (Keeling) Islands", ["Cocos Islands"]),
+    "CD": ("COD", "Democratic Republic of the Congo", ["DR Congo", "DRC", "Congo-Kinshasa"]),
+    "CF": ("CAF", "Central African Republic", []),
+    "CG": ("COG", "Republic of the Congo", ["Congo", "Congo-Brazzaville"]),
+    "CH": ("CHE", "Switzerland", []),
+    "CI": ("CIV", "Cote d'Ivoire", ["Ivory Coast"]),
+    "CK": ("COK", "Cook Islands", []),
+    "CL": ("CHL", "Chile", []),
+    "CM": ("CMR", "Cameroon", []),
+    "CN": ("CHN", "China", ["People's Republic of China", "PRC"]),
+    "CO": ("COL", "Colombia", []),
+    "CR": ("CRI", "Costa Rica", []),
+    "CU": ("CUB", "Cuba", []),
+    "CV": ("CPV", "Cape Verde", ["Cabo Verde"]),
+    "CW": ("CUW", "Curacao", []),
+    "CX": ("CXR", "Christmas Island", []),
+    "CY": ("CYP", "Cyprus", []),
+    "CZ": ("CZE", "Czech Republic", ["Czechia"]),
+    "DE": ("DEU", "Germany", ["Deutschland"]),
+    "DJ": ("DJI", "Djibouti", []),
+    "DK": ("DNK", "Denmark", []),
+    "DM": ("DMA", "Dominica", []),
+    "DO": ("DOM", "Dominican Republic", []),
+    "DZ": ("DZA", "Algeria", []),
+    "EC": ("ECU", "Ecuador", []),
+    "EE": ("EST", "Estonia", []),
+    "EG": ("EGY", "Egypt", []),
+    "EH": ("ESH", "Western Sahara", []),
+    "ER": ("ERI", "Eritrea", []),
+    "ES": ("ESP", "Spain", ["Espana"]),
+    "ET": ("ETH", "Ethiopia", []),
+    "FI": ("FIN", "Finland", []),
+    "FJ": ("FJI", "Fiji", []),
+    "FK": ("FLK", "Falkland Islands", []),
+    "FM": ("FSM", "Micronesia", ["Federated States of Micronesia"]),
+    "FO": ("FRO", "Faroe Islands", []),
+    "FR": ("FRA", "France", []),
+    "GA": ("GAB", "Gabon", []),
+    "GB": (
+        "GBR",
+        "United Kingdom",
+        ["UK", "Great Britain", "Britain", "England", "Scotland", "Wales", "Northern Ireland"],
+    ),
+    "GD": ("GRD", "Grenada", []),
+    "GE": ("GEO", "Georgia", []),
+    "GF": ("GUF", "French Guiana", []),
+    "GG": ("GGY", "Guernsey", []),
+    "GH": ("GHA", "Ghana", []),
+    "GI": ("GIB", "Gibraltar", []),
+    "GL": ("GRL", "Greenland", []),
+    "GM": ("GMB", "Gambia", ["The Gambia"]),
+    "GN": ("GIN", "Guinea", []),
+    "GP": ("GLP", "Guadeloupe", []),
+    "GQ": ("GNQ", "Equatorial Guinea", []),
+    "GR": ("GRC", "Greece", ["Hellas"]),
+    "GS": ("SGS", "South Georgia and the South Sandwich Islands", []),
+    "GT": ("GTM", "Guatemala", []),
+    "GU": ("GUM", "Guam", []),
+    "GW": ("GNB", "Guinea-Bissau", []),
+    "GY": ("GUY", "Guyana", []),
+    "HK": ("HKG", "Hong Kong", []),
+    "HM": ("HMD", "Heard Island and McDonald Islands", []),
+    "HN": ("HND", "Honduras", []),
+    "HR": ("HRV", "Croatia", []),
+    "HT": ("HTI", "Haiti", []),
+    "HU": ("HUN", "Hungary", []),
+    "ID": ("IDN", "Indonesia", []),
+    "IE": ("IRL", "Ireland", ["Eire", "Republic of Ireland"]),
+    "IL": ("ISR", "Israel", []),
+    "IM": ("IMN", "Isle of Man", []),
+    "IN": ("IND", "India", ["Bharat"]),
+    "IO": ("IOT", "British Indian Ocean Territory", []),
+    "IQ": ("IRQ", "Iraq", []),
+    "IR": ("IRN", "Iran", ["Persia", "Islamic Republic of Iran"]),
+    "IS": ("ISL", "Iceland", []),
+    "IT": ("ITA", "Italy", ["Italia"]),
+    "JE": ("JEY", "Jersey", []),
+    "JM": ("JAM", "Jamaica", []),
+    "JO": ("JOR", "Jordan", []),
+    "JP": ("JPN", "Japan", ["Nippon"]),
+    "KE": ("KEN", "Kenya", []),
+    "KG": ("KGZ", "Kyrgyzstan", []),
+    "KH": ("KHM", "Cambodia", []),
+    "KI": ("KIR", "Kiribati", []),
+    "KM": ("COM", "Comoros", []),
+    "KN": ("KNA", "Saint Kitts and Nevis", ["St Kitts and Nevis"]),
+    "KP": ("PRK", "North Korea", ["DPRK", "Democratic People's Republic of Korea"]),
+    "KR": ("KOR", "South Korea", ["Korea", "Republic of Korea"]),
+    "KW": ("KWT", "Kuwait", []),
+    "KY": ("CYM", "Cayman Islands", []),
+    "KZ": ("KAZ", "Kazakhstan", []),
+    "LA": ("LAO", "Laos", ["Lao PDR", "Lao People's Democratic Republic"]),
+    "LB": ("LBN", "Lebanon", []),
+    "LC": ("LCA", "Saint Lucia", ["St Lucia"]),
+    "LI": ("LIE", "Liechtenstein", []),
+    "LK": ("LKA", "Sri Lanka", ["Ceylon"]),
+    "LR": ("LBR", "Liberia", []),
+    "LS": ("LSO", "Lesotho", []),
+    "LT": ("LTU", "Lithuania", []),
+    "LU": ("LUX", "Luxembourg", []),
+    "LV": ("LVA", "Latvia", []),
+    "LY": ("LBY", "Libya", []),
+    "MA": ("MAR", "Morocco", []),
+    "MC": ("MCO", "Monaco", []),
+    "MD": ("MDA", "Moldova", ["Republic of Moldova"]),
+    "ME": ("MNE", "Montenegro", []),
+    "MF": ("MAF", "Saint Martin", ["St Martin"]),
+    "MG": ("MDG", "Madagascar", []),
+    "MH": ("MHL", "Marshall Islands", []),
+    "MK": ("MKD", "North Macedonia", ["Macedonia"]),
+    "ML": ("MLI", "Mali", []),
+    "MM": ("MMR", "Myanmar", ["Burma"]),
+    "MN": ("MNG", "Mongolia", []),
+    "MO": ("MAC", "Macau", ["Macao"]),
+    "MP": ("MNP", "Northern Mariana Islands", []),
+    "MQ": ("MTQ", "Martinique", []),
+    "MR": ("MRT", "Mauritania", []),
+    "MS": ("MSR", "Montserrat", []),
+    "MT": ("MLT", "Malta", []),
+    "MU": ("MUS", "Mauritius", []),
+    "MV": ("MDV", "Maldives", []),
+    "MW": ("MWI", "Malawi", []),
+    "MX": ("MEX", "Mexico", []),
+    "MY": ("MYS", "Malaysia", []),
+    "MZ": ("MOZ", "Mozambique", []),
+    "NA": ("NAM", "Namibia", []),
+    "NC": ("NCL", "New Caledonia", []),
+    "NE": ("NER", "Niger", []),
+    "NF": ("NFK", "Norfolk Island", []),
+    "NG": ("NGA", "Nigeria", []),
+    "NI": ("NIC", "Nicaragua", []),
+    "NL": ("NLD", "Netherlands", ["Holland", "The Netherlands"]),
+    "NO": ("NOR", "Norway", []),
+    "NP": ("NPL", "Nepal", []),
+    "NR": ("NRU", "Nauru", []),
+    "NU": ("NIU", "Niue", []),
+    "NZ": ("NZL", "New Zealand", ["Aotearoa"]),
+    "OM": ("OMN", "Oman", []),
+    "PA": ("PAN", "Panama", []),
+    "PE": ("PER", "Peru", []),
+    "PF": ("PYF", "French Polynesia", ["Tahiti"]),
+    "PG": ("PNG", "Papua New Guinea", []),
+    "PH": ("PHL", "Philippines", []),
+    "PK": ("PAK", "Pakistan", []),
+    "PL": ("POL", "Poland", []),
+    "PM": ("SPM", "Saint Pierre and Miquelon", []),
+    "PN": ("PCN", "Pitcairn Islands", []),
+    "PR": ("PRI", "Puerto Rico", []),
+    "PS": ("PSE", "Palestine", ["State of Palestine"]),
+    "PT": ("PRT", "Portugal", []),
+    "PW": ("PLW", "Palau", []),
+    "PY": ("PRY", "Paraguay", []),
+    "QA": ("QAT", "Qatar", []),
+    "RE": ("REU", "Reunion", []),
+    "RO": ("ROU", "Romania", []),
+    "RS": ("SRB", "Serbia", []),
+    "RU": ("RUS", "Russia", ["Russian Federation"]),
+    "RW": ("RWA", "Rwanda", []),
+    "SA": ("SAU", "Saudi Arabia", ["KSA"]),
+    "SB": ("SLB", "Solomon Islands", []),
+    "SC": ("SYC", "Seychelles", []),
+    "SD": ("SDN", "Sudan", []),
+    "SE": ("SWE", "Sweden", []),
+    "SG": ("SGP", "Singapore", []),
+    "SH": ("SHN", "Saint Helena", ["St Helena"]),
+    "SI": ("SVN", "Slovenia", []),
+    "SJ": ("SJM", "Svalbard and Jan Mayen", ["Svalbard"]),
+    "SK": ("SVK", "Slovakia", []),
+    "SL": ("SLE", "Sierra Leone", []),
+    "SM": ("SMR", "San Marino", []),
+    "SN": ("SEN", "Senegal", []),
+    "SO": ("SOM", "Somalia", []),
+    "SR": ("SUR", "Suriname", []),
+    "SS": ("SSD", "South Sudan", []),
+    "ST": ("STP", "Sao Tome and Principe", []),
+    "SV": ("SLV", "El Salvador", []),
+    "SX": ("SXM", "Sint Maarten", []),
+    "SY": ("SYR", "Syria", ["Syrian Arab Republic"]),
+    "SZ": ("SWZ", "Eswatini", ["Swaziland"]),
+    "TC": ("TCA", "Turks and Caicos Islands", []),
+    "TD": ("TCD", "Chad", []),
+    "TF": ("ATF", "French Southern Territories", []),
+    "TG": ("TGO", "Togo", []),
+    "TH": ("THA", "Thailand", ["Siam"]),
+    "TJ": ("TJK", "Tajikistan", []),
+    "TK": ("TKL", "Tokelau", []),
+    "TL": ("TLS", "Timor-Leste", ["East Timor"]),
+    "TM": ("TKM", "Turkmenistan", []),
+    "TN": ("TUN", "Tunisia", []),
+    "TO": ("TON", "Tonga", []),
+    "TR": ("TUR", "Turkey", ["Turkiye"]),
+    "TT": ("TTO", "Trinidad and Tobago", ["Trinidad"]),
+    "TV": ("TUV", "Tuvalu", []),
+    "TW": ("TWN", "Taiwan", []),
+    "TZ": ("TZA", "Tanzania", ["United Republic of Tanzania"]),
+    "UA": ("UKR", "Ukraine", []),
+    "UG": ("UGA", "Uganda", []),
+    "UM": ("UMI", "United States Minor Outlying Islands", []),
+    "US": (
+        "USA",
+        "United States",
+        ["USA", "US", "America", "United States of America", "U.S.A."],
+    ),
+    "UY": ("URY", "Uruguay", []),
+    "UZ": ("UZB", "Uzbekistan", []),
+    "VA": ("VAT", "Vatican City", ["Holy See", "Vatican"]),
+    "VC": ("VCT", "Saint Vincent and the Grenadines", ["St Vincent"]),
+    "VE": ("VEN", "Venezuela", ["Bolivarian Republic of Venezuela"]),
+    "VG": ("VGB", "British Virgin Islands", []),
+    "VI": ("VIR", "United States Virgin Islands", ["US Virgin Islands"]),
+    "VN": ("VNM", "Vietnam", ["Viet Nam"]),
+    "VU": ("VUT", "Vanuatu", []),
+    "WF": ("WLF", "Wallis and Futuna", []),
+    "WS": ("WSM", "Samoa", []),
+    "YE": ("YEM", "Yemen", []),
+    "YT": ("MYT", "Mayotte", []),
+    "ZA": ("ZAF", "South Africa", []),
+    "ZM": ("ZMB", "Zambia", []),
+    "ZW": ("ZWE", "Zimbabwe", []),
+}
+
+# (name, iso2, lat, lng, timezone, aliases) for destinations not in zone.tab
+MAJOR_CITIES: list[tuple[str, str, float, float, str, list[str]]] = [
+    ("Kyoto", "JP", 35.0116, 135.7681, "Asia/Tokyo", []),
+    ("Osaka", "JP", 34.6937, 135.5023, "Asia/Tokyo", []),
+    ("Hiroshima", "JP", 34.3853, 132.4553, "Asia/Tokyo", []),
+    ("Sapporo", "JP", 43.0618, 141.3545, "Asia/Tokyo", []),
+    ("Nara", "JP", 34.6851, 135.8048, "Asia/Tokyo", []),
+    ("Busan", "KR", 35.1796, 129.0756, "Asia/Seoul", ["Pusan"]),
+    ("Jeju", "KR", 33.4996, 126.5312, "Asia/Seoul", []),
+    ("Beijing", "CN", 39.9042, 116.4074, "Asia/Shanghai", ["Peking"]),
+    ("Guangzhou", "CN", 23.1291, 113.2644, "Asia/Shanghai", ["Canton"]),
+    ("Shenzhen", "CN", 22.5431, 114.0579, "Asia/Shanghai", []),
+    ("Xi'an", "CN", 34.3416, 108.9398, "Asia/Shanghai", ["Xian"]),
+    ("Chengdu", "CN", 30.5728, 104.0668, "Asia/Shanghai", []),
+    ("Guilin", "CN", 25.2736, 110.2900, "Asia/Shanghai", []),
+    ("Delhi", "IN", 28.6139, 77.2090, "Asia/Kolkata", ["New Delhi"]),
+    ("Mumbai", "IN", 19.0760, 72.8777, "Asia/Kolkata", ["Bombay"]),
+    ("Bangalore", "IN", 12.9716, 77.5946, "Asia/Kolkata", ["Bengaluru"]),
+    ("Chennai", "IN", 13.0827, 80.2707, "Asia/Kolkata", ["Madras"]),
+    ("Jaipur", "IN", 26.9124, 75.7873, "Asia/Kolkata", []),
+    ("Agra", "IN", 27.1767, 78.0081, "Asia/Kolkata", []),
+    ("Goa", "IN", 15.4909, 73.8278, "Asia/Kolkata", ["Panaji"]),
+    ("Varanasi", "IN", 25.3176, 82.9739, "Asia/Kolkata", []),
+    ("Phuket", "TH", 7.8804, 98.3923, "Asia/Bangkok", []),
+    ("Chiang Mai", "TH", 18.7883, 98.9853, "Asia/Bangkok", []),
+    ("Krabi", "TH", 8.0863, 98.9063, "Asia/Bangkok", []),
+    ("Pattaya", "TH", 12.9236, 100.8825, "Asia/Bangkok", []),
+    ("Hanoi", "VN", 21.0278, 105.8342, "Asia/Bangkok", ["Ha Noi"]),
+    ("Da Nang", "VN", 16.0544, 108.2022, "Asia/Ho_Chi_Minh", ["Danang"]),
+    ("Hoi An", "VN", 15.8801, 108.3380, "Asia/Ho_Chi_Minh", []),
+    ("Siem Reap", "KH", 13.3671, 103.8448, "Asia/Phnom_Penh", ["Angkor"]),
+    ("Luang Prabang", "LA", 19.8856, 102.1347, "Asia/Vientiane", []),
+    ("Denpasar", "ID", -8.6705, 115.2126, "Asia/Makassar", ["Bali"]),
+    ("Ubud", "ID", -8.5069, 115.2625, "Asia/Makassar", []),
+    ("Yogyakarta", "ID", -7.7956, 110.3695, "Asia/Jakarta", ["Jogja"]),
+    ("Penang", "MY", 5.4141, 100.3288, "Asia/Kuala_Lumpur", ["George Town"]),
+    ("Langkawi", "MY", 6.3500, 99.8000, "Asia/Kuala_Lumpur", []),
+    ("Cebu", "PH", 10.3157, 123.8854, "Asia/Manila", []),
+    ("Pokhara", "NP", 28.2096, 83.9856, "Asia/Kathmandu", []),
+    ("Abu Dhabi", "AE", 24.4539, 54.3773, "Asia/Dubai", []),
+    ("Muscat", "OM", 23.5880, 58.3829, "Asia/Muscat", []),
+    ("Petra", "JO", 30.3285, 35.4444, "Asia/Amman", []),
+    ("Tel Aviv", "IL", 32.0853, 34.7818, "Asia/Jerusalem", []),
+    ("Antalya", "TR", 36.8969, 30.7133, "Europe/Istanbul", []),
+    ("Ankara", "TR", 39.9334, 32.8597, "Europe/Istanbul", []),
+    ("Cappadocia", "TR", 38.6431, 34.8289, "Europe/Istanbul", ["Goreme"]),
+    ("Luxor", "EG", 25.6872, 32.6396, "Africa/Cairo", []),
+    ("Alexandria", "EG", 31.2001, 29.9187, "Africa/Cairo", []),
+    ("Sharm El Sheikh", "EG", 27.9158, 34.3300, "Africa/Cairo", []),
+    ("Hurghada", "EG", 27.2579, 33.8116, "Africa/Cairo", []),
+    ("Marrakech", "MA", 31.6295, -7.9811, "Africa/Casablanca", ["Marrakesh"]),
+    ("Fez", "MA", 34.0181, -5.0078, "Africa/Casablanca", ["Fes"]),
+    ("Cape Town", "ZA", -33.9249, 18.4241, "Africa/Johannesburg", []),
+    ("Durban", "ZA", -29.8587, 31.0218, "Africa/Johannesburg", []),
+    ("Zanzibar", "TZ", -6.1659, 39.2026, "Africa/Dar_es_Salaam", ["Stone Town"]),
+    ("Arusha", "TZ", -3.3869, 36.6830, "Africa/Dar_es_Salaam", []),
+    ("Mombasa", "KE", -4.0435, 39.6682, "Africa/Nairobi", []),
+    ("Victoria Falls", "ZW", -17.9243, 25.8572, "Africa/Harare", []),
+    ("Barcelona", "ES", 41.3874, 2.1686, "Europe/Madrid", []),
+    ("Seville", "ES", 37.3891, -5.9845, "Europe/Madrid", ["Sevilla"]),
+    ("Valencia", "ES", 39.4699, -0.3763, "Europe/Madrid", []),
+    ("Granada", "ES", 37.1773, -3.5986, "Europe/Madrid", []),
+    ("Malaga", "ES", 36.7213, -4.4214, "Europe/Madrid", []),
+    ("Palma de Mallorca", "ES", 39.5696, 2.6502, "Europe/Madrid", ["Palma", "Mallorca"]),
+    ("Ibiza", "ES", 38.9067, 1.4206, "Europe/Madrid", []),
+    ("Porto", "PT", 41.1579, -8.6291, "Europe/Lisbon", ["Oporto"]),
+    ("Faro", "PT", 37.0194, -7.9322, "Europe/Lisbon", ["Algarve"]),
+    ("Nice", "FR", 43.7102, 7.2620, "Europe/Paris", []),
+    ("Lyon", "FR", 45.7640, 4.8357, "Europe/Paris", []),
+    ("Marseille", "FR", 43.2965, 5.3698, "Europe/Paris", []),
+    ("Bordeaux", "FR", 44.8378, -0.5792, "Europe/Paris", []),
+    ("Strasbourg", "FR", 48.5734, 7.7521, "Europe/Paris", []),
+    ("Milan", "IT", 45.4642, 9.1900, "Europe/Rome", ["Milano"]),
+    ("Florence", "IT", 43.7696, 11.2558, "Europe/Rome", ["Firenze"]),
+    ("Venice", "IT", 45.4408, 12.3155, "Europe/Rome", ["Venezia"]),
+    ("Naples", "IT", 40.8518, 14.2681, "Europe/Rome", ["Napoli"]),
+    ("Pisa", "IT", 43.7228, 10.4017, "Europe/Rome", []),
+    ("Amalfi", "IT", 40.6340, 14.6027, "Europe/Rome", ["Amalfi Coast"]),
+    ("Verona", "IT", 45.4384, 10.9916, "Europe/Rome", []),
+    ("Bologna", "IT", 44.4949, 11.3426, "Europe/Rome", []),
+    ("Palermo", "IT", 38.1157, 13.3615, "Europe/Rome", []),
+    ("Munich", "DE", 48.1351, 11.5820, "Europe/Berlin", ["Munchen"]),
+    ("Frankfurt", "DE", 50.1109, 8.6821, "Europe/Berlin", []),
+    ("Hamburg", "DE", 53.5511, 9.9937, "Europe/Berlin", []),
+    ("Cologne", "DE", 50.9375, 6.9603, "Europe/Berlin", ["Koln"]),
+    ("Dresden", "DE", 51.0504, 13.7373, "Europe/Berlin", []),
+    ("Salzburg", "AT", 47.8095, 13.0550, "Europe/Vienna", []),
+    ("Innsbruck", "AT", 47.2692, 11.4041, "Europe/Vienna", []),
+    ("Geneva", "CH", 46.2044, 6.1432, "Europe/Zurich", ["Geneve"]),
+    ("Lucerne", "CH", 47.0502, 8.3093, "Europe/Zurich", ["Luzern"]),
+    ("Interlaken", "CH", 46.6863, 7.8632, "Europe/Zurich", []),
+    ("Zermatt", "CH", 46.0207, 7.7491, "Europe/Zurich", []),
+    ("Bern", "CH", 46.9480, 7.4474, "Europe/Zurich", []),
+    ("Rotterdam", "NL", 51.9244, 4.4777, "Europe/Amsterdam", []),
+    ("The Hague", "NL", 52.0705, 4.3007, "Europe/Amsterdam", ["Den Haag"]),
+    ("Bruges", "BE", 51.2093, 3.2247, "Europe/Brussels", ["Brugge"]),
+    ("Antwerp", "BE", 51.2194, 4.4025, "Europe/Brussels", []),
+    ("Edinburgh", "GB", 55.9533, -3.1883, "Europe/London", []),
+    ("Manchester", "GB", 53.4808, -2.2426, "Europe/London", []),
+    ("Liverpool", "GB", 53.4084, -2.9916, "Europe/London", []),
+    ("Glasgow", "GB", 55.8642, -4.2518, "Europe/London", []),
+    ("Oxford", "GB", 51.7520, -1.2577, "Europe/London", []),
+    ("Bath", "GB", 51.3811, -2.3590, "Europe/London", []),
+    ("Cork", "IE", 51.8985, -8.4756, "Europe/Dublin", []),
+    ("Galway", "IE", 53.2707, -9.0568, "Europe/Dublin", []),
+    ("Krakow", "PL", 50.0647, 19.9450, "Europe/Warsaw", ["Cracow"]),
+    ("Gdansk", "PL", 54.3520, 18.6466, "Europe/Warsaw", []),
+    ("Cesky Krumlov", "CZ", 48.8127, 14.3175, "Europe/Prague", []),
+    ("Dubrovnik", "HR", 42.6507, 18.0944, "Europe/Zagreb", []),
+    ("Split", "HR", 43.5081, 16.4402, "Europe/Zagreb", []),
+    ("Kotor", "ME", 42.4247, 18.7712, "Europe/Podgorica", []),
+    ("Santorini", "GR", 36.3932, 25.4615, "Europe/Athens", ["Thira", "Fira"]),
+    ("Mykonos", "GR", 37.4467, 25.3289, "Europe/Athens", []),
+    ("Thessaloniki", "GR", 40.6401, 22.9444, "Europe/Athens", []),
+    ("Crete", "GR", 35.3387, 25.1442, "Europe/Athens", ["Heraklion"]),
+    ("Corfu", "GR", 39.6243, 19.9217, "Europe/Athens", []),
+    ("St Petersburg", "RU", 59.9311, 30.3609, "Europe/Moscow", ["Saint Petersburg"]),
+    ("Bergen", "NO", 60.3913, 5.3221, "Europe/Oslo", []),
+    ("Tromso", "NO", 69.6492, 18.9553, "Europe/Oslo", []),
+    ("Gothenburg", "SE", 57.7089, 11.9746, "Europe/Stockholm", ["Goteborg"]),
+    ("Rovaniemi", "FI", 66.5039, 25.7294, "Europe/Helsinki", []),
+    ("San Francisco", "US", 37.7749, -122.4194, "America/Los_Angeles", ["SF"]),
+    ("San Diego", "US", 32.7157, -117.1611, "America/Los_Angeles", []),
+    ("Las Vegas", "US", 36.1699, -115.1398, "America/Los_Angeles", ["Vegas"]),
+    ("Seattle", "US", 47.6062, -122.3321, "America/Los_Angeles", []),
+    ("Portland", "US", 45.5152, -122.6784, "America/Los_Angeles", []),
+    ("Washington", "US", 38.9072, -77.0369, "America/New_York", ["Washington DC", "DC"]),
+    ("Boston", "US", 42.3601, -71.0589, "America/New_York", []),
+    ("Miami", "US", 25.7617, -80.1918, "America/New_York", []),
+    ("Orlando", "US", 28.5383, -81.3792, "America/New_York", []),
+    ("Atlanta", "US", 33.7490, -84.3880, "America/New_York", []),
+    ("Philadelphia", "US", 39.9526, -75.1652, "America/New_York", []),
+    ("New Orleans", "US", 29.9511, -90.0715, "America/Chicago", ["NOLA"]),
+    ("Austin", "US", 30.2672, -97.7431, "America/Chicago", []),
+    ("Houston", "US", 29.7604, -95.3698, "America/Chicago", []),
+    ("Dallas", "US", 32.7767, -96.7970, "America/Chicago", []),
+    ("Nashville", "US", 36.1627, -86.7816, "America/Chicago", []),
+    ("San Antonio", "US", 29.4241, -98.4936, "America/Chicago", []),
+    ("Salt Lake City", "US", 40.7608, -111.8910, "America/Denver", []),
+    ("Montreal", "CA", 45.5019, -73.5674, "America/Toronto", []),
+    ("Quebec City", "CA", 46.8139, -71.2080, "America/Toronto", ["Quebec"]),
+    ("Ottawa", "CA", 45.4215, -75.6972, "America/Toronto", []),
+    ("Calgary", "CA", 51.0447, -114.0719, "America/Edmonton", []),
+    ("Banff", "CA", 51.1784, -115.5708, "America/Edmonton", []),
+    ("Cancun", "MX", 21.1619, -86.8515, "America/Cancun", ["Cancún"]),
+    ("Tulum", "MX", 20.2114, -87.4654, "America/Cancun", []),
+    ("Guadalajara", "MX", 20.6597, -103.3496, "America/Mexico_City", []),
+    ("Oaxaca", "MX", 17.0732, -96.7266, "America/Mexico_City", []),
+    ("Playa del Carmen", "MX", 20.6296, -87.0739, "America/Cancun", []),
+    ("Cabo San Lucas", "MX", 22.8905, -109.9167, "America/Mazatlan", ["Los Cabos"]),
+    ("Rio de Janeiro", "BR", -22.9068, -43.1729, "America/Sao_Paulo", ["Rio"]),
+    ("Brasilia", "BR", -15.7975, -47.8919, "America/Sao_Paulo", []),
+    ("Salvador", "BR", -12.9777, -38.5016, "America/Bahia", []),
+    ("Florianopolis", "BR", -27.5954, -48.5480, "America/Sao_Paulo", []),
+    ("Cusco", "PE", -13.5320, -71.9675, "America/Lima", ["Cuzco"]),
+    ("Machu Picchu", "PE", -13.1631, -72.5450, "America/Lima", []),
+    ("Arequipa", "PE", -16.4090, -71.5375, "America/Lima", []),
+    ("Cartagena", "CO", 10.3910, -75.4794, "America/Bogota", []),
+    ("Medellin", "CO", 6.2442, -75.5812, "America/Bogota", []),
+    ("Quito", "EC", -0.1807, -78.4678, "America/Guayaquil", []),
+    ("Valparaiso", "CL", -33.0472, -71.6127, "America/Santiago", []),
+    ("Mendoza", "AR", -32.8895, -68.8458, "America/Argentina/Mendoza", []),
+    ("Bariloche", "AR", -41.1335, -71.3103, "America/Argentina/Salta", []),
+    ("San Jose", "CR", 9.9281, -84.0907, "America/Costa_Rica", []),
+    ("Punta Cana", "DO", 18.5601, -68.3725, "America/Santo_Domingo", []),
+    ("Montego Bay", "JM", 18.4762, -77.8939, "America/Jamaica", []),
+    ("Melbourne", "AU", -37.8136, 144.9631, "Australia/Melbourne", []),
+    ("Cairns", "AU", -16.9186, 145.7781, "Australia/Brisbane", []),
+    ("Gold Coast", "AU", -28.0167, 153.4000, "Australia/Brisbane", []),
+    ("Canberra", "AU", -35.2809, 149.1300, "Australia/Sydney", []),
+    ("Wellington", "NZ", -41.2866, 174.7756, "Pacific/Auckland", []),
+    ("Queenstown", "NZ", -45.0312, 168.6626, "Pacific/Auckland", []),
+    ("Christchurch", "NZ", -43.5321, 172.6362, "Pacific/Auckland", []),
+    ("Nadi", "FJ", -17.7765, 177.4356, "Pacific/Fiji", []),
+    ("Bora Bora", "PF", -16.5004, -151.7415, "Pacific/Tahiti", []),
+    ("Papeete", "PF", -17.5516, -149.5585, "Pacific/Tahiti", []),
+    ("Bukhara", "UZ", 39.7681, 64.4556, "Asia/Samarkand", []),
+    ("Khiva", "UZ", 41.3775, 60.3619, "Asia/Samarkand", []),
+    ("Almaty", "KZ", 43.2220, 76.8512, "Asia/Almaty", ["Alma-Ata"]),
+    ("Astana", "KZ", 51.1694, 71.4491, "Asia/Almaty", ["Nur-Sultan"]),
+]
+
+# Zone.tab cities whose usual English name differs from the zone name
+ZONE_CITY_NAMES = {
+    "Asia/Kolkata": ("Kolkata", ["Calcutta"]),
+    "Asia/Ho_Chi_Minh": ("Ho Chi Minh City", ["Saigon", "Ho Chi Minh"]),
+    "Asia/Yangon": ("Yangon", ["Rangoon"]),
+    "Europe/Kyiv": ("Kyiv", ["Kiev"]),
+    "Asia/Kathmandu": ("Kathmandu", []),
+    "America/New_York": ("New York", ["New York City", "NYC"]),
+    "America/Los_Angeles": ("Los Angeles", ["LA"]),
+    "Asia/Shanghai": ("Shanghai", []),
+    "Europe/Lisbon": ("Lisbon", ["Lisboa"]),
+    "Europe/Prague": ("Prague", ["Praha"]),
+    "Europe/Rome": ("Rome", ["Roma"]),
+    "Europe/Vienna": ("Vienna", ["Wien"]),
+    "Europe/Moscow": ("Moscow", []),
+    "Europe/Brussels": ("Brussels", ["Bruxelles"]),
+    "Europe/Copenhagen": ("Copenhagen", []),
+    "Europe/Athens": ("Athens", []),
+    "Asia/Seoul": ("Seoul", []),
+    "Asia/Tokyo": ("Tokyo", []),
+    "Asia/Hong_Kong": ("Hong Kong", []),
+    "Asia/Singapore": ("Singapore", []),
+    "America/Mexico_City": ("Mexico City", ["CDMX"]),
+    "America/Argentina/Buenos_Aires": ("Buenos Aires", []),
+    "America/Sao_Paulo": ("Sao Paulo", []),
+    "Africa/Cairo": ("Cairo", []),
+}
+
+
+def _parse_iso6709(value: str) -> tuple[float, float]:
+    """Parse zone.tab coordinates like +353916+1394441 into (lat, lng)."""
+    match = re.fullmatch(r"([+-]\d+)([+-]\d+)", value)
+    if not match:
+        msg = f"Invalid coordinates: {value}"
+        raise ValueError(msg)
+
+    def convert(part: str, degree_digits: int) -> float:
+        sign = -1 if part[0] == "-" else 1
+        digits = part[1:]
+        degrees = int(digits[:degree_digits])
+        minutes = int(digits[degree_digits : degree_digits + 2])
+        seconds = int(digits[degree_digits + 2 :] or 0)
+        return sign * (degrees + minutes / 60 + seconds / 3600)
+
+    return round(convert(match.group(1), 2), 4), round(convert(match.group(2), 3), 4)
+
+
+def _zone_cities() -> list[tuple[str, str, float, float, str, list[str]]]:
+    zone_tab = resources.files("tzdata").joinpath("zoneinfo", "zone.tab").read_text()
+    cities = []
+    for line in zone_tab.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        iso2, coordinates, timezone = line.split("\t")[:3]
+        lat, lng = _parse_iso6709(coordinates)
+        name, aliases = ZONE_CITY_NAMES.get(
+            timezone, (timezone.rsplit("/", 1)[-1].replace("_", " "), [])
+        )
+        cities.append((name, iso2, lat, lng, timezone, aliases))
+    return cities
+
+
+def build() -> dict:
+    """Build the gazetteer document."""
+    major = {(name, iso2) for name, iso2, *_ in MAJOR_CITIES}
+    cities = list(MAJOR_CITIES) + [c for c in _zone_cities() if (c[0], c[1]) not in major]
+    unknown = sorted({c[1] for c in cities} - COUNTRIES.keys())
+    if unknown:
+        msg = f"Cities reference unknown countries: {unknown}"
+        raise ValueError(msg)
+
+    # Columnar layout keeps the file compact and fast to load
+    return {
+        "version": 1,
+        "countries": {
+            "iso2": list(COUNTRIES),
+            "iso3": [v[0] for v in COUNTRIES.values()],
+            "name": [v[1] for v in COUNTRIES.values()],
+            "aliases": [v[2] for v in COUNTRIES.values()],
+        },
+        "cities": {
+            "name": [c[0] for c in cities],
+            "country": [c[1] for c in cities],
+            "lat": [c[2] for c in cities],
+            "lng": [c[3] for c in cities],
+            "timezone": [c[4] for c in cities],
+            "aliases": [c[5] for c in cities],
+        },
+    }
+
+
+def main() -> None:
+    document = build()
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_PATH.write_text(json.dumps(document, ensure_ascii=False, separators=(",", ":")) + "\n")
+    print(
+        f"Wrote {len(document['countries']['iso2'])} countries and "
+        f"{len(document['cities']['name'])} cities to {OUTPUT_PATH}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Offline Gazetteer
+
+Local lookup of countries (ISO 3166-1 alpha-2/alpha-3 codes, names, aliases)
+and major cities (coordinates, time zone) from the bundled data file built by
+app.services.gazetteer.build.
+
+Names are indexed in normalized form (accents, case and punctuation removed):
+- exact lookups are dict hits
+- prefix search bisects a sorted key list
+- fuzzy lookups (typos, partial names) fall back to difflib close matches
+"""
+
+import difflib
+import json
+import re
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+DATA_PATH = Path(__file__).parent / "data" / "gazetteer.json"
+
+FUZZY_CUTOFF = 0.85
+
+
+@dataclass(frozen=True)
+class Country:
+    iso2: str
+    iso3: str
+    name: str
+    aliases: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class City:
+    name: str
+    country: str  # ISO2 code
+    lat: float
+    lng: float
+    timezone: str
+    aliases: tuple[str, ...] = ()
+
+
+def normalize(name: str) -> str:
+    """Normalize a place name for lookup ("Côte d'Ivoire" -> "cote divoire")."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    text = "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+    text = re.sub(r"[.'’]", "", text)
+    text = re.sub(r"[^a-z0-9]+", " ", text).strip()
+    return text[4:] if text.startswith("the ") else text
+
+
+class Gazetteer:
+    """Indexed countries and cities."""
+
+    def __init__(self, document: dict[str, Any]):
+        countries = document["countries"]
+        self.countries = [
+            Country(iso2, iso3, name, tuple(aliases))
+            for iso2, iso3, name, aliases in zip(
+                countries["iso2"],
+                countries["iso3"],
+                countries["name"],
+                countries["aliases"],
+                strict=True,
+            )
+        ]
+        cities = document["cities"]
+        self.cities = [
+            City(name, country, lat, lng, timezone, tuple(aliases))
+            for name, country, lat, lng, timezone, aliases in zip(
+                cities["name"],
+                cities["country"],
+                cities["lat"],
+                cities["lng"],
+                cities["timezone"],
+                cities["aliases"],
+                strict=True,
+            )
+        ]
+
+        self._by_iso2 = {c.iso2: c for c in self.countries}
+        self._by_iso3 = {c.iso3: c for c in self.countries}
+        self._country_names: dict[str, Country] = {}
+        for country in self.countries:
+            for name in (country.name, *country.aliases):
+                self._country_names.setdefault(normalize(name), country)
+
+        # Normalized name -> cities, in data file order (curated cities first)
+        self._city_names: dict[str, list[City]] = {}
+        for city in self.cities:
+            for name in {normalize(n) for n in (city.name, *city.aliases)}:
+                self._city_names.setdefault(name, []).append(city)
+
+        # Sorted (key, entry) pairs for prefix search
+        self._prefix_keys: list[tuple[str, Country | City]] = sorted(
+            [(k, c) for k, c in self._country_names.items()]
+            + [(k, c) for k, cities in self._city_names.items() for c in cities],
+            key=lambda item: item[0],
+        )
+        self._prefix_index = [k for k, _ in self._prefix_keys]
+
+    @classmethod
+    def load(cls, path: Path = DATA_PATH) -> "Gazetteer":
+        with path.open(encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    # ------------------------------------------------------------------
+    # Countries
+    # ------------------------------------------------------------------
+
+    def country(self, query: str, fuzzy: bool = True) -> Optional[Country]:
+        """
+        Resolve a country by ISO2/ISO3 code, name or alias.
+
+        Args:
+            query: e.g. "JP", "JPN", "Japan", "england", "Cote d'Ivoire", or an
+                inverted ISO name like "Korea, Republic of"
+            fuzzy: Fall back to close matches for misspelled names
+
+        Returns:
+            Country, or None if nothing matches
+        """
+        if not query or not query.strip():
+            return None
+        key = normalize(query)
+        if key in self._country_names:
+            return self._country_names[key]
+        if "," in query:
+            name, _, qualifier = query.partition(",")
+            reordered = normalize(f"{qualifier} {name}")
+            if reordered in self._country_names:
+                return self._country_names[reordered]
+
+        code = query.strip().upper()
+        if len(code) == 2 and code in self._by_iso2:
+            return self._by_iso2[code]
+        if len(code) == 3 and code in self._by_iso3:
+            return self._by_iso3[code]
+
+        if not fuzzy or len(key) < 4:
+            return None
+        match = difflib.get_close_matches(key, self._country_names, n=1, cutoff=FUZZY_CUTOFF)
+        return self._country_names[match[0]] if match else None
+
+    # ------------------------------------------------------------------
+    # Cities
+    # ------------------------------------------------------------------
+
+    def city(self, name: str, country: Optional[str] = None, fuzzy: bool = True) -> Optional[City]:
+        """
+        Resolve a city by name or alias.
+
+        Args:
+            name: City name, e.g. "Kyoto", "Saigon"
+            country: Optional country (code or name) to disambiguate
+            fuzzy: Fall back to close matches for misspelled names
+
+        Returns:
+            City, or None if nothing matches (or only in another country)
+        """
+        if not name or not name.strip():
+            return None
+        iso2 = None
+        if country:
+            resolved = self.country(country)
+            iso2 = resolved.iso2 if resolved else None
+
+        key = normalize(name)
+        candidates = self._city_names.get(key)
+        if not candidates and fuzzy and len(key) >= 4:
+            match = difflib.get_close_matches(key, self._city_names, n=1, cutoff=FUZZY_CUTOFF)
+            candidates = self._city_names[match[0]] if match else None
+        if not candidates:
+            return None
+        if iso2 is None:
+            return candidates[0]
+        return next((c for c in candidates if c.country == iso2), None)
+
+    def geocode(self, location: str, country: Optional[str] = None) -> Optional[City]:
+        """
+        Resolve a free-form location like "Paris", "Paris, France" or "Kyoto, JP".
+
+        A qualified location is only answered when the whole string is a
+        known city or it ends in a country (name or ISO code), the rest then
+        being the city. Other qualifiers (states, regions, districts: "Paris,
+        Texas", "Shibuya, Tokyo") return None so callers fall back to a full
+        geocoder instead of dropping them.
+        """
+        if not location or not location.strip():
+            return None
+        parts = [p.strip() for p in location.split(",") if p.strip()]
+        if len(parts) == 1:
+            return self.city(parts[0], country)
+
+        city = self.city(", ".join(parts), country, fuzzy=False)
+        if city:
+            return city
+        # The country may itself contain a comma ("Seoul, Korea, Republic of")
+        for split in range(len(parts) - 1, 0, -1):
+            qualifier = self.country(", ".join(parts[split:]), fuzzy=False)
+            if qualifier is None:
+                continue
+            if country is not None and self.country(country) not in (None, qualifier):
+                return None
+            return self.city(", ".join(parts[:split]), qualifier.iso2)
+        return None
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(self, prefix: str, limit: int = 10) -> list[Country | City]:
+        """
+        Countries and cities whose name or alias starts with prefix.
+
+        Results are ordered by the matching key, each entry appearing once.
+        """
+        key = normalize(prefix)
+        if not key:
+            return []
+        results: list[Country | City] = []
+        seen: set[int] = set()
+        position = bisect_left(self._prefix_index, key)
+        while position < len(self._prefix_index) and len(results) < limit:
+            if not self._prefix_index[position].startswith(key):
+                break
+            entry = self._prefix_keys[position][1]
+            if id(entry) not in seen:
+                seen.add(id(entry))
+                results.append(entry)
+            position += 1
+        return results
+
+
+_gazetteer: Optional[Gazetteer] = None
+
+
+def get_gazetteer() -> Gazetteer:
+    """Get the shared gazetteer (loaded on first use)."""
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer.load()
+    return _gazetteer
+
+
+def country_code(name: str) -> Optional[str]:
+    """ISO 3166-1 alpha-2 code for a country name, alias or code (None if unknown)."""
+    country = get_gazetteer().country(name)
+    return country.iso2 if country else None
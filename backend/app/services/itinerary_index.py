@@ -0,0 +1,259 @@
+"""
+Indexed Itinerary Service
+
+In-memory view over the user-editable itinerary (trips.trip_details.itinerary)
+used by the itinerary endpoints.
+
+Keeps id -> position maps for days and activities and maintains day and total
+costs incrementally, so lookups are O(1) and a reorder only touches the days
+it moves activities between, instead of scanning every day and re-summing
+every activity per operation.
+
+Activities priced in another currency than the itinerary are converted with
+the latest exchange rate snapshot, all activities in one vectorized batch.
+Without rates, amounts are summed unconverted.
+
+The wrapped dict is mutated in place and stays JSON-serializable, so it can be
+saved as-is with to_dict().
+"""
+
+import logging
+from typing import Any, Optional
+
+import httpx
+import numpy as np
+
+from app.services.currency import RateSnapshot, get_exchange_rate_matrix
+
+logger = logging.getLogger(__name__)
+
+
+class ItineraryItemNotFound(LookupError):
+    """Raised when a day or activity ID is not in the itinerary."""
+
+
+def activity_cost(activity: dict[str, Any]) -> float:
+    """Cost of a single activity in its own currency."""
+    return activity.get("cost_estimate", 0) or 0
+
+
+def _latest_rates() -> Optional[RateSnapshot]:
+    try:
+        return get_exchange_rate_matrix().latest()
+    except (httpx.HTTPError, ValueError) as e:
+        logger.warning(f"Exchange rates unavailable, costs are not converted: {e}")
+        return None
+
+
+def activity_costs(activities: list[dict[str, Any]], currency: Optional[str]) -> np.ndarray:
+    """Costs of activities in the given currency, converted in one batch."""
+    currency = (currency or "USD").upper()
+    costs = np.array([activity_cost(a) for a in activities], dtype=float)
+    sources = [(a.get("currency") or currency).upper() for a in activities]
+    foreign = [i for i, source in enumerate(sources) if costs[i] and source != currency]
+    if not foreign:
+        return costs
+
+    rates = _latest_rates()
+    if rates is None or currency not in rates:
+        return costs
+    known = [i for i in foreign if sources[i] in rates]
+    if known:
+        costs[known] = rates.convert(costs[known], [sources[i] for i in known], currency)
+    return costs
+
+
+class IndexedItinerary:
+    """
+    Itinerary with id indexes and incrementally maintained costs.
+
+    Attributes:
+        data: Underlying itinerary dict ({"days": [...], "currency": ..., ...})
+    """
+
+    def __init__(self, itinerary: Optional[dict[str, Any]] = None):
+        self.data = itinerary if itinerary is not None else {}
+        self.data.setdefault("days", [])
+        self.data.setdefault("currency", "USD")
+
+        # day_id -> position in data["days"]
+        self._day_index: dict[str, int] = {}
+        # activity_id -> (day_id, position in the day's activities)
+        self._activity_index: dict[str, tuple[str, int]] = {}
+        # day_id -> day cost
+        self._day_costs: dict[str, float] = {}
+        self._total_cost = 0.0
+
+        for position, day in enumerate(self.data["days"]):
+            day.setdefault("activities", [])
+            self._day_index[day["id"]] = position
+            self._reindex_activities(day)
+
+        costs = activity_costs(
+            [a for day in self.data["days"] for a in day["activities"]], self.data["currency"]
+        )
+        start = 0
+        for day in self.data["days"]:
+            end = start + len(day["activities"])
+            self._day_costs[day["id"]] = float(costs[start:end].sum())
+            day["total_cost"] = self._day_costs[day["id"]]
+            start = end
+        self._total_cost = sum(self._day_costs.values())
+        self.data["total_cost"] = self._total_cost
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    @property
+    def days(self) -> list[dict[str, Any]]:
+        return self.data["days"]
+
+    @property
+    def total_cost(self) -> float:
+        return self._total_cost
+
+    def day_cost(self, day_id: str) -> float:
+        return self._day_costs[self.get_day(day_id)["id"]]
+
+    def get_day(self, day_id: str) -> dict[str, Any]:
+        """Get a day by ID."""
+        if day_id not in self._day_index:
+            raise ItineraryItemNotFound(f"Day {day_id} not found")
+        return self.data["days"][self._day_index[day_id]]
+
+    def get_activity(self, activity_id: str) -> dict[str, Any]:
+        """Get an activity by ID."""
+        day_id, position = self._locate_activity(activity_id)
+        return self.get_day(day_id)["activities"][position]
+
+    def day_of_activity(self, activity_id: str) -> dict[str, Any]:
+        """Get the day containing an activity."""
+        return self.get_day(self._locate_activity(activity_id)[0])
+
+    def _locate_activity(self, activity_id: str) -> tuple[str, int]:
+        if activity_id not in self._activity_index:
+            raise ItineraryItemNotFound(f"Activity {activity_id} not found")
+        return self._activity_index[activity_id]
+
+    # ------------------------------------------------------------------
+    # Index and cost maintenance
+    # ------------------------------------------------------------------
+
+    def _reindex_activities(self, day: dict[str, Any], start: int = 0) -> None:
+        activities = day["activities"]
+        for position in range(start, len(activities)):
+            self._activity_index[activities[position]["id"]] = (day["id"], position)
+
+    def _reindex_days(self, start: int = 0) -> None:
+        days = self.data["days"]
+        for position in range(start, len(days)):
+            self._day_index[days[position]["id"]] = position
+
+    def _cost(self, activities: list[dict[str, Any]]) -> float:
+        return float(activity_costs(activities, self.data["currency"]).sum())
+
+    def _adjust_cost(self, day: dict[str, Any], delta: float) -> None:
+        if not delta:
+            return
+        self._day_costs[day["id"]] += delta
+        day["total_cost"] = self._day_costs[day["id"]]
+        self._total_cost += delta
+        self.data["total_cost"] = self._total_cost
+
+    # ------------------------------------------------------------------
+    # Day mutations
+    # ------------------------------------------------------------------
+
+    def add_day(self, day: dict[str, Any]) -> dict[str, Any]:
+        """Append a day (with its activities) to the itinerary."""
+        day.setdefault("activities", [])
+        day["total_cost"] = 0
+        self.data["days"].append(day)
+        self._day_index[day["id"]] = len(self.data["days"]) - 1
+        self._day_costs[day["id"]] = 0.0
+        self._reindex_activities(day)
+        self._adjust_cost(day, self._cost(day["activities"]))
+        return day
+
+    def update_day(self, day_id: str, fields: dict[str, Any]) -> dict[str, Any]:
+        """Update day fields (not activities)."""
+        day = self.get_day(day_id)
+        for key, value in fields.items():
+            if key not in ("id", "activities", "total_cost"):
+                day[key] = value
+        return day
+
+    def remove_day(self, day_id: str) -> dict[str, Any]:
+        """Remove a day and all its activities."""
+        position = self._day_index[self.get_day(day_id)["id"]]
+        day = self.data["days"].pop(position)
+        for activity in day["activities"]:
+            self._activity_index.pop(activity["id"], None)
+        self._total_cost -= self._day_costs.pop(day_id)
+        self.data["total_cost"] = self._total_cost
+        del self._day_index[day_id]
+        self._reindex_days(position)
+        return day
+
+    # ------------------------------------------------------------------
+    # Activity mutations
+    # ------------------------------------------------------------------
+
+    def add_activity(
+        self, day_id: str, activity: dict[str, Any], position: Optional[int] = None
+    ) -> dict[str, Any]:
+        """Insert an activity into a day (appended if position is None)."""
+        day = self.get_day(day_id)
+        activities = day["activities"]
+        position = len(activities) if position is None else min(position, len(activities))
+        activities.insert(position, activity)
+        self._reindex_activities(day, position)
+        self._adjust_cost(day, self._cost([activity]))
+        return activity
+
+    def update_activity(self, activity_id: str, fields: dict[str, Any]) -> dict[str, Any]:
+        """Update activity fields, keeping costs in sync."""
+        activity = self.get_activity(activity_id)
+        old_cost = self._cost([activity])
+        for key, value in fields.items():
+            if key != "id":
+                activity[key] = value
+        self._adjust_cost(self.day_of_activity(activity_id), self._cost([activity]) - old_cost)
+        return activity
+
+    def remove_activity(self, activity_id: str) -> dict[str, Any]:
+        """Remove an activity from its day."""
+        day_id, position = self._locate_activity(activity_id)
+        day = self.get_day(day_id)
+        activity = day["activities"].pop(position)
+        del self._activity_index[activity_id]
+        self._reindex_activities(day, position)
+        self._adjust_cost(day, -self._cost([activity]))
+        return activity
+
+    def move_activity(self, activity_id: str, target_day_id: str, position: int) -> dict[str, Any]:
+        """Move an activity to a position in the same or another day."""
+        self._locate_activity(activity_id)
+        self.get_day(target_day_id)
+        activity = self.remove_activity(activity_id)
+        return self.add_activity(target_day_id, activity, position)
+
+    def replace_activities(self, day_id: str, activities: list[dict[str, Any]]) -> dict[str, Any]:
+        """Replace a day's activities (e.g. with a reordered schedule)."""
+        day = self.get_day(day_id)
+        for activity in day["activities"]:
+            self._activity_index.pop(activity["id"], None)
+        old_cost = self._day_costs[day_id]
+        day["activities"] = activities
+        self._reindex_activities(day)
+        self._adjust_cost(day, self._cost(activities) - old_cost)
+        return day
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the itinerary dict (costs already up to date)."""
+        return self.data
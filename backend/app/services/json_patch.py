@@ -0,0 +1,158 @@
+"""
+JSON Patch (RFC 6902) Service
+
+Applies JSON Patch operations to plain dict/list documents such as the
+user-editable itinerary stored in trips.trip_details.
+
+Supported operations: add, remove, replace, move, copy, test.
+Operations are applied to a deep copy, so a failing patch leaves the input
+document untouched (all-or-nothing).
+"""
+
+import copy
+from typing import Any
+
+
+class JsonPatchError(ValueError):
+    """Raised when a patch operation is invalid or cannot be applied."""
+
+
+class JsonPatchTestFailed(JsonPatchError):
+    """Raised when a 'test' operation does not match the document."""
+
+
+def parse_pointer(pointer: str) -> list[str]:
+    """
+    Split a JSON Pointer (RFC 6901) into reference tokens.
+
+    Args:
+        pointer: JSON Pointer string, e.g. "/days/0/activities/-"
+
+    Returns:
+        List of unescaped reference tokens ([] for the whole document)
+    """
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer '{pointer}': must start with '/'")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _list_index(container: list, token: str, pointer: str, allow_end: bool) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise JsonPatchError(f"Invalid array index '{token}' in '{pointer}'")
+    index = int(token)
+    limit = len(container) if allow_end else len(container) - 1
+    if index > limit:
+        raise JsonPatchError(f"Array index {index} out of range in '{pointer}'")
+    return index
+
+
+def _resolve_parent(document: Any, pointer: str) -> tuple[Any, str]:
+    """Return (parent container, last token) for a pointer."""
+    tokens = parse_pointer(pointer)
+    if not tokens:
+        raise JsonPatchError("Operation cannot target the document root")
+
+    parent = document
+    for token in tokens[:-1]:
+        if isinstance(parent, dict):
+            if token not in parent:
+                raise JsonPatchError(f"Path '{pointer}' does not exist")
+            parent = parent[token]
+        elif isinstance(parent, list):
+            parent = parent[_list_index(parent, token, pointer, allow_end=False)]
+        else:
+            raise JsonPatchError(f"Path '{pointer}' does not exist")
+    return parent, tokens[-1]
+
+
+def get_value(document: Any, pointer: str) -> Any:
+    """Get the value at a JSON Pointer."""
+    if pointer == "":
+        return document
+    parent, token = _resolve_parent(document, pointer)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path '{pointer}' does not exist")
+        return parent[token]
+    if isinstance(parent, list):
+        return parent[_list_index(parent, token, pointer, allow_end=False)]
+    raise JsonPatchError(f"Path '{pointer}' does not exist")
+
+
+def _add(document: Any, pointer: str, value: Any) -> None:
+    parent, token = _resolve_parent(document, pointer)
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_list_index(parent, token, pointer, allow_end=True), value)
+    else:
+        raise JsonPatchError(f"Path '{pointer}' does not exist")
+
+
+def _remove(document: Any, pointer: str) -> Any:
+    parent, token = _resolve_parent(document, pointer)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path '{pointer}' does not exist")
+        return parent.pop(token)
+    if isinstance(parent, list):
+        return parent.pop(_list_index(parent, token, pointer, allow_end=False))
+    raise JsonPatchError(f"Path '{pointer}' does not exist")
+
+
+def apply_operation(document: Any, operation: dict[str, Any]) -> None:
+    """Apply a single operation in place."""
+    op = operation.get("op")
+    path = operation.get("path")
+    if not isinstance(path, str):
+        raise JsonPatchError("Operation is missing 'path'")
+
+    if op == "add":
+        _add(document, path, copy.deepcopy(operation["value"]))
+    elif op == "remove":
+        _remove(document, path)
+    elif op == "replace":
+        _remove(document, path)
+        _add(document, path, copy.deepcopy(operation["value"]))
+    elif op in ("move", "copy"):
+        from_path = operation.get("from")
+        if not isinstance(from_path, str):
+            raise JsonPatchError(f"'{op}' operation is missing 'from'")
+        if op == "move":
+            if path.startswith(from_path + "/"):
+                raise JsonPatchError(f"Cannot move '{from_path}' into its own child '{path}'")
+            value = _remove(document, from_path)
+        else:
+            value = copy.deepcopy(get_value(document, from_path))
+        _add(document, path, value)
+    elif op == "test":
+        if get_value(document, path) != operation.get("value"):
+            raise JsonPatchTestFailed(f"Test failed at '{path}'")
+    else:
+        raise JsonPatchError(f"Unsupported operation '{op}'")
+
+
+def apply_patch(document: Any, operations: list[dict[str, Any]]) -> Any:
+    """
+    Apply a JSON Patch to a document.
+
+    Args:
+        document: Document to patch (not modified)
+        operations: RFC 6902 operations, applied in order
+
+    Returns:
+        Patched copy of the document
+
+    Raises:
+        JsonPatchError: If any operation is invalid or cannot be applied
+    """
+    patched = copy.deepcopy(document)
+    for operation in operations:
+        if "value" not in operation and operation.get("op") in ("add", "replace", "test"):
+            raise JsonPatchError(f"'{operation.get('op')}' operation is missing 'value'")
+        apply_operation(patched, operation)
+    return patched
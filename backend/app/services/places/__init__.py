@@ -0,0 +1,33 @@
+"""Place search services package."""
+
+from .autocomplete import (
+    AutocompleteIndex,
+    Suggestion,
+    get_autocomplete_index,
+    nearby,
+    reset_autocomplete_index,
+)
+from .tile_cache import (
+    JsonCache,
+    PlaceTileCache,
+    get_geocode_cache,
+    get_place_details_cache,
+    get_place_tile_cache,
+    get_suggest_cache,
+    reset_place_caches,
+)
+
+__all__ = [
+    "AutocompleteIndex",
+    "JsonCache",
+    "PlaceTileCache",
+    "Suggestion",
+    "get_autocomplete_index",
+    "get_geocode_cache",
+    "get_place_details_cache",
+    "get_place_tile_cache",
+    "get_suggest_cache",
+    "nearby",
+    "reset_autocomplete_index",
+    "reset_place_caches",
+]
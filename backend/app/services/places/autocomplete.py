@@ -0,0 +1,362 @@
+"""
+Place autocomplete index
+
+In-memory prefix index over destinations (gazetteer countries and cities) and
+places seen in OpenTripMap results, so destination-picker keystrokes are
+answered locally:
+
+- Every name is indexed under its normalized form and each word suffix
+  ("musee du louvre", "du louvre", "louvre"), in one sorted array; a prefix
+  query is a bisect plus a scan of the matching range
+- Candidates are ranked by popularity (seen count and OpenTripMap rating),
+  with a boost for whole-name prefix matches and, given a location context,
+  for nearby entries
+- Seen places are also written to a Redis hash so other workers and restarts
+  start from the same index (add_places_async() writes from a worker thread,
+  for use in request handlers)
+
+Queries the index cannot fill with suggestions near the location context (see
+nearby()) are looked up remotely by the caller, and the results are added back
+with add_places().
+"""
+
+import asyncio
+import json
+import logging
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+import redis
+
+from app.core.redis_client import get_redis_client
+from app.services.gazetteer import City, Country, get_gazetteer, normalize
+
+from .geohash import haversine_km
+from .tile_cache import place_point
+
+logger = logging.getLogger(__name__)
+
+PLACES_REDIS_KEY = "tip:autocomplete:places"
+
+# Upper bound on matches scored per query (keeps short prefixes fast)
+MAX_CANDIDATES = 2000
+MAX_PLACES = 50000
+
+COUNTRY_POPULARITY = 6.0
+CITY_POPULARITY = 4.0
+WHOLE_NAME_BOOST = 1.5
+# Extra score for an entry at the context location, halving every NEAR_SCALE_KM
+NEAR_BOOST = 10.0
+NEAR_SCALE_KM = 25.0
+# Located entries farther than this from the context do not fill a request
+NEARBY_KM = 50.0
+
+
+@dataclass
+class Suggestion:
+    """An autocomplete entry."""
+
+    id: str
+    name: str
+    type: str
+    popularity: float
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+    country: Optional[str] = None
+
+    def to_response(self) -> dict[str, Any]:
+        response = {"name": self.name, "type": self.type}
+        if self.country:
+            response["country"] = self.country
+        if self.lat is not None and self.lng is not None:
+            response["lat"] = self.lat
+            response["lng"] = self.lng
+        return response
+
+
+def place_rating(place: dict[str, Any]) -> float:
+    """OpenTripMap rate ("1".."3", "1h".."3h" or 0-7) as a number (heritage adds 3)."""
+    rate = place.get("rate", (place.get("properties") or {}).get("rate"))
+    if rate is None:
+        return 0.0
+    text = str(rate)
+    digits = "".join(c for c in text if c.isdigit())
+    return float(digits or 0) + (3.0 if text.endswith("h") else 0.0)
+
+
+def place_category(kinds: str, categories: dict[str, str]) -> str:
+    """Map comma-separated OpenTripMap kinds to one of our categories."""
+    for kind in kinds.split(","):
+        for category, otm_kind in categories.items():
+            if otm_kind in kind:
+                return category
+    return "attraction"
+
+
+def _terms(names: tuple[str, ...]) -> set[tuple[str, bool]]:
+    """Indexed terms: each normalized name and its word suffixes, flagged whole-name."""
+    terms = set()
+    for name in names:
+        words = normalize(name).split()
+        terms.update((" ".join(words[i:]), i == 0) for i in range(len(words)))
+    return terms
+
+
+class AutocompleteIndex:
+    """Sorted-array prefix index with popularity ranking."""
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None):
+        self._client = redis_client
+        # (term, entry id, whole-name match), sorted
+        self._terms: list[tuple[str, str, bool]] = []
+        self._entries: dict[str, Suggestion] = {}
+        self._place_count = 0
+
+    @property
+    def client(self) -> Optional[redis.Redis]:
+        return self._client if self._client is not None else get_redis_client()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def add(self, entry: Suggestion, aliases: tuple[str, ...] = ()) -> Suggestion:
+        """Add an entry, or raise the popularity of an existing one."""
+        existing = self._entries.get(entry.id)
+        if existing is not None:
+            existing.popularity = max(existing.popularity, entry.popularity)
+            return existing
+
+        self._entries[entry.id] = entry
+        for term, whole in _terms((entry.name, *aliases)):
+            insort(self._terms, (term, entry.id, whole))
+        return entry
+
+    def _add_bulk(self, items: list[tuple[Suggestion, tuple[str, ...]]]) -> int:
+        """Add new entries, sorting the term array once at the end."""
+        added = 0
+        for entry, aliases in items:
+            if entry.id in self._entries:
+                continue
+            self._entries[entry.id] = entry
+            self._terms.extend(
+                (term, entry.id, whole) for term, whole in _terms((entry.name, *aliases))
+            )
+            added += 1
+        self._terms.sort()
+        return added
+
+    def add_gazetteer(self) -> None:
+        """Index all gazetteer countries and cities."""
+        gazetteer = get_gazetteer()
+        self._add_bulk(
+            [(_country_entry(c), c.aliases) for c in gazetteer.countries]
+            + [(_city_entry(c), c.aliases) for c in gazetteer.cities]
+        )
+
+    def add_places(self, places: list[dict[str, Any]], categories: dict[str, str]) -> int:
+        """
+        Index places from OpenTripMap results (json, geojson or details format).
+
+        A place seen again gains popularity. Returns the number of places indexed.
+        """
+        added = self._index_places(places, categories)
+        if added:
+            self._persist(added)
+        return len(added)
+
+    async def add_places_async(
+        self, places: list[dict[str, Any]], categories: dict[str, str]
+    ) -> int:
+        """add_places() that writes to Redis from a worker thread."""
+        added = self._index_places(places, categories)
+        if added:
+            await asyncio.to_thread(self._persist, added)
+        return len(added)
+
+    def _index_places(
+        self, places: list[dict[str, Any]], categories: dict[str, str]
+    ) -> list[Suggestion]:
+        added = []
+        new: list[tuple[Suggestion, tuple[str, ...]]] = []
+        for place in places:
+            properties = place.get("properties") or {}
+            xid = place.get("xid") or properties.get("xid")
+            name = place.get("name") or properties.get("name")
+            if not xid or not name:
+                continue
+            entry_id = f"place:{xid}"
+            existing = self._entries.get(entry_id)
+            if existing is not None:
+                existing.popularity += 1
+                added.append(existing)
+                continue
+            if self._place_count >= MAX_PLACES:
+                continue
+
+            point = place_point(place)
+            kinds = place.get("kinds") or properties.get("kinds") or ""
+            entry = Suggestion(
+                id=entry_id,
+                name=name,
+                type=place_category(kinds, categories),
+                popularity=1.0 + place_rating(place),
+                lat=point[0] if point else None,
+                lng=point[1] if point else None,
+            )
+            new.append((entry, ()))
+            self._place_count += 1
+            added.append(entry)
+
+        # Appending and re-sorting (timsort merges the new run) beats per-term insort
+        if new:
+            self._add_bulk(new)
+        return added
+
+    def _persist(self, entries: list[Suggestion]) -> None:
+        client = self.client
+        if client is None:
+            return
+        try:
+            client.hset(PLACES_REDIS_KEY, mapping={e.id: json.dumps(vars(e)) for e in entries})
+        except redis.RedisError as e:
+            logger.debug(f"Autocomplete persist failed: {e}")
+
+    def load_places(self) -> int:
+        """Load places persisted by any worker. Returns the number loaded."""
+        client = self.client
+        if client is None:
+            return 0
+        try:
+            stored = client.hgetall(PLACES_REDIS_KEY)
+        except redis.RedisError as e:
+            logger.debug(f"Autocomplete load failed: {e}")
+            return 0
+
+        entries = []
+        for raw in stored.values():
+            try:
+                entries.append((Suggestion(**json.loads(raw)), ()))
+            except (ValueError, TypeError):
+                continue
+        loaded = self._add_bulk(entries[: max(MAX_PLACES - self._place_count, 0)])
+        self._place_count += loaded
+        return loaded
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def suggest(
+        self,
+        query: str,
+        limit: int = 5,
+        near: Optional[tuple[float, float]] = None,
+        types: Optional[set[str]] = None,
+    ) -> list[Suggestion]:
+        """
+        Entries with a word starting with query, best first.
+
+        Args:
+            query: Typed prefix
+            limit: Maximum suggestions
+            near: Optional (lat, lng) context; nearby entries rank higher
+            types: Only return entries of these types
+
+        Returns:
+            Suggestions ranked by popularity and proximity
+        """
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        # Best-matching term per entry: a whole-name match beats a word match
+        matches: dict[str, bool] = {}
+        position = bisect_left(self._terms, (prefix,))
+        while position < len(self._terms) and len(matches) < MAX_CANDIDATES:
+            term, entry_id, whole = self._terms[position]
+            if not term.startswith(prefix):
+                break
+            if types is None or self._entries[entry_id].type in types:
+                matches[entry_id] = matches.get(entry_id, False) or whole
+            position += 1
+        if not matches:
+            return []
+
+        candidates = [self._entries[entry_id] for entry_id in matches]
+        scores = np.array(
+            [e.popularity * (WHOLE_NAME_BOOST if matches[e.id] else 1.0) for e in candidates]
+        )
+
+        if near is not None:
+            located = [i for i, e in enumerate(candidates) if e.lat is not None]
+            if located:
+                distances = haversine_km(
+                    near[0],
+                    near[1],
+                    np.array([candidates[i].lat for i in located]),
+                    np.array([candidates[i].lng for i in located]),
+                )
+                scores[located] += NEAR_BOOST * np.exp2(-distances / NEAR_SCALE_KM)
+
+        # Highest score first; ties keep the alphabetical order of the scan
+        ordered = np.argsort(-scores, kind="stable")[:limit]
+        return [candidates[i] for i in ordered]
+
+
+def nearby(
+    suggestions: list[Suggestion], near: tuple[float, float], max_km: float = NEARBY_KM
+) -> list[Suggestion]:
+    """Suggestions within max_km of near, plus those without coordinates (countries)."""
+    return [
+        s
+        for s in suggestions
+        if s.lat is None or s.lng is None or haversine_km(near[0], near[1], s.lat, s.lng) <= max_km
+    ]
+
+
+def _country_entry(country: Country) -> Suggestion:
+    return Suggestion(
+        id=f"country:{country.iso2}",
+        name=country.name,
+        type="country",
+        popularity=COUNTRY_POPULARITY,
+        country=country.iso2,
+    )
+
+
+def _city_entry(city: City) -> Suggestion:
+    return Suggestion(
+        id=f"city:{city.country}:{city.name}",
+        name=city.name,
+        type="city",
+        popularity=CITY_POPULARITY,
+        lat=city.lat,
+        lng=city.lng,
+        country=city.country,
+    )
+
+
+_autocomplete_index: Optional[AutocompleteIndex] = None
+
+
+def get_autocomplete_index() -> AutocompleteIndex:
+    """Shared autocomplete index (gazetteer plus persisted places, built on first use)."""
+    global _autocomplete_index
+    if _autocomplete_index is None:
+        index = AutocompleteIndex()
+        index.add_gazetteer()
+        index.load_places()
+        _autocomplete_index = index
+    return _autocomplete_index
+
+
+def reset_autocomplete_index() -> None:
+    """Drop the shared index (used by tests)."""
+    global _autocomplete_index
+    _autocomplete_index = None
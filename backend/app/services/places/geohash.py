@@ -0,0 +1,109 @@
+"""
+Geohash helpers for the place tile cache.
+
+Geohash cells are used as cache tiles: a radius query is covered by the set
+of cells intersecting the circle's bounding box, and each cell is cached and
+refreshed independently. Cells are not wrapped across the antimeridian.
+"""
+
+import math
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {char: index for index, char in enumerate(_BASE32)}
+
+
+def encode(lat: float, lng: float, precision: int = 5) -> str:
+    """Encode a coordinate as a geohash of the given length."""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value_range, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (value_range[0] + value_range[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            value_range[0] = mid
+        else:
+            bits <<= 1
+            value_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def decode_bbox(geohash: str) -> tuple[float, float, float, float]:
+    """Bounding box of a geohash cell as (lat_min, lat_max, lng_min, lng_max)."""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        bits = _DECODE[char]
+        for shift in range(4, -1, -1):
+            value_range = lng_range if even else lat_range
+            mid = (value_range[0] + value_range[1]) / 2
+            if (bits >> shift) & 1:
+                value_range[0] = mid
+            else:
+                value_range[1] = mid
+            even = not even
+    return lat_range[0], lat_range[1], lng_range[0], lng_range[1]
+
+
+def cell_size(precision: int) -> tuple[float, float]:
+    """Cell height and width in degrees for a precision."""
+    lng_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 // 2
+    return 180.0 / 2**lat_bits, 360.0 / 2**lng_bits
+
+
+def circle_bbox(lat: float, lng: float, radius_m: float) -> tuple[float, float, float, float]:
+    """Bounding box (lat_min, lat_max, lng_min, lng_max) of a circle."""
+    dlat = math.degrees(radius_m / 1000 / EARTH_RADIUS_KM)
+    cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+    dlng = min(dlat / cos_lat, 180.0)
+    return (
+        max(lat - dlat, -90.0),
+        min(lat + dlat, 90.0),
+        max(lng - dlng, -180.0),
+        min(lng + dlng, 180.0),
+    )
+
+
+def covering_cells(lat: float, lng: float, radius_m: float, precision: int = 5) -> list[str]:
+    """Geohash cells intersecting the bounding box of a circle."""
+    lat_min, lat_max, lng_min, lng_max = circle_bbox(lat, lng, radius_m)
+    height, width = cell_size(precision)
+    # Snap to the cell grid so every intersecting cell is visited exactly once
+    lat_start = math.floor((lat_min + 90.0) / height) * height - 90.0
+    lng_start = math.floor((lng_min + 180.0) / width) * width - 180.0
+    rows = int(math.floor((lat_max - lat_start) / height)) + 1
+    cols = int(math.floor((lng_max - lng_start) / width)) + 1
+
+    cells = []
+    for row in range(rows):
+        cell_lat = min(lat_start + (row + 0.5) * height, 90.0 - height / 2)
+        for col in range(cols):
+            cell_lng = min(lng_start + (col + 0.5) * width, 180.0 - width / 2)
+            cells.append(encode(cell_lat, cell_lng, precision))
+    return list(dict.fromkeys(cells))
+
+
+def haversine_km(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Great-circle distances in km from one point to many."""
+    lat1 = math.radians(lat)
+    lat2 = np.radians(lats)
+    dlat = lat2 - lat1
+    dlng = np.radians(lngs) - math.radians(lng)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
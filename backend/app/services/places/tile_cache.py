@@ -0,0 +1,476 @@
+"""
+Place tile cache
+
+Caches OpenTripMap radius results per geohash tile and category, and answers
+radius queries locally from the cached tiles:
+
+- A query circle is covered by geohash cells (tiles); missing or expired
+  tiles are fetched with one radius request per tile (concurrently) and
+  stored, so neighbouring queries reuse them
+- Each tile keeps NumPy coordinate arrays, so the radius filter over all
+  covering tiles is a vectorized haversine over a few hundred points
+- Tiles live in an in-process LRU (L1) backed by Redis (L2, shared across
+  workers, with a TTL); without Redis the cache is process-local
+- Tiles older than the refresh age are served as-is and refreshed in the
+  background (stale-while-revalidate)
+- A tile whose fetch hits TILE_FETCH_LIMIT may be missing places, possibly
+  the ones nearest the query point; it is cached as a truncated marker and
+  queries touching it are sent to the API for their own point instead
+
+JsonCache is the same L1 + Redis store for single keyed values (place
+details, geocoding results). Async callers read and write it through the
+*_async methods, which batch the Redis round-trip into a worker thread, so
+searches do not block the event loop on Redis.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, replace
+from typing import Any, Optional
+
+import numpy as np
+import redis
+
+from app.core.config import settings
+from app.core.metrics import count_cache_lookup
+from app.core.redis_client import get_redis_client
+
+from .geohash import covering_cells, decode_bbox, haversine_km
+
+logger = logging.getLogger(__name__)
+
+# OpenTripMap returns at most 500 objects per radius request
+TILE_FETCH_LIMIT = 500
+TILE_FETCH_CONCURRENCY = 5
+
+# (lat, lng, radius_m, limit) -> raw places
+PlaceFetcher = Callable[[float, float, int, int], Awaitable[list[dict[str, Any]]]]
+
+
+def precision_for_radius(radius_m: float) -> int:
+    """Tile precision for a query radius (~5 km tiles for small radii, ~20-40 km otherwise)."""
+    return 5 if radius_m <= 2500 else 4
+
+
+def place_point(place: dict[str, Any]) -> Optional[tuple[float, float]]:
+    """(lat, lng) of a place in OpenTripMap json, geojson or details format."""
+    point = place.get("point")
+    if isinstance(point, dict) and point.get("lat") is not None and point.get("lon") is not None:
+        return float(point["lat"]), float(point["lon"])
+    geometry = place.get("geometry")
+    if isinstance(geometry, dict):
+        coordinates = geometry.get("coordinates") or []
+        if len(coordinates) >= 2:
+            return float(coordinates[1]), float(coordinates[0])
+    return None
+
+
+class JsonCache:
+    """
+    Keyed JSON values in an in-process LRU backed by Redis.
+
+    get/set block on Redis; the *_async variants do their Redis round-trip
+    (one MGET or pipeline per call) in a worker thread, for the event loop.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl_seconds: int,
+        max_entries: int = 10000,
+        redis_client: Optional[redis.Redis] = None,
+    ):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._client = redis_client
+        # key -> (stored_at, value)
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    @property
+    def client(self) -> Optional[redis.Redis]:
+        return self._client if self._client is not None else get_redis_client()
+
+    def _redis_key(self, key: str) -> str:
+        return f"tip:cache:{self.namespace}:{key}"
+
+    def get_entry(self, key: str) -> Optional[tuple[float, Any]]:
+        """Get (stored_at, value), or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._decode(key, self._read([key])[0])
+        return self._fresh(key, entry)
+
+    async def get_entries_async(self, keys: list[str]) -> dict[str, Optional[tuple[float, Any]]]:
+        """get_entry for several keys, reading the ones not held in-process in one MGET."""
+        entries = {key: self._entries.get(key) for key in keys}
+        missing = [key for key, entry in entries.items() if entry is None]
+        if missing:
+            raws = await asyncio.to_thread(self._read, missing)
+            for key, raw in zip(missing, raws, strict=True):
+                entries[key] = self._decode(key, raw)
+        return {key: self._fresh(key, entry) for key, entry in entries.items()}
+
+    def get(self, key: str) -> Any:
+        entry = self.get_entry(key)
+        return entry[1] if entry else None
+
+    async def get_many_async(self, keys: list[str]) -> dict[str, Any]:
+        """Values for several keys (None if missing or expired)."""
+        entries = await self.get_entries_async(keys)
+        return {key: entry[1] if entry else None for key, entry in entries.items()}
+
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None) -> None:
+        self._write(self._store({key: value}, stored_at))
+
+    async def set_async(self, key: str, value: Any, stored_at: Optional[float] = None) -> None:
+        await self.set_many_async({key: value}, stored_at)
+
+    async def set_many_async(
+        self, values: dict[str, Any], stored_at: Optional[float] = None
+    ) -> None:
+        """Set several keys, writing them to Redis in one pipeline."""
+        if values:
+            await asyncio.to_thread(self._write, self._store(values, stored_at))
+
+    def forget(self, key: str) -> None:
+        """Drop an in-process entry so the next read goes to Redis."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Clear the in-process entries (Redis entries expire on their own)."""
+        self._entries.clear()
+
+    def _remember(self, key: str, entry: tuple[float, Any]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _fresh(self, key: str, entry: Optional[tuple[float, Any]]) -> Optional[tuple[float, Any]]:
+        """The entry if present and within the TTL, counting the lookup."""
+        if entry is None or time.time() - entry[0] > self.ttl_seconds:
+            self._entries.pop(key, None)
+            count_cache_lookup(self.namespace, hit=False)
+            return None
+        self._entries.move_to_end(key)
+        count_cache_lookup(self.namespace, hit=True)
+        return entry
+
+    def _store(
+        self, values: dict[str, Any], stored_at: Optional[float]
+    ) -> dict[str, tuple[float, Any]]:
+        stored_at = stored_at if stored_at is not None else time.time()
+        entries = {key: (stored_at, value) for key, value in values.items()}
+        for key, entry in entries.items():
+            self._remember(key, entry)
+        return entries
+
+    def _read(self, keys: list[str]) -> list[Optional[str]]:
+        """Raw Redis values of keys (blocking; None where missing or unreadable)."""
+        client = self.client
+        if client is None:
+            return [None] * len(keys)
+        try:
+            return client.mget([self._redis_key(key) for key in keys])
+        except redis.RedisError as e:
+            logger.debug(f"Cache read failed for {self.namespace}: {e}")
+            return [None] * len(keys)
+
+    def _decode(self, key: str, raw: Optional[str]) -> Optional[tuple[float, Any]]:
+        if not raw:
+            return None
+        try:
+            payload = json.loads(raw)
+            entry = (float(payload["stored_at"]), payload["value"])
+        except (ValueError, KeyError, TypeError):
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def _write(self, entries: dict[str, tuple[float, Any]]) -> None:
+        """Write entries to Redis (blocking)."""
+        client = self.client
+        if client is None:
+            return
+        try:
+            with client.pipeline(transaction=False) as pipe:
+                for key, (stored_at, value) in entries.items():
+                    pipe.set(
+                        self._redis_key(key),
+                        json.dumps({"stored_at": stored_at, "value": value}, default=str),
+                        ex=self.ttl_seconds,
+                    )
+                pipe.execute()
+        except redis.RedisError as e:
+            logger.debug(f"Cache write failed for {self.namespace}: {e}")
+
+
+@dataclass
+class _Tile:
+    """Places of one tile with their coordinates as arrays."""
+
+    stored_at: float
+    places: list[dict[str, Any]]
+    lats: np.ndarray
+    lngs: np.ndarray
+    truncated: bool = False
+
+    @classmethod
+    def build(cls, stored_at: float, places: list[dict[str, Any]]) -> "_Tile":
+        points = [place_point(p) for p in places]
+        located = [(p, pt) for p, pt in zip(places, points, strict=True) if pt is not None]
+        return cls(
+            stored_at=stored_at,
+            places=[p for p, _ in located],
+            lats=np.array([pt[0] for _, pt in located], dtype=float),
+            lngs=np.array([pt[1] for _, pt in located], dtype=float),
+        )
+
+    @classmethod
+    def from_stored(cls, stored_at: float, value: Any) -> "_Tile":
+        """Tile from a stored value: a list of places or the truncated marker."""
+        if isinstance(value, dict) and value.get("truncated"):
+            return replace(cls.build(stored_at, []), truncated=True)
+        return cls.build(stored_at, value)
+
+    def nearest(self, lat: float, lng: float, radius_m: float, limit: Optional[int]) -> list[int]:
+        """Indexes of the places within radius_m of (lat, lng), nearest first."""
+        distances = haversine_km(lat, lng, self.lats, self.lngs)
+        within = np.flatnonzero(distances * 1000 <= radius_m)
+        ordered = within[np.argsort(distances[within], kind="stable")]
+        return ordered[:limit].tolist() if limit is not None else ordered.tolist()
+
+
+class PlaceTileCache:
+    """Radius search over geohash-tiled, cached place results."""
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl_seconds: Optional[int] = None,
+        refresh_after_seconds: Optional[int] = None,
+        max_tiles: int = 2000,
+        redis_client: Optional[redis.Redis] = None,
+    ):
+        self.store = JsonCache(
+            namespace,
+            ttl_seconds or settings.PLACES_TILE_TTL_SECONDS,
+            max_entries=max_tiles,
+            redis_client=redis_client,
+        )
+        self.refresh_after_seconds = refresh_after_seconds or settings.PLACES_TILE_REFRESH_SECONDS
+        # Built tiles, keyed by tile key; rebuilt when the stored entry changes
+        self._tiles: dict[str, _Tile] = {}
+        self._refreshing: set[str] = set()
+        self._background: set[asyncio.Task] = set()
+
+    @staticmethod
+    def tile_key(category: str, cell: str) -> str:
+        return f"{category}:{cell}"
+
+    def _get_tile(self, key: str, entry: Optional[tuple[float, Any]]) -> Optional[_Tile]:
+        """Built tile for a stored entry (reused while the entry is unchanged)."""
+        if entry is None:
+            self._tiles.pop(key, None)
+            return None
+        tile = self._tiles.get(key)
+        if tile is None or tile.stored_at != entry[0]:
+            tile = _Tile.from_stored(entry[0], entry[1])
+            self._tiles[key] = tile
+            if len(self._tiles) > self.store.max_entries:
+                self._tiles.pop(next(iter(self._tiles)))
+        return tile
+
+    async def _fetch_tile(self, key: str, cell: str, fetch: PlaceFetcher) -> _Tile:
+        lat_min, lat_max, lng_min, lng_max = decode_bbox(cell)
+        center_lat, center_lng = (lat_min + lat_max) / 2, (lng_min + lng_max) / 2
+        # Circumradius of the cell, so the request covers all of it
+        radius_km = float(
+            haversine_km(center_lat, center_lng, np.array([lat_max]), np.array([lng_max]))[0]
+        )
+        places = await fetch(center_lat, center_lng, int(radius_km * 1000) + 1, TILE_FETCH_LIMIT)
+
+        stored_at = time.time()
+        if len(places) >= TILE_FETCH_LIMIT:
+            # Which places the API dropped is unknown, so the tile cannot answer
+            logger.warning(
+                f"Tile {key} truncated at {TILE_FETCH_LIMIT} places; "
+                "searches covering it query the API directly"
+            )
+            value: Any = {"truncated": True}
+        else:
+            # Keep only places inside this cell; neighbours are cached by their own tiles
+            value = [
+                place
+                for place in places
+                if (point := place_point(place))
+                and lat_min <= point[0] < lat_max
+                and lng_min <= point[1] < lng_max
+            ]
+
+        await self.store.set_async(key, value, stored_at)
+        tile = _Tile.from_stored(stored_at, value)
+        self._tiles[key] = tile
+        return tile
+
+    async def _search_point(
+        self, lat: float, lng: float, radius_m: float, fetch: PlaceFetcher, limit: Optional[int]
+    ) -> list[dict[str, Any]]:
+        """Uncached radius request for the query point itself."""
+        places = await fetch(lat, lng, int(radius_m), TILE_FETCH_LIMIT)
+        if len(places) >= TILE_FETCH_LIMIT:
+            logger.warning(
+                f"Radius search at ({lat:.4f}, {lng:.4f}) r={radius_m:.0f}m "
+                f"truncated at {TILE_FETCH_LIMIT} places"
+            )
+        tile = _Tile.build(time.time(), places)
+        return [tile.places[i] for i in tile.nearest(lat, lng, radius_m, limit)]
+
+    async def _refresh(self, key: str, cell: str, fetch: PlaceFetcher) -> None:
+        try:
+            await self._fetch_tile(key, cell, fetch)
+        except Exception as e:
+            logger.warning(f"Background refresh of tile {key} failed: {e}")
+        finally:
+            self._refreshing.discard(key)
+
+    def _schedule_refresh(self, key: str, cell: str, fetch: PlaceFetcher) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.get_running_loop().create_task(self._refresh(key, cell, fetch))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def radius_search(
+        self,
+        lat: float,
+        lng: float,
+        radius_m: float,
+        fetch: PlaceFetcher,
+        *,
+        category: str = "",
+        limit: Optional[int] = None,
+        background_refresh: bool = True,
+    ) -> list[dict[str, Any]]:
+        """
+        Places within radius_m of (lat, lng), nearest first.
+
+        Args:
+            lat: Center latitude
+            lng: Center longitude
+            radius_m: Radius in meters
+            fetch: Remote radius search used for missing or stale tiles
+            category: Cache partition (e.g. kinds and rating filter)
+            limit: Maximum number of places
+            background_refresh: Refresh stale tiles in a background task; when
+                False they are refreshed inline (for short-lived event loops)
+
+        Returns:
+            Places (shared dicts, do not mutate), sorted by distance
+        """
+        precision = precision_for_radius(radius_m)
+        cells = covering_cells(lat, lng, radius_m, precision)
+        category = f"{category}:p{precision}"
+
+        tiles: list[_Tile] = []
+        missing: list[tuple[str, str]] = []
+        keys = {cell: self.tile_key(category, cell) for cell in cells}
+        entries = await self.store.get_entries_async(list(keys.values()))
+        now = time.time()
+        for cell, key in keys.items():
+            tile = self._get_tile(key, entries[key])
+            if tile is None:
+                missing.append((key, cell))
+                continue
+            if now - tile.stored_at > self.refresh_after_seconds:
+                if background_refresh:
+                    self._schedule_refresh(key, cell, fetch)
+                else:
+                    missing.append((key, cell))
+                    continue
+            tiles.append(tile)
+
+        if missing:
+            semaphore = asyncio.Semaphore(TILE_FETCH_CONCURRENCY)
+
+            async def fetch_one(key: str, cell: str) -> _Tile:
+                async with semaphore:
+                    return await self._fetch_tile(key, cell, fetch)
+
+            tiles.extend(await asyncio.gather(*(fetch_one(k, c) for k, c in missing)))
+
+        if any(t.truncated for t in tiles):
+            return await self._search_point(lat, lng, radius_m, fetch, limit)
+
+        tiles = [t for t in tiles if t.places]
+        if not tiles:
+            return []
+
+        merged = _Tile(
+            stored_at=now,
+            places=[p for t in tiles for p in t.places],
+            lats=np.concatenate([t.lats for t in tiles]),
+            lngs=np.concatenate([t.lngs for t in tiles]),
+        )
+        return [merged.places[i] for i in merged.nearest(lat, lng, radius_m, limit)]
+
+    def clear(self) -> None:
+        self.store.clear()
+        self._tiles.clear()
+
+
+# ============================================================================
+# Shared caches
+# ============================================================================
+
+_place_tile_cache: Optional[PlaceTileCache] = None
+_place_details_cache: Optional[JsonCache] = None
+_geocode_cache: Optional[JsonCache] = None
+_suggest_cache: Optional[JsonCache] = None
+
+
+def get_place_tile_cache() -> PlaceTileCache:
+    """Shared tile cache for OpenTripMap radius searches."""
+    global _place_tile_cache
+    if _place_tile_cache is None:
+        _place_tile_cache = PlaceTileCache("otm:radius")
+    return _place_tile_cache
+
+
+def get_place_details_cache() -> JsonCache:
+    """Shared cache of OpenTripMap place details by xid."""
+    global _place_details_cache
+    if _place_details_cache is None:
+        _place_details_cache = JsonCache("otm:xid", settings.PLACES_DETAILS_TTL_SECONDS)
+    return _place_details_cache
+
+
+def get_geocode_cache() -> JsonCache:
+    """Shared cache of geocoding results by normalized name."""
+    global _geocode_cache
+    if _geocode_cache is None:
+        _geocode_cache = JsonCache("otm:geoname", settings.PLACES_DETAILS_TTL_SECONDS)
+    return _geocode_cache
+
+
+def get_suggest_cache() -> JsonCache:
+    """Shared record of autocomplete queries already looked up remotely."""
+    global _suggest_cache
+    if _suggest_cache is None:
+        _suggest_cache = JsonCache("otm:suggest", settings.PLACES_DETAILS_TTL_SECONDS)
+    return _suggest_cache
+
+
+def reset_place_caches() -> None:
+    """Drop the shared caches (used by tests)."""
+    global _place_tile_cache, _place_details_cache, _geocode_cache, _suggest_cache
+    _place_tile_cache = None
+    _place_details_cache = None
+    _geocode_cache = None
+    _suggest_cache = None
@@ -0,0 +1,368 @@
+"""
+Route Optimizer Service
+
+Orders a day's activities to minimize travel while respecting opening-hour
+windows.
+
+- Distances: NumPy haversine matrix over activity coordinates
+  (activity["location"]["lat"/"lng"], or top-level lat/lng)
+- Ordering: nearest-insertion construction followed by 2-opt improvement;
+  2-opt candidate moves are scored for all (i, j) pairs at once from the
+  distance matrix, and a move is only accepted if it does not increase
+  opening-hour lateness
+- Schedule: activities run back to back from the day start, waiting for
+  opening time when early; start_time/end_time and travel to the next stop
+  are rewritten on the returned activities (snake_case or camelCase keys,
+  whichever the activity already uses)
+
+Activities without coordinates are kept, in their original order, after the
+routed ones. Coordinates or durations that are not usable numbers raise
+InvalidActivityError.
+"""
+
+import copy
+from typing import Any, Optional
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+# Average door-to-door speeds in km/h and fixed per-leg overhead in minutes
+TRAVEL_SPEEDS_KMH = {
+    "walk": 5,
+    "bike": 15,
+    "metro": 30,
+    "bus": 20,
+    "taxi": 25,
+    "car": 30,
+}
+LEG_OVERHEAD_MINUTES = {
+    "walk": 0,
+    "bike": 5,
+    "metro": 10,
+    "bus": 15,
+    "taxi": 10,
+    "car": 15,
+}
+
+DEFAULT_DAY_START = "09:00"
+DEFAULT_DURATION_MINUTES = 90
+# Minutes of lateness are weighted so that any window violation outweighs
+# realistic travel-distance savings
+LATENESS_PENALTY_KM = 100.0
+
+MAX_TWO_OPT_ROUNDS = 50
+
+
+class InvalidActivityError(ValueError):
+    """An activity's coordinates or duration cannot be used for routing."""
+
+
+# ============================================================================
+# Distances
+# ============================================================================
+
+
+def haversine_matrix(lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """
+    Pairwise great-circle distances.
+
+    Args:
+        lats: Latitudes in degrees, shape (n,)
+        lngs: Longitudes in degrees, shape (n,)
+
+    Returns:
+        Distance matrix in km, shape (n, n)
+    """
+    lat = np.radians(np.asarray(lats, dtype=float))
+    lng = np.radians(np.asarray(lngs, dtype=float))
+    dlat = lat[:, None] - lat[None, :]
+    dlng = lng[:, None] - lng[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def travel_minutes(distance_km: np.ndarray | float, mode: str = "taxi") -> np.ndarray | float:
+    """Estimated travel time for a distance (0 km -> 0 minutes)."""
+    speed = TRAVEL_SPEEDS_KMH.get(mode, TRAVEL_SPEEDS_KMH["taxi"])
+    overhead = LEG_OVERHEAD_MINUTES.get(mode, LEG_OVERHEAD_MINUTES["taxi"])
+    distance = np.asarray(distance_km, dtype=float)
+    minutes = np.where(distance > 0, distance / speed * 60 + overhead, 0.0)
+    return minutes if minutes.ndim else float(minutes)
+
+
+# ============================================================================
+# Activity helpers
+# ============================================================================
+
+
+def parse_minutes(value: Optional[str]) -> Optional[int]:
+    """Parse "HH:MM" into minutes after midnight (None if missing/invalid)."""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        hours, minutes = value.split(":")[:2]
+        return int(hours) * 60 + int(minutes)
+    except ValueError:
+        return None
+
+
+def format_minutes(minutes: float) -> str:
+    """Format minutes after midnight as "HH:MM" (clamped to the same day)."""
+    total = int(round(min(max(minutes, 0), 23 * 60 + 59)))
+    return f"{total // 60:02d}:{total % 60:02d}"
+
+
+def _field(activity: dict[str, Any], name: str, alias: str) -> Any:
+    """Read a field stored under its snake_case name or camelCase alias."""
+    value = activity.get(name)
+    return value if value is not None else activity.get(alias)
+
+
+def _assign(activity: dict[str, Any], name: str, alias: str, value: Any) -> None:
+    """Write a field using the key convention the activity already uses."""
+    activity[alias if alias in activity else name] = value
+
+
+def _coordinates(activity: dict[str, Any]) -> Optional[tuple[float, float]]:
+    location = activity.get("location") or {}
+    lat = location.get("lat", activity.get("lat"))
+    lng = location.get("lng", activity.get("lng"))
+    if lat is None or lng is None:
+        return None
+    try:
+        lat, lng = float(lat), float(lng)
+    except (TypeError, ValueError):
+        lat = lng = float("nan")
+    # Also rejects NaN and infinity
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        msg = f"Invalid coordinates for activity {activity.get('name', '')!r}"
+        raise InvalidActivityError(msg)
+    return lat, lng
+
+
+def _duration(activity: dict[str, Any]) -> int:
+    duration = _field(activity, "duration_minutes", "durationMinutes")
+    if duration:
+        try:
+            return int(duration)
+        except (TypeError, ValueError) as e:
+            msg = f"Invalid duration for activity {activity.get('name', '')!r}"
+            raise InvalidActivityError(msg) from e
+    start = parse_minutes(_field(activity, "start_time", "startTime"))
+    end = parse_minutes(_field(activity, "end_time", "endTime"))
+    if start is not None and end is not None and end > start:
+        return end - start
+    return DEFAULT_DURATION_MINUTES
+
+
+def _window(activity: dict[str, Any]) -> tuple[float, float]:
+    opens = parse_minutes(_field(activity, "opens_at", "opensAt"))
+    closes = parse_minutes(_field(activity, "closes_at", "closesAt"))
+    return (
+        float(opens) if opens is not None else 0.0,
+        float(closes) if closes is not None else 24.0 * 60,
+    )
+
+
+# ============================================================================
+# Schedule evaluation
+# ============================================================================
+
+
+class _Problem:
+    """Distances, travel times and windows for the routable activities."""
+
+    def __init__(
+        self,
+        activities: list[dict[str, Any]],
+        coords: np.ndarray,
+        day_start: float,
+        mode: str,
+    ):
+        self.distances = haversine_matrix(coords[:, 0], coords[:, 1])
+        self.travel = travel_minutes(self.distances, mode)
+        self.durations = np.array([_duration(a) for a in activities], dtype=float)
+        windows = np.array([_window(a) for a in activities], dtype=float).reshape(-1, 2)
+        self.opens = windows[:, 0]
+        self.closes = windows[:, 1]
+        self.day_start = day_start
+
+    def schedule(self, order: list[int]) -> tuple[list[float], float]:
+        """Start times for an order, and total minutes finished after closing."""
+        starts = []
+        lateness = 0.0
+        clock = self.day_start
+        previous = None
+        for stop in order:
+            if previous is not None:
+                clock += self.travel[previous, stop]
+            clock = max(clock, self.opens[stop])
+            starts.append(clock)
+            clock += self.durations[stop]
+            lateness += max(0.0, clock - self.closes[stop])
+            previous = stop
+        return starts, lateness
+
+    def distance(self, order: list[int]) -> float:
+        if len(order) < 2:
+            return 0.0
+        index = np.asarray(order)
+        return float(self.distances[index[:-1], index[1:]].sum())
+
+    def cost(self, order: list[int]) -> float:
+        return self.distance(order) + LATENESS_PENALTY_KM * self.schedule(order)[1]
+
+
+# ============================================================================
+# Heuristics
+# ============================================================================
+
+
+def _nearest_insertion(problem: _Problem) -> list[int]:
+    """Build a route by repeatedly inserting the stop nearest to the route."""
+    n = len(problem.durations)
+    # Start with the earliest-opening stop, ties broken by input order
+    first = int(np.lexsort((np.arange(n), problem.opens))[0])
+    route = [first]
+    remaining = np.ones(n, dtype=bool)
+    remaining[first] = False
+    nearest = problem.distances[first].copy()
+
+    while remaining.any():
+        candidate = int(np.argmin(np.where(remaining, nearest, np.inf)))
+        best_route, best_cost = None, np.inf
+        for position in range(len(route) + 1):
+            trial = route[:position] + [candidate] + route[position:]
+            trial_cost = problem.cost(trial)
+            if trial_cost < best_cost:
+                best_route, best_cost = trial, trial_cost
+        route = best_route
+        remaining[candidate] = False
+        nearest = np.minimum(nearest, problem.distances[candidate])
+    return route
+
+
+def _two_opt(problem: _Problem, route: list[int]) -> list[int]:
+    """Improve an open route with 2-opt segment reversals."""
+    n = len(route)
+    if n < 3:
+        return route
+
+    for _ in range(MAX_TWO_OPT_ROUNDS):
+        index = np.asarray(route)
+        d = problem.distances
+        # Reversing route[i:j+1] replaces edges (i-1, i) and (j, j+1) with
+        # (i-1, j) and (i, j+1); missing edges at the route ends count as 0.
+        prev = np.concatenate(([-1], index[:-1]))
+        nxt = np.concatenate((index[1:], [-1]))
+        i, j = np.triu_indices(n, k=1)
+        has_prev = prev[i] >= 0
+        has_next = nxt[j] >= 0
+        before = np.where(has_prev, d[prev[i], index[i]], 0.0) + np.where(
+            has_next, d[index[j], nxt[j]], 0.0
+        )
+        after = np.where(has_prev, d[prev[i], index[j]], 0.0) + np.where(
+            has_next, d[index[i], nxt[j]], 0.0
+        )
+        gains = before - after
+
+        current_cost = problem.cost(route)
+        improved = False
+        for k in np.argsort(-gains):
+            if gains[k] <= 1e-9:
+                break
+            a, b = int(i[k]), int(j[k])
+            candidate = route[:a] + route[a : b + 1][::-1] + route[b + 1 :]
+            if problem.cost(candidate) < current_cost - 1e-9:
+                route = candidate
+                improved = True
+                break
+        if not improved:
+            break
+    return route
+
+
+# ============================================================================
+# Public API
+# ============================================================================
+
+
+def optimize_route(
+    activities: list[dict[str, Any]],
+    day_start: str = DEFAULT_DAY_START,
+    mode: str = "taxi",
+) -> dict[str, Any]:
+    """
+    Order a day's activities to minimize travel within opening hours.
+
+    Args:
+        activities: Activity dicts (not modified)
+        day_start: Time the day starts ("HH:MM")
+        mode: Travel mode used for travel-time estimates
+
+    Returns:
+        Dictionary with:
+        - activities: reordered copies with start_time, end_time,
+          transport_to_next and transport_duration_minutes filled in
+        - order: original indexes in the new order
+        - total_distance_km / original_distance_km
+        - late_activities: names of activities that end after closing
+        - unrouted: names of activities without coordinates
+
+    Raises:
+        InvalidActivityError: If an activity has unusable coordinates or duration
+    """
+    routable = [i for i, a in enumerate(activities) if _coordinates(a) is not None]
+    unrouted = [i for i, a in enumerate(activities) if _coordinates(a) is None]
+
+    start = parse_minutes(day_start)
+    start = float(start if start is not None else parse_minutes(DEFAULT_DAY_START))
+
+    if not routable:
+        return {
+            "activities": copy.deepcopy(activities),
+            "order": list(range(len(activities))),
+            "total_distance_km": 0.0,
+            "original_distance_km": 0.0,
+            "late_activities": [],
+            "unrouted": [a.get("name", "") for a in activities],
+        }
+
+    stops = [activities[i] for i in routable]
+    problem = _Problem(stops, np.array([_coordinates(a) for a in stops]), start, mode)
+
+    original = list(range(len(stops)))
+    route = _two_opt(problem, _nearest_insertion(problem))
+    if problem.cost(route) > problem.cost(original):
+        route = original
+
+    starts, _ = problem.schedule(route)
+    ordered = []
+    late = []
+    for position, (stop, begin) in enumerate(zip(route, starts, strict=True)):
+        activity = copy.deepcopy(stops[stop])
+        end = begin + problem.durations[stop]
+        _assign(activity, "start_time", "startTime", format_minutes(begin))
+        _assign(activity, "end_time", "endTime", format_minutes(end))
+        if end > problem.closes[stop]:
+            late.append(activity.get("name", ""))
+        if position + 1 < len(route):
+            travel = int(round(problem.travel[stop, route[position + 1]]))
+            _assign(activity, "transport_to_next", "transportToNext", mode)
+            _assign(activity, "transport_duration_minutes", "transportDurationMinutes", travel)
+        else:
+            _assign(activity, "transport_to_next", "transportToNext", None)
+            _assign(activity, "transport_duration_minutes", "transportDurationMinutes", None)
+        ordered.append(activity)
+
+    ordered.extend(copy.deepcopy(activities[i]) for i in unrouted)
+
+    return {
+        "activities": ordered,
+        "order": [routable[stop] for stop in route] + unrouted,
+        "total_distance_km": round(problem.distance(route), 3),
+        "original_distance_km": round(problem.distance(original), 3),
+        "late_activities": late,
+        "unrouted": [activities[i].get("name", "") for i in unrouted],
+    }
@@ -0,0 +1,349 @@
+"""
+Trip Version History Service
+
+Stores trip version history as structural deltas against periodic keyframes
+instead of a full trip snapshot per edit.
+
+Storage model (trip_versions rows):
+- keyframe: full trip_data snapshot (legacy rows with storage_kind 'snapshot'
+  are treated the same way)
+- delta: changes relative to the keyframe at base_version, trip_data is NULL
+
+A new keyframe is written every KEYFRAME_INTERVAL versions, or earlier when the
+delta grows past a fraction of the full snapshot, so any version is rebuilt
+from one keyframe plus one delta. Two versions sharing a keyframe are diffed
+from their deltas alone, touching only the paths that either delta changed.
+
+Delta format (JSON):
+    {"set": [[["trip_details", "budget"], 6000], ...], "unset": [["preferences", "pace"]]}
+
+Paths descend through dict keys only; lists are compared and stored whole,
+matching the granularity of the version comparison endpoint.
+"""
+
+import copy
+import json
+import logging
+from typing import Any, Optional
+
+from app.core.supabase import supabase
+
+logger = logging.getLogger(__name__)
+
+# Write a full keyframe at least this often
+KEYFRAME_INTERVAL = 10
+# Write a keyframe early once a delta exceeds this fraction of the snapshot size
+MAX_DELTA_RATIO = 0.5
+
+STORAGE_KEYFRAME = "keyframe"
+STORAGE_DELTA = "delta"
+STORAGE_SNAPSHOT = "snapshot"  # Rows written before delta encoding
+
+_MISSING = object()
+
+
+# ============================================================================
+# Structural deltas
+# ============================================================================
+
+
+def compute_delta(base: dict[str, Any], target: dict[str, Any]) -> dict[str, list]:
+    """
+    Compute the structural delta that turns base into target.
+
+    Args:
+        base: Base document (keyframe)
+        target: Target document
+
+    Returns:
+        Delta with "set" ([path, value] pairs) and "unset" (paths)
+    """
+    delta: dict[str, list] = {"set": [], "unset": []}
+
+    def walk(a: dict, b: dict, path: list[str]) -> None:
+        for key in a.keys() - b.keys():
+            delta["unset"].append([*path, key])
+        for key, value in b.items():
+            old = a.get(key, _MISSING)
+            if old is _MISSING or old != value:
+                if isinstance(old, dict) and isinstance(value, dict):
+                    walk(old, value, [*path, key])
+                else:
+                    delta["set"].append([[*path, key], copy.deepcopy(value)])
+
+    walk(base, target, [])
+    return delta
+
+
+def apply_delta(base: dict[str, Any], delta: dict[str, list]) -> dict[str, Any]:
+    """Rebuild a document from its base and delta (base is not modified)."""
+    result = copy.deepcopy(base)
+    for path in delta.get("unset", []):
+        parent = _get_path(result, path[:-1])
+        if isinstance(parent, dict):
+            parent.pop(path[-1], None)
+    for path, value in delta.get("set", []):
+        parent = result
+        for key in path[:-1]:
+            if not isinstance(parent.get(key), dict):
+                parent[key] = {}
+            parent = parent[key]
+        parent[path[-1]] = copy.deepcopy(value)
+    return result
+
+
+def delta_size(delta: dict[str, list]) -> int:
+    """Serialized size of a delta in bytes."""
+    return len(json.dumps(delta, default=str))
+
+
+def _get_path(document: Any, path: list[str]) -> Any:
+    node = document
+    for key in path:
+        if not isinstance(node, dict) or key not in node:
+            return _MISSING
+        node = node[key]
+    return node
+
+
+def _resolve(keyframe: dict[str, Any], delta: Optional[dict[str, list]], path: list[str]) -> Any:
+    """Value at path in keyframe+delta, without rebuilding the whole document."""
+    if not delta:
+        return _get_path(keyframe, path)
+
+    depth = len(path)
+    # A delta entry at or above the path replaces the whole subtree
+    for set_path, value in delta.get("set", []):
+        if set_path == path[: len(set_path)]:
+            return _get_path(value, path[len(set_path) :])
+    for unset_path in delta.get("unset", []):
+        if unset_path == path[: len(unset_path)]:
+            return _MISSING
+
+    value = _get_path(keyframe, path)
+    nested_set = [(p[depth:], v) for p, v in delta.get("set", []) if p[:depth] == path]
+    nested_unset = [p[depth:] for p in delta.get("unset", []) if p[:depth] == path]
+    if not (nested_set or nested_unset):
+        return value
+    return apply_delta(
+        value if isinstance(value, dict) else {},
+        {"set": nested_set, "unset": nested_unset},
+    )
+
+
+def diff_values(val_a: Any, val_b: Any, field_name: str = "") -> list[tuple[str, Any, Any]]:
+    """
+    Recursively diff two values.
+
+    Returns:
+        List of (dotted field name, old value, new value) for changed leaves;
+        dicts are descended into, everything else is compared whole
+    """
+    if val_a == val_b:
+        return []
+    if isinstance(val_a, dict) and isinstance(val_b, dict):
+        changes = []
+        for key in val_a.keys() | val_b.keys():
+            nested_name = f"{field_name}.{key}" if field_name else key
+            changes.extend(diff_values(val_a.get(key), val_b.get(key), nested_name))
+        return changes
+    return [(field_name, val_a, val_b)]
+
+
+def diff_from_deltas(
+    keyframe: dict[str, Any],
+    delta_a: Optional[dict[str, list]],
+    delta_b: Optional[dict[str, list]],
+) -> list[tuple[str, Any, Any]]:
+    """
+    Diff two versions that share a keyframe using only their deltas.
+
+    A delta of None means the version is the keyframe itself. Only paths
+    touched by either delta are visited.
+    """
+    touched = {
+        tuple(path)
+        for delta in (delta_a, delta_b)
+        if delta
+        for path in [*(p for p, _ in delta.get("set", [])), *delta.get("unset", [])]
+    }
+    # Keep only top-most paths; descendants are covered by the recursive diff
+    roots = [p for p in touched if not any(p[: len(q)] == q and p != q for q in touched)]
+
+    changes = []
+    for path in sorted(roots):
+        val_a = _resolve(keyframe, delta_a, list(path))
+        val_b = _resolve(keyframe, delta_b, list(path))
+        changes.extend(
+            diff_values(
+                None if val_a is _MISSING else val_a,
+                None if val_b is _MISSING else val_b,
+                ".".join(path),
+            )
+        )
+    return changes
+
+
+# ============================================================================
+# Storage
+# ============================================================================
+
+
+def _is_keyframe(row: dict[str, Any]) -> bool:
+    return row.get("storage_kind", STORAGE_SNAPSHOT) != STORAGE_DELTA
+
+
+def build_version_record(
+    trip_id: str,
+    version_number: int,
+    trip_data: dict[str, Any],
+    change_summary: str,
+    fields_changed: list[str],
+) -> dict[str, Any]:
+    """
+    Build the trip_versions row for a new version, as a keyframe or a delta.
+
+    Args:
+        trip_id: Trip ID
+        version_number: Version number being stored
+        trip_data: Full trip data of that version
+        change_summary: Human-readable description
+        fields_changed: Fields changed relative to the previous version
+
+    Returns:
+        Row dict ready to insert
+    """
+    record = {
+        "trip_id": trip_id,
+        "version_number": version_number,
+        "change_summary": change_summary,
+        "fields_changed": fields_changed,
+    }
+
+    keyframe_response = (
+        supabase.table("trip_versions")
+        .select("version_number, trip_data")
+        .eq("trip_id", trip_id)
+        .in_("storage_kind", [STORAGE_KEYFRAME, STORAGE_SNAPSHOT])
+        .lt("version_number", version_number)
+        .order("version_number", desc=True)
+        .limit(1)
+        .execute()
+    )
+    keyframe = keyframe_response.data[0] if keyframe_response.data else None
+
+    if keyframe and version_number - keyframe["version_number"] < KEYFRAME_INTERVAL:
+        delta = compute_delta(keyframe["trip_data"] or {}, trip_data)
+        if delta_size(delta) <= MAX_DELTA_RATIO * len(json.dumps(trip_data, default=str)):
+            return {
+                **record,
+                "trip_data": None,
+                "storage_kind": STORAGE_DELTA,
+                "base_version": keyframe["version_number"],
+                "delta": delta,
+            }
+
+    return {
+        **record,
+        "trip_data": trip_data,
+        "storage_kind": STORAGE_KEYFRAME,
+        "base_version": None,
+        "delta": None,
+    }
+
+
+def save_trip_version(
+    trip_id: str,
+    version_number: int,
+    trip_data: dict[str, Any],
+    change_summary: str,
+    fields_changed: Optional[list[str]] = None,
+) -> dict[str, Any]:
+    """Store a version of a trip (delta-encoded when possible)."""
+    record = build_version_record(
+        trip_id, version_number, trip_data, change_summary, fields_changed or []
+    )
+    supabase.table("trip_versions").insert(record).execute()
+    return record
+
+
+def _fetch_version_rows(trip_id: str, version_numbers: list[int]) -> dict[int, dict[str, Any]]:
+    """Fetch version rows plus the keyframes their deltas are based on."""
+    response = (
+        supabase.table("trip_versions")
+        .select("version_number, trip_data, storage_kind, base_version, delta")
+        .eq("trip_id", trip_id)
+        .in_("version_number", version_numbers)
+        .execute()
+    )
+    rows = {row["version_number"]: row for row in response.data or []}
+
+    missing_bases = {
+        row["base_version"]
+        for row in rows.values()
+        if not _is_keyframe(row) and row.get("base_version") not in rows
+    }
+    if missing_bases:
+        base_response = (
+            supabase.table("trip_versions")
+            .select("version_number, trip_data, storage_kind, base_version, delta")
+            .eq("trip_id", trip_id)
+            .in_("version_number", sorted(missing_bases))
+            .execute()
+        )
+        for row in base_response.data or []:
+            rows[row["version_number"]] = row
+    return rows
+
+
+def _reconstruct(row: dict[str, Any], rows: dict[int, dict[str, Any]]) -> dict[str, Any]:
+    if _is_keyframe(row):
+        return row.get("trip_data") or {}
+    base = rows.get(row.get("base_version"))
+    if base is None:
+        msg = f"Keyframe {row.get('base_version')} missing for version {row['version_number']}"
+        raise LookupError(msg)
+    return apply_delta(base.get("trip_data") or {}, row.get("delta") or {})
+
+
+def load_trip_versions(trip_id: str, version_numbers: list[int]) -> dict[int, dict[str, Any]]:
+    """
+    Load full trip data for the given versions.
+
+    Returns:
+        version_number -> trip_data for every version that exists
+    """
+    rows = _fetch_version_rows(trip_id, version_numbers)
+    return {
+        number: _reconstruct(rows[number], rows) for number in version_numbers if number in rows
+    }
+
+
+def compare_versions(
+    trip_id: str, version_a: int, version_b: int
+) -> Optional[list[tuple[str, Any, Any]]]:
+    """
+    Diff two stored versions.
+
+    Versions sharing a keyframe are diffed from their deltas; otherwise both
+    are reconstructed and diffed in full.
+
+    Returns:
+        List of (field, old value, new value), or None if a version is missing
+    """
+    rows = _fetch_version_rows(trip_id, [version_a, version_b])
+    if version_a not in rows or version_b not in rows:
+        return None
+
+    row_a, row_b = rows[version_a], rows[version_b]
+    base_a = version_a if _is_keyframe(row_a) else row_a.get("base_version")
+    base_b = version_b if _is_keyframe(row_b) else row_b.get("base_version")
+
+    if base_a == base_b and base_a in rows:
+        return diff_from_deltas(
+            rows[base_a].get("trip_data") or {},
+            None if _is_keyframe(row_a) else row_a.get("delta"),
+            None if _is_keyframe(row_b) else row_b.get("delta"),
+        )
+
+    return diff_values(_reconstruct(row_a, rows), _reconstruct(row_b, rows))
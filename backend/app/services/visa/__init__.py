@@ -3,10 +3,18 @@ Visa services package
 
 Includes:
 - Travel Buddy AI client (primary visa data source)
-- Redis caching layer
+- Visa requirement matrix (stored passport x destination results)
 - Fallback data sources
 """
 
-from .travel_buddy_client import TravelBuddyClient, VisaCheckResult
+from .matrix import VisaMatrix, VisaMatrixEntry, get_visa_matrix
+from .travel_buddy_client import InvalidCountryCodeError, TravelBuddyClient, VisaCheckResult
 
-__all__ = ["TravelBuddyClient", "VisaCheckResult"]
+__all__ = [
+    "InvalidCountryCodeError",
+    "TravelBuddyClient",
+    "VisaCheckResult",
+    "VisaMatrix",
+    "VisaMatrixEntry",
+    "get_visa_matrix",
+]
@@ -0,0 +1,232 @@
+"""
+Visa Requirement Matrix
+
+Locally stored passport x destination visa requirements, so visa checks are
+an O(1) lookup instead of a Travel Buddy request per trip:
+
+- Entries are VisaCheckResult dicts in a JsonCache (in-process LRU backed by
+  Redis), keyed "US:FR", with the time they were checked
+- A Redis sorted set scores every known pair by its last check time; the
+  Celery beat job (app.tasks.visa_matrix) re-checks the oldest pairs first,
+  a fixed number of requests per run with a pause between requests
+- Known pairs are the seeded passports (settings.VISA_MATRIX_PASSPORTS)
+  against every gazetteer country, plus any pair looked up by a trip
+- Lookups report the entry's age and flag it stale past
+  VISA_MATRIX_STALE_SECONDS; a pair that is not stored yet is checked live
+  and stored
+"""
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+import httpx
+import redis
+
+from app.core.config import settings
+from app.core.redis_client import get_redis_client
+from app.services.gazetteer import get_gazetteer
+from app.services.places import JsonCache
+
+from .travel_buddy_client import InvalidCountryCodeError, TravelBuddyClient, VisaCheckResult
+
+logger = logging.getLogger(__name__)
+
+CHECKED_KEY = "tip:visa:matrix:checked"
+# Failed pairs are retried after this long instead of on the next run
+FAILURE_RETRY_SECONDS = 24 * 3600
+
+
+def pair_key(passport: str, destination: str) -> str:
+    return f"{passport.upper()}:{destination.upper()}"
+
+
+@dataclass
+class VisaMatrixEntry:
+    """A stored visa requirement and when it was checked."""
+
+    result: VisaCheckResult
+    checked_at: float
+
+    @property
+    def age_seconds(self) -> float:
+        return max(0.0, time.time() - self.checked_at)
+
+    @property
+    def stale(self) -> bool:
+        return self.age_seconds > settings.VISA_MATRIX_STALE_SECONDS
+
+    def to_dict(self) -> dict[str, Any]:
+        """Result fields plus checked_at (ISO), age_days and stale."""
+        return {
+            **self.result.to_dict(),
+            "checked_at": datetime.fromtimestamp(self.checked_at, tz=timezone.utc).isoformat(),
+            "age_days": round(self.age_seconds / 86400, 1),
+            "stale": self.stale,
+        }
+
+
+class VisaMatrix:
+    """Passport x destination visa requirements with scheduled refresh."""
+
+    def __init__(
+        self,
+        client: Optional[TravelBuddyClient] = None,
+        redis_client: Optional[redis.Redis] = None,
+    ):
+        self.client = client or TravelBuddyClient()
+        self._redis = redis_client
+        self.store = JsonCache(
+            "visa:matrix",
+            settings.VISA_MATRIX_TTL_SECONDS,
+            max_entries=50000,
+            redis_client=redis_client,
+        )
+
+    @property
+    def redis(self) -> Optional[redis.Redis]:
+        return self._redis if self._redis is not None else get_redis_client()
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get(self, passport: str, destination: str) -> Optional[VisaMatrixEntry]:
+        """Stored entry for a pair, or None (never calls the API)."""
+        entry = self.store.get_entry(pair_key(passport, destination))
+        if entry is None:
+            return None
+        try:
+            return VisaMatrixEntry(VisaCheckResult(**entry[1]), entry[0])
+        except TypeError:
+            return None
+
+    def lookup(self, passport: str, destination: str) -> VisaMatrixEntry:
+        """
+        Stored entry for a pair, checked live and stored on a miss.
+
+        Raises:
+            ValueError: If a country code is invalid
+            httpx.HTTPError: If the live check fails
+        """
+        return self.get(passport, destination) or self.check(passport, destination)
+
+    def check(self, passport: str, destination: str) -> VisaMatrixEntry:
+        """Check a pair with Travel Buddy and store the result."""
+        result = self.client.check_visa(passport=passport, destination=destination)
+        return self.put(result)
+
+    def put(self, result: VisaCheckResult, checked_at: Optional[float] = None) -> VisaMatrixEntry:
+        entry = VisaMatrixEntry(result, checked_at if checked_at is not None else time.time())
+        key = pair_key(result.passport_code, result.destination_code)
+        self.store.set(key, result.to_dict(), entry.checked_at)
+        self._mark(key, entry.checked_at)
+        return entry
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    def _mark(self, key: str, checked_at: float) -> None:
+        client = self.redis
+        if client is None:
+            return
+        try:
+            client.zadd(CHECKED_KEY, {key: checked_at})
+        except redis.RedisError as e:
+            logger.debug(f"Visa matrix mark failed for {key}: {e}")
+
+    def seed(self, passports: Optional[list[str]] = None) -> int:
+        """Track the seeded passports against every destination. Returns pairs added."""
+        client = self.redis
+        if client is None:
+            return 0
+        passports = passports if passports is not None else settings.visa_matrix_passports_list
+        destinations = [c.iso2 for c in get_gazetteer().countries]
+        pairs = {pair_key(p, d): 0 for p in passports for d in destinations if p != d}
+        if not pairs:
+            return 0
+        # NX: never reset the check time of a known pair
+        return client.zadd(CHECKED_KEY, pairs, nx=True)
+
+    def refresh(
+        self,
+        budget: Optional[int] = None,
+        interval_seconds: Optional[float] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> dict[str, int]:
+        """
+        Re-check the pairs that were checked longest ago.
+
+        Args:
+            budget: Maximum Travel Buddy requests (default VISA_MATRIX_REFRESH_BUDGET)
+            interval_seconds: Pause between requests
+            sleep: Sleep function (injectable for tests)
+
+        Returns:
+            Counts: checked, failed, pending (pairs still due after this run)
+        """
+        stats = {"checked": 0, "failed": 0, "pending": 0}
+        client = self.redis
+        if client is None:
+            logger.warning("Visa matrix refresh skipped: Redis unavailable")
+            return stats
+
+        budget = budget if budget is not None else settings.VISA_MATRIX_REFRESH_BUDGET
+        interval_seconds = (
+            interval_seconds
+            if interval_seconds is not None
+            else settings.VISA_MATRIX_REQUEST_INTERVAL_SECONDS
+        )
+        due_before = time.time() - settings.VISA_MATRIX_REFRESH_SECONDS
+        due = client.zrangebyscore(CHECKED_KEY, "-inf", due_before, start=0, num=budget)
+
+        for position, key in enumerate(due):
+            if position and interval_seconds:
+                sleep(interval_seconds)
+            passport, destination = key.split(":")
+            try:
+                self.check(passport, destination)
+                stats["checked"] += 1
+            except InvalidCountryCodeError:
+                # Not a valid pair for the API; stop tracking it
+                client.zrem(CHECKED_KEY, key)
+                stats["failed"] += 1
+            except ValueError as e:
+                # Unexpected response for a valid pair; keep it and try again later
+                logger.warning(f"Visa matrix refresh could not parse {key}: {e}")
+                stats["failed"] += 1
+                self._retry_later(key)
+            except httpx.HTTPStatusError as e:
+                stats["failed"] += 1
+                if e.response.status_code == 429:
+                    logger.warning("Visa matrix refresh rate limited; stopping this run")
+                    break
+                self._retry_later(key)
+            except httpx.HTTPError as e:
+                logger.warning(f"Visa matrix refresh failed for {key}: {e}")
+                stats["failed"] += 1
+                self._retry_later(key)
+
+        stats["pending"] = client.zcount(
+            CHECKED_KEY, "-inf", time.time() - settings.VISA_MATRIX_REFRESH_SECONDS
+        )
+        return stats
+
+    def _retry_later(self, key: str) -> None:
+        retry_at = time.time() - settings.VISA_MATRIX_REFRESH_SECONDS + FAILURE_RETRY_SECONDS
+        self._mark(key, retry_at)
+
+
+_visa_matrix: Optional[VisaMatrix] = None
+
+
+def get_visa_matrix() -> VisaMatrix:
+    """Get the shared visa matrix."""
+    global _visa_matrix
+    if _visa_matrix is None:
+        _visa_matrix = VisaMatrix()
+    return _visa_matrix
@@ -13,6 +13,11 @@ from dataclasses import asdict, dataclass
 import httpx
 
 from app.core.config import settings
+from app.core.metrics import async_http_event_hooks, http_event_hooks
+
+
+class InvalidCountryCodeError(ValueError):
+    """A passport or destination code that is not ISO Alpha-2."""
 
 
 @dataclass
@@ -70,12 +75,19 @@ class TravelBuddyClient:
             api_key: RapidAPI key (defaults to settings.RAPIDAPI_KEY)
         """
         self.api_key = api_key or settings.RAPIDAPI_KEY
-        self.base_url = "https://visa-requirement.p.rapidapi.com"
+        self.base_url = settings.TRAVEL_BUDDY_BASE_URL or "https://visa-requirement.p.rapidapi.com"
         self.headers = {
             "x-rapidapi-key": self.api_key,
             "x-rapidapi-host": "visa-requirement.p.rapidapi.com",
             "Content-Type": "application/json",
         }
+        # Connection pool reused across synchronous checks
+        self._http: httpx.Client | None = None
+
+    def _http_client(self) -> httpx.Client:
+        if self._http is None:
+            self._http = httpx.Client(timeout=30.0, event_hooks=http_event_hooks("travel_buddy"))
+        return self._http
 
     def _validate_country_code(self, code: str, code_type: str) -> None:
         """
@@ -86,10 +98,12 @@ class TravelBuddyClient:
             code_type: Type of code ("passport" or "destination")
 
         Raises:
-            ValueError: If code is invalid
+            InvalidCountryCodeError: If code is invalid
         """
         if not code or len(code) != 2 or not code.isalpha():
-            raise ValueError(f"Invalid {code_type} code: {code}. Must be ISO Alpha-2 (2 letters)")
+            raise InvalidCountryCodeError(
+                f"Invalid {code_type} code: {code}. Must be ISO Alpha-2 (2 letters)"
+            )
 
     def check_visa(self, passport: str, destination: str) -> VisaCheckResult:
         """
@@ -103,7 +117,7 @@ class TravelBuddyClient:
             VisaCheckResult with visa requirements
 
         Raises:
-            ValueError: If country codes are invalid
+            InvalidCountryCodeError: If country codes are invalid
             httpx.HTTPError: If API request fails
         """
         # Validate inputs
@@ -114,10 +128,9 @@ class TravelBuddyClient:
         url = f"{self.base_url}/v2/visa/check"
         payload = {"passport": passport.upper(), "destination": destination.upper()}
 
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            return self._parse_response(response.json(), passport, destination)
+        response = self._http_client().post(url, headers=self.headers, json=payload)
+        response.raise_for_status()
+        return self._parse_response(response.json(), passport, destination)
 
     async def check_visa_async(self, passport: str, destination: str) -> VisaCheckResult:
         """
@@ -131,7 +144,7 @@ class TravelBuddyClient:
             VisaCheckResult with visa requirements
 
         Raises:
-            ValueError: If country codes are invalid
+            InvalidCountryCodeError: If country codes are invalid
             httpx.HTTPError: If API request fails
         """
         # Validate inputs
@@ -142,7 +155,9 @@ class TravelBuddyClient:
         url = f"{self.base_url}/v2/visa/check"
         payload = {"passport": passport.upper(), "destination": destination.upper()}
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with httpx.AsyncClient(
+            timeout=30.0, event_hooks=async_http_event_hooks("travel_buddy")
+        ) as client:
             response = await client.post(url, headers=self.headers, json=payload)
             response.raise_for_status()
             return self._parse_response(response.json(), passport, destination)
@@ -6,6 +6,9 @@ from datetime import date
 import httpx
 from pydantic import BaseModel, Field
 
+from app.core.config import settings
+from app.core.metrics import async_http_event_hooks, http_event_hooks
+
 
 class DailyWeather(BaseModel):
     """Daily weather data from Visual Crossing API."""
@@ -76,6 +79,7 @@ class VisualCrossingClient:
                 "Visual Crossing API key required. "
                 "Provide via api_key parameter or VISUAL_CROSSING_API_KEY environment variable."
             )
+        self.base_url = settings.VISUAL_CROSSING_BASE_URL or self.BASE_URL
 
     def _build_url(
         self,
@@ -94,7 +98,7 @@ class VisualCrossingClient:
         Returns:
             Complete API URL
         """
-        url = f"{self.BASE_URL}/{location}"
+        url = f"{self.base_url}/{location}"
 
         if start_date:
             url += f"/{start_date.isoformat()}"
@@ -170,7 +174,9 @@ class VisualCrossingClient:
         )
 
         try:
-            with httpx.Client(timeout=30.0) as client:
+            with httpx.Client(
+                timeout=30.0, event_hooks=http_event_hooks("visual_crossing")
+            ) as client:
                 response = client.get(url, params=params)
                 response.raise_for_status()
                 data = response.json()
@@ -221,7 +227,9 @@ class VisualCrossingClient:
         )
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(
+                timeout=30.0, event_hooks=async_http_event_hooks("visual_crossing")
+            ) as client:
                 response = await client.get(url, params=params)
                 response.raise_for_status()
                 data = response.json()
@@ -6,6 +6,9 @@ from datetime import date
 import httpx
 from pydantic import BaseModel, Field
 
+from app.core.config import settings
+from app.core.metrics import async_http_event_hooks, http_event_hooks
+
 
 class CurrentWeather(BaseModel):
     """Current weather data from WeatherAPI.com."""
@@ -94,6 +97,7 @@ class WeatherAPIClient:
                 "WeatherAPI key required. "
                 "Provide via api_key parameter or WEATHERAPI_KEY environment variable."
             )
+        self.base_url = settings.WEATHERAPI_BASE_URL or self.BASE_URL
 
     def get_current_weather(self, location: str, aqi: bool = False) -> CurrentWeatherResponse:
         """
@@ -116,7 +120,7 @@ class WeatherAPIClient:
             >>> weather = client.get_current_weather("London")
             >>> print(f"Temperature: {weather.current.temp_c}°C")
         """
-        url = f"{self.BASE_URL}/current.json"
+        url = f"{self.base_url}/current.json"
         params = {
             "key": self.api_key,
             "q": location,
@@ -124,7 +128,7 @@ class WeatherAPIClient:
         }
 
         try:
-            with httpx.Client(timeout=30.0) as client:
+            with httpx.Client(timeout=30.0, event_hooks=http_event_hooks("weatherapi")) as client:
                 response = client.get(url, params=params)
                 response.raise_for_status()
                 data = response.json()
@@ -168,7 +172,7 @@ class WeatherAPIClient:
             >>> for day in forecast.forecast.forecastday:
             ...     print(f"{day.date}: {day.day['condition']['text']}")
         """
-        url = f"{self.BASE_URL}/forecast.json"
+        url = f"{self.base_url}/forecast.json"
         params = {
             "key": self.api_key,
             "q": location,
@@ -178,7 +182,7 @@ class WeatherAPIClient:
         }
 
         try:
-            with httpx.Client(timeout=30.0) as client:
+            with httpx.Client(timeout=30.0, event_hooks=http_event_hooks("weatherapi")) as client:
                 response = client.get(url, params=params)
                 response.raise_for_status()
                 data = response.json()
@@ -210,7 +214,7 @@ class WeatherAPIClient:
             httpx.HTTPStatusError: If API request fails
             ValueError: If response cannot be parsed
         """
-        url = f"{self.BASE_URL}/current.json"
+        url = f"{self.base_url}/current.json"
         params = {
             "key": self.api_key,
             "q": location,
@@ -218,7 +222,9 @@ class WeatherAPIClient:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(
+                timeout=30.0, event_hooks=async_http_event_hooks("weatherapi")
+            ) as client:
                 response = await client.get(url, params=params)
                 response.raise_for_status()
                 data = response.json()
@@ -256,7 +262,7 @@ class WeatherAPIClient:
             httpx.HTTPStatusError: If API request fails
             ValueError: If response cannot be parsed
         """
-        url = f"{self.BASE_URL}/forecast.json"
+        url = f"{self.base_url}/forecast.json"
         params = {
             "key": self.api_key,
             "q": location,
@@ -266,7 +272,9 @@ class WeatherAPIClient:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(
+                timeout=30.0, event_hooks=async_http_event_hooks("weatherapi")
+            ) as client:
                 response = await client.get(url, params=params)
                 response.raise_for_status()
                 data = response.json()
@@ -11,6 +11,7 @@ from typing import Any
 import httpx
 
 from app.core.config import settings
+from app.core.metrics import http_event_hooks
 
 logger = logging.getLogger(__name__)
 
@@ -28,8 +29,8 @@ class FirecrawlClient:
             api_key: Firecrawl API key (defaults to settings)
         """
         self.api_key = api_key or settings.FIRECRAWL_API_KEY
-        self.base_url = FIRECRAWL_API_URL
-        self._client = httpx.Client(timeout=30.0)
+        self.base_url = settings.FIRECRAWL_BASE_URL or FIRECRAWL_API_URL
+        self._client = httpx.Client(timeout=30.0, event_hooks=http_event_hooks("firecrawl"))
 
     def _headers(self) -> dict[str, str]:
         """Get request headers with auth."""
@@ -5,11 +5,14 @@ This package contains all Celery tasks for async processing:
 - Agent job execution (visa, country, weather, etc.)
 - Report generation
 - Data cleanup and maintenance
+- Reference data refresh (visa matrix, country catalog, exchange rates)
+- Agent duration estimates for ETAs
 - Email notifications
 
 All tasks are auto-discovered by Celery from this module.
 """
 
+from app.tasks.agent_durations import refresh_agent_durations
 from app.tasks.agent_jobs import (
     execute_agent_job,
     execute_orchestrator,
@@ -22,7 +25,10 @@ from app.tasks.cleanup import (
     process_deletion_queue,
     schedule_trip_deletion,
 )
+from app.tasks.country_catalog import refresh_country_catalog
 from app.tasks.example import add, multiply
+from app.tasks.exchange_rates import refresh_exchange_rates
+from app.tasks.visa_matrix import refresh_visa_matrix
 
 __all__ = [
     # Agent tasks
@@ -35,6 +41,12 @@ __all__ = [
     "process_deletion_queue",
     "schedule_trip_deletion",
     "cancel_scheduled_deletion",
+    # Reference data refresh
+    "refresh_visa_matrix",
+    "refresh_country_catalog",
+    "refresh_exchange_rates",
+    # Estimates
+    "refresh_agent_durations",
     # Example tasks
     "add",
     "multiply",
@@ -0,0 +1,38 @@
+"""
+Agent duration refresh task
+
+Folds the agent_jobs rows completed since the last run into the shared agent
+duration estimates (app/services/duration_estimator.py).
+"""
+
+import logging
+
+from celery import shared_task
+
+from app.core.celery_app import BaseTipTask
+from app.services.duration_estimator import get_duration_estimator
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    bind=True,
+    base=BaseTipTask,
+    name="app.tasks.agent_durations.refresh_agent_durations",
+)
+def refresh_agent_durations(self) -> dict:
+    """
+    Refresh the agent duration estimates
+
+    Runs every 15 minutes from Celery beat. Rows are read in completion
+    order from where the previous run stopped.
+
+    Returns:
+        Refresh statistics (agent runs recorded)
+    """
+    from app.agents.config import AGENT_MODEL_TIERS
+    from app.core.supabase import supabase
+
+    recorded = get_duration_estimator().refresh(supabase, tiers=AGENT_MODEL_TIERS)
+    logger.info(f"[Task {self.request.id}] Agent durations refreshed: {recorded} runs recorded")
+    return {"runs": recorded}
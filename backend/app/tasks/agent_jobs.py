@@ -9,11 +9,15 @@ These tasks handle async execution of AI agents for report generation:
 Each agent job is tracked in the agent_jobs table with status updates.
 """
 
+import logging
 from typing import Any
 
 from celery import shared_task
 
 from app.core.celery_app import BaseTipTask
+from app.core.generation_lease import get_generation_lease
+
+logger = logging.getLogger(__name__)
 
 
 def _get_field(data: dict, *field_names: str, default: Any = None) -> Any:
@@ -83,7 +87,7 @@ def _normalize_trip_data(trip: dict) -> dict:
         "departure_date": departure_date,
         "return_date": return_date,
         "budget": details.get("budget", 1000),
-        "currency": details.get("currency", "USD"),
+        "currency": _get_field(details, "currency", "budgetCurrency", default="USD"),
         "trip_purpose": trip_purpose,
         "trip_purposes": trip_purposes,
     }
@@ -123,6 +127,26 @@ def _normalize_trip_data(trip: dict) -> dict:
     }
 
 
+def _build_orchestrator_input(trip_id: str, normalized: dict) -> dict[str, Any]:
+    """Build the OrchestratorAgent trip input from normalized trip data."""
+    return {
+        "trip_id": trip_id,
+        "user_nationality": normalized["traveler"]["nationality"],
+        "destination_country": normalized["destination"]["country"],
+        "destination_city": normalized["destination"]["city"],
+        "departure_date": normalized["details"]["departure_date"],
+        "return_date": normalized["details"]["return_date"],
+        "trip_purpose": normalized["details"]["trip_purpose"],
+        "origin_city": normalized["traveler"].get("origin_city"),
+        "group_size": normalized["traveler"].get("party_size", 1),
+        "budget_level": normalized["preferences"].get("travel_style", "mid-range"),
+        "interests": normalized["preferences"].get("interests"),
+        "dietary_restrictions": normalized["preferences"].get("dietary_restrictions"),
+        "budget": normalized["details"]["budget"],
+        "currency": normalized["details"]["currency"],
+    }
+
+
 @shared_task(
     bind=True,
     base=BaseTipTask,
@@ -747,12 +771,13 @@ def execute_weather_agent(self, trip_id: str, trip_data: dict[str, Any]) -> dict
     name="app.tasks.agent_jobs.execute_orchestrator",
     time_limit=3600,  # 60 minutes
 )
-def execute_orchestrator(self, trip_id: str) -> dict[str, Any]:
+def execute_orchestrator(self, trip_id: str, force: bool = False) -> dict[str, Any]:
     """
     Execute Orchestrator Agent to coordinate all sub-agents
 
     Args:
         trip_id: Trip ID from database
+        force: Re-run every agent, even those whose input fingerprint is unchanged
 
     Returns:
         Orchestrator execution summary with all agent results
@@ -782,6 +807,24 @@ def execute_orchestrator(self, trip_id: str) -> dict[str, Any]:
     print(f"[Task {self.request.id}] Executing Orchestrator for trip {trip_id}")
     start_time = time.time()
 
+    # Single-flight: skip if another generation already owns this trip
+    lease = get_generation_lease()
+    task_id = str(self.request.id)
+    holder_task_id = lease.claim(trip_id, task_id)
+    if holder_task_id:
+        print(f"[Task {task_id}] Generation already running for trip {trip_id}: {holder_task_id}")
+        return {
+            "trip_id": trip_id,
+            "status": "skipped",
+            "agents_executed": [],
+            "total_duration": 0,
+            "sections": {},
+            "errors": [],
+            "error": None,
+            "in_flight_task_id": holder_task_id,
+        }
+    heartbeat = lease.start_heartbeat(trip_id, task_id)
+
     try:
         # Step 1: Load trip data from database
         trip_response = supabase.table("trips").select("*").eq("id", trip_id).execute()
@@ -823,20 +866,7 @@ def execute_orchestrator(self, trip_id: str) -> dict[str, Any]:
             }
 
         # Build orchestrator input using normalized data
-        orchestrator_input = {
-            "trip_id": trip_id,
-            "user_nationality": normalized["traveler"]["nationality"],
-            "destination_country": normalized["destination"]["country"],
-            "destination_city": normalized["destination"]["city"],
-            "departure_date": departure_date,
-            "return_date": return_date,
-            "trip_purpose": normalized["details"]["trip_purpose"],
-            "origin_city": normalized["traveler"].get("origin_city"),
-            "group_size": normalized["traveler"].get("party_size", 1),
-            "budget_level": normalized["preferences"].get("travel_style", "mid-range"),
-            "interests": normalized["preferences"].get("interests"),
-            "dietary_restrictions": normalized["preferences"].get("dietary_restrictions"),
-        }
+        orchestrator_input = _build_orchestrator_input(trip_id, normalized)
 
         print(f"[Task {self.request.id}] Prepared orchestrator input: {orchestrator_input}")
 
@@ -873,7 +903,7 @@ def execute_orchestrator(self, trip_id: str) -> dict[str, Any]:
 
         # Run the async generate_report method
         # Use asyncio.run() for synchronous context
-        result = asyncio.run(orchestrator.generate_report(orchestrator_input))
+        result = asyncio.run(orchestrator.generate_report(orchestrator_input, force=force))
 
         # Step 6: Update trip status to completed
         execution_time = time.time() - start_time
@@ -895,15 +925,35 @@ def execute_orchestrator(self, trip_id: str) -> dict[str, Any]:
             ).eq("id", job_id).execute()
 
         print(f"[Task {self.request.id}] Completed Orchestrator for trip {trip_id}")
-        print(f"[Task {self.request.id}] Execution time: {execution_time:.2f}s")
         print(
             f"[Task {self.request.id}] Sections generated: {list(result.get('sections', {}).keys())}"
         )
+        metadata = result.get("metadata", {})
+        telemetry = metadata.get("telemetry") or {}
+        logger.info(
+            f"Report for trip {trip_id} generated in {execution_time:.2f}s",
+            extra={
+                "task_id": str(self.request.id),
+                "trip_id": trip_id,
+                "duration_seconds": round(execution_time, 2),
+                "agents": {
+                    name: {
+                        "duration_ms": stats.get("duration_ms"),
+                        "llm_ms": stats.get("llm_ms"),
+                        "tool_ms": stats.get("tool_ms"),
+                    }
+                    for name, stats in telemetry.get("agents", {}).items()
+                },
+                "totals": telemetry.get("totals"),
+            },
+        )
 
         return {
             "trip_id": trip_id,
             "status": "completed",
             "agents_executed": list(result.get("sections", {}).keys()),
+            "agents_skipped": metadata.get("skipped_agents", []),
+            "estimated_time_saved": metadata.get("estimated_time_saved", 0),
             "total_duration": execution_time,
             "sections": result.get("sections", {}),
             "errors": result.get("errors", []),
@@ -936,6 +986,9 @@ def execute_orchestrator(self, trip_id: str) -> dict[str, Any]:
             "error": error_msg,
         }
 
+    finally:
+        heartbeat.stop()
+
 
 @shared_task(
     bind=True,
@@ -1765,7 +1818,9 @@ def execute_flight_agent(self, trip_id: str, trip_data: dict[str, Any]) -> dict[
     name="app.tasks.agent_jobs.execute_selective_recalc",
     time_limit=3600,  # 60 minutes for full recalc
 )
-def execute_selective_recalc(self, trip_id: str, agents_to_recalc: list[str]) -> dict[str, Any]:
+def execute_selective_recalc(
+    self, trip_id: str, agents_to_recalc: list[str], force: bool = False
+) -> dict[str, Any]:
     """
     Execute selective recalculation for specified agents.
 
@@ -1776,25 +1831,28 @@ def execute_selective_recalc(self, trip_id: str, agents_to_recalc: list[str]) ->
         trip_id: Trip ID from database
         agents_to_recalc: List of agent types to recalculate
             (e.g., ["visa", "weather", "itinerary"])
+        force: Re-run agents even if their input fingerprint is unchanged
 
     Returns:
         Summary of recalculation results including:
         - trip_id: The trip that was recalculated
         - agents_recalculated: List of agents that were run
         - agent_results: Individual results per agent
+        - agents_skipped: Agents skipped because their input is unchanged
+        - estimated_time_saved: Estimated seconds saved by skipping them
         - overall_status: "completed" | "partial" | "failed"
         - errors: List of any errors encountered
 
     Flow:
         1. Fetch trip data from database
         2. Record recalculation job start
-        3. For each agent in agents_to_recalc:
-            a. Delete existing report section (if exists)
-            b. Execute agent with current trip data
-            c. Store new report section
-            d. Update progress
-        4. Update trip status based on results
-        5. Record recalculation job completion
+        3. Unless force, drop agents whose input fingerprint matches their section
+        4. Group agents_to_recalc by orchestrator phase (AGENT_PHASES) and, per phase:
+            a. Execute the phase's agents concurrently with current trip data
+            b. As each agent succeeds, swap its new section in with a single upsert
+               (the old section stays readable until then, and is kept on failure)
+        5. Update trip status based on results
+        6. Record recalculation job completion
     """
     from app.core.supabase import supabase
 
@@ -1804,11 +1862,25 @@ def execute_selective_recalc(self, trip_id: str, agents_to_recalc: list[str]) ->
     results: dict[str, Any] = {
         "trip_id": trip_id,
         "agents_recalculated": agents_to_recalc,
+        "agents_skipped": [],
+        "estimated_time_saved": 0,
         "agent_results": {},
         "overall_status": "completed",
         "errors": [],
     }
 
+    # Single-flight: skip if another generation already owns this trip
+    lease = get_generation_lease()
+    task_id = str(self.request.id)
+    holder_task_id = lease.claim(trip_id, task_id)
+    if holder_task_id:
+        print(f"[Task {task_id}] Generation already running for trip {trip_id}: {holder_task_id}")
+        results["agents_recalculated"] = []
+        results["overall_status"] = "skipped"
+        results["in_flight_task_id"] = holder_task_id
+        return results
+    heartbeat = lease.start_heartbeat(trip_id, task_id)
+
     try:
         # Fetch trip data
         trip_response = supabase.table("trips").select("*").eq("id", trip_id).execute()
@@ -1818,6 +1890,24 @@ def execute_selective_recalc(self, trip_id: str, agents_to_recalc: list[str]) ->
 
         trip = trip_response.data[0]
 
+        # Skip agents whose input is unchanged since their section was generated
+        fingerprints = _compute_input_fingerprints(trip_id, trip, agents_to_recalc)
+        if not force:
+            existing = _load_section_fingerprints(trip_id)
+            skipped = [
+                a
+                for a in agents_to_recalc
+                if a in fingerprints and existing.get(a) == fingerprints[a]
+            ]
+            if skipped:
+                from app.services.change_detector import ChangeDetector
+
+                agents_to_recalc = [a for a in agents_to_recalc if a not in skipped]
+                results["agents_recalculated"] = agents_to_recalc
+                results["agents_skipped"] = skipped
+                results["estimated_time_saved"] = ChangeDetector().estimate_recalc_time(skipped)
+                print(f"[Task {self.request.id}] Skipping unchanged agents: {skipped}")
+
         # Record recalculation job start
         try:
             job_response = (
@@ -1837,27 +1927,23 @@ def execute_selective_recalc(self, trip_id: str, agents_to_recalc: list[str]) ->
         except Exception:
             job_id = None  # Table might not exist yet
 
-        # Process each agent
+        # Process agents phase by phase; agents within a phase run concurrently.
+        # Existing sections stay readable until their replacement is ready.
         completed_agents = []
         failed_agents = []
 
-        for agent_type in agents_to_recalc:
-            try:
-                print(f"[Task {self.request.id}] Recalculating {agent_type} agent...")
-
-                # Delete existing report section
-                supabase.table("report_sections").delete().eq("trip_id", trip_id).eq(
-                    "section_type", agent_type
-                ).execute()
-
-                # Execute the appropriate agent task
-                agent_result = _execute_single_agent(
-                    task_id=str(self.request.id),
-                    trip_id=trip_id,
-                    trip_data=trip,
-                    agent_type=agent_type,
-                )
+        for phase_agents in _group_agents_by_phase(agents_to_recalc):
+            print(f"[Task {self.request.id}] Recalculating phase: {phase_agents}")
+            phase_results = _run_recalc_phase(
+                task_id=str(self.request.id),
+                trip_id=trip_id,
+                trip_data=trip,
+                agent_types=phase_agents,
+                fingerprints=fingerprints,
+            )
 
+            for agent_type in phase_agents:
+                agent_result = phase_results[agent_type]
                 results["agent_results"][agent_type] = agent_result
 
                 if agent_result.get("status") == "completed":
@@ -1870,15 +1956,6 @@ def execute_selective_recalc(self, trip_id: str, agents_to_recalc: list[str]) ->
                     )
                     print(f"[Task {self.request.id}] {agent_type} recalculation failed")
 
-            except Exception as e:
-                failed_agents.append(agent_type)
-                results["errors"].append(f"{agent_type}: {str(e)}")
-                results["agent_results"][agent_type] = {
-                    "status": "failed",
-                    "error": str(e),
-                }
-                print(f"[Task {self.request.id}] Error recalculating {agent_type}: {str(e)}")
-
         # Determine overall status
         if len(failed_agents) == 0:
             results["overall_status"] = "completed"
@@ -1935,21 +2012,145 @@ def execute_selective_recalc(self, trip_id: str, agents_to_recalc: list[str]) ->
         results["errors"].append(f"Fatal error: {str(e)}")
         return results
 
+    finally:
+        heartbeat.stop()
 
-def _execute_single_agent(
-    task_id: str, trip_id: str, trip_data: dict, agent_type: str
+
+def _group_agents_by_phase(agent_types: list[str]) -> list[list[str]]:
+    """
+    Split agents into the orchestrator's dependency phases, preserving phase order.
+
+    Agents that are not part of any phase run in a final phase of their own.
+    """
+    from app.agents.orchestrator.agent import AGENT_PHASES
+
+    requested = list(dict.fromkeys(agent_types))
+    phases = [[a for a in phase if a in requested] for phase in AGENT_PHASES]
+    known = {a for phase in AGENT_PHASES for a in phase}
+    phases.append([a for a in requested if a not in known])
+    return [phase for phase in phases if phase]
+
+
+def _run_recalc_phase(
+    task_id: str,
+    trip_id: str,
+    trip_data: dict,
+    agent_types: list[str],
+    fingerprints: dict[str, str] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Run one phase of recalculation with bounded concurrency.
+
+    fingerprints (agent type -> input fingerprint) are stored on swapped-in sections.
+
+    Returns:
+        Mapping of agent type to its result (status/data or status/error)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from app.core.config import settings
+
+    max_workers = max(1, min(len(agent_types), settings.RECALC_MAX_CONCURRENT_AGENTS))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="recalc") as pool:
+        futures = {
+            agent_type: pool.submit(
+                _recalc_agent,
+                task_id,
+                trip_id,
+                trip_data,
+                agent_type,
+                (fingerprints or {}).get(agent_type),
+            )
+            for agent_type in agent_types
+        }
+        return {agent_type: future.result() for agent_type, future in futures.items()}
+
+
+def _recalc_agent(
+    task_id: str,
+    trip_id: str,
+    trip_data: dict,
+    agent_type: str,
+    input_fingerprint: str | None = None,
 ) -> dict[str, Any]:
     """
-    Execute a single agent with the given trip data.
+    Re-run one agent and swap its section in only if it succeeded.
 
-    This is a helper function that routes to the appropriate agent
-    based on agent_type.
+    The new content is staged in memory until the agent finishes, then written
+    with one upsert on (trip_id, section_type), so readers see either the old
+    or the new section and never a gap.
     """
-    # Normalize trip data to handle camelCase/snake_case mismatch
-    normalized = _normalize_trip_data(trip_data)
+    try:
+        agent_result = _execute_single_agent(
+            task_id=task_id,
+            trip_id=trip_id,
+            trip_data=trip_data,
+            agent_type=agent_type,
+        )
+        if agent_result.get("status") == "completed":
+            _swap_in_section(trip_id, agent_type, agent_result.get("data") or {}, input_fingerprint)
+        return agent_result
+    except Exception as e:
+        print(f"[Task {task_id}] Error recalculating {agent_type}: {str(e)}")
+        return {"status": "failed", "error": str(e)}
+
+
+def _swap_in_section(
+    trip_id: str,
+    section_type: str,
+    content: dict[str, Any],
+    input_fingerprint: str | None = None,
+) -> None:
+    """Atomically replace a report section with freshly generated content."""
+    from datetime import datetime
+
+    from app.agents.orchestrator.agent import get_section_title
+    from app.core.supabase import supabase
+
+    supabase.table("report_sections").upsert(
+        {
+            "trip_id": trip_id,
+            "section_type": section_type,
+            "title": get_section_title(section_type),
+            "content": content,
+            "input_fingerprint": input_fingerprint,
+            "generated_at": datetime.utcnow().isoformat(),
+        },
+        on_conflict="trip_id,section_type",
+    ).execute()
+
+
+def _compute_input_fingerprints(
+    trip_id: str, trip_data: dict, agent_types: list[str]
+) -> dict[str, str]:
+    """
+    Fingerprint each agent's input the same way the orchestrator does.
 
-    # Common input data using normalized fields
-    base_input = {
+    Returns an empty mapping if the trip cannot be turned into orchestrator input
+    (e.g. missing dates), in which case nothing is skipped.
+    """
+    from app.agents.orchestrator.agent import OrchestratorAgent
+
+    try:
+        orchestrator = OrchestratorAgent()
+        orchestrator_input = _build_orchestrator_input(trip_id, _normalize_trip_data(trip_data))
+        validated = orchestrator._validate_trip_data(orchestrator_input)
+        return orchestrator.get_input_fingerprints(validated, agent_types)
+    except Exception as e:
+        logger.warning(f"Could not fingerprint inputs for trip {trip_id}: {e}")
+        return {}
+
+
+def _load_section_fingerprints(trip_id: str) -> dict[str, str]:
+    """Load the input fingerprints stored on a trip's report sections."""
+    from app.agents.orchestrator.agent import OrchestratorAgent
+
+    return OrchestratorAgent()._load_existing_fingerprints(trip_id)
+
+
+def _build_agent_base_input(normalized: dict) -> dict[str, Any]:
+    """Common input data for single-agent runs, from normalized trip data."""
+    return {
         "nationality": normalized["traveler"]["nationality"],
         "origin_city": normalized["traveler"]["origin_city"] or "New York",
         "destination_country": normalized["destination"]["country"],
@@ -1964,6 +2165,19 @@ def _execute_single_agent(
         "travel_style": normalized["preferences"]["travel_style"],
     }
 
+
+def _execute_single_agent(
+    task_id: str, trip_id: str, trip_data: dict, agent_type: str
+) -> dict[str, Any]:
+    """
+    Execute a single agent with the given trip data.
+
+    This is a helper function that routes to the appropriate agent
+    based on agent_type.
+    """
+    # Normalize trip data to handle camelCase/snake_case mismatch
+    base_input = _build_agent_base_input(_normalize_trip_data(trip_data))
+
     # Route to appropriate agent (using synchronous execution for simplicity)
     # In production, you might want to call the actual agent tasks
     try:
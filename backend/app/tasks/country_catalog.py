@@ -0,0 +1,35 @@
+"""
+Country catalog refresh task
+
+Re-fetches the REST Countries dataset in one bulk pass and replaces the
+shared snapshot the country catalog serves lookups from.
+"""
+
+import logging
+
+from celery import shared_task
+
+from app.core.celery_app import BaseTipTask
+from app.services.country import get_country_catalog
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    bind=True,
+    base=BaseTipTask,
+    name="app.tasks.country_catalog.refresh_country_catalog",
+)
+def refresh_country_catalog(self) -> dict:
+    """
+    Refresh the country catalog snapshot
+
+    Runs weekly from Celery beat. If the fetch fails, the previous snapshot
+    keeps serving lookups until the next run.
+
+    Returns:
+        Refresh statistics (countries)
+    """
+    count = get_country_catalog().refresh()
+    logger.info(f"[Task {self.request.id}] Country catalog refreshed: {count} countries")
+    return {"countries": count}
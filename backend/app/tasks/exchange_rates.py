@@ -0,0 +1,38 @@
+"""
+Exchange rate refresh task
+
+Fetches the day's exchange rates against the base currency once and stores
+them as the latest snapshot and under their rate date.
+"""
+
+import logging
+
+from celery import shared_task
+
+from app.core.celery_app import BaseTipTask
+from app.services.currency import get_exchange_rate_matrix
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    bind=True,
+    base=BaseTipTask,
+    name="app.tasks.exchange_rates.refresh_exchange_rates",
+)
+def refresh_exchange_rates(self) -> dict:
+    """
+    Refresh the exchange rate snapshot
+
+    Runs daily from Celery beat. If the fetch fails, the previous snapshot
+    keeps serving conversions until the next run.
+
+    Returns:
+        Refresh statistics (date, currencies)
+    """
+    snapshot = get_exchange_rate_matrix().refresh()
+    logger.info(
+        f"[Task {self.request.id}] Exchange rates refreshed: {len(snapshot)} currencies "
+        f"against {snapshot.base} for {snapshot.date}"
+    )
+    return {"date": snapshot.date.isoformat(), "currencies": len(snapshot)}
@@ -0,0 +1,41 @@
+"""
+Visa matrix refresh task
+
+Keeps the stored passport x destination visa requirements current by
+re-checking the pairs checked longest ago, within a per-run request budget.
+"""
+
+import logging
+
+from celery import shared_task
+
+from app.core.celery_app import BaseTipTask
+from app.services.visa.matrix import get_visa_matrix
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    bind=True,
+    base=BaseTipTask,
+    name="app.tasks.visa_matrix.refresh_visa_matrix",
+)
+def refresh_visa_matrix(self, budget: int | None = None) -> dict:
+    """
+    Refresh the oldest visa matrix entries
+
+    Runs hourly from Celery beat. Each run seeds any new passport x destination
+    pairs, then re-checks up to `budget` due pairs with Travel Buddy
+    (default settings.VISA_MATRIX_REFRESH_BUDGET).
+
+    Returns:
+        Refresh statistics (seeded, checked, failed, pending)
+    """
+    matrix = get_visa_matrix()
+    seeded = matrix.seed()
+    stats = matrix.refresh(budget=budget)
+    logger.info(
+        f"[Task {self.request.id}] Visa matrix refresh: {seeded} pairs seeded, "
+        f"{stats['checked']} checked, {stats['failed']} failed, {stats['pending']} still due"
+    )
+    return {"seeded": seeded, **stats}
@@ -0,0 +1,839 @@
+"""
+Fake external services
+
+One stand-in for every external API the backend calls (Visual Crossing,
+WeatherAPI.com, REST Countries, the currency exchange API, Travel Buddy,
+Amadeus, Skyscanner, Firecrawl and OpenTripMap), with scriptable latency
+distributions, error rates, timeouts and rate limits.
+
+It runs two ways:
+- as a local HTTP server; point the clients at it with the *_BASE_URL
+  settings (--print-env prints them) for load and soak tests
+- in-process (FakeServices.install()), answering every httpx request without
+  a network, as the report generation benchmark does
+
+Each service is mounted at /{service}/..., paths relative to the client's
+base URL (e.g. /amadeus/v2/shopping/flight-offers). Admin endpoints:
+GET /_fake/stats, GET and PUT /_fake/scenario, POST /_fake/reset.
+
+A scenario is JSON, e.g. slow Amadeus with 5% errors, and Firecrawl rate
+limited to 2 requests per second from 60 s in:
+    {
+      "seed": 7,
+      "default": {"latency": {"kind": "lognormal", "ms": 120, "sigma": 0.5}},
+      "services": {"amadeus": {"latency": {"kind": "fixed", "ms": 900}, "error_rate": 0.05}},
+      "phases": [{"at_seconds": 60, "services": {"firecrawl": {"rate_limit_per_second": 2}}}]
+    }
+
+Usage (from backend/):
+    python -m benchmarks.fake_services [--port 8900] [--scenario scenario.json]
+    python -m benchmarks.fake_services --print-env [--port 8900]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Literal
+from unittest.mock import patch
+
+import httpx
+from fastapi import FastAPI, Request, Response
+from pydantic import BaseModel, Field
+
+from app.services.gazetteer import get_gazetteer
+
+SERVICES = (
+    "visual_crossing",
+    "weatherapi",
+    "rest_countries",
+    "exchangerate_api",
+    "travel_buddy",
+    "amadeus",
+    "skyscanner",
+    "firecrawl",
+    "opentripmap",
+)
+
+# Base-URL setting and path below the server root, per service
+BASE_URL_SETTINGS = {
+    "VISUAL_CROSSING_BASE_URL": "visual_crossing",
+    "WEATHERAPI_BASE_URL": "weatherapi",
+    "REST_COUNTRIES_BASE_URL": "rest_countries",
+    "EXCHANGE_API_BASE_URL": "exchangerate_api/{version}/v1",
+    "TRAVEL_BUDDY_BASE_URL": "travel_buddy",
+    "AMADEUS_BASE_URL": "amadeus",
+    "SKYSCANNER_BASE_URL": "skyscanner/search",
+    "FIRECRAWL_BASE_URL": "firecrawl",
+    "OPENTRIPMAP_BASE_URL": "opentripmap",
+}
+
+# Real API hosts (and the path prefix the clients' base URLs add) for install()
+REAL_HOSTS = {
+    "weather.visualcrossing.com": (
+        "visual_crossing",
+        "/VisualCrossingWebServices/rest/services/timeline",
+    ),
+    "api.weatherapi.com": ("weatherapi", "/v1"),
+    "restcountries.com": ("rest_countries", "/v3.1"),
+    "cdn.jsdelivr.net": ("exchangerate_api", "/npm/@fawazahmed0/currency-api@"),
+    "visa-requirement.p.rapidapi.com": ("travel_buddy", ""),
+    "api.amadeus.com": ("amadeus", ""),
+    "test.api.amadeus.com": ("amadeus", ""),
+    "skyscanner44.p.rapidapi.com": ("skyscanner", ""),
+    "api.firecrawl.dev": ("firecrawl", "/v1"),
+    "api.opentripmap.com": ("opentripmap", "/0.1"),
+}
+
+# Currencies for the fake country data (others have none)
+CURRENCIES = {
+    "US": ("USD", "United States dollar", "$"),
+    "GB": ("GBP", "British pound", "£"),
+    "JP": ("JPY", "Japanese yen", "¥"),
+    "FR": ("EUR", "Euro", "€"),
+    "DE": ("EUR", "Euro", "€"),
+    "IT": ("EUR", "Euro", "€"),
+    "ES": ("EUR", "Euro", "€"),
+    "TH": ("THB", "Thai baht", "฿"),
+}
+
+# Units of each currency per US dollar
+USD_RATES = {"usd": 1.0, "eur": 0.92, "gbp": 0.79, "jpy": 151.0, "thb": 36.5, "cad": 1.36}
+
+
+# ----------------------------------------------------------------------
+# Scenarios
+# ----------------------------------------------------------------------
+
+
+class LatencyModel(BaseModel):
+    """
+    Response latency distribution.
+
+    fixed: ms; uniform: min_ms..max_ms; normal: mean ms, stddev_ms;
+    lognormal: median ms, sigma (shape). Samples are never negative.
+    """
+
+    kind: Literal["fixed", "uniform", "normal", "lognormal"] = "fixed"
+    ms: float = 0.0
+    min_ms: float = 0.0
+    max_ms: float = 0.0
+    stddev_ms: float = 0.0
+    sigma: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        """One latency in seconds."""
+        if self.kind == "uniform":
+            ms = rng.uniform(self.min_ms, self.max_ms)
+        elif self.kind == "normal":
+            ms = rng.gauss(self.ms, self.stddev_ms)
+        elif self.kind == "lognormal":
+            ms = self.ms * rng.lognormvariate(0.0, self.sigma)
+        else:
+            ms = self.ms
+        return max(ms, 0.0) / 1000
+
+
+class Behavior(BaseModel):
+    """How a service responds: latency, injected errors, timeouts and rate limit."""
+
+    latency: LatencyModel = Field(default_factory=LatencyModel)
+    error_rate: float = Field(0.0, ge=0.0, le=1.0)
+    error_status: int = 503
+    timeout_rate: float = Field(0.0, ge=0.0, le=1.0)
+    timeout_ms: float = 30_000.0  # Hang this long (longer than the clients wait)
+    rate_limit_per_second: float | None = None  # Answer 429 above this request rate
+
+
+class Phase(BaseModel):
+    """Behavior overrides that apply from at_seconds after the start (or last reset)."""
+
+    at_seconds: float
+    default: Behavior | None = None
+    services: dict[str, Behavior] = {}
+
+
+class Scenario(BaseModel):
+    """Behavior of every service over time."""
+
+    seed: int | None = None
+    default: Behavior = Field(default_factory=Behavior)
+    services: dict[str, Behavior] = {}
+    phases: list[Phase] = []
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Scenario":
+        return cls.model_validate_json(Path(path).read_text())
+
+    @classmethod
+    def fixed_latency(cls, ms: float) -> "Scenario":
+        return cls(default=Behavior(latency=LatencyModel(ms=ms)))
+
+    def behavior(self, service: str, elapsed: float) -> Behavior:
+        """Behavior of service at elapsed seconds (the latest phase wins)."""
+        behavior = self.services.get(service, self.default)
+        for phase in sorted(self.phases, key=lambda p: p.at_seconds):
+            if phase.at_seconds > elapsed:
+                break
+            if service in phase.services:
+                behavior = phase.services[service]
+            elif phase.default is not None:
+                behavior = phase.default
+        return behavior
+
+
+@dataclass
+class Outcome:
+    """What one request gets: a delay, then a fault or the service's answer."""
+
+    delay: float
+    status: int | None = None  # Injected error status (None: answer normally)
+    headers: dict[str, str] = field(default_factory=dict)
+    timeout: bool = False
+
+
+@dataclass
+class ServiceStats:
+    requests: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    rate_limited: int = 0
+    latency_seconds: float = 0.0
+    statuses: Counter = field(default_factory=Counter)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "rate_limited": self.rate_limited,
+            "mean_latency_ms": (
+                self.latency_seconds / self.requests * 1000 if self.requests else 0.0
+            ),
+            "statuses": {str(status): count for status, count in self.statuses.items()},
+        }
+
+
+# ----------------------------------------------------------------------
+# Services
+# ----------------------------------------------------------------------
+
+
+class FakeServices:
+    """
+    Fake external APIs with scriptable behavior.
+
+    answer() produces the service's response; plan() decides the latency and
+    any fault for a request (seeded, so runs are reproducible). calls counts
+    requests per service ("unhandled" for unknown services and hosts).
+
+    Usage:
+        services = FakeServices(Scenario.fixed_latency(150))
+        with services.install():
+            ...  # every httpx request is answered here
+        print(services.stats())
+    """
+
+    def __init__(self, scenario: Scenario | None = None, places_per_search: int = 50):
+        self.places_per_search = places_per_search
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+        self._handlers = {
+            "visual_crossing": self._visual_crossing,
+            "weatherapi": self._weatherapi,
+            "rest_countries": self._rest_countries,
+            "exchangerate_api": self._exchange,
+            "travel_buddy": self._travel_buddy,
+            "amadeus": self._amadeus,
+            "skyscanner": self._skyscanner,
+            "firecrawl": self._firecrawl,
+            "opentripmap": self._opentripmap,
+        }
+        self.set_scenario(scenario or Scenario())
+
+    def set_scenario(self, scenario: Scenario) -> None:
+        """Switch scenario; restarts the phase clock and the stats."""
+        with self._lock:
+            self.scenario = scenario
+            self._rng = random.Random(scenario.seed)
+            self._started = time.monotonic()
+            self._stats: dict[str, ServiceStats] = {}
+            self._recent: dict[str, deque] = {}
+            self.calls.clear()
+
+    def reset(self) -> None:
+        self.set_scenario(self.scenario)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "elapsed_seconds": time.monotonic() - self._started,
+                "services": {name: s.to_dict() for name, s in sorted(self._stats.items())},
+            }
+
+    def plan(self, service: str) -> Outcome:
+        """Latency and fault for the next request to service."""
+        with self._lock:
+            now = time.monotonic()
+            behavior = self.scenario.behavior(service, now - self._started)
+            stats = self._stats.setdefault(service, ServiceStats())
+            stats.requests += 1
+            self.calls[service] += 1
+
+            if behavior.rate_limit_per_second:
+                recent = self._recent.setdefault(service, deque())
+                while recent and now - recent[0] >= 1.0:
+                    recent.popleft()
+                if len(recent) >= behavior.rate_limit_per_second:
+                    stats.rate_limited += 1
+                    stats.statuses[429] += 1
+                    return Outcome(delay=0.0, status=429, headers={"Retry-After": "1"})
+                recent.append(now)
+
+            delay = behavior.latency.sample(self._rng)
+            stats.latency_seconds += delay
+            roll = self._rng.random()
+            if roll < behavior.timeout_rate:
+                stats.timeouts += 1
+                return Outcome(delay=behavior.timeout_ms / 1000, status=504, timeout=True)
+            if roll < behavior.timeout_rate + behavior.error_rate:
+                stats.errors += 1
+                stats.statuses[behavior.error_status] += 1
+                return Outcome(delay=delay, status=behavior.error_status)
+            return Outcome(delay=delay)
+
+    def answer(
+        self, service: str, method: str, path: str, params: Mapping[str, str], body: bytes
+    ) -> tuple[int, Any]:
+        """Status and JSON body of service's answer to a request (no latency or faults)."""
+        handler = self._handlers.get(service)
+        if handler is None:
+            return 404, {"error": f"No fake service {service!r}"}
+        payload = json.loads(body) if method == "POST" and body.startswith(b"{") else {}
+        status, data = handler(path.lstrip("/"), params, payload)
+        with self._lock:
+            self._stats.setdefault(service, ServiceStats()).statuses[status] += 1
+        return status, data
+
+    # In-process: httpx transports
+
+    def route(self, url: httpx.URL) -> tuple[str, str]:
+        """Service and path for a request URL (a real API host, or /{service}/...)."""
+        if url.host in REAL_HOSTS:
+            service, prefix = REAL_HOSTS[url.host]
+            return service, url.path.removeprefix(prefix)
+        service, _, path = url.path.lstrip("/").partition("/")
+        return (service if service in self._handlers else "unhandled"), path
+
+    def respond(self, request: httpx.Request) -> tuple[Outcome, httpx.Response]:
+        service, path = self.route(request.url)
+        if service == "unhandled":
+            with self._lock:
+                self.calls["unhandled"] += 1
+            return Outcome(delay=0.0), httpx.Response(
+                404, json={"error": f"No fake service for {request.url}"}
+            )
+        outcome = self.plan(service)
+        if outcome.status is not None:
+            response = httpx.Response(
+                outcome.status, json={"error": "Injected fault"}, headers=outcome.headers
+            )
+        else:
+            status, data = self.answer(
+                service, request.method, path, request.url.params, request.read()
+            )
+            response = httpx.Response(status, json=data)
+        return outcome, response
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        outcome, response = self.respond(request)
+        time.sleep(outcome.delay)
+        if outcome.timeout:
+            raise httpx.ReadTimeout("Injected timeout", request=request)
+        return response
+
+    async def _handle_async(self, request: httpx.Request) -> httpx.Response:
+        outcome, response = self.respond(request)
+        await asyncio.sleep(outcome.delay)
+        if outcome.timeout:
+            raise httpx.ReadTimeout("Injected timeout", request=request)
+        return response
+
+    @contextmanager
+    def install(self) -> Iterator["FakeServices"]:
+        """Answer all httpx traffic in-process while the context is active."""
+        with (
+            patch.object(httpx.HTTPTransport, "handle_request", self._handle),
+            patch.object(httpx.AsyncHTTPTransport, "handle_async_request", self._handle_async),
+        ):
+            yield self
+
+    # Visual Crossing: /{location}[/{start}[/{end}]]
+
+    def _visual_crossing(self, path: str, params: Mapping[str, str], payload: dict):
+        parts = path.split("/")
+        location = parts[0]
+        start = date.fromisoformat(parts[1]) if len(parts) > 1 else date.today()
+        end = date.fromisoformat(parts[2]) if len(parts) > 2 else start + timedelta(days=14)
+        city = get_gazetteer().geocode(location.split(",")[0])
+        days = [
+            {
+                "datetime": (start + timedelta(days=i)).isoformat(),
+                "tempmax": 24.0 + i % 3,
+                "tempmin": 14.0 + i % 2,
+                "temp": 19.0,
+                "conditions": "Partially cloudy",
+                "icon": "partly-cloudy-day",
+                "precip": 0.4,
+                "precipprob": 20.0,
+                "humidity": 60.0,
+                "windspeed": 12.0,
+                "uvindex": 6,
+                "sunrise": "06:02:00",
+                "sunset": "21:31:00",
+                "description": "Partly cloudy throughout the day.",
+            }
+            for i in range((end - start).days + 1)
+        ]
+        return 200, {
+            "queryCost": len(days),
+            "latitude": city.lat if city else 0.0,
+            "longitude": city.lng if city else 0.0,
+            "resolvedAddress": location,
+            "address": location,
+            "timezone": city.timezone if city else "UTC",
+            "tzoffset": 0.0,
+            "days": days,
+            "alerts": [],
+        }
+
+    # WeatherAPI.com: /current.json, /forecast.json
+
+    def _weatherapi(self, path: str, params: Mapping[str, str], payload: dict):
+        query = params.get("q", "")
+        city = get_gazetteer().geocode(query.split(",")[0])
+        condition = {"text": "Partly cloudy", "icon": "//cdn.weatherapi.com/116.png", "code": 1003}
+        location = {
+            "name": city.name if city else query,
+            "region": "",
+            "country": city.country if city else "",
+            "lat": city.lat if city else 0.0,
+            "lon": city.lng if city else 0.0,
+            "tz_id": city.timezone if city else "UTC",
+            "localtime": f"{date.today().isoformat()} 12:00",
+        }
+        current = {
+            "temp_c": 19.0,
+            "temp_f": 66.2,
+            "condition": condition,
+            "wind_kph": 12.0,
+            "wind_mph": 7.5,
+            "wind_dir": "WSW",
+            "pressure_mb": 1015.0,
+            "precip_mm": 0.0,
+            "humidity": 60,
+            "cloud": 40,
+            "feelslike_c": 19.0,
+            "feelslike_f": 66.2,
+            "uv": 5.0,
+        }
+        if path == "current.json":
+            return 200, {"location": location, "current": current}
+        if path != "forecast.json":
+            return 400, {"error": {"code": 1005, "message": "API request url is invalid."}}
+
+        start = date.fromisoformat(params["dt"]) if params.get("dt") else date.today()
+        forecastday = [
+            {
+                "date": (start + timedelta(days=i)).isoformat(),
+                "date_epoch": 1_700_000_000 + i * 86_400,
+                "day": {
+                    "maxtemp_c": 24.0 + i % 3,
+                    "mintemp_c": 14.0 + i % 2,
+                    "avgtemp_c": 19.0,
+                    "totalprecip_mm": 0.4,
+                    "avghumidity": 60,
+                    "daily_chance_of_rain": 20,
+                    "maxwind_kph": 18.0,
+                    "uv": 5.0,
+                    "condition": condition,
+                },
+                "astro": {"sunrise": "06:02 AM", "sunset": "09:31 PM"},
+            }
+            for i in range(int(params.get("days", 3)))
+        ]
+        return 200, {
+            "location": location,
+            "current": current,
+            "forecast": {"forecastday": forecastday},
+        }
+
+    # REST Countries: /all, /name/{name} (a list), /alpha/{code} (one country)
+
+    def _country(self, iso2: str) -> dict[str, Any] | None:
+        gazetteer = get_gazetteer()
+        country = gazetteer.country(iso2, fuzzy=False)
+        if country is None:
+            return None
+        capital = next((c for c in gazetteer.cities if c.country == country.iso2), None)
+        currency = CURRENCIES.get(country.iso2)
+        return {
+            "name": {"common": country.name, "official": country.name},
+            "cca2": country.iso2,
+            "cca3": country.iso3,
+            "altSpellings": list(country.aliases),
+            "capital": [capital.name] if capital else [],
+            "region": "Europe",
+            "subregion": None,
+            "population": 10_000_000,
+            "area": 100_000.0,
+            "latlng": [capital.lat, capital.lng] if capital else [0.0, 0.0],
+            "languages": {},
+            "timezones": [capital.timezone] if capital else ["UTC"],
+            "borders": [],
+            "currencies": (
+                {currency[0]: {"name": currency[1], "symbol": currency[2]}} if currency else {}
+            ),
+            "idd": {"root": "+1", "suffixes": [""]},
+            "car": {"side": "right"},
+            "flags": {},
+        }
+
+    def _rest_countries(self, path: str, params: Mapping[str, str], payload: dict):
+        if path == "all":
+            return 200, [self._country(c.iso2) for c in get_gazetteer().countries]
+        kind, _, query = path.partition("/")
+        country = get_gazetteer().country(query) if kind in ("name", "alpha") else None
+        data = self._country(country.iso2) if country else None
+        if data is None:
+            return 404, {"status": 404, "message": "Not Found"}
+        return 200, data if kind == "alpha" else [data]
+
+    # Currency exchange: /{version}/v1/currencies.json, /{version}/v1/currencies/{base}.json
+
+    def _exchange(self, path: str, params: Mapping[str, str], payload: dict):
+        version, _, path = path.partition("/v1/")
+        rate_date = date.today() if version == "latest" else date.fromisoformat(version)
+        if path == "currencies.json":
+            return 200, {code: code.upper() for code in USD_RATES}
+        base = path.removeprefix("currencies/").removesuffix(".json")
+        if base not in USD_RATES:
+            return 404, {"error": "Not found"}
+        rates = {code: rate / USD_RATES[base] for code, rate in USD_RATES.items()}
+        return 200, {"date": rate_date.isoformat(), base: rates}
+
+    # Travel Buddy: POST /v2/visa/check
+
+    def _travel_buddy(self, path: str, params: Mapping[str, str], payload: dict):
+        destination = payload.get("destination", "")
+        currency = CURRENCIES.get(destination)
+        return 200, {
+            "passport": {"code": payload.get("passport")},
+            "destination": {
+                "code": destination,
+                "currency": currency[0] if currency else None,
+                "timezone": "+01:00",
+            },
+            "primary": {
+                "category": "visa-free",
+                "duration": "90 days",
+                "passport_validity": {"months": 3},
+            },
+            "embassy": {"url": f"https://embassy.example/{destination.lower()}"},
+        }
+
+    # Amadeus: POST /v1/security/oauth2/token, /v2/shopping/flight-offers,
+    # /v1/reference-data/locations
+
+    def _amadeus(self, path: str, params: Mapping[str, str], payload: dict):
+        if path == "v1/security/oauth2/token":
+            return 200, {"access_token": "fake-token", "token_type": "Bearer", "expires_in": 1799}
+        if path == "v1/reference-data/locations":
+            code = params.get("keyword", "").upper()
+            return 200, {
+                "data": [
+                    {
+                        "iataCode": code,
+                        "name": f"{code} International",
+                        "address": {"cityName": code, "countryName": "", "countryCode": ""},
+                        "timeZoneOffset": "+00:00",
+                        "geoCode": {"latitude": 0.0, "longitude": 0.0},
+                    }
+                ]
+            }
+        if path != "v2/shopping/flight-offers":
+            return 404, {"errors": [{"status": 404, "title": "Resource not found"}]}
+
+        origin = params.get("originLocationCode", "")
+        destination = params.get("destinationLocationCode", "")
+        legs = [(origin, destination, params.get("departureDate", ""))]
+        if params.get("returnDate"):
+            legs.append((destination, origin, params["returnDate"]))
+        adults = int(params.get("adults", 1))
+        offers = []
+        for i in range(int(params.get("max", 10))):
+            price = 420.0 + 35 * i
+            offers.append(
+                {
+                    "id": str(i + 1),
+                    "source": "GDS",
+                    "numberOfBookableSeats": 9,
+                    "lastTicketingDate": legs[0][2],
+                    "itineraries": [
+                        {
+                            "duration": "PT8H",
+                            "segments": [
+                                {
+                                    "departure": {
+                                        "iataCode": src,
+                                        "at": f"{day}T{8 + i % 10:02d}:00:00",
+                                    },
+                                    "arrival": {
+                                        "iataCode": dst,
+                                        "at": f"{day}T{16 + i % 6:02d}:00:00",
+                                    },
+                                    "carrierCode": "XX",
+                                    "number": str(100 + i),
+                                    "aircraft": {"code": "320"},
+                                    "duration": "PT8H",
+                                    "numberOfStops": 0,
+                                }
+                            ],
+                        }
+                        for src, dst, day in legs
+                    ],
+                    "price": {
+                        "currency": params.get("currencyCode", "USD"),
+                        "grandTotal": f"{price * adults:.2f}",
+                    },
+                    "validatingAirlineCodes": ["XX"],
+                    "travelerPricings": [
+                        {
+                            "travelerType": "ADULT",
+                            "price": {"total": f"{price:.2f}"},
+                            "fareDetailsBySegment": [
+                                {
+                                    "cabin": params.get("travelClass", "ECONOMY"),
+                                    "class": "Y",
+                                    "includedCheckedBags": {"quantity": 1},
+                                }
+                            ],
+                        }
+                    ],
+                }
+            )
+        return 200, {
+            "data": offers,
+            "dictionaries": {"carriers": {"XX": "Fake Air"}, "aircraft": {"320": "AIRBUS A320"}},
+        }
+
+    # Skyscanner: /search
+
+    def _skyscanner(self, path: str, params: Mapping[str, str], payload: dict):
+        origin, destination = params.get("origin", ""), params.get("destination", "")
+        legs = [(origin, destination, params.get("departureDate", ""))]
+        if params.get("returnDate"):
+            legs.append((destination, origin, params["returnDate"]))
+        results = [
+            {
+                "id": f"itinerary-{i}",
+                "pricing_options": [
+                    {"price": {"amount": 410.0 + 30 * i, "currency": params.get("currency", "USD")}}
+                ],
+                "legs": [
+                    {
+                        "segments": [
+                            {
+                                "origin": {"displayCode": src},
+                                "destination": {"displayCode": dst},
+                                "departure": f"{day}T{8 + i % 10:02d}:00:00",
+                                "arrival": f"{day}T{16 + i % 6:02d}:00:00",
+                                "operatingCarrier": {"id": "XX", "name": "Fake Air"},
+                                "flightNumber": 100 + i,
+                                "durationInMinutes": 480,
+                            }
+                        ]
+                    }
+                    for src, dst, day in legs
+                ],
+            }
+            for i in range(10)
+        ]
+        return 200, {"itineraries": {"results": results}, "context": {"status": "complete"}}
+
+    # Firecrawl: POST /search, POST /scrape
+
+    def _firecrawl(self, path: str, params: Mapping[str, str], payload: dict):
+        if path == "scrape":
+            url = payload.get("url", "")
+            return 200, {
+                "success": True,
+                "data": {"markdown": f"# {url}\n\n" + "Lorem ipsum. " * 150},
+            }
+        query = payload.get("query", "")
+        results = [
+            {
+                "title": f"{query} ({i + 1})",
+                "url": f"https://guide.example/{i}",
+                "description": f"Result {i + 1} for {query}",
+                "markdown": f"# {query}\n\n" + "Lorem ipsum dolor sit amet. " * 80,
+            }
+            for i in range(payload.get("limit", 5))
+        ]
+        return 200, {"success": True, "data": results}
+
+    # OpenTripMap: /{lang}/places/{geoname,radius,autosuggest,xid/{xid}}
+
+    def _place(self, xid: str, lat: float, lng: float) -> dict[str, Any]:
+        return {
+            "xid": xid,
+            "name": f"Place {xid}",
+            "kinds": "interesting_places,museums,cultural",
+            "rate": 3,
+            "point": {"lat": lat, "lon": lng},
+            "osm": f"node/{xid}",
+            "wikidata": "Q90",
+        }
+
+    def _opentripmap(self, path: str, params: Mapping[str, str], payload: dict):
+        endpoint = path.split("/places/", 1)[-1]
+
+        if endpoint == "geoname":
+            city = get_gazetteer().city(params.get("name", ""), params.get("country"))
+            if city is None:
+                return 404, {"error": "Not found"}
+            return 200, {
+                "name": city.name,
+                "country": city.country,
+                "lat": city.lat,
+                "lon": city.lng,
+                "timezone": city.timezone,
+                "population": 1_000_000,
+            }
+
+        if endpoint in ("radius", "autosuggest"):
+            lat, lng = float(params["lat"]), float(params["lon"])
+            count = min(int(params.get("limit", 100)), self.places_per_search)
+            # Places on a small grid around the center, ids stable per location
+            places = []
+            for i in range(count):
+                place_lat = round(lat + (i % 10 - 5) * 0.002, 6)
+                place_lng = round(lng + (i // 10 - 2) * 0.002, 6)
+                place = self._place(f"B{place_lat:.4f}_{place_lng:.4f}", place_lat, place_lng)
+                places.append({**place, "dist": 100.0 * i})
+            if params.get("format") == "json":
+                return 200, places
+            features = [
+                {
+                    "type": "Feature",
+                    "id": place["xid"],
+                    "geometry": {
+                        "type": "Point",
+                        "coordinates": [place["point"]["lon"], place["point"]["lat"]],
+                    },
+                    "properties": {k: v for k, v in place.items() if k != "point"},
+                }
+                for place in places
+            ]
+            return 200, {"type": "FeatureCollection", "features": features}
+
+        if endpoint.startswith("xid/"):
+            xid = endpoint.removeprefix("xid/")
+            return 200, {
+                **self._place(xid, 0.0, 0.0),
+                "address": {"city": "Benchmark", "road": "Main Street"},
+                "wikipedia_extracts": {"text": "A notable place. " * 40},
+                "preview": {"source": f"https://images.example/{xid}.jpg"},
+            }
+
+        return 404, {"error": "Unknown endpoint"}
+
+
+# ----------------------------------------------------------------------
+# HTTP server
+# ----------------------------------------------------------------------
+
+
+def create_app(services: FakeServices | None = None) -> FastAPI:
+    """ASGI app serving services (a new FakeServices by default)."""
+    services = services or FakeServices()
+    app = FastAPI(title="TIP fake external services")
+    app.state.services = services
+
+    @app.get("/_fake/stats")
+    def get_stats() -> dict[str, Any]:
+        return services.stats()
+
+    @app.get("/_fake/scenario")
+    def get_scenario() -> Scenario:
+        return services.scenario
+
+    @app.put("/_fake/scenario")
+    def put_scenario(scenario: Scenario) -> dict[str, str]:
+        services.set_scenario(scenario)
+        return {"status": "ok"}
+
+    @app.post("/_fake/reset")
+    def reset() -> dict[str, str]:
+        services.reset()
+        return {"status": "ok"}
+
+    @app.api_route("/{service}/{path:path}", methods=["GET", "POST"])
+    async def serve(service: str, path: str, request: Request) -> Response:
+        if service not in SERVICES:
+            return Response(json.dumps({"error": f"No fake service {service!r}"}), 404)
+        outcome = services.plan(service)
+        await asyncio.sleep(outcome.delay)
+        if outcome.status is not None:
+            status, data = outcome.status, {"error": "Injected fault"}
+        else:
+            body = await request.body()
+            status, data = services.answer(
+                service, request.method, path, request.query_params, body
+            )
+        return Response(
+            json.dumps(data),
+            status_code=status,
+            headers=outcome.headers,
+            media_type="application/json",
+        )
+
+    return app
+
+
+def base_url_env(root: str) -> dict[str, str]:
+    """Base-URL settings pointing every client at the server at root."""
+    return {name: f"{root.rstrip('/')}/{path}" for name, path in BASE_URL_SETTINGS.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--scenario", help="scenario JSON file (default: no latency or faults)")
+    parser.add_argument(
+        "--print-env", action="store_true", help="print the base-URL settings and exit"
+    )
+    args = parser.parse_args()
+
+    if args.print_env:
+        for name, value in base_url_env(f"http://{args.host}:{args.port}").items():
+            print(f"{name}={value}")
+        return
+
+    import uvicorn
+
+    scenario = Scenario.load(args.scenario) if args.scenario else Scenario()
+    uvicorn.run(create_app(FakeServices(scenario)), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
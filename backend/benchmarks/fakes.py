@@ -0,0 +1,238 @@
+"""
+Offline stand-ins for report generation benchmarks
+
+- FakeChatModel: deterministic CrewAI LLM with fixed latency and token counts
+  that plays a scripted sequence of tool calls, then a final JSON answer
+- InMemorySupabase: the subset of the Supabase query builder the orchestrator
+  uses (select/eq/order/single/insert/upsert/update/execute), backed by dicts
+
+The external APIs are faked by benchmarks/fake_services.py.
+"""
+
+import json
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any
+
+from crewai.llms.base_llm import BaseLLM
+
+from app.agents.config import get_model_tier
+from app.agents.llm_usage import get_usage_tracker
+from app.core.telemetry import LLM, record_span
+
+# Rough prompt size -> token count, as used for budgeting elsewhere
+CHARS_PER_TOKEN = 4
+
+
+# ----------------------------------------------------------------------
+# LLM
+# ----------------------------------------------------------------------
+
+
+class FakeChatModel(BaseLLM):
+    """
+    Deterministic chat model for CrewAI agents.
+
+    Each call sleeps for latency_ms and is recorded like a real call (usage
+    tracker and telemetry LLM span). The first calls request the scripted
+    tools in order, in CrewAI's ReAct format; the next returns a final answer
+    of about output_tokens tokens.
+
+    Attributes:
+        agent_type: Agent the model serves (selects the usage tier)
+        latency_ms: Time each call takes
+        output_tokens: Tokens per response
+        input_tokens: Tokens per prompt (None: estimated from the prompt)
+        tool_calls: (tool name, arguments) pairs to request before answering
+    """
+
+    agent_type: str = "benchmark"
+    latency_ms: float = 800.0
+    output_tokens: int = 400
+    input_tokens: int | None = None
+    tool_calls: list[tuple[str, dict[str, Any]]] = []
+    calls: int = 0
+
+    def call(  # noqa: PLR0917 - BaseLLM.call signature
+        self,
+        messages,
+        tools=None,
+        callbacks=None,
+        available_functions=None,
+        from_task=None,
+        from_agent=None,
+        response_model=None,
+    ):
+        started = time.perf_counter()
+        time.sleep(self.latency_ms / 1000)
+
+        step = self.calls
+        self.calls += 1
+        if step < len(self.tool_calls):
+            name, arguments = self.tool_calls[step]
+            text = (
+                f"Thought: I need more information\n"
+                f"Action: {name}\n"
+                f"Action Input: {json.dumps(arguments)}"
+            )
+        else:
+            answer = {
+                "confidence_score": 0.9,
+                "summary": "x" * max(0, self.output_tokens * CHARS_PER_TOKEN - 40),
+            }
+            text = (
+                "Thought: I now know the final answer\n"
+                f"Final Answer: ```json\n{json.dumps(answer)}\n```"
+            )
+
+        if self.input_tokens is not None:
+            input_tokens = self.input_tokens
+        elif isinstance(messages, str):
+            input_tokens = len(messages) // CHARS_PER_TOKEN
+        else:
+            input_tokens = sum(len(str(m.get("content", ""))) for m in messages) // CHARS_PER_TOKEN
+        output_tokens = len(text) // CHARS_PER_TOKEN
+        latency_ms = (time.perf_counter() - started) * 1000
+        tier = get_model_tier(self.agent_type).name
+
+        get_usage_tracker().record(
+            tier=tier,
+            provider="fake",
+            model=self.model,
+            latency_ms=latency_ms,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+        )
+        record_span(
+            self.model,
+            LLM,
+            duration_ms=latency_ms,
+            tier=tier,
+            provider="fake",
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+        )
+        return text
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+
+# ----------------------------------------------------------------------
+# Supabase
+# ----------------------------------------------------------------------
+
+
+class _Query:
+    def __init__(self, db: "InMemorySupabase", table: str):
+        self.db = db
+        self.table = table
+        self.operation = "select"
+        self.payload: Any = None
+        self.on_conflict: list[str] = []
+        self.filters: list[tuple[str, Any]] = []
+        self.ordering: list[tuple[str, bool]] = []
+        self.single_row = False
+
+    def select(self, *columns, **kwargs):
+        self.operation = "select"
+        return self
+
+    def insert(self, rows, **kwargs):
+        self.operation, self.payload = "insert", rows
+        return self
+
+    def upsert(self, rows, on_conflict: str = "", **kwargs):
+        self.operation, self.payload = "upsert", rows
+        self.on_conflict = [c.strip() for c in on_conflict.split(",") if c.strip()]
+        return self
+
+    def update(self, values, **kwargs):
+        self.operation, self.payload = "update", values
+        return self
+
+    def delete(self, **kwargs):
+        self.operation = "delete"
+        return self
+
+    def eq(self, column: str, value: Any):
+        self.filters.append((column, value))
+        return self
+
+    def order(self, column: str, desc: bool = False):
+        self.ordering.append((column, desc))
+        return self
+
+    def single(self):
+        self.single_row = True
+        return self
+
+    def _matches(self, row: dict) -> bool:
+        return all(row.get(column) == value for column, value in self.filters)
+
+    def execute(self):
+        return self.db._execute(self)
+
+
+class InMemorySupabase:
+    """
+    Dict-backed stand-in for the Supabase client.
+
+    Every execute() sleeps for latency_ms (a database round trip) and is
+    counted per table and operation in calls.
+    """
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.tables: dict[str, list[dict]] = {}
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+    def _execute(self, query: _Query):
+        time.sleep(self.latency_ms / 1000)
+        with self._lock:
+            self.calls[f"{query.table}.{query.operation}"] += 1
+            rows = self.tables.setdefault(query.table, [])
+
+            if query.operation == "select":
+                data = [dict(row) for row in rows if query._matches(row)]
+                for column, desc in reversed(query.ordering):
+                    data.sort(key=lambda row: row.get(column), reverse=desc)
+            elif query.operation in ("insert", "upsert"):
+                payload = query.payload if isinstance(query.payload, list) else [query.payload]
+                data = []
+                for new in payload:
+                    existing = None
+                    if query.operation == "upsert" and query.on_conflict:
+                        existing = next(
+                            (
+                                row
+                                for row in rows
+                                if all(row.get(c) == new.get(c) for c in query.on_conflict)
+                            ),
+                            None,
+                        )
+                    if existing is not None:
+                        existing.update(new)
+                        data.append(dict(existing))
+                    else:
+                        rows.append(dict(new))
+                        data.append(dict(new))
+            elif query.operation == "update":
+                data = []
+                for row in rows:
+                    if query._matches(row):
+                        row.update(query.payload)
+                        data.append(dict(row))
+            else:
+                data = [dict(row) for row in rows if query._matches(row)]
+                rows[:] = [row for row in rows if not query._matches(row)]
+
+        if query.single_row:
+            return SimpleNamespace(data=data[0] if data else None, count=len(data))
+        return SimpleNamespace(data=data, count=len(data))
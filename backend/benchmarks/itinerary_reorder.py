@@ -0,0 +1,132 @@
+"""
+Itinerary reorder benchmark
+
+Compares the previous reorder implementation (nested linear scan per operation
+plus full cost re-summation) with IndexedItinerary on a 30-day, 300-activity
+itinerary.
+
+Usage (from backend/):
+    python -m benchmarks.itinerary_reorder [--operations 200] [--repeat 20]
+"""
+
+import argparse
+import copy
+import random
+import time
+
+from app.services.itinerary_index import IndexedItinerary
+
+DAYS = 30
+ACTIVITIES_PER_DAY = 10
+
+
+def build_itinerary(days: int = DAYS, per_day: int = ACTIVITIES_PER_DAY) -> dict:
+    return {
+        "days": [
+            {
+                "id": f"day-{d}",
+                "activities": [
+                    {"id": f"act-{d}-{a}", "cost_estimate": float(a * 3 + d)}
+                    for a in range(per_day)
+                ],
+            }
+            for d in range(days)
+        ],
+        "currency": "USD",
+    }
+
+
+def build_operations(itinerary: dict, count: int, seed: int = 42) -> list[tuple[str, str, int]]:
+    rng = random.Random(seed)
+    activity_ids = [a["id"] for d in itinerary["days"] for a in d["activities"]]
+    day_ids = [d["id"] for d in itinerary["days"]]
+    return [
+        (rng.choice(activity_ids), rng.choice(day_ids), rng.randint(0, ACTIVITIES_PER_DAY))
+        for _ in range(count)
+    ]
+
+
+def _day_cost(day: dict) -> float:
+    return sum(a.get("cost_estimate", 0) or 0 for a in day.get("activities", []))
+
+
+def legacy_reorder(itinerary: dict, operations: list[tuple[str, str, int]]) -> dict:
+    """The reorder algorithm used by the endpoint before IndexedItinerary."""
+    days_by_id = {d["id"]: d for d in itinerary["days"]}
+    for activity_id, target_day_id, position in operations:
+        source_day = activity = None
+        for day in itinerary["days"]:
+            for i, a in enumerate(day.get("activities", [])):
+                if a["id"] == activity_id:
+                    source_day, activity = day, a
+                    day["activities"].pop(i)
+                    break
+            if activity:
+                break
+        target_day = days_by_id[target_day_id]
+        target_day["activities"].insert(min(position, len(target_day["activities"])), activity)
+        source_day["total_cost"] = _day_cost(source_day)
+        target_day["total_cost"] = _day_cost(target_day)
+    itinerary["total_cost"] = sum(_day_cost(d) for d in itinerary["days"])
+    return itinerary
+
+
+def indexed_reorder(itinerary: dict, operations: list[tuple[str, str, int]]) -> dict:
+    indexed = IndexedItinerary(itinerary)
+    for activity_id, target_day_id, position in operations:
+        indexed.move_activity(activity_id, target_day_id, position)
+    return indexed.to_dict()
+
+
+def _time(fn, itinerary: dict, operations, repeat: int) -> tuple[float, dict]:
+    best = float("inf")
+    result = {}
+    for _ in range(repeat):
+        data = copy.deepcopy(itinerary)
+        started = time.perf_counter()
+        result = fn(data, operations)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def run(operations: int = 200, repeat: int = 20) -> dict:
+    itinerary = build_itinerary()
+    ops = build_operations(itinerary, operations)
+
+    legacy_seconds, legacy_result = _time(legacy_reorder, itinerary, ops, repeat)
+    indexed_seconds, indexed_result = _time(indexed_reorder, itinerary, ops, repeat)
+
+    # Both implementations must produce the same itinerary
+    assert [[a["id"] for a in d["activities"]] for d in legacy_result["days"]] == [
+        [a["id"] for a in d["activities"]] for d in indexed_result["days"]
+    ]
+    assert abs(legacy_result["total_cost"] - indexed_result["total_cost"]) < 1e-6
+
+    return {
+        "days": DAYS,
+        "activities": DAYS * ACTIVITIES_PER_DAY,
+        "operations": operations,
+        "legacy_ms": legacy_seconds * 1000,
+        "indexed_ms": indexed_seconds * 1000,
+        "speedup": legacy_seconds / indexed_seconds if indexed_seconds else float("inf"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--operations", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    result = run(args.operations, args.repeat)
+    print(
+        f"{result['days']} days, {result['activities']} activities, "
+        f"{result['operations']} reorder operations (best of {args.repeat})"
+    )
+    print(f"  legacy:  {result['legacy_ms']:8.2f} ms")
+    print(f"  indexed: {result['indexed_ms']:8.2f} ms")
+    print(f"  speedup: {result['speedup']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
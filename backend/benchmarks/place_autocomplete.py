@@ -0,0 +1,101 @@
+"""
+Place autocomplete benchmark
+
+Measures /places/autocomplete style prefix lookups against the in-memory
+index: the gazetteer destinations plus a configurable number of seen places,
+for 1-6 character prefixes typed keystroke by keystroke, with and without a
+location context.
+
+Usage (from backend/):
+    python -m benchmarks.place_autocomplete [--places 20000] [--queries 2000]
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from app.services.places.autocomplete import AutocompleteIndex
+
+WORDS = [
+    "temple", "museum", "park", "tower", "palace", "garden", "shrine", "market",
+    "castle", "bridge", "gallery", "cathedral", "square", "station", "harbor", "beach",
+]  # fmt: skip
+CITIES = ["tokyo", "paris", "kyoto", "rome", "new york", "barcelona", "bangkok", "london"]
+
+
+class _NoRedis:
+    """Redis stand-in that stores nothing (keeps the benchmark in-process)."""
+
+    def hset(self, *args, **kwargs):
+        return 0
+
+    def hgetall(self, key):
+        return {}
+
+
+def build_places(count: int) -> list[dict]:
+    rng = np.random.default_rng(0)
+    places = []
+    for i in range(count):
+        words = rng.choice(WORDS, size=2, replace=False)
+        lat, lng = rng.uniform(-60, 60), rng.uniform(-180, 180)
+        places.append(
+            {
+                "xid": f"N{i}",
+                "name": f"{words[0].title()} {words[1].title()} {i}",
+                "kinds": "interesting_places",
+                "rate": str(rng.integers(1, 4)),
+                "point": {"lat": lat, "lon": lng},
+            }
+        )
+    return places
+
+
+def run(places_count: int = 20000, queries: int = 2000) -> dict:
+    index = AutocompleteIndex(redis_client=_NoRedis())
+    started = time.perf_counter()
+    index.add_gazetteer()
+    index.add_places(build_places(places_count), {})
+    build_ms = (time.perf_counter() - started) * 1000
+
+    rng = np.random.default_rng(1)
+    terms = WORDS + CITIES
+    timings = []
+    for _ in range(queries):
+        term = terms[rng.integers(len(terms))]
+        near = (rng.uniform(-60, 60), rng.uniform(-180, 180)) if rng.random() < 0.5 else None
+        # One lookup per keystroke
+        for length in range(1, min(len(term), 6) + 1):
+            started = time.perf_counter()
+            index.suggest(term[:length], limit=10, near=near)
+            timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    return {
+        "entries": len(index),
+        "build_ms": build_ms,
+        "lookups": len(timings),
+        "p50_ms": statistics.median(timings),
+        "p99_ms": timings[int(len(timings) * 0.99) - 1],
+        "max_ms": timings[-1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--places", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    result = run(args.places, args.queries)
+    print(f"index: {result['entries']} entries built in {result['build_ms']:.0f} ms")
+    print(
+        f"{result['lookups']} lookups: p50 {result['p50_ms']:.2f} ms, "
+        f"p99 {result['p99_ms']:.2f} ms, max {result['max_ms']:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Place search benchmark
+
+Measures /places/search style lookups around a popular city once the
+geohash tiles and place details are cached: tile radius search, detail cache
+lookups and result transformation, with the remote API replaced by an
+in-memory fake (the cold run shows how many remote calls the tiles cost).
+
+Usage (from backend/):
+    python -m benchmarks.place_search [--places 3000] [--queries 500]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import numpy as np
+
+from app.api.places import transform_place
+from app.services.places.geohash import haversine_km
+from app.services.places.tile_cache import JsonCache, PlaceTileCache
+
+CENTER = (35.6762, 139.6503)  # Tokyo
+
+
+def build_places(count: int) -> list[dict]:
+    rng = np.random.default_rng(0)
+    coords = rng.normal(CENTER, 0.08, size=(count, 2))
+    return [
+        {
+            "xid": f"N{i}",
+            "name": f"Place {i}",
+            "address": {"road": f"{i} Street", "city": "Tokyo", "country": "Japan"},
+            "point": {"lat": lat, "lon": lng},
+            "kinds": "museums,interesting_places",
+            "rate": "3h",
+        }
+        for i, (lat, lng) in enumerate(coords)
+    ]
+
+
+class _NoRedis:
+    """Redis stand-in that stores nothing (keeps the benchmark in-process)."""
+
+    def get(self, key):
+        return None
+
+    def set(self, *args, **kwargs):
+        return True
+
+
+async def run(places_count: int = 3000, queries: int = 500) -> dict:
+    places = build_places(places_count)
+    lats = np.array([p["point"]["lat"] for p in places])
+    lngs = np.array([p["point"]["lon"] for p in places])
+    remote_calls = 0
+
+    async def fetch(lat, lng, radius_m, limit):
+        nonlocal remote_calls
+        remote_calls += 1
+        inside = np.flatnonzero(haversine_km(lat, lng, lats, lngs) * 1000 <= radius_m)
+        return [{"properties": {"xid": places[i]["xid"]}, **places[i]} for i in inside[:limit]]
+
+    # No Redis: measure the in-process path
+    tiles = PlaceTileCache("bench", redis_client=_NoRedis())
+    details = JsonCache("bench:xid", ttl_seconds=3600, redis_client=_NoRedis())
+    for place in places:
+        details.set(place["xid"], place)
+
+    async def search(lat, lng):
+        found = await tiles.radius_search(lat, lng, 10000, fetch, category="bench", limit=20)
+        xids = [p["properties"]["xid"] for p in found]
+        return [transform_place(details.get(xid)) for xid in xids]
+
+    started = time.perf_counter()
+    await search(*CENTER)
+    cold_ms = (time.perf_counter() - started) * 1000
+    cold_calls = remote_calls
+
+    rng = np.random.default_rng(1)
+    timings = []
+    for _ in range(queries):
+        lat, lng = rng.normal(CENTER, 0.02)
+        started = time.perf_counter()
+        await search(lat, lng)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    return {
+        "cold_ms": cold_ms,
+        "cold_remote_calls": cold_calls,
+        "warm_remote_calls": remote_calls - cold_calls,
+        "warm_p50_ms": statistics.median(timings),
+        "warm_p95_ms": timings[int(len(timings) * 0.95) - 1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--places", type=int, default=3000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.places, args.queries))
+    print(f"cold search: {result['cold_ms']:.1f} ms, {result['cold_remote_calls']} tile fetches")
+    print(
+        f"warm search: p50 {result['warm_p50_ms']:.2f} ms, p95 {result['warm_p95_ms']:.2f} ms, "
+        f"{result['warm_remote_calls']} remote calls"
+    )
+
+
+if __name__ == "__main__":
+    main()
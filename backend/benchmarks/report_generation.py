@@ -0,0 +1,271 @@
+"""
+Report generation benchmark
+
+Runs OrchestratorAgent.generate_report end to end without network access:
+every agent gets a deterministic fake chat model (fixed latency and token
+counts, scripted tool calls), the external APIs are answered in-process
+(benchmarks/fake_services.py), Supabase is an in-memory substitute and Redis is
+fakeredis (shared across runs, so later runs show the effect of the caches).
+
+Reports wall time, time per agent, peak and mean agent concurrency, and LLM,
+API and database calls per run, so scheduler and cache changes can be
+compared on a laptop.
+
+Usage (from backend/):
+    python -m benchmarks.report_generation [--runs 3] [--llm-latency-ms 800]
+        [--api-latency-ms 150] [--db-latency-ms 20] [--agent-delay 0]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import time
+from contextlib import ExitStack
+from datetime import date, timedelta
+from typing import Any
+from unittest.mock import patch
+
+# Keep CrewAI from phoning home before it is imported
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+import fakeredis  # noqa: E402
+
+from app.agents.orchestrator import agent as orchestrator_module  # noqa: E402
+from app.agents.orchestrator.agent import (  # noqa: E402
+    AGENT_DELAY_SECONDS,
+    OrchestratorAgent,
+    get_country_code,
+)
+from app.core.config import settings  # noqa: E402
+from app.core.redis_client import set_redis_client  # noqa: E402
+from app.core.telemetry import AGENT, LLM  # noqa: E402
+from app.services.gazetteer import get_gazetteer  # noqa: E402
+from benchmarks.fake_services import FakeServices, Scenario  # noqa: E402
+from benchmarks.fakes import FakeChatModel, InMemorySupabase  # noqa: E402
+
+AGENT_MODULES = (
+    "visa",
+    "country",
+    "weather",
+    "currency",
+    "culture",
+    "food",
+    "attractions",
+    "itinerary",
+    "flight",
+)
+
+API_KEYS = {
+    "VISUAL_CROSSING_API_KEY": "benchmark",
+    "RAPIDAPI_KEY": "benchmark",
+    "FIRECRAWL_API_KEY": "benchmark",
+    "OPENTRIPMAP_API_KEY": "benchmark",
+    "WEATHERAPI_KEY": "",
+}
+
+
+def build_trip(trip_id: str = "bench-trip") -> dict[str, Any]:
+    departure = date.today() + timedelta(days=30)
+    return {
+        "trip_id": trip_id,
+        "user_nationality": "United States",
+        "destination_country": "France",
+        "destination_city": "Paris",
+        "departure_date": departure,
+        "return_date": departure + timedelta(days=6),
+        "interests": ["museums", "food"],
+    }
+
+
+def tool_script(trip: dict[str, Any]) -> dict[str, list[tuple[str, dict[str, Any]]]]:
+    """Tool calls each agent's fake model makes, roughly what a real run does."""
+    city, country = trip["destination_city"], trip["destination_country"]
+    start, end = trip["departure_date"].isoformat(), trip["return_date"].isoformat()
+    destination_code = get_country_code(country)
+    location = get_gazetteer().geocode(city, country)
+    lat, lon = (location.lat, location.lng) if location else (0.0, 0.0)
+
+    return {
+        "visa": [
+            (
+                "Visa Requirements Checker",
+                {
+                    "passport_country": get_country_code(trip["user_nationality"]),
+                    "destination_country": destination_code,
+                },
+            ),
+        ],
+        "country": [("Get Country Information", {"country_name": country})],
+        "weather": [
+            (
+                "Get Weather Forecast",
+                {"location": f"{city}, {country}", "start_date": start, "end_date": end},
+            ),
+        ],
+        "currency": [("Get currency information", {"country_code": destination_code})],
+        "culture": [
+            ("Search cultural information", {"country": country, "topic": "etiquette"}),
+            ("Search cultural information", {"country": country, "topic": "dress code"}),
+        ],
+        "food": [
+            ("Search food and restaurant information", {"country": country, "topic": "dishes"}),
+        ],
+        "attractions": [
+            ("Search Attractions Near Location", {"lon": lon, "lat": lat, "radius_km": 5.0}),
+            (
+                "Get Attraction Details",
+                {"place_id": f"B{round(lat - 0.01, 6):.4f}_{round(lon - 0.004, 6):.4f}"},
+            ),
+        ],
+        "itinerary": [
+            ("Calculate Trip Duration", {"departure_date_str": start, "return_date_str": end}),
+        ],
+    }
+
+
+def peak_concurrency(intervals: list[tuple[float, float]]) -> int:
+    """Largest number of overlapping (start, end) intervals."""
+    events = sorted([(start, 1) for start, _ in intervals] + [(end, -1) for _, end in intervals])
+    running = peak = 0
+    for _, delta in events:
+        running += delta
+        peak = max(peak, running)
+    return peak
+
+
+def summarize(telemetry: dict[str, Any], wall_ms: float) -> dict[str, Any]:
+    spans = telemetry["spans"]
+    agent_spans = [s for s in spans if s["kind"] == AGENT]
+    llm_spans = [s for s in spans if s["kind"] == LLM]
+
+    def intervals(selected):
+        return [(s["offset_ms"], s["offset_ms"] + s["duration_ms"]) for s in selected]
+
+    busy_ms = sum(s["duration_ms"] for s in agent_spans)
+    return {
+        "wall_ms": wall_ms,
+        "agents": {s["name"]: s["duration_ms"] for s in agent_spans},
+        "agent_peak_concurrency": peak_concurrency(intervals(agent_spans)),
+        "agent_mean_concurrency": busy_ms / wall_ms if wall_ms else 0.0,
+        "llm_peak_concurrency": peak_concurrency(intervals(llm_spans)),
+        "llm_calls": telemetry["totals"]["llm_calls"],
+        "tool_calls": telemetry["totals"]["tool_calls"],
+    }
+
+
+async def run(
+    *,
+    runs: int = 3,
+    llm_latency_ms: float = 800.0,
+    output_tokens: int = 400,
+    input_tokens: int | None = None,
+    api_latency_ms: float = 150.0,
+    db_latency_ms: float = 20.0,
+    agent_delay: float = AGENT_DELAY_SECONDS,
+    verbose: bool = False,
+) -> list[dict[str, Any]]:
+    trip = build_trip()
+    scripts = tool_script(trip)
+    apis = FakeServices(Scenario.fixed_latency(api_latency_ms))
+    db = InMemorySupabase(latency_ms=db_latency_ms)
+    db.tables["agent_jobs"] = [
+        {"trip_id": trip["trip_id"], "agent_type": "orchestrator", "status": "queued"}
+    ]
+
+    def fake_llm(temperature: float = 0.1, config=None):
+        agent_type = config.agent_type if config else "benchmark"
+        return FakeChatModel(
+            model=f"fake-{agent_type}",
+            agent_type=agent_type,
+            latency_ms=llm_latency_ms,
+            output_tokens=output_tokens,
+            input_tokens=input_tokens,
+            tool_calls=scripts.get(agent_type, []),
+        )
+
+    results = []
+    with ExitStack() as stack:
+        stack.enter_context(apis.install())
+        stack.enter_context(patch.object(orchestrator_module, "supabase", db))
+        stack.enter_context(patch.object(orchestrator_module, "AGENT_DELAY_SECONDS", agent_delay))
+        stack.enter_context(patch.dict(os.environ, API_KEYS))
+        for name, value in API_KEYS.items():
+            stack.enter_context(patch.object(settings, name, value))
+        for module in AGENT_MODULES:
+            stack.enter_context(patch(f"app.agents.{module}.agent.get_llm", fake_llm))
+        set_redis_client(fakeredis.FakeRedis(decode_responses=True))
+        stack.callback(set_redis_client, None)
+
+        for _ in range(runs):
+            api_calls, db_calls = apis.calls.copy(), db.calls.copy()
+            orchestrator = OrchestratorAgent()
+            output = io.StringIO()
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(None if verbose else output):
+                report = await orchestrator.generate_report(trip, force=True)
+            wall_ms = (time.perf_counter() - started) * 1000
+
+            result = summarize(report["metadata"]["telemetry"], wall_ms)
+            result["errors"] = len(report["errors"])
+            result["api_calls"] = dict(apis.calls - api_calls)
+            result["db_calls"] = sum((db.calls - db_calls).values())
+            results.append(result)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--llm-latency-ms", type=float, default=800.0)
+    parser.add_argument("--output-tokens", type=int, default=400)
+    parser.add_argument(
+        "--input-tokens", type=int, default=None, help="default: estimated from the prompt"
+    )
+    parser.add_argument("--api-latency-ms", type=float, default=150.0)
+    parser.add_argument("--db-latency-ms", type=float, default=20.0)
+    parser.add_argument(
+        "--agent-delay",
+        type=float,
+        default=AGENT_DELAY_SECONDS,
+        help="seconds between agents of a phase",
+    )
+    parser.add_argument("--verbose", action="store_true", help="show agent output")
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        run(
+            runs=args.runs,
+            llm_latency_ms=args.llm_latency_ms,
+            output_tokens=args.output_tokens,
+            input_tokens=args.input_tokens,
+            api_latency_ms=args.api_latency_ms,
+            db_latency_ms=args.db_latency_ms,
+            agent_delay=args.agent_delay,
+            verbose=args.verbose,
+        )
+    )
+
+    for i, result in enumerate(results, 1):
+        print(
+            f"run {i}: {result['wall_ms'] / 1000:.2f} s, "
+            f"concurrency peak {result['agent_peak_concurrency']} "
+            f"mean {result['agent_mean_concurrency']:.2f}, "
+            f"{result['llm_calls']} LLM calls (peak {result['llm_peak_concurrency']} at once), "
+            f"{result['tool_calls']} tool calls, {result['db_calls']} db calls, "
+            f"{result['errors']} errors"
+        )
+        apis = ", ".join(f"{name} {count}" for name, count in sorted(result["api_calls"].items()))
+        print(f"  api calls: {apis or 'none'}")
+        for agent, duration_ms in result["agents"].items():
+            print(f"  {agent:<12} {duration_ms:10.1f} ms")
+
+    walls = [r["wall_ms"] / 1000 for r in results]
+    print(f"wall time: median {statistics.median(walls):.2f} s, min {min(walls):.2f} s")
+
+
+if __name__ == "__main__":
+    main()
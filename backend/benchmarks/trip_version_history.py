@@ -0,0 +1,157 @@
+"""
+Trip version history benchmark
+
+Simulates a frequently edited trip (with a 30-day itinerary in trip_details)
+and compares full-snapshot version storage with keyframe + delta storage:
+- Storage growth (serialized bytes across all versions)
+- Compare latency (full recursive diff of two snapshots vs diff from deltas)
+- Reconstruction latency of a delta-encoded version
+
+Usage (from backend/):
+    python -m benchmarks.trip_version_history [--edits 50] [--repeat 200]
+"""
+
+import argparse
+import copy
+import json
+import random
+import time
+
+from app.services.trip_versions import (
+    KEYFRAME_INTERVAL,
+    MAX_DELTA_RATIO,
+    apply_delta,
+    compute_delta,
+    diff_from_deltas,
+    diff_values,
+)
+
+
+def build_trip() -> dict:
+    return {
+        "traveler_details": {"name": "Jane Doe", "nationality": "US", "party_size": 2},
+        "destinations": [{"country": "Japan", "city": "Tokyo", "duration_days": 30}],
+        "trip_details": {
+            "departure_date": "2026-06-01",
+            "return_date": "2026-06-30",
+            "budget": 8000,
+            "currency": "USD",
+            "itinerary": {
+                "days": [
+                    {
+                        "id": f"day-{d}",
+                        "title": f"Day {d + 1}",
+                        "activities": [
+                            {
+                                "id": f"act-{d}-{a}",
+                                "name": f"Activity {a}",
+                                "location": {"name": f"Place {d}-{a}", "lat": 35.6, "lng": 139.7},
+                                "cost_estimate": 20.0 + a,
+                                "notes": "Lorem ipsum dolor sit amet " * 3,
+                            }
+                            for a in range(10)
+                        ],
+                    }
+                    for d in range(30)
+                ]
+            },
+        },
+        "preferences": {"travel_style": "balanced", "interests": ["food", "museums"]},
+    }
+
+
+def edit(rng: random.Random, trip: dict) -> dict:
+    edited = copy.deepcopy(trip)
+    choice = rng.randint(0, 2)
+    if choice == 0:
+        edited["trip_details"]["budget"] = rng.randint(5000, 12000)
+    elif choice == 1:
+        edited["preferences"]["travel_style"] = rng.choice(["relaxed", "balanced", "packed"])
+    else:
+        edited["trip_details"]["return_date"] = f"2026-06-{rng.randint(20, 30)}"
+    return edited
+
+
+def _size(value) -> int:
+    return len(json.dumps(value))
+
+
+def run(edits: int = 50, repeat: int = 200) -> dict:
+    rng = random.Random(1)
+    versions = [build_trip()]
+    for _ in range(edits):
+        versions.append(edit(rng, versions[-1]))
+
+    # Encode with the same keyframe policy as build_version_record
+    encoded = []
+    keyframe_index = None
+    for index, data in enumerate(versions):
+        if keyframe_index is not None and index - keyframe_index < KEYFRAME_INTERVAL:
+            delta = compute_delta(versions[keyframe_index], data)
+            if _size(delta) <= MAX_DELTA_RATIO * _size(data):
+                encoded.append(("delta", keyframe_index, delta))
+                continue
+        keyframe_index = index
+        encoded.append(("keyframe", index, None))
+
+    snapshot_bytes = sum(_size(v) for v in versions)
+    delta_bytes = sum(
+        _size(versions[i]) if kind == "keyframe" else _size(d) for kind, i, d in encoded
+    )
+
+    # Compare two delta versions that share a keyframe
+    a, b = next(
+        (i, i + 1)
+        for i in range(len(encoded) - 1)
+        if encoded[i][0] == "delta"
+        and encoded[i + 1][0] == "delta"
+        and encoded[i][1] == encoded[i + 1][1]
+    )
+    keyframe = versions[encoded[a][1]]
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        full = diff_values(versions[a], versions[b])
+    full_ms = (time.perf_counter() - started) * 1000 / repeat
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        from_deltas = diff_from_deltas(keyframe, encoded[a][2], encoded[b][2])
+    delta_ms = (time.perf_counter() - started) * 1000 / repeat
+
+    assert sorted(full) == sorted(from_deltas)
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        rebuilt = apply_delta(keyframe, encoded[b][2])
+    rebuild_ms = (time.perf_counter() - started) * 1000 / repeat
+    assert rebuilt == versions[b]
+
+    return {
+        "versions": len(versions),
+        "keyframes": sum(1 for kind, _, _ in encoded if kind == "keyframe"),
+        "snapshot_bytes": snapshot_bytes,
+        "delta_bytes": delta_bytes,
+        "full_diff_ms": full_ms,
+        "delta_diff_ms": delta_ms,
+        "rebuild_ms": rebuild_ms,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--edits", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    result = run(args.edits, args.repeat)
+    print(f"{result['versions']} versions, {result['keyframes']} keyframes")
+    print(f"  storage, full snapshots: {result['snapshot_bytes'] / 1024:10.1f} KiB")
+    print(f"  storage, keyframe+delta: {result['delta_bytes'] / 1024:10.1f} KiB")
+    print(f"  compare, full diff:      {result['full_diff_ms']:10.3f} ms")
+    print(f"  compare, from deltas:    {result['delta_diff_ms']:10.3f} ms")
+    print(f"  rebuild delta version:   {result['rebuild_ms']:10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
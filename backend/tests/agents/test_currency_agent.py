@@ -114,7 +114,7 @@ class TestCurrencyAgent:
     def test_agent_creation(self, agent):
         """Test CrewAI agent is created."""
         assert agent.agent is not None
-        assert len(agent.agent.tools) == 5  # 5 tools
+        assert len(agent.agent.tools) == 6  # 6 tools
 
     # Output structure tests
     @pytest.mark.integration
@@ -0,0 +1,135 @@
+"""Tests for per-agent model tiering and LLM usage reporting."""
+
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from app.agents import config as agent_config
+from app.agents.config import AgentConfig, get_llm, get_model_tier
+from app.agents.llm_usage import LLMUsageTracker, UsageCallbackHandler, estimate_cost
+from app.core.telemetry import AGENT, Trace
+
+
+class TestModelTiering:
+    """Tests for agent -> tier routing in get_llm."""
+
+    def _get_llm(self, config):
+        create = MagicMock(return_value=MagicMock(callbacks=None))
+        with (
+            patch.object(agent_config, "LLM_PROVIDER", "anthropic"),
+            patch.object(agent_config, "LLM_RUNTIME_FAILOVER_ENABLED", False),
+            patch.object(agent_config, "_create_anthropic_llm", create),
+        ):
+            get_llm(temperature=0.1, config=config)
+        return create.call_args
+
+    def test_agents_map_to_expected_tiers(self):
+        assert get_model_tier("currency").name == "fast"
+        assert get_model_tier("food").name == "standard"
+        assert get_model_tier("itinerary").name == "large"
+        assert get_model_tier(None).name == "standard"
+
+    def test_tier_settings_are_applied(self):
+        call = self._get_llm(AgentConfig(agent_type="country", name="Country Agent"))
+
+        tier = agent_config.MODEL_TIERS["fast"]
+        assert call.kwargs["model"] == tier.anthropic_model
+        assert call.kwargs["max_tokens"] == tier.max_tokens
+        assert call.kwargs["timeout"] == tier.timeout_seconds
+
+    def test_explicit_config_overrides_tier(self):
+        config = AgentConfig(
+            agent_type="country",
+            name="Country Agent",
+            llm_model="claude-opus-4-20250514",
+            max_tokens=1234,
+            timeout_seconds=10,
+        )
+
+        call = self._get_llm(config)
+
+        assert call.kwargs["model"] == "claude-opus-4-20250514"
+        assert call.kwargs["max_tokens"] == 1234
+        assert call.kwargs["timeout"] == 10.0
+
+    def test_usage_tracking_is_attached(self):
+        llm = MagicMock(callbacks=None)
+        with (
+            patch.object(agent_config, "LLM_PROVIDER", "anthropic"),
+            patch.object(agent_config, "LLM_RUNTIME_FAILOVER_ENABLED", False),
+            patch.object(agent_config, "_create_anthropic_llm", return_value=llm),
+        ):
+            result = get_llm(config=AgentConfig(agent_type="itinerary", name="Itinerary Agent"))
+
+        assert isinstance(result.callbacks[0], UsageCallbackHandler)
+        assert result.callbacks[0].tier == "large"
+
+
+class TestUsageReport:
+    """Tests for the per-tier latency/cost report."""
+
+    def test_callback_records_latency_and_tokens(self):
+        tracker = LLMUsageTracker()
+        handler = UsageCallbackHandler(tracker, "fast", "anthropic", "claude-3-5-haiku-20241022")
+        run_id = uuid4()
+        message = AIMessage(
+            content="ok",
+            usage_metadata={"input_tokens": 1000, "output_tokens": 200, "total_tokens": 1200},
+        )
+
+        handler.on_chat_model_start({}, [[]], run_id=run_id)
+        handler.on_llm_end(
+            LLMResult(generations=[[ChatGeneration(message=message)]]), run_id=run_id
+        )
+
+        report = tracker.report()
+        fast = report["tiers"]["fast"]
+        assert fast["calls"] == 1
+        assert fast["input_tokens"] == 1000
+        assert fast["output_tokens"] == 200
+        assert fast["estimated_cost_usd"] == estimate_cost("claude-3-5-haiku-20241022", 1000, 200)
+
+    def test_callback_records_llm_span(self):
+        handler = UsageCallbackHandler(LLMUsageTracker(), "fast", "anthropic", "claude-3-5-haiku")
+        run_id = uuid4()
+        message = AIMessage(
+            content="ok",
+            usage_metadata={"input_tokens": 300, "output_tokens": 40, "total_tokens": 340},
+        )
+        trace = Trace("report")
+
+        with trace.span("weather", AGENT):
+            handler.on_chat_model_start({}, [[]], run_id=run_id)
+            handler.on_llm_end(
+                LLMResult(generations=[[ChatGeneration(message=message)]]), run_id=run_id
+            )
+
+        llm_span = next(s for s in trace.summary()["spans"] if s["kind"] == "llm")
+        assert llm_span["name"] == "claude-3-5-haiku"
+        assert llm_span["attributes"]["provider"] == "anthropic"
+        assert llm_span["attributes"]["output_tokens"] == 40
+        assert trace.summary()["agents"]["weather"]["input_tokens"] == 300
+
+    def test_report_groups_by_tier_and_respects_mark(self):
+        tracker = LLMUsageTracker()
+        tokens = {"input_tokens": 10, "output_tokens": 10}
+        sonnet = {"tier": "standard", "provider": "anthropic", "model": "claude-sonnet-4-20250514"}
+        haiku = {"tier": "fast", "provider": "anthropic", "model": "claude-3-5-haiku-20241022"}
+        tracker.record(**sonnet, latency_ms=900, **tokens)
+        mark = tracker.mark()
+        tracker.record(**haiku, latency_ms=100, **tokens)
+        tracker.record(**haiku, latency_ms=300, **tokens, error=True)
+
+        report = tracker.report(since=mark)
+
+        assert list(report["tiers"]) == ["fast"]
+        assert report["tiers"]["fast"]["calls"] == 2
+        assert report["tiers"]["fast"]["errors"] == 1
+        assert report["tiers"]["fast"]["latency_ms"]["avg"] == 200.0
+
+    def test_estimate_cost_uses_longest_prefix(self):
+        assert estimate_cost("gpt-4o-mini", 1_000_000, 0) == 0.15
+        assert estimate_cost("gpt-4o", 1_000_000, 0) == 2.5
+        assert estimate_cost("unknown-model", 1000, 1000) is None
@@ -0,0 +1,151 @@
+"""Tests for call-level LLM failover and hedging."""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.agents import config as agent_config
+from app.agents.config import get_llm
+from app.agents.llm_router import (
+    MIN_SAMPLES,
+    FailoverChatModel,
+    get_provider_stats,
+    reset_provider_stats,
+)
+
+
+class FakeProvider:
+    """Stand-in chat model with configurable delay and failure."""
+
+    def __init__(self, reply: str, delay: float = 0.0, error: Exception | None = None):
+        self.reply = reply
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def invoke(self, messages, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return AIMessage(content=self.reply)
+
+
+@pytest.fixture(autouse=True)
+def _clean_stats():
+    reset_provider_stats()
+    yield
+    reset_provider_stats()
+
+
+PROMPT = [HumanMessage(content="hello")]
+
+
+class TestFailover:
+    """Tests for failing over between providers on errors."""
+
+    def test_primary_answers(self):
+        primary, backup = FakeProvider("anthropic"), FakeProvider("google")
+        router = FailoverChatModel(models=[("anthropic", primary), ("google", backup)])
+
+        result = router.invoke(PROMPT)
+
+        assert result.content == "anthropic"
+        assert backup.calls == 0
+
+    def test_fails_over_on_error(self):
+        primary = FakeProvider("anthropic", error=RuntimeError("529 overloaded"))
+        router = FailoverChatModel(
+            models=[("anthropic", primary), ("google", FakeProvider("google"))]
+        )
+
+        result = router.invoke(PROMPT)
+
+        assert result.content == "google"
+        assert result.response_metadata["provider"] == "google"
+        assert get_provider_stats("anthropic").error_rate() == 1.0
+
+    def test_all_providers_failing_raises(self):
+        router = FailoverChatModel(
+            models=[
+                ("anthropic", FakeProvider("a", error=RuntimeError("429"))),
+                ("google", FakeProvider("g", error=RuntimeError("timeout"))),
+            ]
+        )
+
+        with pytest.raises(RuntimeError, match="All LLM providers failed"):
+            router.invoke(PROMPT)
+
+    def test_unhealthy_provider_is_tried_last(self):
+        for _ in range(MIN_SAMPLES):
+            get_provider_stats("anthropic").record(1.0, ok=False)
+        router = FailoverChatModel(
+            models=[("anthropic", FakeProvider("anthropic")), ("google", FakeProvider("google"))]
+        )
+
+        assert router.provider_order == ["google", "anthropic"]
+        assert router.invoke(PROMPT).content == "google"
+
+
+class TestHedging:
+    """Tests for hedged requests after the p95 delay."""
+
+    def _seed_latency(self, provider, seconds):
+        for _ in range(MIN_SAMPLES):
+            get_provider_stats(provider).record(seconds, ok=True)
+
+    def test_slow_primary_is_hedged(self):
+        self._seed_latency("anthropic", 0.05)
+        primary, backup = FakeProvider("anthropic", delay=0.5), FakeProvider("google")
+        router = FailoverChatModel(
+            models=[("anthropic", primary), ("google", backup)], hedge=True, hedge_min_delay=0.05
+        )
+
+        started = time.monotonic()
+        result = router.invoke(PROMPT)
+
+        assert result.content == "google"
+        assert time.monotonic() - started < 0.4
+
+    def test_fast_primary_is_not_hedged(self):
+        self._seed_latency("anthropic", 0.2)
+        backup = FakeProvider("google")
+        router = FailoverChatModel(
+            models=[("anthropic", FakeProvider("anthropic")), ("google", backup)],
+            hedge=True,
+            hedge_min_delay=0.2,
+        )
+
+        assert router.invoke(PROMPT).content == "anthropic"
+        assert backup.calls == 0
+
+    def test_primary_failure_before_hedge_falls_over(self):
+        self._seed_latency("anthropic", 1.0)
+        router = FailoverChatModel(
+            models=[
+                ("anthropic", FakeProvider("a", error=RuntimeError("529"))),
+                ("google", FakeProvider("google")),
+            ],
+            hedge=True,
+        )
+
+        assert router.invoke(PROMPT).content == "google"
+
+
+class TestGetLlmFailover:
+    """Tests for get_llm wiring of the router."""
+
+    def test_multiple_providers_are_wrapped(self):
+        with (
+            patch.object(agent_config, "LLM_PROVIDER", "anthropic"),
+            patch.object(agent_config, "LLM_RUNTIME_FAILOVER_ENABLED", True),
+            patch.object(agent_config, "_create_anthropic_llm", return_value=MagicMock()),
+            patch.object(agent_config, "_create_google_llm", return_value=MagicMock()),
+            patch.object(agent_config, "_create_openai_llm", side_effect=ValueError("no key")),
+        ):
+            llm = get_llm()
+
+        assert isinstance(llm, FailoverChatModel)
+        assert [name for name, _ in llm.models] == ["anthropic", "google"]
@@ -17,6 +17,7 @@ import pytest
 
 from app.agents.interfaces import AgentResult
 from app.agents.orchestrator.agent import OrchestratorAgent
+from app.core.telemetry import LLM, record_span
 
 
 class TestOrchestratorAgent:
@@ -274,3 +275,139 @@ class TestOrchestratorAgent:
 
         assert orchestrator.is_agent_available("visa") == True
         assert orchestrator.is_agent_available("nonexistent") == False
+
+
+class TestInputFingerprints:
+    """Test input fingerprinting used to skip unchanged agents"""
+
+    trip_data = {
+        "trip_id": "test-fp",
+        "user_nationality": "US",
+        "destination_country": "France",
+        "destination_city": "Paris",
+        "departure_date": date(2025, 6, 1),
+        "return_date": date(2025, 6, 15),
+        "trip_purpose": "tourism",
+    }
+
+    def test_fingerprints_are_stable_and_ignore_trip_id(self):
+        """Same inputs for different trips produce the same fingerprint"""
+        orchestrator = OrchestratorAgent()
+
+        first = orchestrator.get_input_fingerprints(
+            orchestrator._validate_trip_data(self.trip_data)
+        )
+        second = orchestrator.get_input_fingerprints(
+            orchestrator._validate_trip_data({**self.trip_data, "trip_id": "other"})
+        )
+
+        assert first == second
+        assert "visa" in first
+
+    def test_only_affected_fingerprints_change(self):
+        """Changing interests changes attractions but not visa"""
+        orchestrator = OrchestratorAgent()
+
+        before = orchestrator.get_input_fingerprints(
+            orchestrator._validate_trip_data(self.trip_data)
+        )
+        after = orchestrator.get_input_fingerprints(
+            orchestrator._validate_trip_data({**self.trip_data, "interests": ["museums"]})
+        )
+
+        assert before["visa"] == after["visa"]
+        assert before["attractions"] != after["attractions"]
+
+    def test_budget_and_dietary_edits_change_affected_fingerprints(self):
+        """Budget, home currency and dietary restrictions reach the agents using them"""
+        orchestrator = OrchestratorAgent()
+
+        def fingerprints(**changes):
+            return orchestrator.get_input_fingerprints(
+                orchestrator._validate_trip_data({**self.trip_data, **changes})
+            )
+
+        before = fingerprints(budget=2000, currency="USD")
+        budget = fingerprints(budget=8000, currency="USD")
+        currency = fingerprints(budget=2000, currency="EUR")
+        dietary = fingerprints(budget=2000, currency="USD", dietary_restrictions=["vegan"])
+
+        assert budget["currency"] != before["currency"]
+        assert budget["attractions"] != before["attractions"]
+        assert budget["visa"] == before["visa"]
+        assert currency["currency"] != before["currency"]
+        assert dietary["food"] != before["food"]
+        assert dietary["attractions"] == before["attractions"]
+
+    @pytest.mark.asyncio()
+    async def test_unchanged_agents_are_skipped(self):
+        """Agents with a matching stored fingerprint are not run unless forced"""
+        orchestrator = OrchestratorAgent()
+        fingerprints = orchestrator.get_input_fingerprints(
+            orchestrator._validate_trip_data(self.trip_data)
+        )
+        stored = {name: fp for name, fp in fingerprints.items() if name != "weather"}
+        ran = []
+
+        async def fake_run_agent(trip_data, agent_name):
+            ran.append(agent_name)
+            return {"agent": agent_name}
+
+        with (
+            patch("app.agents.orchestrator.agent.supabase", Mock()),
+            patch("app.agents.orchestrator.agent.asyncio.sleep"),
+            patch.object(orchestrator, "_load_existing_fingerprints", return_value=stored),
+            patch.object(orchestrator, "_run_agent", side_effect=fake_run_agent),
+        ):
+            result = await orchestrator.generate_report(self.trip_data)
+
+        assert ran == ["weather"]
+        assert "visa" in result["metadata"]["skipped_agents"]
+        assert result["metadata"]["estimated_time_saved"] > 0
+
+    @pytest.mark.asyncio()
+    async def test_force_runs_all_agents(self):
+        """force=True ignores stored fingerprints"""
+        orchestrator = OrchestratorAgent()
+        ran = []
+
+        async def fake_run_agent(trip_data, agent_name):
+            ran.append(agent_name)
+            return {"agent": agent_name}
+
+        with (
+            patch("app.agents.orchestrator.agent.supabase", Mock()),
+            patch("app.agents.orchestrator.agent.asyncio.sleep"),
+            patch.object(orchestrator, "_load_existing_fingerprints") as load_existing,
+            patch.object(orchestrator, "_run_agent", side_effect=fake_run_agent),
+        ):
+            result = await orchestrator.generate_report(self.trip_data, force=True)
+
+        load_existing.assert_not_called()
+        assert "visa" in ran
+        assert result["metadata"]["skipped_agents"] == []
+
+    @pytest.mark.asyncio()
+    async def test_report_metadata_includes_agent_telemetry(self):
+        """Each agent run is recorded as a span with its LLM calls"""
+        orchestrator = OrchestratorAgent()
+
+        class FakeAgent:
+            async def run_async(self, agent_input):
+                record_span("claude", LLM, duration_ms=120, input_tokens=50, output_tokens=10)
+                return {"ok": True}
+
+        orchestrator.available_agents = {"visa": FakeAgent, "weather": FakeAgent}
+
+        with (
+            patch("app.agents.orchestrator.agent.supabase", Mock()),
+            patch("app.agents.orchestrator.agent.asyncio.sleep"),
+            patch.object(orchestrator, "_load_existing_fingerprints", return_value={}),
+        ):
+            result = await orchestrator.generate_report(self.trip_data)
+
+        telemetry = result["metadata"]["telemetry"]
+        assert telemetry["attributes"] == {"trip_id": "test-fp"}
+        assert set(telemetry["agents"]) == {"visa", "weather"}
+        assert telemetry["agents"]["visa"]["llm_calls"] == 1
+        assert telemetry["totals"]["input_tokens"] == 100
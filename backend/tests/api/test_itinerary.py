@@ -626,6 +626,236 @@ class TestReorderActivities:
         assert response.status_code in [200, 404, 500]
 
 
+class TestPatchItinerary:
+    """Tests for PATCH /trips/{trip_id}/itinerary endpoint."""
+
+    def _mock_supabase(self, mocker, trip_data, rpc_data):
+        mock_supabase = MagicMock()
+        mocker.patch("app.api.itinerary.supabase", mock_supabase)
+        mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.single.return_value.execute.return_value.data = (
+            trip_data
+        )
+        mock_supabase.rpc.return_value.execute.return_value.data = rpc_data
+        return mock_supabase
+
+    def test_patch_applies_batch_in_one_write(
+        self, client, mock_auth, mock_trip_id, sample_trip_with_itinerary, mocker
+    ):
+        """Should apply all operations and write once with the expected version."""
+        mock_supabase = self._mock_supabase(
+            mocker, sample_trip_with_itinerary, [{"found": True, "applied": True, "version": 1}]
+        )
+
+        response = client.patch(
+            f"/api/trips/{mock_trip_id}/itinerary",
+            headers=mock_auth,
+            json={
+                "version": 0,
+                "operations": [
+                    {"op": "replace", "path": "/days/0/title", "value": "Landing"},
+                    {"op": "replace", "path": "/days/0/activities/0/cost_estimate", "value": 80},
+                ],
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["itinerary"]["days"][0]["title"] == "Landing"
+        assert data["itinerary"]["totalCost"] == 80
+        assert data["itinerary"]["version"] == 1
+
+        mock_supabase.rpc.assert_called_once()
+        name, params = mock_supabase.rpc.call_args.args
+        assert name == "save_trip_itinerary"
+        assert params["p_expected_version"] == 0
+        mock_supabase.table.return_value.update.assert_not_called()
+
+    def test_patch_stale_version_conflicts(
+        self, client, mock_auth, mock_trip_id, sample_trip_with_itinerary, mocker
+    ):
+        """Should return 409 without writing when the version is stale."""
+        sample_trip_with_itinerary["trip_details"]["itinerary"]["version"] = 3
+        mock_supabase = self._mock_supabase(mocker, sample_trip_with_itinerary, [])
+
+        response = client.patch(
+            f"/api/trips/{mock_trip_id}/itinerary",
+            headers=mock_auth,
+            json={"version": 2, "operations": [{"op": "remove", "path": "/days/0"}]},
+        )
+
+        assert response.status_code == 409
+        mock_supabase.rpc.assert_not_called()
+
+    def test_patch_concurrent_write_conflicts(
+        self, client, mock_auth, mock_trip_id, sample_trip_with_itinerary, mocker
+    ):
+        """Should return 409 when another write lands between read and write."""
+        self._mock_supabase(
+            mocker, sample_trip_with_itinerary, [{"found": True, "applied": False, "version": 4}]
+        )
+
+        response = client.patch(
+            f"/api/trips/{mock_trip_id}/itinerary",
+            headers=mock_auth,
+            json={"version": 0, "operations": [{"op": "remove", "path": "/days/0"}]},
+        )
+
+        assert response.status_code == 409
+
+    def test_patch_single_concurrent_write_conflicts(
+        self, client, mock_auth, mock_trip_id, sample_trip_with_itinerary, mocker
+    ):
+        """Should return 409 when exactly one write landed first (current = expected + 1)."""
+        self._mock_supabase(
+            mocker, sample_trip_with_itinerary, [{"found": True, "applied": False, "version": 1}]
+        )
+
+        response = client.patch(
+            f"/api/trips/{mock_trip_id}/itinerary",
+            headers=mock_auth,
+            json={"version": 0, "operations": [{"op": "remove", "path": "/days/0"}]},
+        )
+
+        assert response.status_code == 409
+
+    def test_patch_invalid_operation(
+        self, client, mock_auth, mock_trip_id, sample_trip_with_itinerary, mocker
+    ):
+        """Should return 422 for operations that cannot be applied."""
+        self._mock_supabase(mocker, sample_trip_with_itinerary, [])
+
+        response = client.patch(
+            f"/api/trips/{mock_trip_id}/itinerary",
+            headers=mock_auth,
+            json={"version": 0, "operations": [{"op": "remove", "path": "/days/9"}]},
+        )
+
+        assert response.status_code == 422
+
+    def test_patch_producing_invalid_itinerary(
+        self, client, mock_auth, mock_trip_id, sample_trip_with_itinerary, mocker
+    ):
+        """Should return 422 when the patched itinerary fails validation."""
+        self._mock_supabase(mocker, sample_trip_with_itinerary, [])
+
+        response = client.patch(
+            f"/api/trips/{mock_trip_id}/itinerary",
+            headers=mock_auth,
+            json={
+                "version": 0,
+                "operations": [{"op": "replace", "path": "/days/0/day_number", "value": 0}],
+            },
+        )
+
+        assert response.status_code == 422
+
+
+class TestOptimizeItinerary:
+    """Tests for POST /trips/{trip_id}/itinerary/optimize endpoint."""
+
+    def _trip(self, mock_trip_id, mock_user_id):
+        def activity(activity_id, lng):
+            return {
+                "id": activity_id,
+                "name": activity_id,
+                "type": "attraction",
+                "location": {"name": activity_id, "lat": 35.68, "lng": lng},
+                "start_time": "09:00",
+                "end_time": "10:00",
+                "duration_minutes": 60,
+                "cost_estimate": 10.0,
+            }
+
+        return {
+            "id": mock_trip_id,
+            "user_id": mock_user_id,
+            "trip_details": {
+                "itinerary": {
+                    "days": [
+                        {
+                            "id": "day-1",
+                            "date": "2025-06-01",
+                            "day_number": 1,
+                            "activities": [
+                                activity("west", 139.70),
+                                activity("east", 139.80),
+                                activity("middle", 139.75),
+                            ],
+                        }
+                    ],
+                    "currency": "USD",
+                }
+            },
+        }
+
+    def test_optimize_reorders_and_saves(
+        self, client, mock_auth, mock_trip_id, mock_user_id, mocker
+    ):
+        """Should reorder activities by distance and write the itinerary once."""
+        mock_supabase = MagicMock()
+        mocker.patch("app.api.itinerary.supabase", mock_supabase)
+        mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.single.return_value.execute.return_value.data = (
+            self._trip(mock_trip_id, mock_user_id)
+        )
+        mock_supabase.rpc.return_value.execute.return_value.data = [{"found": True, "applied": True, "version": 1}]
+
+        response = client.post(
+            f"/api/trips/{mock_trip_id}/itinerary/optimize",
+            headers=mock_auth,
+            json={"dayStart": "10:00"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        names = [a["name"] for a in data["updatedDays"][0]["activities"]]
+        assert names in (["west", "middle", "east"], ["east", "middle", "west"])
+        assert data["updatedDays"][0]["activities"][0]["startTime"] == "10:00"
+        route = data["routes"][0]
+        assert route["totalDistanceKm"] < route["originalDistanceKm"]
+        mock_supabase.rpc.assert_called_once()
+
+    def test_optimize_unknown_day(
+        self, client, mock_auth, mock_trip_id, mock_user_id, mocker
+    ):
+        """Should return 404 for a day that is not in the itinerary."""
+        mock_supabase = MagicMock()
+        mocker.patch("app.api.itinerary.supabase", mock_supabase)
+        mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.single.return_value.execute.return_value.data = (
+            self._trip(mock_trip_id, mock_user_id)
+        )
+
+        response = client.post(
+            f"/api/trips/{mock_trip_id}/itinerary/optimize",
+            headers=mock_auth,
+            json={"dayIds": ["day-9"]},
+        )
+
+        assert response.status_code == 404
+        mock_supabase.rpc.assert_not_called()
+
+    def test_optimize_invalid_coordinates(
+        self, client, mock_auth, mock_trip_id, mock_user_id, mocker
+    ):
+        """Should return 422 instead of failing on non-numeric coordinates."""
+        trip = self._trip(mock_trip_id, mock_user_id)
+        trip["trip_details"]["itinerary"]["days"][0]["activities"][1]["location"]["lat"] = "north"
+        mock_supabase = MagicMock()
+        mocker.patch("app.api.itinerary.supabase", mock_supabase)
+        mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.single.return_value.execute.return_value.data = (
+            trip
+        )
+
+        response = client.post(
+            f"/api/trips/{mock_trip_id}/itinerary/optimize",
+            headers=mock_auth,
+            json={},
+        )
+
+        assert response.status_code == 422
+        assert "east" in str(response.json())
+        mock_supabase.rpc.assert_not_called()
+
+
 # ============================================================================
 # Model Validation Tests
 # ============================================================================
@@ -7,11 +7,13 @@ Tests place search functionality for itinerary building.
 import uuid
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import fakeredis
 import pytest
 from fastapi.testclient import TestClient
 
 from app.core.auth import verify_jwt_token
 from app.main import app
+from app.services.places import AutocompleteIndex, JsonCache
 
 
 # ============================================================================
@@ -306,6 +308,89 @@ class TestPlaceAutocomplete:
         data = response.json()
         assert len(data) <= 3
 
+    def test_autocomplete_serves_destinations_from_index(self, client, mock_auth, mocker):
+        """Should suggest gazetteer destinations without remote calls."""
+        mocker.patch("app.api.places.OPENTRIPMAP_API_KEY", "test_key")
+        fetch = mocker.patch("app.api.places.fetch_opentripmap_autosuggest", new=AsyncMock())
+
+        response = client.get(
+            "/api/places/autocomplete",
+            headers=mock_auth,
+            params={"query": "kyo", "limit": 1},
+        )
+
+        assert response.status_code == 200
+        assert response.json()[0]["name"] == "Kyoto"
+        assert response.json()[0]["country"] == "JP"
+        fetch.assert_not_called()
+
+    def test_autocomplete_looks_up_misses_once(self, client, mock_auth, mocker):
+        """Should fetch unknown prefixes remotely once and index the results."""
+        redis_client = fakeredis.FakeRedis(decode_responses=True)
+        mocker.patch("app.api.places.OPENTRIPMAP_API_KEY", "test_key")
+        mocker.patch(
+            "app.api.places.get_autocomplete_index",
+            return_value=AutocompleteIndex(redis_client=redis_client),
+        )
+        mocker.patch(
+            "app.api.places.get_suggest_cache",
+            return_value=JsonCache("test:suggest", 3600, redis_client=redis_client),
+        )
+        fetch = mocker.patch(
+            "app.api.places.fetch_opentripmap_autosuggest",
+            new=AsyncMock(
+                return_value=[
+                    {
+                        "xid": "N1",
+                        "name": "Fushimi Inari Taisha",
+                        "kinds": "religion,interesting_places",
+                        "rate": "3h",
+                        "point": {"lat": 34.967, "lon": 135.772},
+                    }
+                ]
+            ),
+        )
+
+        for _ in range(2):
+            response = client.get(
+                "/api/places/autocomplete",
+                headers=mock_auth,
+                params={"query": "fushimi", "location": "Kyoto, Japan"},
+            )
+            assert response.status_code == 200
+            assert response.json()[0]["name"] == "Fushimi Inari Taisha"
+            assert response.json()[0]["type"] == "temple"
+
+        fetch.assert_awaited_once()
+
+    def test_far_away_matches_do_not_suppress_lookup(self, client, mock_auth, mocker):
+        """Should look up a query the index only answers with far-away places."""
+        redis_client = fakeredis.FakeRedis(decode_responses=True)
+        index = AutocompleteIndex(redis_client=redis_client)
+        index.add_places(
+            [{"xid": "N9", "name": "Fushimi Hall", "point": {"lat": 35.69, "lon": 139.69}}],
+            {},
+        )
+        mocker.patch("app.api.places.OPENTRIPMAP_API_KEY", "test_key")
+        mocker.patch("app.api.places.get_autocomplete_index", return_value=index)
+        mocker.patch(
+            "app.api.places.get_suggest_cache",
+            return_value=JsonCache("test:suggest", 3600, redis_client=redis_client),
+        )
+        fetch = mocker.patch(
+            "app.api.places.fetch_opentripmap_autosuggest", new=AsyncMock(return_value=[])
+        )
+
+        response = client.get(
+            "/api/places/autocomplete",
+            headers=mock_auth,
+            params={"query": "fushimi", "location": "Kyoto, Japan", "limit": 1},
+        )
+
+        assert response.status_code == 200
+        assert response.json()[0]["name"] == "Fushimi Hall"
+        fetch.assert_awaited_once()
+
 
 # ============================================================================
 # Place Result Model Tests
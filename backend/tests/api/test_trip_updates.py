@@ -9,10 +9,12 @@ Tests cover:
 - POST /trips/{id}/versions/{version}/restore
 """
 
+import fakeredis
 import pytest
 from fastapi.testclient import TestClient
 
 from app.core.auth import verify_jwt_token
+from app.core.generation_lease import GenerationLease
 from app.core.security import get_rate_limiter
 from app.main import app
 
@@ -332,3 +334,61 @@ class TestVersionHistory:
         response = test_client.get("/api/trips/nonexistent/versions")
 
         assert response.status_code == 404
+
+
+# ============================================================================
+# RECALCULATION LEASE TESTS
+# ============================================================================
+
+
+class TestRestoreRecalcLease:
+    """Test that a version restore queues its recalculation under the trip's lease."""
+
+    @pytest.fixture
+    def lease(self, mocker):
+        lease = GenerationLease(client=fakeredis.FakeRedis(decode_responses=True))
+        mocker.patch.object(GenerationLease, "_is_task_finished", return_value=False)
+        mocker.patch("app.api.trips.get_generation_lease", return_value=lease)
+        return lease
+
+    @pytest.fixture
+    def recalc_task(self, mocker):
+        task = mocker.Mock()
+        task.apply_async.side_effect = lambda args, task_id: mocker.Mock(id=task_id)
+        mocker.patch("app.tasks.agent_jobs.execute_selective_recalc", task)
+        return task
+
+    @pytest.fixture
+    def restorable_trip(self, mocker, mock_supabase, sample_trip):
+        trips_table = mock_supabase.table.return_value
+        trips_table.select.return_value.eq.return_value.eq.return_value.execute.return_value = (
+            mocker.Mock(data=[sample_trip])
+        )
+        mocker.patch("app.api.trips.save_trip_version")
+        mocker.patch("app.api.trips.load_trip_versions", return_value={1: sample_trip})
+        return trips_table
+
+    def test_restore_queues_recalc_holding_the_lease(
+        self, test_client, lease, recalc_task, restorable_trip
+    ):
+        response = test_client.post("/api/trips/trip-123/versions/1/restore")
+
+        assert response.status_code == 200
+        recalculation = response.json()["recalculation"]
+        assert recalculation["status"] == "queued"
+        assert lease.holder("trip-123") == recalculation["taskId"]
+        assert recalc_task.apply_async.call_args.kwargs["task_id"] == recalculation["taskId"]
+
+    def test_duplicate_restore_returns_in_flight_task(
+        self, test_client, lease, recalc_task, restorable_trip
+    ):
+        lease.acquire("trip-123", "in-flight-task")
+
+        response = test_client.post("/api/trips/trip-123/versions/1/restore")
+
+        assert response.status_code == 200
+        recalculation = response.json()["recalculation"]
+        assert recalculation["status"] == "in_progress"
+        assert recalculation["taskId"] == "in-flight-task"
+        recalc_task.apply_async.assert_not_called()
+        assert lease.holder("trip-123") == "in-flight-task"
@@ -0,0 +1,15 @@
+"""
+Microbenchmarks for pure-Python hot paths (pytest-benchmark)
+
+Normal test runs execute each benchmark once (--benchmark-disable in
+pytest.ini). To time them, save a baseline and compare against it:
+
+    pytest tests/benchmarks --benchmark-enable --benchmark-only --no-cov --benchmark-save=base
+    ... change code ...
+    pytest tests/benchmarks --benchmark-enable --benchmark-only --no-cov \\
+        --benchmark-compare --benchmark-compare-fail=median:25%
+
+Baselines are stored under .benchmarks/ (machine specific, not committed).
+CI benchmarks a pull request's base and head on the same runner and fails
+on regressions beyond the threshold.
+"""
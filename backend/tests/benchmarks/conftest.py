@@ -0,0 +1,214 @@
+"""Large, realistic fixtures for the microbenchmarks (deterministic)"""
+
+import json
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.services.report_aggregator import EXPECTED_SECTIONS, ReportSection
+
+CITIES = [
+    ("Paris", "France"),
+    ("Tokyo", "Japan"),
+    ("Rome", "Italy"),
+    ("Barcelona", "Spain"),
+    ("Bangkok", "Thailand"),
+    ("London", "United Kingdom"),
+    ("Berlin", "Germany"),
+    ("New York", "United States"),
+    ("Lisbon", "Portugal"),
+    ("Kyoto", "Japan"),
+]
+INTERESTS = ["museums", "food", "history", "nightlife", "hiking", "art", "shopping", "beaches"]
+STATUSES = ["draft", "pending", "processing", "completed", "failed"]
+
+
+def trip_row(rng: random.Random, index: int, status: str | None = None) -> dict:
+    """A trips row as stored (camelCase JSONB from the frontend)."""
+    departure = date(2024, 1, 1) + timedelta(days=rng.randrange(900))
+    destinations = [
+        {"city": city, "country": country}
+        for city, country in rng.sample(CITIES, rng.randint(1, 4))
+    ]
+    return {
+        "id": f"trip-{index:05d}",
+        "user_id": "user-1",
+        "title": f"Trip {index}",
+        "status": status or rng.choice(STATUSES),
+        "created_at": f"2024-01-01T00:00:{index % 60:02d}Z",
+        "updated_at": "2024-02-01T00:00:00Z",
+        "auto_delete_at": "2025-01-01T00:00:00Z",
+        "cover_image_url": None,
+        "traveler_details": {
+            "name": "Alex Traveler",
+            "email": "alex@example.com",
+            "age": 34,
+            "nationality": "US",
+            "residenceCountry": "US",
+            "originCity": "Boston",
+            "residencyStatus": "citizen",
+            "partySize": 3,
+            "partyAges": [34, 33, 6],
+            "contactPreferences": ["email"],
+        },
+        "destinations": destinations,
+        "trip_details": {
+            "departureDate": departure.isoformat(),
+            "returnDate": (departure + timedelta(days=rng.randint(2, 21))).isoformat(),
+            "budget": rng.randrange(500, 10_000),
+            "currency": "USD",
+            "tripPurposes": ["Tourism", "Business"],
+        },
+        "preferences": {
+            "travelStyle": "balanced",
+            "interests": rng.sample(INTERESTS, 5),
+            "dietaryRestrictions": ["vegetarian"],
+            "accessibilityNeeds": "",
+            "accommodationType": "hotel",
+            "transportationPreference": "public",
+        },
+    }
+
+
+def section_content(section_type: str, days: int = 14) -> dict:
+    """Agent output for a section, about the size of a real two-week report."""
+    start = date(2025, 6, 1)
+    if section_type == "itinerary":
+        return {
+            "daily_plans": [
+                {
+                    "date": start + timedelta(days=d),
+                    "activities": [
+                        {
+                            "name": f"Activity {d}-{a}",
+                            "time": f"{9 + a}:00",
+                            "description": "Guided visit with time to explore. " * 4,
+                            "cost": {"amount": 25.0 + a, "currency": "EUR"},
+                        }
+                        for a in range(8)
+                    ],
+                }
+                for d in range(days)
+            ],
+            "tips": ["Book museum tickets ahead"] * 10,
+        }
+    if section_type == "weather":
+        return {
+            "climate_info": {"climate_type": "Temperate", "best_months": "May-September"},
+            "forecast": [
+                {"date": start + timedelta(days=d), "high": 24.0, "low": 15.0, "precip": 0.2}
+                for d in range(days)
+            ],
+            "packing_suggestions": [{"item": f"Item {i}"} for i in range(15)],
+        }
+    if section_type == "attractions":
+        return {
+            "top_attractions": [
+                {
+                    "name": f"Attraction {i}",
+                    "category": "museum",
+                    "rating": 4.5,
+                    "location": {"lat": 48.85 + i / 1000, "lon": 2.35},
+                    "description": "A notable place worth a visit. " * 6,
+                    "last_checked": datetime(2025, 5, 1, 12, 0),
+                }
+                for i in range(60)
+            ]
+        }
+    if section_type == "visa":
+        return {
+            "visa_requirement": {
+                "visa_required": False,
+                "visa_type": "visa-free",
+                "max_stay_days": 90,
+            },
+            "application_process": {"processing_time": "N/A"},
+            "entry_requirements": {"passport_validity": "3 months"},
+            "warnings": ["Register on arrival"] * 3,
+            "tips": ["Carry a copy of your passport"] * 5,
+        }
+    if section_type == "flight":
+        return {
+            "price_range": {"min": 420.0, "max": 1200.0, "average": 690.0},
+            "airport_info": {"origin": "BOS", "destination": "CDG"},
+            "offers": [
+                {"price": 420.0 + 30 * i, "departure": datetime(2025, 6, 1, 8 + i % 10)}
+                for i in range(20)
+            ],
+            "booking_tips": ["Book 6-8 weeks ahead"] * 5,
+        }
+    return {
+        "capital": "Paris",
+        "official_languages": ["French"],
+        "currencies": ["EUR"],
+        "time_zones": ["UTC+1"],
+        "safety_rating": 4.2,
+        "highlights": [f"{section_type} note {i}: " + "detail " * 20 for i in range(25)],
+    }
+
+
+@pytest.fixture(scope="session")
+def rng():
+    return random.Random(20250601)
+
+
+@pytest.fixture(scope="session")
+def trip(rng):
+    return trip_row(rng, 0, status="pending")
+
+
+@pytest.fixture(scope="session")
+def trip_page(rng):
+    """A full page of list_trips rows (the endpoint's maximum limit)."""
+    return [trip_row(rng, i) for i in range(100)]
+
+
+@pytest.fixture(scope="session")
+def completed_trips(rng):
+    """A frequent traveller's completed trips, for the stats aggregation."""
+    return [trip_row(rng, i, status="completed") for i in range(2000)]
+
+
+@pytest.fixture(scope="session")
+def agent_results():
+    """Section contents as the agents return them (dates and datetimes included)."""
+    return {section_type: section_content(section_type) for section_type in EXPECTED_SECTIONS}
+
+
+@pytest.fixture(scope="session")
+def section_contents(agent_results):
+    """Section contents as stored (JSON)."""
+    return json.loads(json.dumps(agent_results, default=str))
+
+
+@pytest.fixture(scope="session")
+def report_section_rows(section_contents):
+    """report_sections rows: three generations of every section (only the latest is used)."""
+    return [
+        {
+            "trip_id": "trip-00000",
+            "section_type": section_type,
+            "title": section_type.title(),
+            "content": content,
+            "confidence_score": 80 + generation,
+            "generated_at": f"2025-05-0{generation + 1}T12:00:00Z",
+            "sources": [{"url": f"https://source.example/{i}"} for i in range(5)],
+        }
+        for generation in range(3)
+        for section_type, content in section_contents.items()
+    ]
+
+
+@pytest.fixture(scope="session")
+def report_sections(section_contents):
+    return {
+        section_type: ReportSection(
+            section_type=section_type,
+            title=section_type.title(),
+            content=content,
+            confidence_score=0.85,
+            generated_at=datetime(2025, 5, 1, 12, 0),
+        )
+        for section_type, content in section_contents.items()
+    }
@@ -0,0 +1,199 @@
+"""Microbenchmarks for trip, report and version hot paths"""
+
+import asyncio
+import copy
+from datetime import date, datetime
+
+import pytest
+
+from app.agents.orchestrator.agent import OrchestratorAgent
+from app.api.history import _aggregate_travel_stats
+from app.api.trips import _trip_list_item
+from app.services import trip_versions
+from app.services.change_detector import ChangeDetector
+from app.services.pdf_generator import PDFGenerator
+from app.services.report_aggregator import AggregatedReport, ReportAggregator, TripInfo
+from app.services.trip_versions import compute_delta, compare_versions
+from app.tasks.agent_jobs import _build_agent_base_input, _normalize_trip_data
+from benchmarks.fakes import InMemorySupabase
+
+pytestmark = pytest.mark.unit()
+
+
+# ============================================================================
+# Trips
+# ============================================================================
+
+
+@pytest.mark.benchmark(group="trips")
+def test_normalize_trip_data(benchmark, trip):
+    normalized = benchmark(_normalize_trip_data, trip)
+
+    assert normalized["traveler"]["origin_city"] == "Boston"
+
+
+@pytest.mark.benchmark(group="trips")
+def test_agent_base_input(benchmark, trip):
+    base_input = benchmark(lambda: _build_agent_base_input(_normalize_trip_data(trip)))
+
+    assert base_input["trip_purpose"] == "tourism"
+
+
+@pytest.mark.benchmark(group="trips")
+def test_list_trips_page(benchmark, trip_page):
+    today = date(2025, 6, 1)
+
+    items = benchmark(lambda: [_trip_list_item(trip, today) for trip in trip_page])
+
+    assert len(items) == 100
+
+
+@pytest.mark.benchmark(group="trips")
+def test_travel_stats(benchmark, completed_trips):
+    stats = benchmark(_aggregate_travel_stats, completed_trips, datetime(2025, 6, 1))
+
+    assert stats.stats.total_trips == 2000
+
+
+@pytest.mark.benchmark(group="trips")
+def test_detect_changes(benchmark, trip):
+    edited = copy.deepcopy(trip)
+    edited["destinations"][0]["city"] = "Lyon"
+    edited["trip_details"]["returnDate"] = "2027-01-01"
+    edited["trip_details"]["budget"] += 500
+    edited["preferences"]["interests"] = ["food", "wine"]
+
+    result = benchmark(ChangeDetector().detect_changes, trip, edited)
+
+    assert result.has_changes
+
+
+# ============================================================================
+# Versions
+# ============================================================================
+
+
+@pytest.fixture()
+def version_rows(trip, monkeypatch):
+    """Versions 1-9 as deltas on keyframe 1, and keyframe 11 with a delta in 15."""
+    notes = {f"day_{d}": {"plan": "Walk the old town. " * 10, "budget": 100 + d} for d in range(50)}
+    keyframe = {**trip, "notes": notes}
+
+    versions = {1: keyframe}
+    for number in range(2, 10):
+        version = copy.deepcopy(versions[number - 1])
+        version["notes"][f"day_{number}"]["budget"] += 25
+        version["preferences"]["interests"] = [*version["preferences"]["interests"][1:], "art"]
+        versions[number] = version
+    versions[11] = copy.deepcopy(versions[9])
+    versions[11]["destinations"] = [{"city": "Osaka", "country": "Japan"}]
+    versions[15] = copy.deepcopy(versions[11])
+    versions[15]["trip_details"]["budget"] = 9999
+
+    rows = {}
+    for number, data in versions.items():
+        base = 11 if number == 15 else 1
+        if number in (1, 11):
+            rows[number] = {"version_number": number, "storage_kind": "keyframe", "trip_data": data}
+        else:
+            rows[number] = {
+                "version_number": number,
+                "storage_kind": "delta",
+                "base_version": base,
+                "delta": compute_delta(versions[base], data),
+            }
+    monkeypatch.setattr(
+        trip_versions,
+        "_fetch_version_rows",
+        lambda trip_id, numbers: {n: rows[n] for n in {*numbers, 1, 11}},
+    )
+    return rows
+
+
+@pytest.mark.benchmark(group="versions")
+def test_compare_versions_from_deltas(benchmark, version_rows):
+    changes = benchmark(compare_versions, "trip-00000", 2, 9)
+
+    assert changes
+
+
+@pytest.mark.benchmark(group="versions")
+def test_compare_versions_reconstructed(benchmark, version_rows):
+    changes = benchmark(compare_versions, "trip-00000", 1, 15)
+
+    assert any(field == "destinations" for field, _, _ in changes)
+
+
+# ============================================================================
+# Reports
+# ============================================================================
+
+
+@pytest.mark.benchmark(group="reports")
+def test_serialize_for_json(benchmark, agent_results, report_sections):
+    report = {
+        "trip_id": "trip-00000",
+        "generated_at": datetime(2025, 5, 1, 12, 0),
+        "sections": agent_results,
+        "section_models": list(report_sections.values()),
+    }
+
+    serialized = benchmark(OrchestratorAgent()._serialize_for_json, report)
+
+    assert isinstance(serialized["generated_at"], str)
+
+
+@pytest.mark.benchmark(group="reports")
+def test_aggregate_report(benchmark, report_section_rows):
+    aggregator = ReportAggregator()
+    aggregator.supabase = InMemorySupabase()
+    aggregator.supabase.tables = {
+        "trips": [
+            {
+                "id": "trip-00000",
+                "destination_country": "France",
+                "destination_city": "Paris",
+                "departure_date": "2025-06-01",
+                "return_date": "2025-06-14",
+                "status": "completed",
+                "created_at": "2025-05-01T12:00:00Z",
+            }
+        ],
+        "report_sections": report_section_rows,
+    }
+    loop = asyncio.new_event_loop()
+
+    try:
+        report = benchmark(
+            lambda: loop.run_until_complete(aggregator.aggregate_report("trip-00000"))
+        )
+    finally:
+        loop.close()
+
+    assert report.is_complete
+
+
+@pytest.mark.benchmark(group="reports")
+def test_generate_pdf_html(benchmark, report_sections):
+    report = AggregatedReport(
+        trip_id="trip-00000",
+        trip_info=TripInfo(
+            trip_id="trip-00000",
+            title="Trip to Paris",
+            destination_country="France",
+            destination_city="Paris",
+            departure_date="2025-06-01",
+            return_date="2025-06-14",
+            travelers=3,
+            status="completed",
+            created_at=datetime(2025, 5, 1, 12, 0),
+        ),
+        sections=report_sections,
+        available_sections=list(report_sections),
+        is_complete=True,
+    )
+
+    html = benchmark(PDFGenerator()._generate_html, report)
+
+    assert "Activity 6-3" in html
+    assert "+ 7 more days" in html
@@ -0,0 +1,136 @@
+"""Tests for the offline airport database."""
+
+import json
+
+import pytest
+
+from app.agents.flight.tools import get_airport_info
+from app.services.airports import airport_code, get_airport_database
+from app.services.airports.airports import REGION_AIRPORTS
+
+
+@pytest.fixture(scope="module")
+def database():
+    return get_airport_database()
+
+
+def codes(airports):
+    return [a.iata for a in airports]
+
+
+class TestCodes:
+    """Tests for code lookups."""
+
+    def test_airport_by_iata_and_icao(self, database):
+        jfk = database.airport("jfk")
+
+        assert (jfk.icao, jfk.city, jfk.country) == ("KJFK", "New York", "US")
+        assert jfk.timezone == "America/New_York"
+        assert database.airport("EGLL").iata == "LHR"
+
+    def test_metro_area(self, database):
+        assert database.metro("LON").airports[:2] == ("LHR", "LGW")
+        assert database.metro_of(database.airport("ORY")).code == "PAR"
+        assert database.metro_of(database.airport("CUZ")) is None
+
+    def test_metro_airports_exist(self, database):
+        for metro in database.metros.values():
+            assert all(database.airport(code) for code in metro.airports), metro.code
+
+
+class TestResolve:
+    """Tests for resolving free-form locations."""
+
+    @pytest.mark.parametrize(
+        ("location", "expected"),
+        [
+            ("JFK", ["JFK"]),
+            ("NYC", ["JFK", "EWR", "LGA"]),
+            ("New York", ["JFK", "EWR", "LGA"]),
+            ("tokyo", ["HND", "NRT"]),
+        ],
+    )
+    def test_codes_and_metro_names(self, database, location, expected):
+        assert codes(database.resolve(location)) == expected
+
+    def test_city_names(self, database):
+        assert codes(database.resolve("Lisbon")) == ["LIS"]
+        assert codes(database.resolve("Sao Paulo"))[0] == "GRU"
+        assert codes(database.resolve("Kraków")) == ["KRK"]
+
+    def test_country_disambiguates(self, database):
+        assert codes(database.resolve("London", "Canada")) == ["YXU"]
+        assert codes(database.resolve("London, Canada")) == ["YXU"]
+        assert codes(database.resolve("Paris, France"))[0] == "CDG"
+
+    def test_city_without_airport_uses_nearby_airports(self, database):
+        airports = database.resolve("Kyoto")
+
+        assert {"ITM", "KIX"} <= set(codes(airports))
+        assert all(a.country == "JP" for a in airports)
+
+    def test_airport_name(self, database):
+        assert codes(database.resolve("Heathrow")) == ["LHR"]
+
+    @pytest.mark.parametrize(
+        ("location", "expected"),
+        [
+            ("Bali", "DPS"),
+            ("Bali, Indonesia", "DPS"),
+            ("Maui", "OGG"),
+            ("Tuscany", "FLR"),
+            ("Amalfi Coast", "NAP"),
+            ("Côte d'Azur", "NCE"),
+            ("Sicily, Italy", "PMO"),
+            ("Phuket", "HKT"),
+            ("Santorini", "JTR"),
+        ],
+    )
+    def test_region_destinations(self, location, expected):
+        assert airport_code(location) == expected
+
+    def test_region_table_airports_exist(self, database):
+        for region, airports in REGION_AIRPORTS.items():
+            assert all(database.airport(code) for code in airports), region
+
+    def test_country_outside_region_falls_back_to_cities(self, database):
+        assert codes(database.resolve("Bali", "Cameroon")) == ["BLC"]
+
+    @pytest.mark.parametrize(
+        ("location", "expected"),
+        [("Dublin", "DUB"), ("Florence", "FLR"), ("Naples", "NAP"), ("Valencia", "VLC")],
+    )
+    def test_gazetteer_country_wins_over_small_namesakes(self, location, expected):
+        assert airport_code(location) == expected
+
+    def test_non_country_qualifier_is_not_dropped(self, database):
+        assert database.resolve("Paris, Texas") == []
+        assert database.resolve("Shibuya, Tokyo, Japan") == []
+
+    def test_unknown_location(self, database):
+        assert database.resolve("Nowhereville") == []
+        assert database.resolve("  ") == []
+        assert airport_code("Nowhereville") is None
+
+    def test_airport_code(self):
+        assert airport_code("London") == "LHR"
+        assert airport_code("Frankfurt") == "FRA"
+
+
+class TestAirportInfoTool:
+    """Tests for the flight agent's airport tool."""
+
+    def test_returns_airports_with_distances(self):
+        result = json.loads(get_airport_info.func("Paris", "France"))
+
+        assert result["main_airport"] == "CDG"
+        cdg = result["airports"][0]
+        assert cdg["icao"] == "LFPG"
+        assert cdg["metro_code"] == "PAR"
+        assert 15 < cdg["distance_to_city_km"] < 35
+
+    def test_unknown_city(self):
+        result = json.loads(get_airport_info.func("Nowhereville"))
+
+        assert "error" in result
+        assert "airports" not in result
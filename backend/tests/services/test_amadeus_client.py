@@ -12,9 +12,11 @@ Covers:
 from datetime import date
 from unittest.mock import MagicMock, patch
 
+import fakeredis
 import httpx
 import pytest
 
+from app.core.oauth_tokens import SharedTokenCache
 from app.services.flight.amadeus_client import (
     AmadeusFlightClient,
     FlightOffer,
@@ -23,16 +25,23 @@ from app.services.flight.amadeus_client import (
 )
 
 
+@pytest.fixture
+def token_cache():
+    """Token cache isolated from other tests"""
+    return SharedTokenCache(redis_client=fakeredis.FakeRedis(decode_responses=True))
+
+
 class TestAmadeusFlightClient:
     """Test suite for AmadeusFlightClient"""
 
     @pytest.fixture
-    def client(self):
+    def client(self, token_cache):
         """Create a test client"""
         return AmadeusFlightClient(
             api_key="test_api_key",
             api_secret="test_api_secret",
             test_mode=True,
+            token_cache=token_cache,
         )
 
     @pytest.fixture
@@ -141,7 +150,7 @@ class TestAmadeusFlightClient:
             mock_response = MagicMock()
             mock_response.json.return_value = mock_token_response
             mock_response.raise_for_status = MagicMock()
-            mock_client.return_value.__enter__.return_value.post.return_value = (
+            mock_client.return_value.post.return_value = (
                 mock_response
             )
 
@@ -172,7 +181,7 @@ class TestAmadeusFlightClient:
             mock_response = MagicMock()
             mock_response.json.return_value = mock_token_response
             mock_response.raise_for_status = MagicMock()
-            mock_client.return_value.__enter__.return_value.post.return_value = (
+            mock_client.return_value.post.return_value = (
                 mock_response
             )
 
@@ -180,6 +189,67 @@ class TestAmadeusFlightClient:
 
             assert token == "test_access_token_123"
 
+    def test_token_shared_between_instances(self, client, token_cache, mock_token_response):
+        """Test a new instance reuses the token instead of re-authenticating"""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json=mock_token_response)
+
+        client._sync_client = httpx.Client(transport=httpx.MockTransport(handler))
+        client._get_access_token()
+
+        other = AmadeusFlightClient(
+            api_key="test_api_key", api_secret="test_api_secret", token_cache=token_cache
+        )
+
+        assert other._get_access_token() == "test_access_token_123"
+        assert len(requests) == 1
+
+    def test_token_not_shared_between_credentials(self, client, token_cache):
+        """Test different API keys use different tokens"""
+        other = AmadeusFlightClient(
+            api_key="other_key", api_secret="test_api_secret", token_cache=token_cache
+        )
+
+        assert other._token_name != client._token_name
+        assert "test_api_key" not in client._token_name
+
+    def test_rejected_token_is_refreshed_and_request_retried(
+        self, client, token_cache, mock_token_response
+    ):
+        """Test a 401 invalidates the shared token and retries once with a new one"""
+        token_cache.put(client._token_name, "revoked_token", 1800)
+        authorizations = []
+
+        def handler(request):
+            if request.url.path.endswith("/oauth2/token"):
+                return httpx.Response(200, json=mock_token_response)
+            authorizations.append(request.headers["Authorization"])
+            if request.headers["Authorization"] == "Bearer revoked_token":
+                return httpx.Response(401, json={"errors": [{"code": 38192}]})
+            return httpx.Response(200, json={"data": []})
+
+        client._sync_client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        assert "error" in client.get_airport_info("JFK")
+        assert authorizations == ["Bearer revoked_token", "Bearer test_access_token_123"]
+        assert token_cache.get(client._token_name)[0] == "test_access_token_123"
+
+    def test_second_rejection_is_raised(self, client, mock_token_response):
+        """Test the request is only retried once"""
+
+        def handler(request):
+            if request.url.path.endswith("/oauth2/token"):
+                return httpx.Response(200, json=mock_token_response)
+            return httpx.Response(401)
+
+        client._sync_client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            client.get_airport_info("JFK")
+
     # ===========================================
     # Flight Search Tests
     # ===========================================
@@ -200,7 +270,7 @@ class TestAmadeusFlightClient:
             search_response.raise_for_status = MagicMock()
 
             # Configure mock to return different responses
-            mock_context = mock_client.return_value.__enter__.return_value
+            mock_context = mock_client.return_value
             mock_context.post.return_value = token_response
             mock_context.get.return_value = search_response
 
@@ -230,7 +300,7 @@ class TestAmadeusFlightClient:
             search_response.json.return_value = mock_flight_response
             search_response.raise_for_status = MagicMock()
 
-            mock_context = mock_client.return_value.__enter__.return_value
+            mock_context = mock_client.return_value
             mock_context.post.return_value = token_response
             mock_context.get.return_value = search_response
 
@@ -262,7 +332,7 @@ class TestAmadeusFlightClient:
             search_response.json.return_value = mock_flight_response
             search_response.raise_for_status = MagicMock()
 
-            mock_context = mock_client.return_value.__enter__.return_value
+            mock_context = mock_client.return_value
             mock_context.post.return_value = token_response
             mock_context.get.return_value = search_response
 
@@ -330,7 +400,7 @@ class TestAmadeusFlightClient:
             airport_response.json.return_value = mock_airport_response
             airport_response.raise_for_status = MagicMock()
 
-            mock_context = mock_client.return_value.__enter__.return_value
+            mock_context = mock_client.return_value
             mock_context.post.return_value = token_response
             mock_context.get.return_value = airport_response
 
@@ -351,7 +421,7 @@ class TestAmadeusFlightClient:
             airport_response.json.return_value = {"data": []}
             airport_response.raise_for_status = MagicMock()
 
-            mock_context = mock_client.return_value.__enter__.return_value
+            mock_context = mock_client.return_value
             mock_context.post.return_value = token_response
             mock_context.get.return_value = airport_response
 
@@ -481,12 +551,13 @@ class TestAmadeusFlightClientAsync:
     """Async test suite for AmadeusFlightClient"""
 
     @pytest.fixture
-    def client(self):
+    def client(self, token_cache):
         """Create a test client"""
         return AmadeusFlightClient(
             api_key="test_api_key",
             api_secret="test_api_secret",
             test_mode=True,
+            token_cache=token_cache,
         )
 
     @pytest.fixture
@@ -568,6 +639,29 @@ class TestAmadeusFlightClientAsync:
             assert isinstance(result, FlightSearchResult)
             assert result.total_offers == 1
 
+    async def test_search_flights_async_retries_rejected_token(
+        self, client, token_cache, mock_token_response, mock_flight_response
+    ):
+        """Test a 401 on an async search refreshes the token and retries once"""
+        token_cache.put(client._token_name, "revoked_token", 1800)
+
+        def handler(request):
+            if request.url.path.endswith("/oauth2/token"):
+                return httpx.Response(200, json=mock_token_response)
+            if request.headers["Authorization"] == "Bearer revoked_token":
+                return httpx.Response(401)
+            return httpx.Response(200, json=mock_flight_response)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            result = await client.search_flights_async(
+                origin="JFK",
+                destination="LHR",
+                departure_date=date(2025, 6, 15),
+                http_client=http_client,
+            )
+
+        assert result.total_offers == 1
+
 
 # ===========================================
 # Integration Tests (skipped if no API key)
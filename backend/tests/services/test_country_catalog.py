@@ -0,0 +1,185 @@
+"""Tests for the in-memory country catalog."""
+
+import json
+
+import fakeredis
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services.country.catalog import SNAPSHOT_KEY, CountryCatalog
+from app.services.country.rest_countries_client import CountryInfo, RestCountriesClient
+
+
+def make_country(cca2, cca3, name, official, currency, *, alt_spellings=()):
+    return CountryInfo(
+        name_common=name,
+        name_official=official,
+        cca2=cca2,
+        cca3=cca3,
+        region="Europe",
+        population=1000,
+        currencies={currency: {"name": currency, "symbol": "$"}},
+        car_side="right",
+        alt_spellings=list(alt_spellings),
+    )
+
+
+COUNTRIES = [
+    make_country(
+        "FR",
+        "FRA",
+        "France",
+        "French Republic",
+        "EUR",
+        alt_spellings=["FR", "République française"],
+    ),
+    make_country(
+        "GB",
+        "GBR",
+        "United Kingdom",
+        "United Kingdom of Great Britain",
+        "GBP",
+        alt_spellings=["UK"],
+    ),
+    make_country("CI", "CIV", "Ivory Coast", "Republic of Côte d'Ivoire", "XOF"),
+]
+
+
+class FakeRestCountries:
+    """Returns the test countries, or raises a configured error."""
+
+    def __init__(self):
+        self.calls = 0
+        self.error = None
+
+    def get_all_countries_sync(self):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return COUNTRIES
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def api():
+    return FakeRestCountries()
+
+
+@pytest.fixture
+def catalog(api, redis_client):
+    return CountryCatalog(client=api, redis_client=redis_client)
+
+
+class TestLookups:
+    """Tests for code, name and alias lookups."""
+
+    @pytest.mark.parametrize(
+        "query",
+        ["FR", "fra", "France", "french republic", "Republique Francaise", "  france "],
+    )
+    def test_resolves_codes_names_and_spellings(self, catalog, query):
+        assert catalog.get(query).cca2 == "FR"
+
+    def test_resolves_gazetteer_aliases(self, catalog):
+        assert catalog.get("England").cca2 == "GB"
+        assert catalog.get("Cote d'Ivoire").cca2 == "CI"
+
+    def test_unknown_country(self, catalog):
+        assert catalog.get("Atlantis") is None
+        assert catalog.get("") is None
+
+    def test_currencies(self, catalog):
+        assert list(catalog.currencies("UK")) == ["GBP"]
+        assert catalog.currencies("Atlantis") == {}
+
+    def test_fetches_once_for_many_lookups(self, catalog, api):
+        for name in ("France", "GB", "CIV", "Atlantis"):
+            catalog.get(name)
+
+        assert api.calls == 1
+
+
+class TestSnapshot:
+    """Tests for the shared snapshot and refresh."""
+
+    def test_snapshot_shared_through_redis(self, catalog, api, redis_client):
+        catalog.refresh()
+
+        other = CountryCatalog(client=api, redis_client=redis_client)
+        assert other.get("France").currencies == {"EUR": {"name": "EUR", "symbol": "$"}}
+        assert len(other) == 3
+        assert api.calls == 1
+
+    def test_snapshot_is_compact(self, catalog, redis_client):
+        catalog.refresh()
+
+        stored = json.loads(redis_client.get(SNAPSHOT_KEY))["countries"][0]
+        assert "subregion" not in stored
+        assert stored["cca2"] == "FR"
+
+    def test_workers_pick_up_a_refreshed_snapshot(self, catalog, api, redis_client, monkeypatch):
+        catalog.get("France")
+        refreshed = CountryCatalog(client=api, redis_client=redis_client)
+        refreshed.refresh()
+
+        monkeypatch.setattr(settings, "COUNTRY_CATALOG_RELOAD_SECONDS", 0)
+        catalog.get("France")
+        assert catalog.fetched_at == refreshed.fetched_at
+
+    def test_failed_fetch_is_not_retried_immediately(self, catalog, api):
+        api.error = httpx.ConnectError("offline")
+
+        assert catalog.get("France") is None
+        assert catalog.get("Japan") is None
+        assert api.calls == 1
+
+    def test_works_without_redis(self, api, mocker):
+        mocker.patch("app.services.country.catalog.get_redis_client", return_value=None)
+        catalog = CountryCatalog(client=api)
+
+        assert catalog.get("France").cca3 == "FRA"
+        assert catalog.get("GBR").cca2 == "GB"
+        assert api.calls == 1
+
+
+class TestBulkFetch:
+    """Tests for RestCountriesClient.get_all_countries_sync."""
+
+    def test_merges_field_groups(self):
+        def handler(request):
+            fields = request.url.params["fields"]
+            if fields.startswith("name"):
+                body = [
+                    {
+                        "name": {"common": "Japan", "official": "Japan"},
+                        "cca2": "JP",
+                        "cca3": "JPN",
+                        "altSpellings": ["Nippon"],
+                        "region": "Asia",
+                        "population": 125000000,
+                    }
+                ]
+            else:
+                body = [
+                    {
+                        "cca3": "JPN",
+                        "currencies": {"JPY": {"name": "Japanese yen", "symbol": "¥"}},
+                        "car": {"side": "left"},
+                    }
+                ]
+            return httpx.Response(200, json=body)
+
+        client = RestCountriesClient()
+        client._sync_client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        (japan,) = client.get_all_countries_sync()
+
+        assert japan.cca2 == "JP"
+        assert japan.alt_spellings == ["Nippon"]
+        assert list(japan.currencies) == ["JPY"]
+        assert japan.car_side == "left"
@@ -0,0 +1,239 @@
+"""Tests for the learned agent duration estimates."""
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import trips
+from app.core import metrics
+from app.core.auth import verify_jwt_token
+from app.core.config import settings
+from app.main import app
+from app.services import duration_estimator
+from app.services.change_detector import ChangeDetector
+from app.services.duration_estimator import GAP, AgentDurationEstimator, DurationStats
+
+
+def orchestrator_row(completed_at, agents, *, started_at="2026-10-01T10:00:00+00:00"):
+    return {
+        "agent_type": "orchestrator",
+        "started_at": started_at,
+        "completed_at": completed_at,
+        "agents": agents,
+    }
+
+
+def agent_run(seconds, tier="fast", status="ok"):
+    return {"duration_ms": seconds * 1000, "status": status, "model_tier": tier}
+
+
+@pytest.fixture()
+def redis_client():
+    return fakeredis.FakeRedis()
+
+
+@pytest.fixture()
+def estimator(redis_client):
+    return AgentDurationEstimator(redis_client=redis_client)
+
+
+def supabase_returning(mocker, *batches):
+    supabase = mocker.Mock()
+    query = supabase.table.return_value.select.return_value.eq.return_value.gt.return_value
+    query.order.return_value.limit.return_value.execute.side_effect = [
+        mocker.Mock(data=rows) for rows in batches
+    ]
+    return supabase, query
+
+
+@pytest.mark.unit()
+class TestEstimates:
+    """Test defaults, learned means, quantiles and ETAs"""
+
+    def test_defaults_until_enough_runs(self, estimator):
+        for _ in range(settings.ETA_MIN_SAMPLES - 1):
+            estimator.observe("itinerary", 90)
+
+        assert estimator.expected_seconds("itinerary") == 25
+        assert estimator.expected_seconds("unknown") == 15
+        assert estimator.expected_seconds("itinerary", cache_hit=True) == 0
+
+    def test_ewma_follows_recent_runs(self, estimator):
+        for seconds in [60, 60, 60, 120]:
+            estimator.observe("visa", seconds)
+
+        assert estimator.expected_seconds("visa") == pytest.approx(72)
+
+    def test_quantiles_of_recent_runs(self):
+        stats = DurationStats()
+        for seconds in range(1, 11):
+            stats.add(seconds, alpha=0.2)
+
+        assert stats.quantile(0.5) == pytest.approx(5.5)
+        assert stats.quantile(0.9) == pytest.approx(9.1)
+
+    def test_current_tier_wins_over_other_tiers(self, estimator):
+        for _ in range(3):
+            estimator.observe("food", 40, tier="standard")
+            estimator.observe("food", 12, tier="fast")
+        estimator.observe("food", 40, tier="standard")
+
+        estimator.tiers = {"food": "fast"}
+        assert estimator.expected_seconds("food") == 12
+        estimator.tiers = {"food": "large"}  # Not observed yet: most-observed tier
+        assert estimator.expected_seconds("food") == 40
+
+    def test_remaining_seconds_counts_running_agent_and_gaps(self, estimator):
+        remaining = estimator.remaining_seconds(["attractions", "itinerary"], elapsed=15)
+
+        # 5s left of attractions, a 5s gap, then itinerary
+        assert remaining == 5 + 5 + 25
+
+    def test_recalc_time_uses_learned_durations(self, estimator, mocker):
+        mocker.patch.object(duration_estimator, "_duration_estimator", estimator)
+        for _ in range(3):
+            estimator.observe("weather", 42)
+
+        assert ChangeDetector().estimate_recalc_time(["weather", "visa"]) == 42 + 15
+
+
+@pytest.mark.unit()
+class TestLearning:
+    """Test folding agent_jobs rows into the estimates"""
+
+    def test_orchestrator_telemetry_and_gap(self, estimator):
+        row = orchestrator_row(
+            "2026-10-01T10:01:40+00:00",
+            {
+                "visa": agent_run(30),
+                "itinerary": agent_run(60, "large"),
+                "food": agent_run(5, status="error"),
+            },
+        )
+
+        assert estimator.observe_job(row) == 2
+        assert estimator.stats["visa:fast"].mean == 30
+        assert estimator.stats["itinerary:large"].mean == 60
+        assert "food:fast" not in estimator.stats
+        assert estimator.stats[f"{GAP}:default"].mean == 5  # (100s - 90s) / 2 agents
+
+    def test_single_agent_rows_mixing_timestamp_formats(self, estimator):
+        estimator.tiers = {"weather": "fast"}
+
+        estimator.observe_job(
+            {
+                "agent_type": "weather",
+                "started_at": "2026-10-01T10:00:00",
+                "completed_at": "2026-10-01T10:00:20Z",
+            }
+        )
+
+        assert estimator.stats["weather:fast"].mean == 20
+
+    def test_refresh_pages_rows_and_shares_snapshot(self, estimator, redis_client, mocker):
+        mocker.patch.object(settings, "ETA_REFRESH_BATCH", 2)
+        rows = [
+            orchestrator_row(f"2026-10-01T10:0{i}:00+00:00", {"culture": agent_run(20 + i)})
+            for i in range(1, 4)
+        ]
+        supabase, query = supabase_returning(mocker, rows[:2], rows[2:])
+
+        assert estimator.refresh(supabase, tiers={"culture": "standard"}) == 3
+
+        assert query.order.return_value.limit.return_value.execute.call_count == 2
+        assert query.order.call_args.args == ("completed_at",)
+        shared = AgentDurationEstimator(redis_client=redis_client)
+        assert shared.load()
+        assert shared.cursor == "2026-10-01T10:03:00+00:00"
+        assert shared.tiers == {"culture": "standard"}
+        assert shared.expected_seconds("culture") == estimator.expected_seconds("culture")
+
+    def test_refresh_continues_from_cursor(self, estimator, mocker):
+        supabase, _ = supabase_returning(mocker, [])
+        estimator.cursor = "2026-10-01T10:03:00+00:00"
+        estimator.refresh(supabase)  # stores the cursor
+
+        supabase, _ = supabase_returning(mocker, [])
+        AgentDurationEstimator(redis_client=estimator.redis).refresh(supabase)
+
+        supabase.table.return_value.select.return_value.eq.return_value.gt.assert_called_with(
+            "completed_at", "2026-10-01T10:03:00+00:00"
+        )
+
+
+@pytest.mark.unit()
+class TestQueueAdmission:
+    """Test the queue wait estimate used to admit report generation"""
+
+    def test_wait_scales_with_generation_queue_and_worker_slots(self, estimator, mocker):
+        mocker.patch.object(duration_estimator, "_duration_estimator", estimator)
+        mocker.patch.object(settings, "GENERATION_WORKER_SLOTS", 2)
+        mocker.patch.object(settings, "GENERATION_QUEUE", "reports")
+        depth = mocker.patch.object(trips, "queue_depth", return_value=3)
+        report = estimator.report_seconds(trips._report_agents(None))
+
+        assert trips._estimated_queue_wait() == 2 * report
+        depth.assert_called_once_with("reports")
+
+    def test_unknown_when_broker_unreadable(self, mocker):
+        mocker.patch.object(trips, "queue_depth", return_value=None)
+
+        assert trips._estimated_queue_wait() is None
+
+    def test_queue_depth_reads_only_the_given_queue(self, mocker):
+        broker = fakeredis.FakeRedis()
+        broker.rpush("reports", "a", "b")
+        broker.rpush("celery", "c")
+        collector = metrics.QueueDepthCollector(["celery"], redis_client=broker)
+        mocker.patch.object(metrics, "_get_queue_collector", return_value=collector)
+
+        assert metrics.queue_depth("reports") == 2
+
+    def test_flight_agent_runs_only_with_an_origin_city(self):
+        assert "flight" not in trips._report_agents({"originCity": ""})
+        assert trips._report_agents({"originCity": "Boston"})[-1] == "flight"
+
+
+@pytest.mark.unit()
+class TestStatusEta:
+    """Test the generation status ETA over the agents that will run"""
+
+    @pytest.fixture()
+    def status_of(self, mocker, mock_supabase, estimator):
+        mocker.patch.object(duration_estimator, "_duration_estimator", estimator)
+        app.dependency_overrides[verify_jwt_token] = lambda: {"user_id": "user-1"}
+        tables = {
+            "trips": mocker.Mock(),
+            "agent_jobs": mocker.Mock(),
+            "report_sections": mocker.Mock(),
+        }
+        mock_supabase.table.side_effect = tables.__getitem__
+        jobs = tables["agent_jobs"].select.return_value.eq.return_value.eq.return_value
+        jobs.order.return_value.limit.return_value.execute.return_value = mocker.Mock(
+            data=[{"started_at": "2026-10-01T10:00:00+00:00"}]
+        )
+        sections = tables["report_sections"].select.return_value.eq.return_value
+        sections.execute.return_value = mocker.Mock(data=[])
+        trips_query = tables["trips"].select.return_value.eq.return_value.eq.return_value
+
+        def status_of(traveler_details):
+            trip = {
+                "status": "processing",
+                "created_at": "2026-10-01T09:59:00+00:00",
+                "updated_at": "2026-10-01T10:00:00+00:00",
+                "traveler_details": traveler_details,
+            }
+            trips_query.single.return_value.execute.return_value = mocker.Mock(data=trip)
+            return TestClient(app).get("/api/trips/trip-1/status").json()
+
+        yield status_of
+        app.dependency_overrides.clear()
+
+    def test_flight_not_counted_without_origin_city(self, status_of, estimator):
+        with_flight = status_of({"origin_city": "Boston"})
+        without_flight = status_of({})
+
+        flight = estimator.expected_seconds("flight") + estimator.gap_seconds()
+        assert with_flight["eta_seconds"] - without_flight["eta_seconds"] == pytest.approx(
+            flight, abs=1
+        )
@@ -0,0 +1,151 @@
+"""Tests for the exchange rate matrix."""
+
+from datetime import date, timedelta
+
+import fakeredis
+import httpx
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services.currency.rate_matrix import ExchangeRateMatrix, RateSnapshot
+
+TODAY_RATES = {"usd": 1, "eur": 0.9, "jpy": 150.0, "gbp": 0.8, "btc": 0, "name": "x"}
+
+
+class FakeExchangeApi:
+    """Serves rate tables against USD by date, or raises a configured error."""
+
+    def __init__(self):
+        self.calls = []
+        self.error = None
+
+    def get_rate_table(self, base_currency, date_str=None):
+        self.calls.append(date_str)
+        if self.error:
+            raise self.error
+        if date_str:
+            return date.fromisoformat(date_str), {"usd": 1, "eur": 0.5, "jpy": 100.0}
+        return date.today(), TODAY_RATES
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def api():
+    return FakeExchangeApi()
+
+
+@pytest.fixture
+def matrix(api, redis_client):
+    return ExchangeRateMatrix(client=api, redis_client=redis_client, base_currency="USD")
+
+
+class TestRateSnapshot:
+    """Tests for cross rates and vectorized conversion."""
+
+    @pytest.fixture
+    def snapshot(self):
+        return RateSnapshot(date(2026, 1, 5), "USD", TODAY_RATES)
+
+    def test_ignores_invalid_rates(self, snapshot):
+        assert snapshot.codes == ["EUR", "GBP", "JPY", "USD"]
+        assert "btc" not in snapshot
+
+    def test_cross_rate_through_base(self, snapshot):
+        assert snapshot.rate("EUR", "JPY") == pytest.approx(150 / 0.9)
+        assert snapshot.rate("jpy", "usd") == pytest.approx(1 / 150)
+
+    def test_convert_batch(self, snapshot):
+        converted = snapshot.convert([1500, 3000, 0], "JPY", "EUR")
+
+        np.testing.assert_allclose(converted, [9.0, 18.0, 0.0])
+
+    def test_convert_per_amount_currencies(self, snapshot):
+        converted = snapshot.convert([10, 150, 8], ["USD", "JPY", "GBP"], "EUR")
+
+        np.testing.assert_allclose(converted, [9.0, 0.9, 9.0])
+
+    def test_cross_rate_matrix(self, snapshot):
+        rates = snapshot.cross_rates(["USD", "EUR"])
+
+        np.testing.assert_allclose(rates, [[1, 0.9], [1 / 0.9, 1]])
+
+    def test_unknown_currency(self, snapshot):
+        with pytest.raises(ValueError, match="XYZ"):
+            snapshot.convert([1], "XYZ", "USD")
+
+    def test_round_trip(self, snapshot):
+        restored = RateSnapshot.from_dict(snapshot.to_dict())
+
+        assert restored.date == snapshot.date
+        np.testing.assert_array_equal(restored.rates, snapshot.rates)
+
+
+class TestExchangeRateMatrix:
+    """Tests for snapshot storage and refresh."""
+
+    def test_fetches_latest_once_per_interval(self, matrix, api):
+        for _ in range(5):
+            matrix.rate("USD", "JPY")
+
+        assert matrix.convert([100, 200], "USD", "EUR").tolist() == pytest.approx([90, 180])
+        assert api.calls == [None]
+
+    def test_shared_across_instances_through_redis(self, matrix, api, redis_client):
+        matrix.refresh()
+
+        other = ExchangeRateMatrix(client=api, redis_client=redis_client, base_currency="USD")
+        assert other.rate("USD", "GBP") == pytest.approx(0.8)
+        assert api.calls == [None]
+
+    def test_refreshes_when_stale(self, matrix, api, monkeypatch):
+        matrix.latest()
+        monkeypatch.setattr(settings, "FX_REFRESH_SECONDS", -1)
+
+        matrix.latest()
+
+        assert api.calls == [None, None]
+
+    def test_stale_snapshot_serves_when_fetch_fails(self, matrix, api, monkeypatch):
+        matrix.latest()
+        monkeypatch.setattr(settings, "FX_REFRESH_SECONDS", -1)
+        api.error = httpx.ConnectError("offline")
+
+        assert matrix.rate("USD", "EUR") == pytest.approx(0.9)
+        # Failed fetches are not retried on every call
+        matrix.rate("USD", "EUR")
+        assert len(api.calls) == 2
+
+    def test_no_snapshot_and_fetch_fails(self, matrix, api):
+        api.error = httpx.ConnectError("offline")
+
+        with pytest.raises(httpx.ConnectError):
+            matrix.latest()
+        with pytest.raises(ValueError):
+            matrix.latest()
+        assert len(api.calls) == 1
+
+    def test_historical_snapshot_by_date(self, matrix, api):
+        day = date.today() - timedelta(days=30)
+
+        assert matrix.rate("USD", "EUR", on=day) == pytest.approx(0.5)
+        assert matrix.convert([200], "JPY", "EUR", on=day).tolist() == pytest.approx([1.0])
+        assert matrix.snapshot(day).date == day
+        assert api.calls == [day.isoformat()]
+
+    def test_refresh_stores_latest_under_its_date(self, matrix, api):
+        matrix.refresh()
+
+        assert matrix.on(date.today()).rate("USD", "JPY") == pytest.approx(150)
+        assert matrix.store.get(date.today().isoformat())["base"] == "USD"
+
+    def test_exchange_rate_data(self, matrix):
+        data = matrix.exchange_rate("eur", "gbp")
+
+        assert (data.base_currency, data.target_currency) == ("EUR", "GBP")
+        assert data.rate == pytest.approx(0.8 / 0.9)
+        assert data.rate_date == date.today()
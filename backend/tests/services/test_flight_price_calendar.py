@@ -0,0 +1,206 @@
+"""Tests for the flexible-date flight search and price calendar."""
+
+import asyncio
+from datetime import date, timedelta
+
+import fakeredis
+import httpx
+import pytest
+
+from app.services.flight.amadeus_client import AmadeusFlightClient
+from app.services.flight.price_calendar import FlexibleFlightSearch
+from app.services.flight.skyscanner_client import (
+    FlightOffer,
+    FlightSearchResult,
+    FlightSegment,
+    SkyscannerClient,
+)
+
+DEPARTURE = date.today() + timedelta(days=30)
+
+
+def make_offer(price, segments=1):
+    legs = [
+        FlightSegment("JFK", "LHR", "08:00", "20:00", "BA", "British Airways", "178", "420", 0)
+        for _ in range(segments)
+    ]
+    return FlightOffer(price, "USD", "economy", "BA", legs, [], None, None, None, None)
+
+
+class FakeSkyscanner(SkyscannerClient):
+    """Prices fall with the departure day of month; fails configured dates."""
+
+    def __init__(self):
+        super().__init__(api_key="test")
+        self.calls = []
+        self.failing = set()
+        self.active = 0
+        self.max_active = 0
+
+    async def search_flights_async(
+        self, origin, destination, departure_date, return_date=None, **kwargs
+    ):
+        self.calls.append((departure_date, return_date, kwargs))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0)
+        self.active -= 1
+        if departure_date in self.failing:
+            raise httpx.ConnectError("offline")
+        base = 500 + (departure_date - DEPARTURE).days * 10
+        offers = [make_offer(base + 50, segments=2), make_offer(base)]
+        return FlightSearchResult(
+            origin, destination, str(departure_date), None, len(offers), offers, {}
+        )
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def client():
+    return FakeSkyscanner()
+
+
+@pytest.fixture
+def search(client, redis_client):
+    return FlexibleFlightSearch(client, redis_client=redis_client)
+
+
+class TestFlexibleSearch:
+    """Tests for the fan-out, merge and calendar."""
+
+    def test_searches_each_date_in_window(self, search, client):
+        calendar = search.search("jfk", "lhr", DEPARTURE, flex_days=2)
+
+        assert [d.departure_date for d in calendar.days] == [
+            DEPARTURE + timedelta(days=n) for n in range(-2, 3)
+        ]
+        assert len(client.calls) == 5
+        assert calendar.requested.lowest == 500
+        assert calendar.cheapest_day.departure_date == DEPARTURE - timedelta(days=2)
+
+    def test_round_trip_keeps_trip_length(self, search, client):
+        calendar = search.search(
+            "JFK", "LHR", DEPARTURE, DEPARTURE + timedelta(days=7), flex_days=1
+        )
+
+        assert all(d.return_date - d.departure_date == timedelta(days=7) for d in calendar.days)
+        assert {c[1] - c[0] for c in client.calls} == {timedelta(days=7)}
+
+    def test_offers_ranked_across_dates(self, search):
+        calendar = search.search("JFK", "LHR", DEPARTURE, flex_days=1)
+
+        prices = [f.price for f in calendar.offers()]
+        assert prices == sorted(prices)
+        assert calendar.offers(1)[0].departure_date == (DEPARTURE - timedelta(days=1)).isoformat()
+        assert [f.stops for f in calendar.requested_offers()] == [0, 1]
+
+    def test_summary(self, search):
+        summary = search.search("JFK", "LHR", DEPARTURE, flex_days=1).to_dict(offers=2)
+
+        assert summary["requested_price"] == 500
+        assert summary["cheapest_price"] == 490
+        assert summary["savings"] == 10
+        assert len(summary["calendar"]) == 3
+        assert len(summary["best_offers"]) == 2
+
+    def test_skips_past_dates(self, search):
+        today = date.today()
+
+        calendar = search.search("JFK", "LHR", today, flex_days=2)
+
+        assert calendar.days[0].departure_date == today
+        assert len(calendar.days) == 3
+
+    def test_concurrency_is_bounded(self, search, client, mocker):
+        mocker.patch("app.services.flight.price_calendar.settings.FLIGHT_SEARCH_CONCURRENCY", 2)
+
+        search.search("JFK", "LHR", DEPARTURE, flex_days=3)
+
+        assert client.max_active == 2
+
+    def test_failed_date_is_marked_unavailable(self, search, client):
+        client.failing = {DEPARTURE + timedelta(days=1)}
+
+        calendar = search.search("JFK", "LHR", DEPARTURE, flex_days=1)
+
+        assert [d.available for d in calendar.days] == [True, True, False]
+        assert calendar.requested.lowest == 500
+
+
+class TestFareCache:
+    """Tests for the per-date fare cache."""
+
+    def test_overlapping_searches_reuse_dates(self, search, client):
+        search.search("JFK", "LHR", DEPARTURE, flex_days=1)
+        search.search("JFK", "LHR", DEPARTURE + timedelta(days=1), flex_days=1)
+
+        assert len(client.calls) == 4
+
+    def test_cache_shared_through_redis(self, search, client, redis_client):
+        search.search("JFK", "LHR", DEPARTURE)
+
+        other = FlexibleFlightSearch(client, redis_client=redis_client)
+        calendar = other.search("JFK", "LHR", DEPARTURE)
+
+        assert calendar.requested.lowest == 500
+        assert calendar.requested_offers()[0].outbound[0]["flight"] == "BA178"
+        assert len(client.calls) == 1
+
+    def test_cabin_and_passengers_are_separate_entries(self, search, client):
+        search.search("JFK", "LHR", DEPARTURE)
+        search.search("JFK", "LHR", DEPARTURE, cabin_class="business")
+        search.search("JFK", "LHR", DEPARTURE, adults=2)
+
+        assert len(client.calls) == 3
+
+    def test_failed_dates_are_retried(self, search, client):
+        client.failing = {DEPARTURE}
+        search.search("JFK", "LHR", DEPARTURE)
+        client.failing = set()
+
+        assert search.search("JFK", "LHR", DEPARTURE).requested.available
+        assert len(client.calls) == 2
+
+
+class TestProviders:
+    """Tests for provider-specific search arguments."""
+
+    def test_amadeus_authenticates_once(self, redis_client, mocker):
+        client = AmadeusFlightClient(api_key="key", api_secret="secret")
+        authenticate = mocker.patch.object(client, "authenticate_async")
+        searches = mocker.patch.object(
+            client,
+            "search_flights_async",
+            return_value=FlightSearchResult("JFK", "LHR", "", None, 0, [], {}),
+        )
+
+        FlexibleFlightSearch(client, redis_client=redis_client).search(
+            "JFK", "LHR", DEPARTURE, flex_days=1, cabin_class="business"
+        )
+
+        authenticate.assert_awaited_once()
+        assert searches.await_count == 3
+        assert searches.await_args.kwargs["travel_class"] == "BUSINESS"
+
+    def test_skyscanner_async_search_uses_shared_client(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"itineraries": {"results": []}})
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+                return await SkyscannerClient(api_key="test").search_flights_async(
+                    "JFK", "LHR", DEPARTURE, cabin_class="business", http_client=http
+                )
+
+        result = asyncio.run(run())
+
+        assert result.total_offers == 0
+        assert requests[0].url.params["cabinClass"] == "business"
+        assert requests[0].headers["X-RapidAPI-Key"] == "test"
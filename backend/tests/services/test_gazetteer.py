@@ -0,0 +1,133 @@
+"""Tests for the offline gazetteer."""
+
+import pytest
+
+from app.services.gazetteer import City, Country, country_code, get_gazetteer, normalize
+from app.services.gazetteer.build import build
+
+
+@pytest.fixture
+def gazetteer():
+    return get_gazetteer()
+
+
+class TestNormalize:
+    def test_strips_accents_case_and_punctuation(self):
+        assert normalize("Côte d'Ivoire") == "cote divoire"
+        assert normalize("  U.S.A. ") == "usa"
+        assert normalize("Guinea-Bissau") == "guinea bissau"
+
+    def test_drops_leading_article(self):
+        assert normalize("The Netherlands") == "netherlands"
+
+
+class TestCountries:
+    @pytest.mark.parametrize(
+        ("query", "expected"),
+        [
+            ("Japan", "JP"),
+            ("JP", "JP"),
+            ("jpn", "JP"),
+            ("United Kingdom", "GB"),
+            ("England", "GB"),
+            ("usa", "US"),
+            ("United States of America", "US"),
+            ("UAE", "AE"),
+            ("Korea", "KR"),
+            ("Czechia", "CZ"),
+            ("Cote d’Ivoire", "CI"),
+            ("Korea, Republic of", "KR"),
+            ("Korea, Democratic People's Republic of", "KP"),
+            ("Congo, Democratic Republic of the", "CD"),
+            ("Iran, Islamic Republic of", "IR"),
+        ],
+    )
+    def test_names_aliases_and_codes(self, query, expected):
+        assert country_code(query) == expected
+
+    def test_fuzzy_match(self, gazetteer):
+        assert gazetteer.country("Germny").iso2 == "DE"
+        assert gazetteer.country("Germny", fuzzy=False) is None
+
+    def test_unknown(self, gazetteer):
+        assert gazetteer.country("Atlantis") is None
+        assert gazetteer.country("") is None
+        assert country_code("ZZ") is None
+
+    def test_country_fields(self, gazetteer):
+        assert gazetteer.country("France") == Country("FR", "FRA", "France", ())
+
+
+class TestCities:
+    def test_curated_city(self, gazetteer):
+        city = gazetteer.city("Kyoto")
+
+        assert city.country == "JP"
+        assert city.timezone == "Asia/Tokyo"
+        assert city.lat == pytest.approx(35.01, abs=0.1)
+        assert city.lng == pytest.approx(135.77, abs=0.1)
+
+    def test_zone_city_with_alias(self, gazetteer):
+        assert gazetteer.city("Saigon").name == "Ho Chi Minh City"
+        assert gazetteer.city("Tokyo").timezone == "Asia/Tokyo"
+
+    def test_country_filter(self, gazetteer):
+        assert gazetteer.city("Paris", "FR").country == "FR"
+        assert gazetteer.city("Paris", "France").country == "FR"
+        assert gazetteer.city("Paris", "US") is None
+
+    def test_fuzzy_match(self, gazetteer):
+        assert gazetteer.city("Barcelna").name == "Barcelona"
+
+    @pytest.mark.parametrize(
+        ("location", "expected"),
+        [
+            ("Paris", "Paris"),
+            ("Paris, France", "Paris"),
+            ("Kyoto, JP", "Kyoto"),
+            ("Kyoto, JPN", "Kyoto"),
+            ("Seoul, Korea, Republic of", "Seoul"),
+        ],
+    )
+    def test_geocode(self, gazetteer, location, expected):
+        city = gazetteer.geocode(location)
+
+        assert isinstance(city, City)
+        assert city.name == expected
+
+    def test_geocode_unknown(self, gazetteer):
+        assert gazetteer.geocode("Nowhereville") is None
+
+    @pytest.mark.parametrize(
+        "location",
+        ["Paris, Texas", "Paris, TX", "Shibuya, Tokyo", "Shibuya, Tokyo, Japan", "Paris, Japan"],
+    )
+    def test_geocode_leaves_unknown_qualifiers_to_remote_lookup(self, gazetteer, location):
+        assert gazetteer.geocode(location) is None
+
+
+class TestSearch:
+    def test_prefix_search_mixes_countries_and_cities(self, gazetteer):
+        names = [entry.name for entry in gazetteer.search("san")]
+
+        assert "San Francisco" in names
+        assert "San Marino" in names
+        assert all(normalize(n).startswith("san") for n in names)
+
+    def test_alias_prefix_returns_entry_once(self, gazetteer):
+        results = gazetteer.search("united")
+
+        assert len(results) == len({id(r) for r in results})
+        assert "United States" in [r.name for r in results]
+
+    def test_limit_and_empty(self, gazetteer):
+        assert len(gazetteer.search("s", limit=3)) == 3
+        assert gazetteer.search("") == []
+
+
+class TestBundledData:
+    def test_data_file_matches_build(self, gazetteer):
+        document = build()
+
+        assert len(gazetteer.countries) == len(document["countries"]["iso2"])
+        assert len(gazetteer.cities) == len(document["cities"]["name"])
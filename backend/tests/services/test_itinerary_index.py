@@ -0,0 +1,165 @@
+"""Tests for the indexed itinerary model."""
+
+from datetime import date
+
+import pytest
+
+from app.services.currency import RateSnapshot
+from app.services.itinerary_index import IndexedItinerary, ItineraryItemNotFound
+
+
+def _itinerary():
+    return {
+        "days": [
+            {
+                "id": "day-1",
+                "activities": [
+                    {"id": "a", "cost_estimate": 10},
+                    {"id": "b", "cost_estimate": 20},
+                    {"id": "c", "cost_estimate": None},
+                ],
+            },
+            {"id": "day-2", "activities": [{"id": "d", "cost_estimate": 5}]},
+        ],
+        "currency": "USD",
+    }
+
+
+def _assert_consistent(itinerary: IndexedItinerary):
+    """Indexes and costs must match a full recomputation."""
+    fresh = IndexedItinerary(
+        {"days": [dict(d, activities=list(d["activities"])) for d in itinerary.days]}
+    )
+    assert itinerary.total_cost == pytest.approx(fresh.total_cost)
+    for day in itinerary.days:
+        assert itinerary.get_day(day["id"]) is day
+        assert day["total_cost"] == pytest.approx(fresh.day_cost(day["id"]))
+        for activity in day["activities"]:
+            assert itinerary.get_activity(activity["id"]) is activity
+            assert itinerary.day_of_activity(activity["id"]) is day
+
+
+class TestIndexedItinerary:
+    """Tests for IndexedItinerary lookups and incremental costs."""
+
+    def test_initial_costs(self):
+        itinerary = IndexedItinerary(_itinerary())
+
+        assert itinerary.day_cost("day-1") == 30
+        assert itinerary.total_cost == 35
+        assert itinerary.to_dict()["total_cost"] == 35
+
+    def test_move_between_days(self):
+        itinerary = IndexedItinerary(_itinerary())
+
+        itinerary.move_activity("a", "day-2", 0)
+
+        assert [a["id"] for a in itinerary.get_day("day-1")["activities"]] == ["b", "c"]
+        assert [a["id"] for a in itinerary.get_day("day-2")["activities"]] == ["a", "d"]
+        assert itinerary.day_cost("day-2") == 15
+        _assert_consistent(itinerary)
+
+    def test_move_within_day_clamps_position(self):
+        itinerary = IndexedItinerary(_itinerary())
+
+        itinerary.move_activity("a", "day-1", 99)
+
+        assert [a["id"] for a in itinerary.get_day("day-1")["activities"]] == ["b", "c", "a"]
+        _assert_consistent(itinerary)
+
+    def test_update_activity_adjusts_cost(self):
+        itinerary = IndexedItinerary(_itinerary())
+
+        itinerary.update_activity("c", {"cost_estimate": 100})
+
+        assert itinerary.day_cost("day-1") == 130
+        assert itinerary.total_cost == 135
+
+    def test_add_and_remove_days(self):
+        itinerary = IndexedItinerary(_itinerary())
+
+        itinerary.add_day({"id": "day-3", "activities": [{"id": "e", "cost_estimate": 7}]})
+        itinerary.remove_day("day-1")
+
+        assert [d["id"] for d in itinerary.days] == ["day-2", "day-3"]
+        assert itinerary.total_cost == 12
+        with pytest.raises(ItineraryItemNotFound):
+            itinerary.get_activity("a")
+        _assert_consistent(itinerary)
+
+    def test_remove_activity(self):
+        itinerary = IndexedItinerary(_itinerary())
+
+        itinerary.remove_activity("a")
+
+        assert itinerary.get_activity("b") is itinerary.days[0]["activities"][0]
+        assert itinerary.total_cost == 25
+
+    def test_replace_activities(self):
+        itinerary = IndexedItinerary(_itinerary())
+        reordered = list(reversed(itinerary.get_day("day-1")["activities"]))
+
+        itinerary.replace_activities("day-1", reordered)
+
+        assert [a["id"] for a in itinerary.get_day("day-1")["activities"]] == ["c", "b", "a"]
+        assert itinerary.day_cost("day-1") == 30
+        _assert_consistent(itinerary)
+
+    def test_unknown_ids_raise(self):
+        itinerary = IndexedItinerary(_itinerary())
+
+        with pytest.raises(ItineraryItemNotFound):
+            itinerary.move_activity("missing", "day-1", 0)
+        with pytest.raises(ItineraryItemNotFound):
+            itinerary.move_activity("a", "missing", 0)
+        # A failed move leaves the activity where it was
+        assert itinerary.day_of_activity("a")["id"] == "day-1"
+
+    def test_empty_itinerary(self):
+        itinerary = IndexedItinerary(None)
+
+        assert itinerary.days == []
+        assert itinerary.total_cost == 0
+
+
+class TestCurrencyConversion:
+    """Tests for costs priced in other currencies."""
+
+    @pytest.fixture
+    def rates(self, mocker):
+        snapshot = RateSnapshot(date(2026, 1, 5), "USD", {"eur": 0.5, "jpy": 100.0})
+        return mocker.patch("app.services.itinerary_index._latest_rates", return_value=snapshot)
+
+    def _itinerary(self):
+        itinerary = _itinerary()
+        itinerary["days"][0]["activities"][1]["currency"] = "JPY"  # 20 JPY
+        itinerary["days"][1]["activities"][0]["currency"] = "EUR"  # 5 EUR
+        return itinerary
+
+    def test_converts_to_itinerary_currency(self, rates):
+        itinerary = IndexedItinerary(self._itinerary())
+
+        assert itinerary.day_cost("day-1") == pytest.approx(10.2)
+        assert itinerary.day_cost("day-2") == pytest.approx(10)
+        # One snapshot lookup for the whole itinerary
+        assert rates.call_count == 1
+
+    def test_incremental_updates_convert(self, rates):
+        itinerary = IndexedItinerary(self._itinerary())
+
+        itinerary.update_activity("d", {"currency": "USD"})
+        itinerary.add_activity("day-1", {"id": "e", "cost_estimate": 1000, "currency": "JPY"})
+
+        assert itinerary.day_cost("day-2") == pytest.approx(5)
+        assert itinerary.day_cost("day-1") == pytest.approx(20.2)
+        _assert_consistent(itinerary)
+
+    def test_unconverted_without_rates(self, mocker):
+        mocker.patch("app.services.itinerary_index._latest_rates", return_value=None)
+
+        assert IndexedItinerary(self._itinerary()).total_cost == 35
+
+    def test_same_currency_needs_no_rates(self, rates):
+        IndexedItinerary(_itinerary())
+
+        rates.assert_not_called()
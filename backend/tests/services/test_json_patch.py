@@ -0,0 +1,90 @@
+"""Tests for the JSON Patch (RFC 6902) service."""
+
+import pytest
+
+from app.services.json_patch import JsonPatchError, JsonPatchTestFailed, apply_patch
+
+
+@pytest.fixture
+def document():
+    return {
+        "days": [
+            {"id": "day-1", "activities": [{"id": "a"}, {"id": "b"}]},
+            {"id": "day-2", "activities": []},
+        ],
+        "currency": "USD",
+    }
+
+
+class TestApplyPatch:
+    """Tests for apply_patch."""
+
+    def test_add_appends_with_dash(self, document):
+        result = apply_patch(
+            document, [{"op": "add", "path": "/days/1/activities/-", "value": {"id": "c"}}]
+        )
+
+        assert result["days"][1]["activities"] == [{"id": "c"}]
+
+    def test_move_between_days(self, document):
+        result = apply_patch(
+            document,
+            [{"op": "move", "from": "/days/0/activities/1", "path": "/days/1/activities/0"}],
+        )
+
+        assert [a["id"] for a in result["days"][0]["activities"]] == ["a"]
+        assert [a["id"] for a in result["days"][1]["activities"]] == ["b"]
+
+    def test_replace_remove_and_copy(self, document):
+        result = apply_patch(
+            document,
+            [
+                {"op": "replace", "path": "/currency", "value": "EUR"},
+                {"op": "copy", "from": "/days/0/activities/0", "path": "/days/1/activities/0"},
+                {"op": "remove", "path": "/days/0/activities/0"},
+            ],
+        )
+
+        assert result["currency"] == "EUR"
+        assert result["days"][0]["activities"] == [{"id": "b"}]
+        assert result["days"][1]["activities"] == [{"id": "a"}]
+
+    def test_escaped_pointer_tokens(self):
+        result = apply_patch(
+            {"a/b": {"~c": 1}}, [{"op": "replace", "path": "/a~1b/~0c", "value": 2}]
+        )
+
+        assert result == {"a/b": {"~c": 2}}
+
+    def test_failed_patch_leaves_document_untouched(self, document):
+        with pytest.raises(JsonPatchError):
+            apply_patch(
+                document,
+                [
+                    {"op": "remove", "path": "/days/0/activities/0"},
+                    {"op": "remove", "path": "/days/5"},
+                ],
+            )
+
+        assert len(document["days"][0]["activities"]) == 2
+
+    def test_test_operation(self, document):
+        apply_patch(document, [{"op": "test", "path": "/days/0/id", "value": "day-1"}])
+
+        with pytest.raises(JsonPatchTestFailed):
+            apply_patch(document, [{"op": "test", "path": "/days/0/id", "value": "day-2"}])
+
+    @pytest.mark.parametrize(
+        "operation",
+        [
+            {"op": "add", "path": "/days/01/activities/0", "value": {}},
+            {"op": "add", "path": "days", "value": []},
+            {"op": "replace", "path": "/missing", "value": 1},
+            {"op": "move", "from": "/days/0", "path": "/days/0/activities/0"},
+            {"op": "add", "path": "/currency"},
+            {"op": "explode", "path": "/currency"},
+        ],
+    )
+    def test_invalid_operations(self, document, operation):
+        with pytest.raises(JsonPatchError):
+            apply_patch(document, [operation])
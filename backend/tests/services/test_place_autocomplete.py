@@ -0,0 +1,152 @@
+"""Tests for the place autocomplete index."""
+
+import asyncio
+
+import fakeredis
+import pytest
+
+from app.services.places.autocomplete import (
+    PLACES_REDIS_KEY,
+    AutocompleteIndex,
+    Suggestion,
+    nearby,
+    place_rating,
+)
+
+CATEGORIES = {"museum": "museums", "temple": "religion"}
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def index(redis_client):
+    index = AutocompleteIndex(redis_client=redis_client)
+    index.add_gazetteer()
+    return index
+
+
+def make_place(xid, name, lat, lng, *, kinds="museums", rate="3h"):
+    return {
+        "xid": xid,
+        "name": name,
+        "kinds": kinds,
+        "rate": rate,
+        "point": {"lat": lat, "lon": lng},
+    }
+
+
+class TestSuggest:
+    """Tests for prefix matching and ranking."""
+
+    def test_gazetteer_destinations(self, index):
+        names = [s.name for s in index.suggest("kyo", limit=5)]
+
+        assert "Kyoto" in names
+
+    def test_matches_word_prefixes_and_aliases(self, index):
+        assert index.suggest("york", limit=1)[0].name == "New York"
+        assert index.suggest("saig", limit=1)[0].name == "Ho Chi Minh City"
+
+    def test_normalizes_accents_and_case(self, index):
+        assert index.suggest("CÔTE", limit=1)[0].country == "CI"
+
+    def test_whole_name_match_ranks_above_word_match(self):
+        index = AutocompleteIndex(redis_client=fakeredis.FakeRedis(decode_responses=True))
+        index.add(Suggestion("a", "Old Paris Cafe", "restaurant", popularity=5))
+        index.add(Suggestion("b", "Paris Museum", "museum", popularity=5))
+
+        assert [s.id for s in index.suggest("paris")] == ["b", "a"]
+
+    def test_location_context_boosts_nearby_places(self, index):
+        index.add_places(
+            [
+                make_place("N1", "Temple of Heaven", 39.88, 116.41, kinds="religion"),
+                make_place("N2", "Temple Bar", 53.345, -6.264, kinds="bars", rate="3"),
+            ],
+            CATEGORIES,
+        )
+
+        # Temple of Heaven is rated higher, but Temple Bar is near Dublin
+        assert index.suggest("temple", limit=1)[0].name == "Temple of Heaven"
+        assert index.suggest("temple", limit=1, near=(53.35, -6.26))[0].name == "Temple Bar"
+
+    def test_type_filter_and_limit(self, index):
+        results = index.suggest("s", limit=4, types={"country"})
+
+        assert len(results) == 4
+        assert all(s.type == "country" for s in results)
+
+    def test_no_match(self, index):
+        assert index.suggest("zzzq") == []
+        assert index.suggest("  ") == []
+
+
+class TestSeenPlaces:
+    """Tests for indexing places from OpenTripMap results."""
+
+    def test_add_places_in_json_and_geojson_format(self, index):
+        added = index.add_places(
+            [
+                make_place("N1", "Musee du Louvre", 48.861, 2.336),
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [2.2945, 48.8584]},
+                    "properties": {"xid": "N2", "name": "Eiffel Tower", "rate": 7},
+                },
+                {"properties": {"name": "No id"}},
+            ],
+            CATEGORIES,
+        )
+
+        assert added == 2
+        louvre = index.suggest("louvre", limit=1)[0]
+        assert (louvre.type, louvre.lat, louvre.lng) == ("museum", 48.861, 2.336)
+        assert index.suggest("eiff", limit=1)[0].type == "attraction"
+
+    def test_seen_again_gains_popularity(self, index):
+        place = make_place("N1", "Ueno Park", 35.71, 139.77, kinds="natural", rate="1")
+        index.add_places([place], CATEGORIES)
+        first = index.suggest("ueno", limit=1)[0].popularity
+        index.add_places([place], CATEGORIES)
+
+        assert index.suggest("ueno", limit=1)[0].popularity == first + 1
+        assert len([s for s in index.suggest("ueno") if s.id == "place:N1"]) == 1
+
+    def test_places_are_shared_through_redis(self, index, redis_client):
+        index.add_places([make_place("N1", "Senso-ji", 35.7148, 139.7967)], CATEGORIES)
+
+        other = AutocompleteIndex(redis_client=redis_client)
+        assert other.load_places() == 1
+        assert redis_client.hlen(PLACES_REDIS_KEY) == 1
+        assert other.suggest("senso", limit=1)[0].name == "Senso-ji"
+
+    def test_add_places_async_persists_to_redis(self, index, redis_client):
+        place = make_place("N1", "Senso-ji", 35.7148, 139.7967)
+
+        assert asyncio.run(index.add_places_async([place], CATEGORIES)) == 1
+
+        assert redis_client.hlen(PLACES_REDIS_KEY) == 1
+        assert index.suggest("senso", limit=1)[0].name == "Senso-ji"
+
+    def test_nearby_keeps_close_and_unlocated_entries(self, index):
+        index.add_places(
+            [
+                make_place("N1", "Kiyomizu-dera", 34.9949, 135.785),
+                make_place("N2", "Kinkaku Hall", 35.6895, 139.6917),
+            ],
+            CATEGORIES,
+        )
+        kyoto = (35.0116, 135.7681)
+
+        names = {s.name for s in nearby(index.suggest("ki", limit=10), kyoto)}
+
+        assert "Kiyomizu-dera" in names
+        assert "Kinkaku Hall" not in names
+        assert "Kiribati" in names  # Countries have no coordinates
+
+    @pytest.mark.parametrize(("rate", "expected"), [("3h", 6.0), ("2", 2.0), (7, 7.0), (None, 0.0)])
+    def test_place_rating(self, rate, expected):
+        assert place_rating({"rate": rate}) == expected
@@ -0,0 +1,188 @@
+"""Tests for the geohash place tile cache."""
+
+import asyncio
+import time
+
+import fakeredis
+import numpy as np
+import pytest
+
+from app.services.places.geohash import covering_cells, decode_bbox, encode, haversine_km
+from app.services.places.tile_cache import TILE_FETCH_LIMIT, JsonCache, PlaceTileCache
+
+
+def make_places(rng, center_lat, center_lng, count, spread=0.3):
+    coords = rng.uniform(-spread, spread, size=(count, 2)) + [center_lat, center_lng]
+    return [
+        {"xid": f"P{i}", "name": f"Place {i}", "point": {"lat": lat, "lon": lng}}
+        for i, (lat, lng) in enumerate(coords)
+    ]
+
+
+class FakeOpenTripMap:
+    """Answers radius requests from a fixed set of places."""
+
+    def __init__(self, places):
+        self.places = places
+        self.lats = np.array([p["point"]["lat"] for p in places])
+        self.lngs = np.array([p["point"]["lon"] for p in places])
+        self.calls = 0
+
+    async def __call__(self, lat, lng, radius_m, limit):
+        self.calls += 1
+        distances = haversine_km(lat, lng, self.lats, self.lngs) * 1000
+        return [self.places[i] for i in np.flatnonzero(distances <= radius_m)][:limit]
+
+    def expected(self, lat, lng, radius_m):
+        distances = haversine_km(lat, lng, self.lats, self.lngs) * 1000
+        inside = np.flatnonzero(distances <= radius_m)
+        return [self.places[i]["xid"] for i in inside[np.argsort(distances[inside])]]
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+class TestGeohash:
+    """Tests for geohash encoding and cell coverage."""
+
+    def test_known_geohash(self):
+        assert encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+    def test_bbox_contains_point(self):
+        lat_min, lat_max, lng_min, lng_max = decode_bbox(encode(35.6762, 139.6503, 5))
+
+        assert lat_min <= 35.6762 < lat_max
+        assert lng_min <= 139.6503 < lng_max
+
+    def test_covering_cells_cover_the_circle(self):
+        rng = np.random.default_rng(3)
+        cells = set(covering_cells(48.8566, 2.3522, 3000, precision=5))
+        # Random points inside the circle must fall in a covering cell
+        for _ in range(200):
+            angle, r = rng.uniform(0, 2 * np.pi), rng.uniform(0, 0.027)
+            lat = 48.8566 + r * np.sin(angle)
+            lng = 2.3522 + r * np.cos(angle) / np.cos(np.radians(48.8566))
+            if haversine_km(48.8566, 2.3522, np.array([lat]), np.array([lng]))[0] <= 3:
+                assert encode(lat, lng, 5) in cells
+
+
+class TestPlaceTileCache:
+    """Tests for radius search over cached tiles."""
+
+    @pytest.mark.asyncio
+    async def test_results_match_remote_and_second_query_is_local(self, redis_client):
+        api = FakeOpenTripMap(make_places(np.random.default_rng(1), 35.68, 139.76, 400))
+        cache = PlaceTileCache("test", redis_client=redis_client)
+
+        first = await cache.radius_search(35.68, 139.76, 8000, api)
+        calls = api.calls
+        second = await cache.radius_search(35.69, 139.75, 6000, api)
+
+        assert [p["xid"] for p in first] == api.expected(35.68, 139.76, 8000)
+        assert [p["xid"] for p in second] == api.expected(35.69, 139.75, 6000)
+        assert calls > 0
+        assert api.calls == calls  # Overlapping query answered from cached tiles
+
+    @pytest.mark.asyncio
+    async def test_tiles_are_shared_through_redis(self, redis_client):
+        api = FakeOpenTripMap(make_places(np.random.default_rng(2), 51.5, -0.12, 100))
+        await PlaceTileCache("test", redis_client=redis_client).radius_search(
+            51.5, -0.12, 5000, api
+        )
+        calls = api.calls
+
+        # A new process-local cache (another worker) reuses the tiles
+        other = PlaceTileCache("test", redis_client=redis_client)
+        result = await other.radius_search(51.5, -0.12, 5000, api, limit=5)
+
+        assert api.calls == calls
+        assert [p["xid"] for p in result] == api.expected(51.5, -0.12, 5000)[:5]
+
+    @pytest.mark.asyncio
+    async def test_redis_is_read_off_the_event_loop_in_one_batch(self, redis_client, mocker):
+        api = FakeOpenTripMap(make_places(np.random.default_rng(2), 51.5, -0.12, 100))
+        await PlaceTileCache("test", redis_client=redis_client).radius_search(
+            51.5, -0.12, 5000, api
+        )
+        other = PlaceTileCache("test", redis_client=redis_client)
+        to_thread = mocker.spy(asyncio, "to_thread")
+        mget = mocker.spy(redis_client, "mget")
+
+        await other.radius_search(51.5, -0.12, 5000, api)
+
+        assert mget.call_count == 1
+        assert to_thread.call_args.args[0] == other.store._read
+
+    @pytest.mark.asyncio
+    async def test_categories_are_cached_separately(self, redis_client):
+        api = FakeOpenTripMap(make_places(np.random.default_rng(4), 0.0, 0.0, 10))
+        cache = PlaceTileCache("test", redis_client=redis_client)
+
+        await cache.radius_search(0.0, 0.0, 1000, api, category="museums")
+        calls = api.calls
+        await cache.radius_search(0.0, 0.0, 1000, api, category="foods")
+
+        assert api.calls > calls
+
+    @pytest.mark.asyncio
+    async def test_stale_tiles_are_served_and_refreshed_inline(self, redis_client):
+        api = FakeOpenTripMap(make_places(np.random.default_rng(5), 0.0, 0.0, 20, spread=0.01))
+        cache = PlaceTileCache("test", refresh_after_seconds=60, redis_client=redis_client)
+        await cache.radius_search(0.0, 0.0, 1000, api)
+        calls = api.calls
+
+        for key, (stored_at, value) in list(cache.store._entries.items()):
+            cache.store._entries[key] = (stored_at - 120, value)
+        await cache.radius_search(0.0, 0.0, 1000, api, background_refresh=False)
+
+        assert api.calls == 2 * calls
+
+    @pytest.mark.asyncio
+    async def test_truncated_tile_falls_back_to_point_query(self, redis_client, caplog):
+        # More places in the tile than one fetch returns; the API drops the
+        # ones nearest the query point
+        places = make_places(np.random.default_rng(6), 0.0, 0.0, TILE_FETCH_LIMIT * 8, spread=0.02)
+        api = FakeOpenTripMap(sorted(places, key=lambda p: -abs(p["point"]["lat"])))
+        cache = PlaceTileCache("test", redis_client=redis_client)
+
+        first = await cache.radius_search(0.0, 0.0, 500, api, limit=10)
+        calls = api.calls
+        second = await cache.radius_search(0.0, 0.0, 500, api, limit=10)
+
+        assert [p["xid"] for p in first] == api.expected(0.0, 0.0, 500)[:10]
+        assert second == first
+        assert api.calls == calls + 1  # Tile not refetched, only the point query
+        assert "truncated" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_fetch_errors_propagate(self, redis_client):
+        async def failing(lat, lng, radius_m, limit):
+            raise RuntimeError("503")
+
+        cache = PlaceTileCache("test", redis_client=redis_client)
+
+        with pytest.raises(RuntimeError):
+            await cache.radius_search(0.0, 0.0, 1000, failing)
+
+
+class TestJsonCache:
+    """Tests for the keyed L1 + Redis cache."""
+
+    def test_round_trip_and_expiry(self, redis_client):
+        cache = JsonCache("test", ttl_seconds=60, redis_client=redis_client)
+        cache.set("a", {"x": 1})
+
+        assert JsonCache("test", 60, redis_client=redis_client).get("a") == {"x": 1}
+
+        cache.set("old", 1, stored_at=time.time() - 120)
+        assert cache.get("old") is None
+
+    @pytest.mark.asyncio
+    async def test_batched_async_round_trip(self, redis_client):
+        cache = JsonCache("test", ttl_seconds=60, redis_client=redis_client)
+        await cache.set_many_async({"a": 1, "b": {"x": 2}})
+
+        other = JsonCache("test", 60, redis_client=redis_client)
+        assert await other.get_many_async(["a", "b", "c"]) == {"a": 1, "b": {"x": 2}, "c": None}
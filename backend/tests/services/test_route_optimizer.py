@@ -0,0 +1,127 @@
+"""Tests for the itinerary route optimizer."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from app.services.route_optimizer import InvalidActivityError, haversine_matrix, optimize_route
+
+
+def make_activity(name, lat, lng, *, duration=60, opens=None, closes=None):
+    activity = {
+        "id": name,
+        "name": name,
+        "location": {"name": name, "lat": lat, "lng": lng},
+        "duration_minutes": duration,
+    }
+    if opens:
+        activity["opens_at"] = opens
+    if closes:
+        activity["closes_at"] = closes
+    return activity
+
+
+class TestHaversineMatrix:
+    """Tests for the vectorized distance matrix."""
+
+    def test_known_distance(self):
+        # Paris -> London is about 344 km
+        matrix = haversine_matrix(np.array([48.8566, 51.5074]), np.array([2.3522, -0.1278]))
+
+        assert matrix.shape == (2, 2)
+        assert matrix[0, 1] == pytest.approx(344, abs=2)
+        assert matrix[0, 1] == matrix[1, 0]
+        assert matrix[0, 0] == 0
+
+
+class TestOptimizeRoute:
+    """Tests for nearest-insertion + 2-opt ordering with time windows."""
+
+    def test_orders_points_along_a_line(self):
+        # Points along a meridian given in scrambled order
+        lats = [0.00, 0.04, 0.01, 0.03, 0.02]
+        activities = [make_activity(f"a{i}", lat, 0.0) for i, lat in enumerate(lats)]
+
+        result = optimize_route(activities)
+
+        visited = [lats[i] for i in result["order"]]
+        assert visited in (sorted(lats), sorted(lats, reverse=True))
+        assert result["total_distance_km"] < result["original_distance_km"]
+
+    def test_matches_brute_force_on_small_instance(self):
+        rng = np.random.default_rng(7)
+        coords = rng.uniform([48.80, 2.25], [48.90, 2.40], size=(7, 2))
+        activities = [make_activity(f"a{i}", lat, lng) for i, (lat, lng) in enumerate(coords)]
+        matrix = haversine_matrix(coords[:, 0], coords[:, 1])
+
+        best = min(
+            sum(matrix[a, b] for a, b in itertools.pairwise(order))
+            for order in itertools.permutations(range(7))
+        )
+        result = optimize_route(activities)
+
+        assert result["total_distance_km"] <= best * 1.1
+
+    def test_respects_opening_hours(self):
+        # The nearest-first order would visit "late" first, but it only opens at 14:00
+        activities = [
+            make_activity("late", 0.0, 0.0, opens="14:00"),
+            make_activity("near", 0.0, 0.01, closes="12:00"),
+            make_activity("far", 0.0, 0.05, closes="13:00"),
+        ]
+
+        result = optimize_route(activities, day_start="09:00")
+        names = [a["name"] for a in result["activities"]]
+
+        assert names[-1] == "late"
+        assert result["late_activities"] == []
+        assert result["activities"][-1]["start_time"] == "14:00"
+
+    def test_schedule_fields_follow_existing_key_style(self):
+        activities = [
+            {
+                "id": "x",
+                "name": "x",
+                "location": {"name": "x", "lat": 0.0, "lng": 0.0},
+                "startTime": "10:00",
+                "endTime": "11:30",
+                "durationMinutes": 90,
+            },
+            make_activity("y", 0.0, 0.02),
+        ]
+
+        result = optimize_route(activities, day_start="10:00", mode="walk")
+        first = next(a for a in result["activities"] if a["id"] == "x")
+
+        assert "start_time" not in first
+        assert "startTime" in first
+        assert activities[0]["startTime"] == "10:00"  # input untouched
+
+    def test_activities_without_coordinates_go_last(self):
+        activities = [
+            {"id": "n", "name": "No coords", "location": {"name": "?"}},
+            make_activity("a", 0.0, 0.0),
+        ]
+
+        result = optimize_route(activities)
+
+        assert result["order"] == [1, 0]
+        assert result["unrouted"] == ["No coords"]
+
+    @pytest.mark.parametrize(
+        ("lat", "lng"),
+        [("north", 0.0), (float("nan"), 0.0), (0.0, float("inf")), (91.0, 0.0), ([1], 0.0)],
+    )
+    def test_invalid_coordinates_raise(self, lat, lng):
+        activities = [make_activity("a", 0.0, 0.0), make_activity("b", lat, lng)]
+
+        with pytest.raises(InvalidActivityError, match="'b'"):
+            optimize_route(activities)
+
+    def test_invalid_duration_raises(self):
+        activity = make_activity("a", 0.0, 0.0)
+        activity["duration_minutes"] = "an hour"
+
+        with pytest.raises(InvalidActivityError):
+            optimize_route([activity])
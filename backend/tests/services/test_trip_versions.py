@@ -0,0 +1,148 @@
+"""Tests for delta-encoded trip version history."""
+
+import copy
+import random
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services import trip_versions
+from app.services.trip_versions import (
+    KEYFRAME_INTERVAL,
+    apply_delta,
+    compare_versions,
+    compute_delta,
+    diff_from_deltas,
+    diff_values,
+)
+
+
+@pytest.fixture
+def trip():
+    return {
+        "traveler_details": {"name": "Jane", "party_size": 2, "party_ages": [30, 28]},
+        "destinations": [{"country": "France", "city": "Paris"}],
+        "trip_details": {"budget": 5000, "currency": "USD", "extra": {"a": 1}},
+        "preferences": {"travel_style": "balanced", "interests": ["food"]},
+    }
+
+
+def _random_edit(rng: random.Random, data: dict) -> dict:
+    edited = copy.deepcopy(data)
+    choice = rng.randint(0, 4)
+    if choice == 0:
+        edited["trip_details"]["budget"] = rng.randint(1000, 9000)
+    elif choice == 1:
+        edited["preferences"]["interests"].append(rng.choice(["art", "hiking", "music"]))
+    elif choice == 2:
+        edited["trip_details"].pop("extra", None)
+    elif choice == 3:
+        edited["trip_details"]["extra"] = {"a": rng.randint(0, 3), "b": {"c": rng.random()}}
+    else:
+        edited["traveler_details"] = None
+    return edited
+
+
+class TestDeltas:
+    """Tests for structural deltas and delta-based diffs."""
+
+    def test_delta_round_trip(self, trip):
+        target = copy.deepcopy(trip)
+        target["trip_details"]["budget"] = 6000
+        del target["preferences"]["interests"]
+        target["notes"] = "new"
+
+        delta = compute_delta(trip, target)
+
+        assert apply_delta(trip, delta) == target
+        assert [["trip_details", "budget"], 6000] in delta["set"]
+        assert ["preferences", "interests"] in delta["unset"]
+
+    def test_delta_of_identical_documents_is_empty(self, trip):
+        assert compute_delta(trip, copy.deepcopy(trip)) == {"set": [], "unset": []}
+
+    def test_diff_from_deltas_matches_full_diff(self, trip):
+        rng = random.Random(7)
+        versions = [trip]
+        for _ in range(30):
+            versions.append(_random_edit(rng, versions[-1]))
+        deltas = [compute_delta(trip, v) for v in versions]
+
+        for _ in range(50):
+            a, b = sorted(rng.sample(range(len(versions)), 2))
+            expected = sorted(diff_values(versions[a], versions[b]), key=lambda c: c[0])
+            actual = sorted(diff_from_deltas(trip, deltas[a], deltas[b]), key=lambda c: c[0])
+            assert actual == expected
+            assert apply_delta(trip, deltas[b]) == versions[b]
+
+    def test_diff_against_keyframe_itself(self, trip):
+        target = copy.deepcopy(trip)
+        target["trip_details"]["budget"] = 7000
+
+        changes = diff_from_deltas(trip, None, compute_delta(trip, target))
+
+        assert changes == [("trip_details.budget", 5000, 7000)]
+
+
+class TestVersionStorage:
+    """Tests for choosing keyframes vs deltas and reading them back."""
+
+    def _mock_keyframe(self, version_number, trip_data):
+        mock_supabase = MagicMock()
+        query = mock_supabase.table.return_value.select.return_value.eq.return_value
+        query.in_.return_value.lt.return_value.order.return_value.limit.return_value.execute.return_value.data = (
+            [{"version_number": version_number, "trip_data": trip_data}]
+            if trip_data is not None
+            else []
+        )
+        return mock_supabase
+
+    def test_first_version_is_keyframe(self, trip):
+        with patch.object(trip_versions, "supabase", self._mock_keyframe(0, None)):
+            record = trip_versions.build_version_record("trip-1", 1, trip, "s", [])
+
+        assert record["storage_kind"] == "keyframe"
+        assert record["trip_data"] == trip
+
+    def test_small_change_is_stored_as_delta(self, trip):
+        edited = copy.deepcopy(trip)
+        edited["trip_details"]["budget"] = 6000
+
+        with patch.object(trip_versions, "supabase", self._mock_keyframe(1, trip)):
+            record = trip_versions.build_version_record("trip-1", 2, edited, "s", ["budget"])
+
+        assert record["storage_kind"] == "delta"
+        assert record["trip_data"] is None
+        assert record["base_version"] == 1
+        assert apply_delta(trip, record["delta"]) == edited
+
+    def test_keyframe_interval_forces_keyframe(self, trip):
+        with patch.object(trip_versions, "supabase", self._mock_keyframe(1, trip)):
+            record = trip_versions.build_version_record(
+                "trip-1", 1 + KEYFRAME_INTERVAL, trip, "s", []
+            )
+
+        assert record["storage_kind"] == "keyframe"
+
+    def test_compare_versions_sharing_keyframe(self, trip):
+        edited = copy.deepcopy(trip)
+        edited["trip_details"]["budget"] = 6000
+        rows = {
+            1: {"version_number": 1, "storage_kind": "keyframe", "trip_data": trip},
+            2: {
+                "version_number": 2,
+                "storage_kind": "delta",
+                "base_version": 1,
+                "delta": compute_delta(trip, edited),
+                "trip_data": None,
+            },
+        }
+
+        with patch.object(trip_versions, "_fetch_version_rows", return_value=rows):
+            changes = compare_versions("trip-1", 1, 2)
+
+        assert changes == [("trip_details.budget", 5000, 6000)]
+
+    def test_compare_missing_version(self):
+        with patch.object(trip_versions, "_fetch_version_rows", return_value={}):
+            assert compare_versions("trip-1", 1, 2) is None
@@ -0,0 +1,175 @@
+"""Tests for the stored visa requirement matrix."""
+
+import time
+
+import fakeredis
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services.visa.matrix import CHECKED_KEY, VisaMatrix, pair_key
+from app.services.visa.travel_buddy_client import InvalidCountryCodeError, VisaCheckResult
+
+
+class FakeTravelBuddy:
+    """Returns a visa-free result for every pair, or raises a configured error."""
+
+    def __init__(self):
+        self.calls = []
+        self.errors: dict[str, Exception] = {}
+
+    def check_visa(self, passport, destination):
+        self.calls.append(pair_key(passport, destination))
+        error = self.errors.get(pair_key(passport, destination))
+        if error:
+            raise error
+        return VisaCheckResult(
+            passport_code=passport,
+            destination_code=destination,
+            visa_required=False,
+            visa_type="visa-free",
+            max_stay_days=90,
+        )
+
+
+def http_status_error(status_code):
+    request = httpx.Request("POST", "https://visa-requirement.p.rapidapi.com/v2/visa/check")
+    response = httpx.Response(status_code, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def api():
+    return FakeTravelBuddy()
+
+
+@pytest.fixture
+def matrix(api, redis_client):
+    return VisaMatrix(client=api, redis_client=redis_client)
+
+
+class TestLookup:
+    """Tests for O(1) reads with a live fallback."""
+
+    def test_miss_checks_live_then_serves_stored(self, matrix, api):
+        first = matrix.lookup("US", "FR")
+        second = matrix.lookup("US", "FR")
+
+        assert api.calls == ["US:FR"]
+        assert second.result == first.result
+        assert second.result.max_stay_days == 90
+
+    def test_get_never_calls_the_api(self, matrix, api):
+        assert matrix.get("US", "JP") is None
+        assert api.calls == []
+
+    def test_shared_across_instances_through_redis(self, matrix, api, redis_client):
+        matrix.lookup("GB", "TH")
+
+        other = VisaMatrix(client=api, redis_client=redis_client)
+        assert other.get("GB", "TH").result.visa_type == "visa-free"
+
+    def test_staleness_indicator(self, matrix, monkeypatch):
+        monkeypatch.setattr(settings, "VISA_MATRIX_STALE_SECONDS", 10 * 86400)
+        fresh = matrix.lookup("US", "FR").to_dict()
+        old = matrix.put(
+            VisaCheckResult("US", "CN", True, "visa_required"), time.time() - 30 * 86400
+        ).to_dict()
+
+        assert fresh["stale"] is False
+        assert fresh["age_days"] == 0
+        assert old["stale"] is True
+        assert old["age_days"] == pytest.approx(30, abs=0.1)
+        assert old["checked_at"].endswith("+00:00")
+
+    def test_live_failure_propagates(self, matrix, api):
+        api.errors["US:KP"] = http_status_error(500)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            matrix.lookup("US", "KP")
+
+
+class TestRefresh:
+    """Tests for the budgeted, oldest-first refresh."""
+
+    def test_seed_tracks_passports_against_all_destinations(self, matrix, redis_client):
+        added = matrix.seed(["US", "GB"])
+
+        assert added == 2 * 248
+        assert redis_client.zscore(CHECKED_KEY, "US:FR") == 0
+        assert redis_client.zscore(CHECKED_KEY, "US:US") is None
+        # Seeding again keeps existing check times
+        matrix.lookup("US", "FR")
+        assert matrix.seed(["US"]) == 0
+        assert redis_client.zscore(CHECKED_KEY, "US:FR") > 0
+
+    def test_refreshes_oldest_pairs_within_budget(self, matrix, api, redis_client):
+        now = time.time()
+        old = now - settings.VISA_MATRIX_REFRESH_SECONDS
+        redis_client.zadd(
+            CHECKED_KEY,
+            {"US:FR": old - 300, "US:JP": old - 100, "US:TH": old - 200, "US:DE": now},
+        )
+        pauses = []
+
+        stats = matrix.refresh(budget=2, interval_seconds=0.5, sleep=pauses.append)
+
+        assert api.calls == ["US:FR", "US:TH"]
+        assert pauses == [0.5]
+        assert stats == {"checked": 2, "failed": 0, "pending": 1}
+        assert matrix.get("US", "TH") is not None
+
+    def test_rate_limit_stops_the_run(self, matrix, api, redis_client):
+        redis_client.zadd(CHECKED_KEY, {"US:FR": 0, "US:JP": 1, "US:TH": 2})
+        api.errors["US:JP"] = http_status_error(429)
+
+        stats = matrix.refresh(budget=10, interval_seconds=0)
+
+        assert api.calls == ["US:FR", "US:JP"]
+        assert stats["checked"] == 1
+        assert stats["failed"] == 1
+
+    def test_failed_pair_is_retried_later(self, matrix, api, redis_client):
+        redis_client.zadd(CHECKED_KEY, {"US:FR": 0, "US:JP": 1})
+        api.errors["US:FR"] = http_status_error(503)
+
+        stats = matrix.refresh(budget=10, interval_seconds=0)
+
+        assert stats == {"checked": 1, "failed": 1, "pending": 0}
+        assert redis_client.zscore(CHECKED_KEY, "US:FR") > time.time() - (
+            settings.VISA_MATRIX_REFRESH_SECONDS
+        )
+
+    def test_invalid_pair_is_dropped(self, matrix, api, redis_client):
+        redis_client.zadd(CHECKED_KEY, {"US:XK": 0})
+        api.errors["US:XK"] = InvalidCountryCodeError("Invalid destination code")
+
+        stats = matrix.refresh(budget=10, interval_seconds=0)
+
+        assert stats["failed"] == 1
+        assert redis_client.zscore(CHECKED_KEY, "US:XK") is None
+
+    def test_unparseable_response_keeps_the_pair(self, matrix, api, redis_client):
+        redis_client.zadd(CHECKED_KEY, {"US:FR": 0})
+        api.errors["US:FR"] = ValueError("invalid literal for int()")
+
+        stats = matrix.refresh(budget=10, interval_seconds=0)
+
+        assert stats == {"checked": 0, "failed": 1, "pending": 0}
+        assert redis_client.zscore(CHECKED_KEY, "US:FR") > 0
+
+    def test_without_redis_refresh_is_skipped(self, api, mocker):
+        mocker.patch("app.services.visa.matrix.get_redis_client", return_value=None)
+        mocker.patch("app.services.places.tile_cache.get_redis_client", return_value=None)
+        matrix = VisaMatrix(client=api)
+
+        assert matrix.refresh() == {"checked": 0, "failed": 0, "pending": 0}
+        # Lookups still work from the in-process cache
+        matrix.lookup("US", "FR")
+        matrix.lookup("US", "FR")
+        assert api.calls == ["US:FR"]
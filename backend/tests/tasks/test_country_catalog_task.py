@@ -0,0 +1,21 @@
+"""Tests for the country catalog refresh task."""
+
+from unittest.mock import MagicMock
+
+from app.tasks.country_catalog import refresh_country_catalog
+
+
+class TestRefreshCountryCatalog:
+    def test_task_is_scheduled(self):
+        from app.core.celery_app import celery_app
+
+        schedule = celery_app.conf.beat_schedule["refresh-country-catalog"]
+        assert schedule["task"] == refresh_country_catalog.name
+
+    def test_refreshes_snapshot(self, mocker):
+        catalog = MagicMock()
+        catalog.refresh.return_value = 250
+        mocker.patch("app.tasks.country_catalog.get_country_catalog", return_value=catalog)
+
+        assert refresh_country_catalog.run() == {"countries": 250}
+        catalog.refresh.assert_called_once_with()
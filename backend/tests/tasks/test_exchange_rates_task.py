@@ -0,0 +1,22 @@
+"""Tests for the exchange rate refresh task."""
+
+from datetime import date
+from unittest.mock import MagicMock
+
+from app.services.currency import RateSnapshot
+from app.tasks.exchange_rates import refresh_exchange_rates
+
+
+class TestRefreshExchangeRates:
+    def test_task_is_scheduled(self):
+        from app.core.celery_app import celery_app
+
+        schedule = celery_app.conf.beat_schedule["refresh-exchange-rates"]
+        assert schedule["task"] == refresh_exchange_rates.name
+
+    def test_refreshes_snapshot(self, mocker):
+        matrix = MagicMock()
+        matrix.refresh.return_value = RateSnapshot(date(2026, 1, 5), "USD", {"eur": 0.9})
+        mocker.patch("app.tasks.exchange_rates.get_exchange_rate_matrix", return_value=matrix)
+
+        assert refresh_exchange_rates.run() == {"date": "2026-01-05", "currencies": 2}
@@ -0,0 +1,166 @@
+"""Tests for parallel, non-destructive selective recalculation."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from app.tasks.agent_jobs import (
+    _compute_input_fingerprints,
+    _group_agents_by_phase,
+    _run_recalc_phase,
+)
+
+
+class TestGroupAgentsByPhase:
+    """Tests for dependency-aware grouping of agents."""
+
+    def test_groups_follow_orchestrator_phases(self):
+        phases = _group_agents_by_phase(["itinerary", "food", "visa", "weather"])
+
+        assert phases == [["visa", "weather"], ["food"], ["itinerary"]]
+
+    def test_unknown_agents_run_last(self):
+        phases = _group_agents_by_phase(["custom", "visa"])
+
+        assert phases == [["visa"], ["custom"]]
+
+    def test_duplicates_are_removed(self):
+        assert _group_agents_by_phase(["visa", "visa"]) == [["visa"]]
+
+
+class TestRunRecalcPhase:
+    """Tests for concurrent execution and section swapping."""
+
+    def test_agents_in_phase_run_concurrently(self):
+        active = 0
+        max_active = 0
+        lock = threading.Lock()
+
+        def fake_agent(task_id, trip_id, trip_data, agent_type):
+            nonlocal active, max_active
+            with lock:
+                active += 1
+                max_active = max(max_active, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return {"status": "completed", "data": {"agent": agent_type}}
+
+        with (
+            patch("app.tasks.agent_jobs._execute_single_agent", side_effect=fake_agent),
+            patch("app.tasks.agent_jobs._swap_in_section"),
+        ):
+            results = _run_recalc_phase("task-1", "trip-1", {}, ["visa", "country", "weather"])
+
+        assert max_active > 1
+        assert all(r["status"] == "completed" for r in results.values())
+
+    def test_only_successful_sections_are_swapped_in(self):
+        def fake_agent(task_id, trip_id, trip_data, agent_type):
+            if agent_type == "weather":
+                return {"status": "failed", "error": "API down"}
+            return {"status": "completed", "data": {"agent": agent_type}}
+
+        with (
+            patch("app.tasks.agent_jobs._execute_single_agent", side_effect=fake_agent),
+            patch("app.tasks.agent_jobs._swap_in_section") as swap,
+        ):
+            results = _run_recalc_phase("task-1", "trip-1", {}, ["visa", "weather"])
+
+        swap.assert_called_once_with("trip-1", "visa", {"agent": "visa"}, None)
+        assert results["weather"]["status"] == "failed"
+
+    def test_existing_sections_are_never_deleted(self):
+        mock_supabase = MagicMock()
+
+        with (
+            patch(
+                "app.tasks.agent_jobs._execute_single_agent",
+                return_value={"status": "completed", "data": {"ok": True}},
+            ),
+            patch("app.core.supabase.supabase", mock_supabase),
+        ):
+            _run_recalc_phase("task-1", "trip-1", {}, ["visa"])
+
+        table = mock_supabase.table.return_value
+        table.delete.assert_not_called()
+        table.upsert.assert_called_once()
+        assert table.upsert.call_args.kwargs["on_conflict"] == "trip_id,section_type"
+
+    def test_agent_exception_is_reported_as_failure(self):
+        with patch("app.tasks.agent_jobs._execute_single_agent", side_effect=RuntimeError("boom")):
+            results = _run_recalc_phase("task-1", "trip-1", {}, ["visa"])
+
+        assert results["visa"] == {"status": "failed", "error": "boom"}
+
+
+class TestFingerprintSkipping:
+    """Tests for skipping agents whose input is unchanged."""
+
+    def _run(self, existing, force=False):
+        from app.tasks.agent_jobs import execute_selective_recalc
+
+        mock_supabase = MagicMock()
+        trip_query = mock_supabase.table.return_value.select.return_value.eq.return_value
+        trip_query.execute.return_value.data = [{"id": "trip-1"}]
+        with (
+            patch("app.core.supabase.supabase", mock_supabase),
+            patch(
+                "app.tasks.agent_jobs._compute_input_fingerprints",
+                return_value={"visa": "fp-visa", "weather": "fp-weather-new"},
+            ),
+            patch("app.tasks.agent_jobs._load_section_fingerprints", return_value=existing),
+            patch(
+                "app.tasks.agent_jobs._run_recalc_phase",
+                side_effect=lambda **kw: {a: {"status": "completed"} for a in kw["agent_types"]},
+            ) as run_phase,
+        ):
+            result = execute_selective_recalc("trip-1", ["visa", "weather"], force=force)
+        ran = [a for call in run_phase.call_args_list for a in call.kwargs["agent_types"]]
+        return result, ran
+
+    def test_unchanged_agents_are_skipped(self):
+        result, ran = self._run({"visa": "fp-visa", "weather": "fp-weather-old"})
+
+        assert ran == ["weather"]
+        assert result["agents_skipped"] == ["visa"]
+        assert result["estimated_time_saved"] > 0
+
+    def test_force_reruns_unchanged_agents(self):
+        result, ran = self._run({"visa": "fp-visa"}, force=True)
+
+        assert sorted(ran) == ["visa", "weather"]
+        assert result["agents_skipped"] == []
+
+
+class TestComputeInputFingerprints:
+    """Tests for fingerprinting stored trips for selective recalculation."""
+
+    trip = {
+        "traveler_details": {"nationality": "US", "origin_city": "New York"},
+        "destinations": [{"country": "France", "city": "Paris"}],
+        "trip_details": {
+            "departureDate": "2025-06-01",
+            "returnDate": "2025-06-15",
+            "budget": 2000,
+            "budgetCurrency": "USD",
+        },
+        "preferences": {"dietaryRestrictions": []},
+    }
+
+    def _changed(self, **sections):
+        trip = {**self.trip}
+        for key, changes in sections.items():
+            trip[key] = {**trip[key], **changes}
+        before = _compute_input_fingerprints("trip-1", self.trip, ["currency", "food", "visa"])
+        after = _compute_input_fingerprints("trip-1", trip, ["currency", "food", "visa"])
+        return sorted(agent for agent in before if before[agent] != after[agent])
+
+    def test_budget_edit_reruns_currency(self):
+        assert self._changed(trip_details={"budget": 9000}) == ["currency"]
+
+    def test_home_currency_edit_reruns_currency(self):
+        assert self._changed(trip_details={"budgetCurrency": "EUR"}) == ["currency"]
+
+    def test_dietary_edit_reruns_food(self):
+        assert self._changed(preferences={"dietaryRestrictions": ["vegan"]}) == ["food"]
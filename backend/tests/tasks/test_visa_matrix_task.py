@@ -0,0 +1,27 @@
+"""Tests for the visa matrix refresh task."""
+
+from unittest.mock import MagicMock
+
+from app.tasks.visa_matrix import refresh_visa_matrix
+
+
+class TestRefreshVisaMatrix:
+    def test_task_name(self):
+        assert refresh_visa_matrix.name == "app.tasks.visa_matrix.refresh_visa_matrix"
+
+    def test_task_is_scheduled(self):
+        from app.core.celery_app import celery_app
+
+        schedule = celery_app.conf.beat_schedule["refresh-visa-matrix"]
+        assert schedule["task"] == refresh_visa_matrix.name
+
+    def test_seeds_then_refreshes_within_budget(self, mocker):
+        matrix = MagicMock()
+        matrix.seed.return_value = 3
+        matrix.refresh.return_value = {"checked": 2, "failed": 0, "pending": 1}
+        mocker.patch("app.tasks.visa_matrix.get_visa_matrix", return_value=matrix)
+
+        result = refresh_visa_matrix.run(budget=2)
+
+        matrix.refresh.assert_called_once_with(budget=2)
+        assert result == {"seeded": 3, "checked": 2, "failed": 0, "pending": 1}
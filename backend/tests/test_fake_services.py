@@ -0,0 +1,152 @@
+"""Tests for the fake external services and the client base-URL settings"""
+
+from datetime import date, timedelta
+
+import fakeredis
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.oauth_tokens import SharedTokenCache
+from app.services.country.rest_countries_client import RestCountriesClient
+from app.services.currency.exchange_api_client import CurrencyExchangeClient
+from app.services.flight.amadeus_client import AmadeusFlightClient
+from app.services.flight.skyscanner_client import SkyscannerClient
+from app.services.visa.travel_buddy_client import TravelBuddyClient
+from app.services.weather.visual_crossing_client import VisualCrossingClient
+from app.services.weather.weather_api_client import WeatherAPIClient
+from app.services.web_search.firecrawl_client import FirecrawlClient
+from benchmarks.fake_services import (
+    Behavior,
+    FakeServices,
+    LatencyModel,
+    Phase,
+    Scenario,
+    base_url_env,
+    create_app,
+)
+
+DEPARTURE = date.today() + timedelta(days=30)
+
+
+@pytest.fixture()
+def services(mocker):
+    """Fake services answering in-process, with every client pointed at them."""
+    for name, value in base_url_env("http://fake-services").items():
+        mocker.patch.object(settings, name, value)
+    services = FakeServices()
+    with services.install():
+        yield services
+
+
+def fetch(url):
+    with httpx.Client() as http:
+        return http.get(url)
+
+
+@pytest.mark.unit()
+class TestClientsAgainstFakes:
+    """Every client reaches its fake through the base-URL settings"""
+
+    def test_weather_clients(self, services):
+        forecast = VisualCrossingClient(api_key="k").get_forecast(
+            "Paris, France", DEPARTURE, DEPARTURE + timedelta(days=2)
+        )
+        current = WeatherAPIClient(api_key="k").get_current_weather("Paris")
+
+        assert len(forecast.days) == 3
+        assert current.location.name == "Paris"
+        assert services.calls == {"visual_crossing": 1, "weatherapi": 1}
+
+    def test_country_currency_and_visa_clients(self, services):
+        country = RestCountriesClient().get_country_by_code_sync("FR")
+        rate = CurrencyExchangeClient().get_exchange_rate("USD", "EUR")
+        visa = TravelBuddyClient(api_key="k").check_visa("US", "FR")
+
+        assert country.cca2 == "FR"
+        assert rate.rate == pytest.approx(0.92)
+        assert visa.visa_required is False
+        assert set(services.calls) == {"rest_countries", "exchangerate_api", "travel_buddy"}
+
+    def test_flight_clients(self, services):
+        amadeus = AmadeusFlightClient(
+            api_key="k",
+            api_secret="s",
+            token_cache=SharedTokenCache(redis_client=fakeredis.FakeRedis(decode_responses=True)),
+        )
+
+        offers = amadeus.search_flights("JFK", "CDG", DEPARTURE, max_offers=3)
+        skyscanner = SkyscannerClient(api_key="k").search_flights("JFK", "CDG", DEPARTURE)
+
+        assert offers.total_offers == 3
+        assert offers.offers[0].outbound_segments[0].carrier_name == "Fake Air"
+        assert skyscanner.total_offers == 10
+        assert services.calls["amadeus"] == 2  # token + search
+
+    def test_firecrawl(self, services):
+        results = FirecrawlClient(api_key="k").search("Paris etiquette", limit=2)
+
+        assert len(results) == 2
+
+
+@pytest.mark.unit()
+class TestFaultInjection:
+    """Test scripted latency, errors, rate limits and phases"""
+
+    def test_injected_errors(self, services):
+        services.set_scenario(Scenario(services={"firecrawl": Behavior(error_rate=1.0)}))
+
+        assert fetch("http://fake-services/firecrawl/scrape").status_code == 503
+        assert fetch("http://fake-services/weatherapi/current.json?q=Paris").is_success
+        assert services.stats()["services"]["firecrawl"]["errors"] == 1
+
+    def test_rate_limit(self, services):
+        services.set_scenario(Scenario(default=Behavior(rate_limit_per_second=2)))
+
+        responses = [fetch("http://fake-services/amadeus/x") for _ in range(3)]
+
+        assert responses[-1].status_code == 429
+        assert responses[-1].headers["Retry-After"] == "1"
+        assert services.stats()["services"]["amadeus"]["rate_limited"] == 1
+
+    def test_timeouts(self, services):
+        services.set_scenario(Scenario(default=Behavior(timeout_rate=1.0, timeout_ms=0)))
+
+        with pytest.raises(httpx.ReadTimeout):
+            fetch("http://fake-services/weatherapi/current.json")
+
+    def test_phases_take_over_at_their_time(self):
+        scenario = Scenario(
+            default=Behavior(latency=LatencyModel(ms=10)),
+            phases=[Phase(at_seconds=60, services={"amadeus": Behavior(error_rate=1.0)})],
+        )
+
+        assert scenario.behavior("amadeus", 30).error_rate == 0
+        assert scenario.behavior("amadeus", 90).error_rate == 1
+        assert scenario.behavior("firecrawl", 90).latency.ms == 10
+
+    def test_latency_samples_are_seeded(self):
+        model = LatencyModel(kind="lognormal", ms=100, sigma=0.5)
+        first = FakeServices(Scenario(seed=3, default=Behavior(latency=model)))
+        second = FakeServices(Scenario(seed=3, default=Behavior(latency=model)))
+
+        assert [first.plan("amadeus").delay for _ in range(5)] == [
+            second.plan("amadeus").delay for _ in range(5)
+        ]
+
+
+@pytest.mark.unit()
+class TestServer:
+    """Test the HTTP server and its admin endpoints"""
+
+    def test_serves_services_and_stats(self):
+        client = TestClient(create_app())
+
+        response = client.get("/rest_countries/alpha/FR")
+        client.put("/_fake/scenario", json={"services": {"skyscanner": {"error_rate": 1.0}}})
+        failed = client.get("/skyscanner/search")
+
+        assert response.json()["cca2"] == "FR"
+        assert failed.status_code == 503
+        assert client.get("/_fake/stats").json()["services"]["skyscanner"]["errors"] == 1
@@ -0,0 +1,104 @@
+"""Unit tests for the per-trip generation lease"""
+
+import time
+
+import fakeredis
+import pytest
+
+from app.core.generation_lease import GenerationLease
+
+
+@pytest.fixture()
+def redis_client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture()
+def lease(redis_client, mocker):
+    mocker.patch.object(GenerationLease, "_is_task_finished", return_value=False)
+    return GenerationLease(
+        client=redis_client, ttl_seconds=2, queued_ttl_seconds=10, heartbeat_seconds=1
+    )
+
+
+@pytest.mark.unit()
+class TestGenerationLease:
+    """Test single-flight lease semantics"""
+
+    def test_acquire_free_lease(self, lease):
+        acquired, holder = lease.acquire("trip-1", "task-a")
+
+        assert acquired is True
+        assert holder == "task-a"
+        assert lease.holder("trip-1") == "task-a"
+
+    def test_second_acquire_returns_in_flight_task(self, lease):
+        lease.acquire("trip-1", "task-a")
+
+        acquired, holder = lease.acquire("trip-1", "task-b")
+
+        assert acquired is False
+        assert holder == "task-a"
+
+    def test_leases_are_per_trip(self, lease):
+        lease.acquire("trip-1", "task-a")
+
+        acquired, _ = lease.acquire("trip-2", "task-b")
+
+        assert acquired is True
+
+    def test_stale_lease_of_finished_task_is_reclaimed(self, lease, mocker):
+        lease.acquire("trip-1", "task-a")
+        mocker.patch.object(GenerationLease, "_is_task_finished", return_value=True)
+
+        acquired, holder = lease.acquire("trip-1", "task-b")
+
+        assert acquired is True
+        assert holder == "task-b"
+
+    def test_expired_lease_is_reclaimed(self, redis_client, lease):
+        lease.acquire("trip-1", "task-a")
+        redis_client.delete("tip:generation-lease:trip-1")  # Simulate TTL expiry
+
+        acquired, _ = lease.acquire("trip-1", "task-b")
+
+        assert acquired is True
+
+    def test_claim_own_lease(self, lease, redis_client):
+        lease.acquire("trip-1", "task-a")
+
+        assert lease.claim("trip-1", "task-a") is None
+        # Claim switches to the shorter running TTL
+        assert redis_client.pttl("tip:generation-lease:trip-1") <= 2000
+
+    def test_claim_lease_held_by_other_task(self, lease):
+        lease.acquire("trip-1", "task-a")
+
+        assert lease.claim("trip-1", "task-b") == "task-a"
+
+    def test_release_only_by_owner(self, lease):
+        lease.acquire("trip-1", "task-a")
+
+        lease.release("trip-1", "task-b")
+        assert lease.holder("trip-1") == "task-a"
+
+        lease.release("trip-1", "task-a")
+        assert lease.holder("trip-1") is None
+
+    def test_heartbeat_keeps_lease_alive_and_releases(self, lease):
+        lease.claim("trip-1", "task-a")
+        heartbeat = lease.start_heartbeat("trip-1", "task-a")
+
+        time.sleep(2.5)  # Longer than the running TTL
+        assert lease.holder("trip-1") == "task-a"
+
+        heartbeat.stop()
+        assert lease.holder("trip-1") is None
+
+    def test_no_redis_is_not_enforced(self, mocker):
+        mocker.patch("app.core.generation_lease.get_redis_client", return_value=None)
+        lease = GenerationLease()
+
+        assert lease.is_available() is False
+        assert lease.acquire("trip-1", "task-a") == (True, None)
+        assert lease.claim("trip-1", "task-b") is None
@@ -0,0 +1,185 @@
+"""Unit tests for the Prometheus metrics"""
+
+import asyncio
+from types import SimpleNamespace
+
+import fakeredis
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.core import celery_app, metrics
+from app.core.metrics import QueueDepthCollector, async_http_event_hooks, http_event_hooks
+from app.core.telemetry import AGENT, Trace
+from app.main import app
+from app.services.places import JsonCache
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.fixture()
+def client():
+    return TestClient(app)
+
+
+def ok(request):
+    return httpx.Response(200, json={})
+
+
+@pytest.mark.unit()
+class TestApiMetrics:
+    """Test the /metrics endpoint and request metrics"""
+
+    def test_endpoint_serves_prometheus_text(self, client, mocker):
+        mocker.patch.object(
+            metrics, "_get_queue_registry", return_value=metrics.CollectorRegistry()
+        )
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "tip_http_request_duration_seconds" in response.text
+
+    def test_requests_are_labelled_by_route_template(self, client):
+        labels = {"method": "GET", "route": "/api/health", "status": "200"}
+        before = sample("tip_http_request_duration_seconds_count", **labels)
+
+        client.get("/api/health")
+
+        assert sample("tip_http_request_duration_seconds_count", **labels) == before + 1
+        assert sample("tip_http_requests_in_flight") == 0
+
+    def test_unknown_paths_share_one_label(self, client):
+        labels = {"method": "GET", "route": "unmatched", "status": "404"}
+        before = sample("tip_http_request_duration_seconds_count", **labels)
+
+        client.get("/no/such/path/123")
+        client.get("/no/such/path/456")
+
+        assert sample("tip_http_request_duration_seconds_count", **labels) == before + 2
+
+    def test_rate_limit_rejections_are_counted(self, client, mocker):
+        limiter = mocker.patch("app.core.security.get_rate_limiter").return_value
+        limiter.is_rate_limited.return_value = (True, {"X-RateLimit-Limit": "60"})
+        before = sample("tip_rate_limit_rejections_total")
+
+        assert client.get("/api/trips").status_code == 429
+
+        assert sample("tip_rate_limit_rejections_total") == before + 1
+
+    def test_disabled_endpoint(self, client, mocker):
+        mocker.patch("app.api.metrics.settings.METRICS_ENABLED", False)
+
+        assert client.get("/metrics").status_code == 404
+
+    def test_token_required_when_configured(self, client, mocker):
+        mocker.patch("app.api.metrics.settings.METRICS_TOKEN", "scrape-s3cret")
+        mocker.patch.object(
+            metrics, "_get_queue_registry", return_value=metrics.CollectorRegistry()
+        )
+
+        assert client.get("/metrics").status_code == 401
+        wrong = {"Authorization": "Bearer guess"}
+        assert client.get("/metrics", headers=wrong).status_code == 401
+        basic = {"Authorization": "Basic scrape-s3cret"}
+        assert client.get("/metrics", headers=basic).status_code == 401
+        valid = {"Authorization": "Bearer scrape-s3cret"}
+        assert client.get("/metrics", headers=valid).status_code == 200
+
+    def test_endpoint_is_rate_limited(self, client, mocker):
+        limiter = mocker.patch("app.core.security.get_rate_limiter").return_value
+        limiter.is_rate_limited.return_value = (True, {"X-RateLimit-Limit": "60"})
+
+        assert client.get("/metrics").status_code == 429
+
+
+@pytest.mark.unit()
+class TestDependencyMetrics:
+    """Test external API, cache, queue and agent metrics"""
+
+    def test_sync_client_calls_are_timed(self):
+        before = sample("tip_external_api_duration_seconds_count", client="test", outcome="2xx")
+
+        with httpx.Client(
+            transport=httpx.MockTransport(ok), event_hooks=http_event_hooks("test")
+        ) as http:
+            http.get("https://example.com/")
+
+        after = sample("tip_external_api_duration_seconds_count", client="test", outcome="2xx")
+        assert after == before + 1
+
+    def test_async_client_calls_are_timed_by_status_class(self):
+        def not_found(request):
+            return httpx.Response(404)
+
+        async def run():
+            async with httpx.AsyncClient(
+                transport=httpx.MockTransport(not_found),
+                event_hooks=async_http_event_hooks("test-async"),
+            ) as http:
+                await http.get("https://example.com/")
+
+        asyncio.run(run())
+
+        assert (
+            sample("tip_external_api_duration_seconds_count", client="test-async", outcome="4xx")
+            == 1
+        )
+
+    def test_cache_hits_and_misses(self):
+        cache = JsonCache("metrics-test", 60, redis_client=fakeredis.FakeRedis())
+
+        cache.get("a")
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("a")
+
+        assert sample("tip_cache_requests_total", cache="metrics-test", result="miss") == 1
+        assert sample("tip_cache_requests_total", cache="metrics-test", result="hit") == 2
+
+    def test_queue_depth_is_read_from_the_broker(self):
+        broker = fakeredis.FakeRedis()
+        broker.rpush("celery", "a", "b", "c")
+        registry = metrics.CollectorRegistry()
+        registry.register(QueueDepthCollector(["celery", "priority"], redis_client=broker))
+
+        assert registry.get_sample_value("tip_celery_queue_depth", {"queue": "celery"}) == 3
+        assert registry.get_sample_value("tip_celery_queue_depth", {"queue": "priority"}) == 0
+
+    def test_agent_runs_are_observed(self):
+        labels = {"agent": "metrics-agent", "status": "error"}
+
+        with pytest.raises(RuntimeError), Trace("report").span("metrics-agent", AGENT):
+            raise RuntimeError("boom")
+
+        assert sample("tip_agent_duration_seconds_count", **labels) == 1
+
+
+@pytest.mark.unit()
+class TestWorkerMetrics:
+    """Test the Celery signal handlers"""
+
+    def test_task_duration_and_in_progress(self):
+        task = SimpleNamespace(name="app.tasks.metrics_test")
+
+        celery_app._record_task_start(task_id="t1", task=task)
+        in_progress = sample("tip_celery_tasks_in_progress", task=task.name)
+        celery_app._record_task_end(task_id="t1", task=task, state="SUCCESS")
+
+        assert in_progress == 1
+        assert sample("tip_celery_tasks_in_progress", task=task.name) == 0
+        assert (
+            sample("tip_celery_task_duration_seconds_count", task=task.name, state="SUCCESS") == 1
+        )
+
+    def test_worker_exporter_starts_once(self, mocker):
+        start = mocker.patch.object(metrics, "start_http_server")
+        mocker.patch.object(metrics, "_worker_exporter_started", False)
+
+        assert metrics.start_worker_exporter(9999)
+        assert not metrics.start_worker_exporter(9999)
+        start.assert_called_once()
@@ -0,0 +1,184 @@
+"""Unit tests for the shared OAuth token cache"""
+
+import asyncio
+import threading
+
+import fakeredis
+import pytest
+
+from app.core import oauth_tokens
+from app.core.oauth_tokens import LOCK_KEY_PREFIX, TOKEN_KEY_PREFIX, SharedTokenCache
+
+
+@pytest.fixture()
+def redis_client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture()
+def tokens(redis_client):
+    return SharedTokenCache(redis_client=redis_client, lock_seconds=5)
+
+
+class Fetcher:
+    """Counts token requests and hands out numbered tokens."""
+
+    def __init__(self, expires_in=1800):
+        self.calls = 0
+        self.expires_in = expires_in
+
+    def __call__(self):
+        self.calls += 1
+        return f"token-{self.calls}", self.expires_in
+
+    async def fetch_async(self):
+        return self()
+
+
+@pytest.mark.unit()
+class TestSharedTokenCache:
+    """Test token sharing and single-flight refresh"""
+
+    def test_fetches_once_then_caches(self, tokens):
+        fetch = Fetcher()
+
+        first = tokens.get_or_refresh("amadeus", fetch)
+        second = tokens.get_or_refresh("amadeus", fetch)
+
+        assert first[0] == second[0] == "token-1"
+        assert fetch.calls == 1
+
+    def test_shared_across_processes_through_redis(self, tokens, redis_client):
+        tokens.get_or_refresh("amadeus", Fetcher())
+        other_process = SharedTokenCache(redis_client=redis_client)
+        fetch = Fetcher()
+
+        token, _ = other_process.get_or_refresh("amadeus", fetch)
+
+        assert token == "token-1"
+        assert fetch.calls == 0
+
+    def test_ttl_follows_expires_in(self, tokens, redis_client):
+        tokens.get_or_refresh("amadeus", Fetcher(expires_in=600))
+
+        ttl = redis_client.ttl(TOKEN_KEY_PREFIX + "amadeus")
+        assert 600 - oauth_tokens.EXPIRY_MARGIN_SECONDS - 2 <= ttl <= 600
+
+    def test_expired_token_is_refreshed(self, tokens, redis_client):
+        fetch = Fetcher()
+        tokens.get_or_refresh("amadeus", fetch)
+        tokens._tokens.clear()
+        redis_client.delete(TOKEN_KEY_PREFIX + "amadeus")
+
+        token, _ = tokens.get_or_refresh("amadeus", fetch)
+
+        assert token == "token-2"
+
+    def test_threads_refresh_once(self, tokens):
+        release = threading.Event()
+        fetch = Fetcher()
+
+        def slow_fetch():
+            release.wait(5)
+            return fetch()
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(tokens.get_or_refresh("a", slow_fetch)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert fetch.calls == 1
+        assert {token for token, _ in results} == {"token-1"}
+
+    def test_waits_for_another_process_refresh(self, tokens, redis_client, mocker):
+        redis_client.set(LOCK_KEY_PREFIX + "amadeus", "other-process", ex=5)
+
+        def other_process_finishes(_seconds):
+            redis_client.set(TOKEN_KEY_PREFIX + "amadeus", "their-token", ex=100)
+
+        mocker.patch.object(oauth_tokens.time, "sleep", side_effect=other_process_finishes)
+        fetch = Fetcher()
+
+        token, _ = tokens.get_or_refresh("amadeus", fetch)
+
+        assert token == "their-token"
+        assert fetch.calls == 0
+
+    def test_refreshes_when_lock_holder_never_finishes(self, redis_client):
+        redis_client.set(LOCK_KEY_PREFIX + "amadeus", "dead-process", ex=60)
+        tokens = SharedTokenCache(redis_client=redis_client, lock_seconds=0)
+        fetch = Fetcher()
+
+        token, _ = tokens.get_or_refresh("amadeus", fetch)
+
+        assert token == "token-1"
+        assert redis_client.get(LOCK_KEY_PREFIX + "amadeus") == "dead-process"
+
+    def test_lock_released_when_fetch_fails(self, tokens, redis_client):
+        def failing_fetch():
+            raise RuntimeError("auth down")
+
+        with pytest.raises(RuntimeError):
+            tokens.get_or_refresh("amadeus", failing_fetch)
+
+        assert redis_client.get(LOCK_KEY_PREFIX + "amadeus") is None
+        assert tokens.get("amadeus") is None
+
+    def test_async_waits_for_another_process_refresh(self, tokens, redis_client, mocker):
+        redis_client.set(LOCK_KEY_PREFIX + "amadeus", "other-process", ex=5)
+
+        async def other_process_finishes(_seconds):
+            redis_client.set(TOKEN_KEY_PREFIX + "amadeus", "their-token", ex=100)
+
+        mocker.patch.object(oauth_tokens.asyncio, "sleep", side_effect=other_process_finishes)
+        fetch = Fetcher()
+
+        token, _ = asyncio.run(tokens.get_or_refresh_async("amadeus", fetch.fetch_async))
+
+        assert token == "their-token"
+        assert fetch.calls == 0
+
+    def test_async_refresh_shares_token(self, tokens, redis_client):
+        fetch = Fetcher()
+
+        asyncio.run(tokens.get_or_refresh_async("amadeus", fetch.fetch_async))
+        token, _ = SharedTokenCache(redis_client=redis_client).get_or_refresh("amadeus", fetch)
+
+        assert token == "token-1"
+        assert fetch.calls == 1
+
+    def test_invalidate(self, tokens, redis_client):
+        token, _ = tokens.get_or_refresh("amadeus", Fetcher())
+
+        tokens.invalidate("amadeus", token)
+
+        assert tokens.get("amadeus") is None
+        assert redis_client.get(TOKEN_KEY_PREFIX + "amadeus") is None
+
+    def test_invalidate_keeps_a_newer_token(self, tokens, redis_client):
+        other = SharedTokenCache(redis_client=redis_client)
+        stale, _ = tokens.get_or_refresh("amadeus", Fetcher())
+        other.put("amadeus", "fresh-token", 1800)
+
+        tokens.invalidate("amadeus", stale)
+        other.invalidate("amadeus", stale)
+
+        assert redis_client.get(TOKEN_KEY_PREFIX + "amadeus") == "fresh-token"
+        assert other.get("amadeus")[0] == "fresh-token"
+
+    def test_works_without_redis(self, mocker):
+        mocker.patch("app.core.oauth_tokens.get_redis_client", return_value=None)
+        tokens = SharedTokenCache()
+        fetch = Fetcher()
+
+        tokens.get_or_refresh("amadeus", fetch)
+        token, _ = tokens.get_or_refresh("amadeus", fetch)
+
+        assert token == "token-1"
+        assert fetch.calls == 1
@@ -0,0 +1,147 @@
+"""Unit tests for on-demand request and task profiling"""
+
+import time
+
+import pytest
+from celery.app.task import Context
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import celery_app
+from app.core.config import settings
+from app.core.profiling import SamplingProfiler, register_profiling_middleware, render_flamegraph
+
+
+def busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.fixture()
+def token(mocker):
+    mocker.patch.object(settings, "PROFILING_TOKEN", "s3cret")
+    return "s3cret"
+
+
+@pytest.fixture()
+def client(token):
+    app = FastAPI()
+    register_profiling_middleware(app)
+
+    @app.get("/slow")
+    def slow():
+        busy_wait(0.05)
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+@pytest.mark.unit()
+class TestSamplingProfiler:
+    """Test the sampler and the flame graph renderer"""
+
+    def test_samples_the_running_code(self):
+        with SamplingProfiler(interval_ms=1) as profiler:
+            busy_wait(0.05)
+
+        assert profiler.samples > 5
+        assert "busy_wait (tests/test_profiling.py" in profiler.folded()
+        assert "tip-profiler" not in profiler.folded()
+
+    def test_stops_at_max_seconds(self):
+        with SamplingProfiler(interval_ms=1, max_seconds=0.01) as profiler:
+            busy_wait(0.05)
+
+        assert profiler.samples < 20
+
+    def test_flamegraph_escapes_and_weights_frames(self):
+        svg = render_flamegraph({"main;a <lambda>": 3, "main;b": 1}, title="GET /x")
+
+        assert svg.startswith("<svg")
+        assert "a &lt;lambda&gt; (3 samples, 75.0%)" in svg
+        assert "GET /x (4 samples)" in svg
+
+
+@pytest.mark.unit()
+class TestRequestProfiling:
+    """Test the token-gated profiling middleware"""
+
+    def test_returns_flamegraph_with_valid_token(self, client, token):
+        response = client.get("/slow", headers={"X-Profile": token})
+
+        assert response.headers["content-type"] == "image/svg+xml"
+        assert response.headers["X-Profiled-Status"] == "200"
+        assert "slow (tests/test_profiling.py" in response.text
+
+    def test_folded_format(self, client, token):
+        response = client.get("/slow", headers={"X-Profile": token, "X-Profile-Format": "folded"})
+
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "busy_wait" in response.text
+
+    def test_query_token_is_not_accepted(self, client, token):
+        response = client.get(f"/slow?profile={token}")
+
+        assert response.json() == {"ok": True}
+        assert "X-Profiled-Status" not in response.headers
+
+    def test_invalid_token_is_ignored(self, client):
+        response = client.get("/slow", headers={"X-Profile": "guess"})
+
+        assert response.json() == {"ok": True}
+        assert "X-Profiled-Status" not in response.headers
+
+    def test_not_registered_without_token(self):
+        app = FastAPI()
+
+        register_profiling_middleware(app)
+
+        assert app.user_middleware == []
+
+
+@pytest.mark.unit()
+class TestTaskProfiling:
+    """Test profiling Celery runs sent with the profile header"""
+
+    def task(self):
+        def run(trip_id, agent_type):
+            pass
+
+        return type("Task", (), {"name": "app.tasks.test", "run": staticmethod(run)})()
+
+    def test_profile_is_stored_on_the_agent_job(self, mock_supabase):
+        task = self.task()
+        task.request = Context(headers={"profile": True})
+
+        celery_app._start_task_profile(task_id="t1", task=task)
+        busy_wait(0.02)
+        celery_app._store_task_profile(task_id="t1", task=task, args=("trip-1", "visa"))
+
+        mock_supabase.table.assert_called_with("agent_jobs")
+        update = mock_supabase.table.return_value.update
+        profile = update.call_args.args[0]["profile"]
+        assert profile["format"] == "folded"
+        assert profile["samples"] > 0
+        update.return_value.eq.assert_called_with("trip_id", "trip-1")
+        update.return_value.eq.return_value.eq.assert_called_with("agent_type", "visa")
+
+    def test_unflagged_runs_are_not_profiled(self, mock_supabase):
+        task = self.task()
+        task.request = Context()
+
+        celery_app._start_task_profile(task_id="t2", task=task)
+        celery_app._store_task_profile(task_id="t2", task=task, args=("trip-1", "visa"))
+
+        assert "t2" not in celery_app._task_profilers
+        mock_supabase.table.assert_not_called()
+
+    def test_orchestrator_rows_match_the_task_id(self):
+        def run(trip_id, force=False):
+            pass
+
+        task = type("Task", (), {"run": staticmethod(run)})()
+
+        assert celery_app._agent_job_filters(task, "t3", ("trip-1",), {}) == {
+            "celery_task_id": "t3"
+        }
@@ -0,0 +1,168 @@
+"""Unit tests for execution telemetry spans"""
+
+import asyncio
+
+import pytest
+from crewai.tools import tool
+
+from app.core import telemetry
+from app.core.telemetry import AGENT, LLM, TOOL, Trace, record_span, span, trace_tools
+
+
+@tool("Lookup")
+def lookup(query: str) -> str:
+    """Look something up."""
+    if query == "fail":
+        msg = "lookup failed"
+        raise RuntimeError(msg)
+    return f"result for {query}"
+
+
+@pytest.mark.unit()
+class TestSpans:
+    """Test span nesting and per-agent totals"""
+
+    def test_children_are_attributed_to_their_agent(self):
+        trace = Trace("report", trip_id="trip-1")
+
+        with trace.span("visa", AGENT) as agent_span:
+            with span("Check visa", TOOL):
+                pass
+            record_span("claude", LLM, duration_ms=250, input_tokens=100, output_tokens=20)
+
+        summary = trace.summary()
+        visa = summary["agents"]["visa"]
+        assert visa["status"] == "ok"
+        assert visa["tool_calls"] == 1
+        assert visa["llm_calls"] == 1
+        assert visa["llm_ms"] == 250
+        assert visa["input_tokens"] == 100
+        assert summary["totals"]["output_tokens"] == 20
+        assert summary["attributes"] == {"trip_id": "trip-1"}
+        children = [s for s in summary["spans"] if s["kind"] != AGENT]
+        assert {s["parent_id"] for s in children} == {agent_span.span_id}
+
+    def test_failed_agent_is_recorded_and_reraised(self):
+        trace = Trace("report")
+
+        with pytest.raises(ValueError, match="bad input"), trace.span("weather", AGENT):
+            raise ValueError("bad input")
+
+        [recorded] = trace.summary()["spans"]
+        assert recorded["status"] == "error"
+        assert recorded["error"] == "bad input"
+        assert trace.summary()["agents"]["weather"]["status"] == "error"
+
+    def test_spans_follow_agents_into_worker_threads(self):
+        trace = Trace("report")
+
+        def run_agent():
+            record_span("gemini", LLM, duration_ms=10, input_tokens=5)
+
+        async def run():
+            with trace.span("food", AGENT):
+                await asyncio.to_thread(run_agent)
+
+        asyncio.run(run())
+
+        assert trace.summary()["agents"]["food"]["input_tokens"] == 5
+
+    def test_concurrent_agents_keep_separate_totals(self):
+        trace = Trace("report")
+
+        async def run_agent(name, calls):
+            with trace.span(name, AGENT):
+                for _ in range(calls):
+                    await asyncio.sleep(0)
+                    record_span("claude", LLM, duration_ms=1)
+
+        async def run():
+            await asyncio.gather(run_agent("culture", 3), run_agent("country", 1))
+
+        asyncio.run(run())
+
+        agents = trace.summary()["agents"]
+        assert agents["culture"]["llm_calls"] == 3
+        assert agents["country"]["llm_calls"] == 1
+
+    def test_spans_outside_a_trace_are_not_recorded(self):
+        trace = Trace("report")
+
+        with span("orphan", TOOL):
+            pass
+
+        assert trace.summary()["spans"] == []
+
+    def test_span_list_is_capped(self, mocker):
+        mocker.patch.object(telemetry, "MAX_SPANS_PER_TRACE", 2)
+        trace = Trace("report")
+
+        with trace.span("visa", AGENT):
+            for _ in range(3):
+                record_span("claude", LLM, duration_ms=1)
+
+        summary = trace.summary()
+        assert len(summary["spans"]) == 2
+        assert summary["dropped_spans"] == 2
+        assert summary["agents"]["visa"]["llm_calls"] == 3
+
+
+@pytest.mark.unit()
+class TestToolTracing:
+    """Test tool invocation spans"""
+
+    def test_tool_calls_are_timed(self):
+        [traced_lookup] = trace_tools([lookup])
+        trace = Trace("report")
+
+        with trace.span("visa", AGENT):
+            assert traced_lookup.run(query="paris") == "result for paris"
+
+        [tool_span] = [s for s in trace.summary()["spans"] if s["kind"] == TOOL]
+        assert tool_span["name"] == "Lookup"
+        assert tool_span["attributes"]["output_chars"] == len("result for paris")
+
+    def test_tool_errors_are_counted(self):
+        [traced_lookup] = trace_tools([lookup])
+        trace = Trace("report")
+
+        with trace.span("visa", AGENT), pytest.raises(RuntimeError):
+            traced_lookup.func(query="fail")
+
+        assert trace.summary()["agents"]["visa"]["errors"] == 1
+
+    def test_original_tools_are_untouched(self):
+        [traced_lookup] = trace_tools([lookup])
+
+        assert traced_lookup is not lookup
+        assert trace_tools([traced_lookup])[0] is traced_lookup
+        assert lookup.func(query="x") == "result for x"
+
+
+@pytest.mark.unit()
+class TestExport:
+    """Test span export to Sentry"""
+
+    def test_spans_are_exported_to_sentry(self, mocker):
+        mocker.patch.object(telemetry, "SENTRY_AVAILABLE", True)
+        mocker.patch.object(telemetry, "OTEL_AVAILABLE", False)
+        start_span = mocker.patch.object(telemetry.sentry_sdk, "start_span")
+
+        with Trace("report").span("visa", AGENT):
+            record_span("claude", LLM, duration_ms=5, input_tokens=7)
+
+        ops = [c.kwargs["op"] for c in start_span.call_args_list]
+        assert ops == ["tip.agent", "tip.llm"]
+        llm_span = start_span.return_value
+        llm_span.set_data.assert_any_call("input_tokens", 7)
+        llm_span.finish.assert_called_once()
+
+    def test_export_failures_do_not_break_spans(self, mocker):
+        mocker.patch.object(telemetry, "SENTRY_AVAILABLE", True)
+        mocker.patch.object(telemetry.sentry_sdk, "start_span", side_effect=RuntimeError)
+        trace = Trace("report")
+
+        with trace.span("visa", AGENT):
+            pass
+
+        assert trace.summary()["agents"]["visa"]["status"] == "ok"
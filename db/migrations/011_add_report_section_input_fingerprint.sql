@@ -0,0 +1,9 @@
+-- Migration: Add input fingerprint to report_sections
+-- Stores a hash of the normalized agent input that produced each section so
+-- regeneration can skip agents whose input has not changed
+-- Date: 2026-10-18
+
+ALTER TABLE public.report_sections
+ADD COLUMN IF NOT EXISTS input_fingerprint TEXT;
+
+COMMENT ON COLUMN public.report_sections.input_fingerprint IS 'SHA-256 of the normalized agent input (excluding trip_id) used to generate this section';
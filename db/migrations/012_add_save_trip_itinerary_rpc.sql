@@ -0,0 +1,58 @@
+-- Migration: Atomic itinerary writes with optimistic concurrency
+-- Replaces the select-then-update of the whole trip_details blob with a single
+-- jsonb_set of the itinerary key. The itinerary carries a "version" counter that
+-- is bumped on every write; callers may pass the version they read and the write
+-- only applies if it still matches (PATCH /trips/{id}/itinerary). "applied"
+-- tells the caller whether the write happened.
+-- Date: 2026-10-18
+
+-- The return type changed (applied column); CREATE OR REPLACE cannot change it
+DROP FUNCTION IF EXISTS public.save_trip_itinerary(UUID, UUID, JSONB, INTEGER);
+
+CREATE FUNCTION public.save_trip_itinerary(
+    p_trip_id UUID,
+    p_user_id UUID,
+    p_itinerary JSONB,
+    p_expected_version INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+    found BOOLEAN,
+    applied BOOLEAN,
+    version INTEGER
+) AS $$
+DECLARE
+    v_current_version INTEGER;
+BEGIN
+    -- Lock the row so concurrent writers serialize on the version check
+    SELECT COALESCE((t.trip_details #>> '{itinerary,version}')::INTEGER, 0)
+    INTO v_current_version
+    FROM public.trips t
+    WHERE t.id = p_trip_id AND t.user_id = p_user_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN QUERY SELECT FALSE, FALSE, NULL::INTEGER;
+        RETURN;
+    END IF;
+
+    -- Version conflict: report the current version without writing
+    IF p_expected_version IS NOT NULL AND p_expected_version <> v_current_version THEN
+        RETURN QUERY SELECT TRUE, FALSE, v_current_version;
+        RETURN;
+    END IF;
+
+    UPDATE public.trips t
+    SET trip_details = jsonb_set(
+            COALESCE(t.trip_details, '{}'::JSONB),
+            '{itinerary}',
+            p_itinerary || jsonb_build_object('version', v_current_version + 1)
+        ),
+        updated_at = NOW()
+    WHERE t.id = p_trip_id AND t.user_id = p_user_id;
+
+    RETURN QUERY SELECT TRUE, TRUE, v_current_version + 1;
+END;
+$$ LANGUAGE plpgsql
+SET search_path = '';
+
+COMMENT ON FUNCTION public.save_trip_itinerary IS 'Writes trips.trip_details.itinerary in one statement, bumping its version; skips the write if p_expected_version is given and stale';
@@ -0,0 +1,29 @@
+-- Migration: Delta-encoded trip version history
+-- Versions are stored as structural deltas against periodic full keyframes
+-- instead of a full trip snapshot per edit (see app/services/trip_versions.py).
+-- Existing rows keep their full snapshot and act as keyframes.
+-- Date: 2026-10-18
+
+ALTER TABLE public.trip_versions
+ADD COLUMN IF NOT EXISTS storage_kind TEXT NOT NULL DEFAULT 'snapshot'
+    CHECK (storage_kind IN ('snapshot', 'keyframe', 'delta')),
+ADD COLUMN IF NOT EXISTS base_version INTEGER,
+ADD COLUMN IF NOT EXISTS delta JSONB;
+
+-- Delta rows carry no snapshot
+ALTER TABLE public.trip_versions ALTER COLUMN trip_data DROP NOT NULL;
+
+ALTER TABLE public.trip_versions
+ADD CONSTRAINT trip_versions_storage_check CHECK (
+    (storage_kind = 'delta' AND delta IS NOT NULL AND base_version IS NOT NULL)
+    OR (storage_kind <> 'delta' AND trip_data IS NOT NULL)
+);
+
+-- Latest keyframe lookup when writing a new version
+CREATE INDEX IF NOT EXISTS idx_trip_versions_keyframes
+ON public.trip_versions(trip_id, version_number DESC)
+WHERE storage_kind <> 'delta';
+
+COMMENT ON COLUMN public.trip_versions.storage_kind IS 'snapshot (legacy full copy), keyframe (full copy) or delta';
+COMMENT ON COLUMN public.trip_versions.base_version IS 'Keyframe version_number a delta row is relative to';
+COMMENT ON COLUMN public.trip_versions.delta IS 'Structural delta {"set": [[path, value]], "unset": [path]} against the base keyframe';
@@ -0,0 +1,9 @@
+-- Migration: Add profile to agent_jobs
+-- Stores the sampled stacks of a run profiled on demand (Celery header
+-- profile=true, see backend/app/core/profiling.py)
+-- Date: 2026-10-18
+
+ALTER TABLE public.agent_jobs
+ADD COLUMN IF NOT EXISTS profile JSONB;
+
+COMMENT ON COLUMN public.agent_jobs.profile IS 'On-demand profile of the run: folded stacks with sample count, interval and duration';